@@ -18,13 +18,15 @@ import os
 import sqlite3
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Any
 from collections import defaultdict
 from dataclasses import dataclass, asdict
 import sys
 
 # Importar componentes existentes
 sys.path.insert(0, str(Path(__file__).parent))
+from ingestion_writer import IngestionWriter, content_key
+
 try:
     from motor_cotizacion_panelin import MotorCotizacionPanelin
 except ImportError:
@@ -65,6 +67,13 @@ class IngestionRecord:
         return asdict(self)
 
 
+def _collect(records: Iterable[IngestionRecord], sink: List[IngestionRecord]) -> Iterator[IngestionRecord]:
+    """Itera registros guardando una referencia en sink (para el resumen)"""
+    for record in records:
+        sink.append(record)
+        yield record
+
+
 class AgenteIngestionAnalisis:
     """Agente principal de ingestion y análisis"""
 
@@ -89,6 +98,7 @@ class AgenteIngestionAnalisis:
 
         # Inicializar base de datos
         self._init_database()
+        self._writer: Optional[IngestionWriter] = None
 
     def _init_database(self):
         """Inicializar base de datos SQLite para ingestion table"""
@@ -193,40 +203,48 @@ class AgenteIngestionAnalisis:
         print("=" * 70)
 
         records = []
+        # Cada fuente entrega sus registros a la cola acotada del escritor a
+        # medida que se ingestan; el guardado se solapa con la lectura
+        writer = self._get_writer().start()
 
-        # 1. Ingestion de cotizaciones
+        # 1. Ingestion de cotizaciones (CSV en streaming, por lotes)
         print("\n1️⃣  Ingestionando cotizaciones...")
-        quote_records = self._ingest_quotes()
+        quote_records: List[IngestionRecord] = []
+        writer.submit(_collect(self._iter_quote_records(), quote_records))
         records.extend(quote_records)
         print(f"   ✅ {len(quote_records)} cotizaciones procesadas")
 
         # 2. Ingestion de MercadoLibre
         print("\n2️⃣  Ingestionando consultas de MercadoLibre...")
         ml_records = self._ingest_mercadolibre()
+        writer.submit(ml_records)
         records.extend(ml_records)
         print(f"   ✅ {len(ml_records)} consultas de MercadoLibre procesadas")
 
         # 3. Ingestion de Instagram
         print("\n3️⃣  Ingestionando consultas de Instagram...")
         ig_records = self._ingest_instagram()
+        writer.submit(ig_records)
         records.extend(ig_records)
         print(f"   ✅ {len(ig_records)} consultas de Instagram procesadas")
 
         # 4. Ingestion de Facebook
         print("\n4️⃣  Ingestionando consultas de Facebook...")
         fb_records = self._ingest_facebook()
+        writer.submit(fb_records)
         records.extend(fb_records)
         print(f"   ✅ {len(fb_records)} consultas de Facebook procesadas")
 
         # 5. Ingestion de MongoDB
         print("\n5️⃣  Ingestionando datos de MongoDB...")
         mongodb_records = self._ingest_mongodb()
+        writer.submit(mongodb_records)
         records.extend(mongodb_records)
         print(f"   ✅ {len(mongodb_records)} registros de MongoDB procesados")
 
         # 6. Guardar en base de datos
         print("\n6️⃣  Guardando en base de datos...")
-        saved_count = self._save_to_database(records)
+        saved_count = writer.join()
         print(f"   ✅ {saved_count} registros guardados")
 
         # 7. Generar resumen
@@ -242,65 +260,77 @@ class AgenteIngestionAnalisis:
 
     def _ingest_quotes(self) -> List[IngestionRecord]:
         """Ingestiona inputs de cotizaciones desde CSV"""
-        records = []
+        return list(self._iter_quote_records())
 
+    def _iter_quote_records(self) -> Iterator[IngestionRecord]:
+        """Registros de cotizaciones leyendo el CSV en streaming"""
         if not os.path.exists(self.csv_inputs):
             print(f"   ⚠️  CSV no encontrado: {self.csv_inputs}")
-            return records
+            return
 
         try:
             with open(self.csv_inputs, "r", encoding="utf-8", errors="ignore") as f:
                 reader = csv.reader(f)
-                rows = list(reader)
+                next(reader, None)
+                header_row = next(reader, None)
 
-                if len(rows) < 3:
-                    return records
+                if header_row is None:
+                    return
 
-                headers = [h.strip() for h in rows[1]]
+                headers = [h.strip() for h in header_row]
                 header_map = {h: i for i, h in enumerate(headers)}
+                n_headers = len(headers)
+
+                # Columnas resueltas una vez por archivo (no por fila)
+                col = {
+                    key: header_map.get(key)
+                    for key in ("Consulta", "Fecha", "Cliente", "Producto",
+                                "Dimensiones", "Luz", "Fijación", "Notas")
+                }
 
-                for idx, row in enumerate(rows[2:], start=3):
-                    if len(row) < len(headers):
-                        row.extend([""] * (len(headers) - len(row)))
+                def get_value(row, key):
+                    col_idx = col[key]
+                    return row[col_idx].strip() if col_idx is not None else ""
 
-                    def get_value(key, default=""):
-                        col_idx = header_map.get(key, -1)
-                        return (
-                            row[col_idx].strip()
-                            if col_idx >= 0 and col_idx < len(row)
-                            else default
-                        )
+                for idx, row in enumerate(reader, start=3):
+                    if len(row) < n_headers:
+                        row.extend([""] * (n_headers - len(row)))
 
-                    consulta = get_value("Consulta", "")
+                    consulta = get_value(row, "Consulta")
                     if not consulta:
                         continue
 
+                    fecha = get_value(row, "Fecha")
+                    metadata = {
+                        "cliente": get_value(row, "Cliente"),
+                        "producto": get_value(row, "Producto"),
+                        "dimensiones": get_value(row, "Dimensiones"),
+                        "luz": get_value(row, "Luz"),
+                        "fijacion": get_value(row, "Fijación"),
+                        "notas": get_value(row, "Notas"),
+                    }
                     record = IngestionRecord(
-                        id=f"quote_{idx}_{datetime.now().strftime('%Y%m%d%H%M%S')}",
+                        # Id derivado del contenido: re-ingestar el CSV actualiza
+                        # las filas en lugar de duplicarlas
+                        id=f"quote_{content_key(fecha, consulta, *metadata.values())}",
                         source="quote",
                         platform="csv",
-                        timestamp=get_value("Fecha", datetime.now().isoformat()),
+                        timestamp=(
+                            fecha
+                            if col["Fecha"] is not None
+                            else datetime.now().isoformat()
+                        ),
                         user_query=consulta,
                         chatbot_response=None,
-                        metadata={
-                            "cliente": get_value("Cliente"),
-                            "producto": get_value("Producto"),
-                            "dimensiones": get_value("Dimensiones"),
-                            "luz": get_value("Luz"),
-                            "fijacion": get_value("Fijación"),
-                            "notas": get_value("Notas"),
-                            "fila": idx,
-                        },
+                        metadata={**metadata, "fila": idx},
                         analysis=None,
                     )
 
-                    records.append(record)
+                    yield record
 
         except Exception as e:
             print(f"   ⚠️  Error leyendo CSV: {e}")
 
-        return records
-
     def _ingest_mercadolibre(self) -> List[IngestionRecord]:
         """Ingestiona consultas de MercadoLibre"""
         records = []
@@ -594,7 +624,7 @@ class AgenteIngestionAnalisis:
         """Ingestiona datos de MongoDB"""
         records = []
 
-        if not self.mongodb_client or not self.mongodb_client.db:
+        if not self.mongodb_client or self.mongodb_client.db is None:
             print(
                 f"   ⚠️  MongoDB no conectado. Configurar MONGODB_CONNECTION_STRING y MONGODB_DATABASE_NAME"
             )
@@ -683,39 +713,21 @@ class AgenteIngestionAnalisis:
 
         return records
 
+    def _get_writer(self) -> IngestionWriter:
+        """Escritor SQLite de larga vida (una conexión WAL por agente)"""
+        if self._writer is None:
+            self._writer = IngestionWriter(self.db_path)
+        return self._writer
+
     def _save_to_database(self, records: List[IngestionRecord]) -> int:
         """Guarda registros en la base de datos"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        saved = 0
-        for record in records:
-            try:
-                cursor.execute(
-                    """
-                    INSERT OR REPLACE INTO ingestion_table 
-                    (id, source, platform, timestamp, user_query, chatbot_response, metadata, analysis)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        record.id,
-                        record.source,
-                        record.platform,
-                        record.timestamp,
-                        record.user_query,
-                        record.chatbot_response,
-                        json.dumps(record.metadata) if record.metadata else None,
-                        json.dumps(record.analysis) if record.analysis else None,
-                    ),
-                )
-                saved += 1
-            except Exception as e:
-                print(f"   ⚠️  Error guardando registro {record.id}: {e}")
-
-        conn.commit()
-        conn.close()
+        return self._get_writer().write_many(records)
 
-        return saved
+    def close(self):
+        """Cierra el escritor de la base de datos"""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
 
     def _generar_resumen_ingestion(self, records: List[IngestionRecord]) -> Dict:
         """Genera resumen de ingestion"""
@@ -13,15 +13,23 @@ Features:
 - Conflict detection and resolution
 - Structured data extraction
 - Google Sheets bidirectional sync for Cost Matrix
+- Persistent inverted index for search_kb (kb_search_index.KBSearchIndex),
+  rebuilt only for source files whose hash changed
 """
 
 import json
 import hashlib
+import os
+import sqlite3
+import tempfile
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 import re
 
+from cost_matrix_sync import CostMatrixSyncBackend, CostMatrixSyncQueue, GoogleSheetsSyncBackend
+from kb_search_index import KBSearchIndex, score_entry
+
 # KB Hierarchy Configuration
 KB_HIERARCHY = {
     "level_1_master": [
@@ -51,28 +59,55 @@ GSHEETS_CREDS = "panelin_improvements/credentials.json"
 GSHEETS_NAME = "BROMYROS_Costos_Ventas_2026"
 COST_MATRIX_REL_PATH = "wiki/matriz de costos adaptacion /redesigned/BROMYROS_Costos_Ventas_2026_OPTIMIZED.json"
 
+# Persisted search index (relative to kb_path)
+SEARCH_INDEX_REL_PATH = ".kb_index/kb_search.sqlite"
+
+# Seconds without new price edits before dirty rows are pushed (0 = push inline)
+COST_MATRIX_SYNC_DEBOUNCE_S = 5.0
+
+# Editable cost-matrix fields -> path inside a product record
+COST_MATRIX_FIELDS = {
+    "costo_base_usd_iva": ("costos", "fabrica_directo", "costo_base_usd_iva"),
+    "precio_venta": ("precios", "empresa", "venta_iva_usd"),
+}
+
 class KBIndexingAgent:
     """Expert agent for KB indexing and retrieval"""
     
-    def __init__(self, kb_path: Optional[Path] = None):
+    def __init__(
+        self,
+        kb_path: Optional[Path] = None,
+        index_path: Optional[Path] = None,
+        sync_backend: Optional[CostMatrixSyncBackend] = None,
+        sync_debounce_s: Optional[float] = COST_MATRIX_SYNC_DEBOUNCE_S
+    ):
         self.kb_path = kb_path or PROJECT_ROOT
         self.files_dir = FILES_DIR
+        self.index_path = Path(index_path) if index_path else Path(self.kb_path) / SEARCH_INDEX_REL_PATH
         self._index_cache = {}
         self._metadata_cache = {}
+        self._search_index: Optional[KBSearchIndex] = None
+        self._search_index_fresh = False
         self._cost_matrix_cache: Optional[Dict[str, Any]] = None
         self._cost_matrix_by_code: Dict[str, Dict[str, Any]] = {}
         self._cost_matrix_by_category: Dict[str, List[Dict[str, Any]]] = {}
+        self._cost_matrix_stamp: Optional[Tuple[int, int]] = None
         self._last_sync_at: Optional[str] = None
+        self._sync_backend = sync_backend
+        self._sync_debounce_s = sync_debounce_s
+        self._sync_queue: Optional[CostMatrixSyncQueue] = None
     
-    def _load_json_file(self, filename: str, level: int) -> Optional[Dict]:
-        """Load JSON file from appropriate location"""
-        # Try project root first
+    def _resolve_kb_file(self, filename: str) -> Optional[Path]:
+        """Locate a KB file: project root first, then the Files directory"""
         file_path = self.kb_path / filename
         if not file_path.exists():
-            # Try Files directory
             file_path = self.files_dir / filename
-        
-        if not file_path.exists():
+        return file_path if file_path.exists() else None
+    
+    def _load_json_file(self, filename: str, level: int) -> Optional[Dict]:
+        """Load JSON file from appropriate location"""
+        file_path = self._resolve_kb_file(filename)
+        if file_path is None:
             return None
         
         try:
@@ -167,11 +202,7 @@ class KBIndexingAgent:
             for filename in KB_HIERARCHY[files_key]:
                 data = self._load_json_file(filename, kb_level)
                 if data:
-                    # Special-case: the cost matrix is already indexed; don't explode it into huge key/value entries.
-                    if "BROMYROS_Costos_Ventas_2026_OPTIMIZED.json" in filename:
-                        file_index = self._index_cost_matrix(data, kb_level)
-                    else:
-                        file_index = self._index_json_structure(data, "", kb_level)
+                    file_index = self._index_file_data(filename, data, kb_level)
                     level_index["files"][filename] = {
                         "entries": file_index,
                         "count": len(file_index),
@@ -193,6 +224,110 @@ class KBIndexingAgent:
         
         self._index_cache = index
         return index
+    
+    def _index_file_data(self, filename: str, data: Dict, level: int) -> List[Dict]:
+        """Flatten one loaded KB file into search entries"""
+        # Special-case: the cost matrix is already indexed; don't explode it into huge key/value entries.
+        if "BROMYROS_Costos_Ventas_2026_OPTIMIZED.json" in filename:
+            return self._index_cost_matrix(data, level)
+        return self._index_json_structure(data, "", level)
+    
+    # ------------------------------------------------------------------------
+    # Persistent search index
+    # ------------------------------------------------------------------------
+    
+    def refresh_search_index(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Bring the persisted search index up to date with the KB files.
+        
+        Files are compared by size/mtime first and by sha256 when those
+        changed; only files whose content hash changed are re-indexed.
+        
+        Args:
+            force: Re-index every file regardless of its hash
+            
+        Returns:
+            Dict[str, Any]: Counts of reindexed, unchanged and removed files.
+        """
+        if self._search_index is None:
+            self._search_index = KBSearchIndex(self.index_path)
+        index = self._search_index
+        states = index.file_states()
+        report = {"reindexed": [], "unchanged": 0, "removed": []}
+        seen = set()
+        
+        for kb_level in [1, 2, 3, 4]:
+            files_key = f"level_{kb_level}_{['master', 'validation', 'dynamic', 'support'][kb_level-1]}"
+            for rank, filename in enumerate(KB_HIERARCHY.get(files_key, [])):
+                file_path = self._resolve_kb_file(filename)
+                if file_path is None:
+                    continue
+                seen.add(filename)
+                stat = file_path.stat()
+                state = states.get(filename)
+                # Entries embed their level: a file moved in KB_HIERARCHY is re-indexed
+                current = not force and state is not None \
+                    and (state["level"], state["rank"]) == (kb_level, rank)
+                if current and (state["size"], state["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+                    report["unchanged"] += 1
+                    continue
+                
+                digest = hashlib.sha256(file_path.read_bytes()).hexdigest()
+                if current and state["sha256"] == digest:
+                    index.touch_file(filename, stat.st_size, stat.st_mtime_ns)
+                    report["unchanged"] += 1
+                    continue
+                
+                data = self._load_json_file(filename, kb_level)
+                entries = self._index_file_data(filename, data, kb_level) if data else []
+                index.replace_file(
+                    filename, kb_level, rank, stat.st_size, stat.st_mtime_ns, digest,
+                    self._metadata_cache.get(filename, {}), entries
+                )
+                report["reindexed"].append(filename)
+        
+        report["removed"] = [name for name in states if name not in seen]
+        index.remove_files(report["removed"])
+        self._search_index_fresh = True
+        return report
+    
+    def _get_search_index(self) -> Optional[KBSearchIndex]:
+        """Search index, refreshed once per agent and after KB writes (None if unusable)"""
+        if not self._search_index_fresh:
+            try:
+                self.refresh_search_index()
+            except (OSError, sqlite3.Error) as e:
+                print(f"Search index unavailable, falling back to scan: {e}")
+                return None
+        return self._search_index
+    
+    def search_kb_path(
+        self,
+        path_prefix: str,
+        level_priority: Optional[int] = None,
+        max_results: int = 50
+    ) -> Dict[str, Any]:
+        """
+        Finds KB entries whose path starts with a prefix (e.g. "products.ISODEC").
+        
+        Args:
+            path_prefix: Case-sensitive path prefix.
+            level_priority: Preferred KB level (1-4). If None, searches all levels.
+            max_results: Maximum number of results to return.
+            
+        Returns:
+            Dict[str, Any]: Matching entries ordered by path.
+        """
+        index = self._get_search_index()
+        if index is None:
+            return {"error": "Search index not available"}
+        results = index.search_path(path_prefix, level_priority, max_results)
+        return {
+            "path_prefix": path_prefix,
+            "level_priority": level_priority,
+            "total_matches": len(results),
+            "results": results
+        }
 
     def _index_cost_matrix(self, data: Dict[str, Any], level: int) -> List[Dict[str, Any]]:
         """
@@ -248,8 +383,26 @@ class KBIndexingAgent:
         self._cost_matrix_by_code = {p.get("codigo", ""): p for p in products if p.get("codigo")}
         self._cost_matrix_by_category = (data.get("productos", {}) or {}).get("por_categoria", {}) or {}
         self._cost_matrix_cache = data
+        self._cost_matrix_stamp = self._file_stamp(self._resolve_kb_file(cm_path))
         return data
 
+    @staticmethod
+    def _file_stamp(path: Optional[Path]) -> Optional[Tuple[int, int]]:
+        if path is None:
+            return None
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return (stat.st_size, stat.st_mtime_ns)
+
+    def _find_cost_matrix_product(self, code: str) -> Optional[Dict[str, Any]]:
+        """Code index lookup: exact code first, then its uppercase form"""
+        product = self._cost_matrix_by_code.get(code)
+        if product is None and code and code.upper() != code:
+            product = self._cost_matrix_by_code.get(code.upper())
+        return product
+
     def get_cost_matrix_product(self, code: str) -> Dict[str, Any]:
         """Get a product from the internal cost matrix by product code."""
         data = self._load_cost_matrix()
@@ -260,9 +413,7 @@ class KBIndexingAgent:
         if not code_norm:
             return {"error": "Missing product code"}
 
-        product = self._cost_matrix_by_code.get(code_norm)
-        if not product and code_norm.upper() != code_norm:
-            product = self._cost_matrix_by_code.get(code_norm.upper())
+        product = self._find_cost_matrix_product(code_norm)
         if not product:
             return {"error": f"Product code not found in cost matrix: {code_norm}"}
 
@@ -300,87 +451,161 @@ class KBIndexingAgent:
 
     def update_product_price(self, code: str, new_value: float, field: str = "costo_base_usd_iva") -> Dict[str, Any]:
         """Update a product value in the Cost Matrix and sync to Google Sheets."""
-        # 1. Load data
-        file_path = self.kb_path / COST_MATRIX_REL_PATH
-        if not file_path.exists():
-            file_path = self.files_dir / COST_MATRIX_REL_PATH
-        
-        if not file_path.exists():
+        # A single edit is pushed synchronously, as before batching existed
+        result = self.update_product_prices(
+            [{"code": code, "new_value": new_value, "field": field}], sync_now=True
+        )
+        if result.get("error"):
+            return {"error": result["error"]}
+
+        return {
+            "status": "success",
+            "code": code,
+            "field": field,
+            "new_value": new_value,
+            "sync_status": result["sync_status"],
+            "last_sync_at": self._last_sync_at,
+            "product": result["products"][0]
+        }
+
+    def update_product_prices(self, updates: List[Dict[str, Any]], sync_now: bool = False) -> Dict[str, Any]:
+        """
+        Apply many price edits with a single atomic write of the Cost Matrix.
+
+        Each update is {"code", "new_value", "field"="costo_base_usd_iva"}.
+        All edits are validated against the code index before anything is
+        modified: one unknown code or field rejects the whole batch. Changed
+        rows are queued for a debounced incremental push to the sync backend
+        (sync_now=True pushes them before returning). Rows still pending are
+        pushed by close() or, at the latest, at interpreter exit.
+        """
+        if not updates:
+            return {"error": "No updates given"}
+
+        file_path = self._resolve_kb_file(COST_MATRIX_REL_PATH)
+        if file_path is None:
             return {"error": f"Cost matrix file not found at {COST_MATRIX_REL_PATH}"}
-            
+
+        # 1. Load data (reuse the cached matrix unless the file changed on disk)
+        if self._cost_matrix_cache is not None and self._cost_matrix_stamp != self._file_stamp(file_path):
+            self._cost_matrix_cache = None
+        data = self._load_cost_matrix()
+        if data is None:
+            return {"error": f"Failed to load JSON: {file_path}"}
+
+        # 2. Resolve every edit through the code index before touching anything
+        edits = []
+        for update in updates:
+            code = update.get("code") or ""
+            field = update.get("field") or "costo_base_usd_iva"
+            if field not in COST_MATRIX_FIELDS:
+                return {"error": f"Unsupported field: {field}"}
+            product = self._find_cost_matrix_product(code)
+            if product is None:
+                return {"error": f"Product code {code} not found"}
+            edits.append((product, field, update.get("new_value")))
+
+        # 3. Apply edits in place and write the whole matrix once
+        now = datetime.now().isoformat()
+        changed: Dict[int, Dict[str, Any]] = {}
+        for product, field, new_value in edits:
+            *parents, leaf = COST_MATRIX_FIELDS[field]
+            node = product
+            for key in parents:
+                node = node.setdefault(key, {})
+            node[leaf] = new_value
+            metadata = product.setdefault("metadata", {})
+            metadata["fecha_actualizacion"] = now
+            metadata["last_editor"] = "AI Agent"
+            changed[id(product)] = product
+
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            self._write_cost_matrix(file_path, data)
         except Exception as e:
-            return {"error": f"Failed to load JSON: {e}"}
-            
-        # 2. Find and update product
-        products = (data.get("productos", {}) or {}).get("todos", [])
-        updated = False
-        target_product = None
-        
-        for p in products:
-            p_code = p.get("codigo", "")
-            # Match exact or case-insensitive (preferring uppercase match if exact fails)
-            if p_code == code or (code and p_code == code.upper()):
-                target_product = p
-                # Update logic
-                if field == "costo_base_usd_iva":
-                    if "costos" not in p: p["costos"] = {}
-                    if "fabrica_directo" not in p["costos"]: p["costos"]["fabrica_directo"] = {}
-                    p["costos"]["fabrica_directo"]["costo_base_usd_iva"] = new_value
-                elif field == "precio_venta":
-                    if "precios" not in p: p["precios"] = {}
-                    if "empresa" not in p["precios"]: p["precios"]["empresa"] = {}
-                    p["precios"]["empresa"]["venta_iva_usd"] = new_value
-                else:
-                    return {"error": f"Unsupported field: {field}"}
-                
-                updated = True
-                if "metadata" not in p: p["metadata"] = {}
-                p["metadata"]["fecha_actualizacion"] = datetime.now().isoformat()
-                p["metadata"]["last_editor"] = "AI Agent"
-                break
-        
-        if not updated:
-            return {"error": f"Product code {code} not found"}
-            
-        # 3. Save JSON
-        try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            
-            # Invalidate cache
+            # The file on disk is untouched; drop the edited cache so it is reloaded
             self._cost_matrix_cache = None
-        except Exception as e:
             return {"error": f"Failed to save JSON: {e}"}
+        self._cost_matrix_stamp = self._file_stamp(file_path)
+        self._search_index_fresh = False
 
-        # 4. Sync to Google Sheets
-        creds_path = GSHEETS_CREDS
-        sheet_name = GSHEETS_NAME
-        
-        # Check for creds
-        if (self.kb_path / creds_path).exists() or Path(creds_path).exists():
-            try:
-                from panelin_improvements.cost_matrix_tools import gsheets_manager
-                gsheets_manager.sync_up(str(file_path), str(creds_path), sheet_name)
-                sync_status = "synced_to_gsheets"
-                self._last_sync_at = datetime.now().isoformat()
-            except Exception as e:
-                sync_status = f"sync_failed: {e}"
-        else:
-            sync_status = "skipped_no_creds"
+        # 4. Queue only the changed rows for the sync backend
+        sync_status, pending = self._queue_cost_matrix_sync(list(changed.values()), sync_now)
 
         return {
             "status": "success",
-            "code": code,
-            "field": field,
-            "new_value": new_value,
+            "updated": len(edits),
+            "codes": [p.get("codigo") for p in changed.values()],
             "sync_status": sync_status,
+            "pending_sync": pending,
             "last_sync_at": self._last_sync_at,
-            "product": target_product
+            "products": [product for product, _, _ in edits],
         }
 
+    @staticmethod
+    def _write_cost_matrix(file_path: Path, data: Dict[str, Any]) -> None:
+        """Write the Cost Matrix atomically (temp file in the same dir + os.replace)"""
+        fd, tmp_name = tempfile.mkstemp(dir=str(file_path.parent), prefix=f".{file_path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_name, file_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+
+    def _get_sync_queue(self) -> Optional[CostMatrixSyncQueue]:
+        """Sync queue for the configured backend (Google Sheets when credentials exist)"""
+        if self._sync_queue is not None:
+            return self._sync_queue
+
+        backend = self._sync_backend
+        if backend is None:
+            creds_path = self.kb_path / GSHEETS_CREDS
+            if not creds_path.exists():
+                creds_path = Path(GSHEETS_CREDS)
+            if not creds_path.exists():
+                return None
+            backend = GoogleSheetsSyncBackend(str(creds_path), GSHEETS_NAME)
+
+        def on_synced(result: Dict[str, Any]) -> None:
+            self._last_sync_at = result["last_sync_at"]
+
+        debounce_s = self._sync_debounce_s or None
+        self._sync_queue = CostMatrixSyncQueue(backend, debounce_s=debounce_s, on_synced=on_synced)
+        return self._sync_queue
+
+    def _queue_cost_matrix_sync(self, products: List[Dict[str, Any]], sync_now: bool = False) -> Tuple[str, int]:
+        """Mark products dirty; push inline when asked to or when debouncing is disabled"""
+        queue = self._get_sync_queue()
+        if queue is None:
+            return "skipped_no_creds", 0
+
+        pending = queue.mark_dirty(products)
+        if not sync_now and self._sync_debounce_s != 0:
+            # Debounced (or, with None, pushed only by flush_cost_matrix_sync)
+            return "queued", pending
+
+        result = self.flush_cost_matrix_sync()
+        if result["status"] == "failed":
+            return f"sync_failed: {result['error']}", result["pending"]
+        return f"synced_to_{queue.backend.name}", 0
+
+    def flush_cost_matrix_sync(self) -> Dict[str, Any]:
+        """Push every queued cost-matrix row to the sync backend now."""
+        queue = self._get_sync_queue()
+        if queue is None:
+            return {"status": "skipped_no_creds", "pushed": 0}
+        return queue.flush()
+
+    def close(self) -> Dict[str, Any]:
+        """Push pending cost-matrix rows and stop the debounce timer."""
+        if self._sync_queue is None:
+            return {"status": "noop", "pushed": 0}
+        return self._sync_queue.close()
+
     def sync_cost_matrix(self) -> Dict[str, Any]:
         """Pull latest data from Google Sheets to local Cost Matrix."""
         cm_path = COST_MATRIX_REL_PATH
@@ -400,6 +625,10 @@ class KBIndexingAgent:
                 "hint": "See panelin_improvements/GOOGLE_SHEETS_SETUP.md"
             }
             
+        # Push queued local edits first so the pull does not discard them
+        if self._sync_queue is not None and self._sync_queue.pending:
+            self._sync_queue.flush()
+
         try:
             from panelin_improvements.cost_matrix_tools import gsheets_manager
             # Pass base_json as the current file to preserve extra metadata
@@ -409,6 +638,7 @@ class KBIndexingAgent:
             
             # Invalidate cache
             self._cost_matrix_cache = None
+            self._search_index_fresh = False
             self._last_sync_at = datetime.now().isoformat()
             
             return {
@@ -421,17 +651,24 @@ class KBIndexingAgent:
 
     def get_sync_status(self) -> Dict[str, Any]:
         """Return last sync timestamp and staleness info."""
+        queue_info: Dict[str, Any] = {}
+        if self._sync_queue is not None:
+            queue_info = {
+                "pending_sync": self._sync_queue.pending,
+                "last_error": self._sync_queue.last_error,
+            }
         if not self._last_sync_at:
-            return {"status": "unknown", "last_sync_at": None}
+            return {"status": "unknown", "last_sync_at": None, **queue_info}
         try:
             last_dt = datetime.fromisoformat(self._last_sync_at)
         except Exception:
-            return {"status": "invalid_timestamp", "last_sync_at": self._last_sync_at}
+            return {"status": "invalid_timestamp", "last_sync_at": self._last_sync_at, **queue_info}
         age_hours = (datetime.now() - last_dt).total_seconds() / 3600
         return {
             "status": "ok" if age_hours <= 24 else "stale",
             "last_sync_at": self._last_sync_at,
             "age_hours": round(age_hours, 2),
+            **queue_info,
         }
 
     def search_kb(
@@ -482,6 +719,28 @@ class KBIndexingAgent:
                         }]
                     }
 
+        index = self._get_search_index()
+        if index is not None:
+            results = index.search(query, level_priority, search_type, max_results)
+        else:
+            results = self._scan_search(query, level_priority, search_type, max_results)
+        
+        return {
+            "query": query,
+            "search_type": search_type,
+            "level_priority": level_priority,
+            "total_matches": len(results),
+            "results": results
+        }
+    
+    def _scan_search(
+        self,
+        query: str,
+        level_priority: Optional[int],
+        search_type: str,
+        max_results: int
+    ) -> List[Dict[str, Any]]:
+        """Linear scan over build_index() entries (fallback when the index is unusable)"""
         if not self._index_cache:
             self.build_index()
         
@@ -501,39 +760,7 @@ class KBIndexingAgent:
             
             for filename, file_data in level_data.get("files", {}).items():
                 for entry in file_data.get("entries", []):
-                    score = 0.0
-                    match_type = None
-                    
-                    # Keyword matching
-                    if search_type in ["hybrid", "keyword"]:
-                        key_lower = entry.get("key", "").lower()
-                        path_lower = entry.get("path", "").lower()
-                        value_lower = entry.get("value", "").lower() if entry.get("value") else ""
-                        
-                        # Exact match
-                        if query_lower in key_lower or query_lower in path_lower:
-                            score += 10.0
-                            match_type = "exact_key"
-                        elif query_lower in value_lower:
-                            score += 8.0
-                            match_type = "exact_value"
-                        
-                        # Word matching
-                        key_words = set(key_lower.split("_"))
-                        path_words = set(re.findall(r'\w+', path_lower))
-                        value_words = set(value_lower.split()) if value_lower else set()
-                        
-                        common_words = query_words.intersection(key_words.union(path_words).union(value_words))
-                        if common_words:
-                            score += len(common_words) * 2.0
-                            match_type = match_type or "word_match"
-                    
-                    # Structured search (path-based)
-                    if search_type in ["hybrid", "structured"]:
-                        path = entry.get("path", "")
-                        # Boost score for product-related paths
-                        if any(term in path for term in ["producto", "precio", "espesor", "autoportancia"]):
-                            score += 1.0
+                    score, match_type = score_entry(entry, query_lower, query_words, search_type)
                     
                     if score > 0:
                         results.append({
@@ -549,15 +776,7 @@ class KBIndexingAgent:
         results.sort(key=lambda x: (x["score"], -x["level"]), reverse=True)
         
         # Limit results
-        results = results[:max_results]
-        
-        return {
-            "query": query,
-            "search_type": search_type,
-            "level_priority": level_priority,
-            "total_matches": len(results),
-            "results": results
-        }
+        return results[:max_results]
     
     def get_product_info(
         self,
@@ -913,6 +1132,35 @@ def get_update_product_price_function_schema() -> Dict:
         }
     }
 
+def get_update_product_prices_function_schema() -> Dict:
+    """Get batch update product prices function schema for OpenAI Actions"""
+    return {
+        "name": "update_product_prices",
+        "description": "Update several product costs or prices in the Cost Matrix at once (all or nothing). Only the changed rows are synced to Google Sheets.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "updates": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "code": {"type": "string", "description": "Product code (e.g., 'IAGRO30')"},
+                            "new_value": {"type": "number", "description": "New monetary value"},
+                            "field": {
+                                "type": "string",
+                                "enum": ["costo_base_usd_iva", "precio_venta"],
+                                "default": "costo_base_usd_iva"
+                            }
+                        },
+                        "required": ["code", "new_value"]
+                    }
+                }
+            },
+            "required": ["updates"]
+        }
+    }
+
 def get_sync_cost_matrix_function_schema() -> Dict:
     """Get sync cost matrix function schema for OpenAI Actions"""
     return {
@@ -985,6 +1233,14 @@ def update_product_price(code: str, new_value: float, field: str = "costo_base_u
     """Update product price - Function for GPT OpenAI Actions"""
     return _kb_agent.update_product_price(code, new_value, field)
 
+def update_product_prices(updates: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Batch update product prices - Function for GPT OpenAI Actions"""
+    return _kb_agent.update_product_prices(updates)
+
+def flush_cost_matrix_sync() -> Dict[str, Any]:
+    """Push queued cost matrix edits now"""
+    return _kb_agent.flush_cost_matrix_sync()
+
 def sync_cost_matrix() -> Dict[str, Any]:
     """Sync cost matrix - Function for GPT OpenAI Actions"""
     return _kb_agent.sync_cost_matrix()
@@ -1006,5 +1262,6 @@ def get_all_kb_function_schemas() -> List[Dict]:
         get_cost_matrix_product_function_schema(),
         get_cost_matrix_products_by_category_function_schema(),
         get_update_product_price_function_schema(),
+        get_update_product_prices_function_schema(),
         get_sync_cost_matrix_function_schema(),
     ]
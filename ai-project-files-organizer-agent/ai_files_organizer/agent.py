@@ -64,7 +64,16 @@ class FileOrganizerAgent:
         self.logger = setup_logger("FileOrganizerAgent", log_file)
 
         # Initialize components
-        self.scanner = FileScanner(str(self.workspace_path))
+        scanning_config = self.config.get("scanning", {})
+        index_file = None
+        if scanning_config.get("persist_index", True):
+            index_file = self.workspace_path / ".files_organizer" / "scan_index.json"
+        self.scanner = FileScanner(
+            str(self.workspace_path),
+            index_file=index_file,
+            hash_algorithm=scanning_config.get("hash_algorithm", "md5"),
+            full_hash=scanning_config.get("full_hash", False),
+        )
         self.version_manager = VersionManager(
             format_string=self.config.get("versioning", {}).get("format", "ddmm_vN"),
             auto_increment=self.config.get("versioning", {}).get("auto_increment", True),
@@ -439,6 +448,7 @@ class FileOrganizerAgent:
         self.file_watcher = FileWatcher(
             str(self.workspace_path), handle_file_event
         )
+        self.outdated_detector.attach_watcher(self.file_watcher)
         self.file_watcher.start()
 
         # Setup periodic tasks
@@ -457,6 +467,7 @@ class FileOrganizerAgent:
         """Stop real-time file monitoring"""
         if self.file_watcher:
             self.file_watcher.stop()
+            self.outdated_detector.detach_watcher(self.file_watcher)
             self.file_watcher = None
 
         self.scheduler.stop()
@@ -4,12 +4,21 @@ Enhanced File Scanner with categorization and metadata extraction
 
 import hashlib
 import json
+import os
+from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Callable, Dict, List, Optional, Set
 import mimetypes
 
+from .scan_index import ScanIndex
+
+try:
+    import xxhash
+except ImportError:  # Optional: fast non-cryptographic hashing
+    xxhash = None
+
 
 @dataclass
 class FileMetadata:
@@ -27,9 +36,19 @@ class FileMetadata:
     is_duplicate: bool = False
     duplicate_of: Optional[Path] = None
     metadata: Dict = field(default_factory=dict)
+    # Set by FileScanner when content_hash was skipped during the scan
+    hash_loader: Optional[Callable[[Path], str]] = field(
+        default=None, repr=False, compare=False
+    )
+
+    def get_content_hash(self) -> Optional[str]:
+        """Return the content hash, computing it on first use if the scan skipped it"""
+        if not self.content_hash and self.hash_loader:
+            self.content_hash = self.hash_loader(self.path) or None
+        return self.content_hash
 
     def to_dict(self) -> Dict:
-        """Convert to dictionary"""
+        """Convert to dictionary (always includes the content hash)"""
         return {
             "path": str(self.path),
             "name": self.name,
@@ -38,7 +57,7 @@ class FileMetadata:
             "modified_time": self.modified_time.isoformat(),
             "category": self.category,
             "file_type": self.file_type,
-            "content_hash": self.content_hash,
+            "content_hash": self.get_content_hash(),
             "version_code": self.version_code,
             "is_duplicate": self.is_duplicate,
             "duplicate_of": str(self.duplicate_of) if self.duplicate_of else None,
@@ -70,14 +89,40 @@ class FileScanner:
     DATA_EXTENSIONS = {".json", ".csv", ".xml", ".parquet", ".xlsx", ".db"}
     OUTPUT_EXTENSIONS = {".log", ".out", ".report", ".pdf"}
 
-    def __init__(self, workspace_path: str, exclude_patterns: Optional[List[str]] = None):
+    # Hashing
+    XXHASH_ALGORITHMS = {"xxh64", "xxh3_64", "xxh3_128"}
+    READ_BUFFER_SIZE = 1024 * 1024
+    PARTIAL_HASH_SIZE = 64 * 1024
+
+    def __init__(
+        self,
+        workspace_path: str,
+        exclude_patterns: Optional[List[str]] = None,
+        index_file: Optional[Path] = None,
+        hash_algorithm: str = "md5",
+        full_hash: bool = False,
+    ):
         """
         Initialize file scanner.
 
         Args:
             workspace_path: Root path to scan
             exclude_patterns: List of patterns to exclude (e.g., ['*.pyc', '__pycache__'])
+            index_file: Optional path of a persisted scan index; unchanged files
+                reuse their cached hash instead of being re-read
+            hash_algorithm: Any hashlib algorithm (default "md5"), or "xxh64",
+                "xxh3_64", "xxh3_128" when the optional xxhash package is installed
+            full_hash: If True, hash every file. By default only files that share
+                a size (and partial-content hash) with another file are fully hashed
         """
+        if hash_algorithm in self.XXHASH_ALGORITHMS:
+            if xxhash is None:
+                raise ValueError(
+                    f"Hash algorithm '{hash_algorithm}' requires the optional 'xxhash' package"
+                )
+        else:
+            hashlib.new(hash_algorithm)  # Raises ValueError if unsupported
+
         self.workspace_path = Path(workspace_path).resolve()
         self.exclude_patterns = exclude_patterns or [
             "*.pyc",
@@ -90,8 +135,14 @@ class FileScanner:
             ".mypy_cache",
             "*.egg-info",
         ]
+        self.hash_algorithm = hash_algorithm
+        self.full_hash = full_hash
+        self.index_file = Path(index_file).resolve() if index_file else None
+        self.index = ScanIndex(self.index_file, algorithm=hash_algorithm)
         self.scanned_files: List[FileMetadata] = []
         self.content_hashes: Dict[str, Path] = {}
+        self.hash_stats: Dict[str, int] = {}
+        self._stats: Dict[Path, os.stat_result] = {}
 
     def scan(self, recursive: bool = True) -> List[FileMetadata]:
         """
@@ -105,6 +156,8 @@ class FileScanner:
         """
         self.scanned_files = []
         self.content_hashes = {}
+        self.hash_stats = {"files_hashed": 0, "bytes_hashed": 0, "cache_hits": 0}
+        self._stats = {}
 
         if not self.workspace_path.exists():
             return []
@@ -122,7 +175,12 @@ class FileScanner:
             metadata = self._extract_metadata(file_path)
             if metadata:
                 self.scanned_files.append(metadata)
-                self._check_duplicates(metadata)
+
+        self._detect_duplicates()
+
+        if self.index_file:
+            self.index.prune({self._index_key(f.path) for f in self.scanned_files})
+            self.index.save()
 
         return self.scanned_files
 
@@ -136,6 +194,9 @@ class FileScanner:
 
     def _should_exclude(self, path: Path) -> bool:
         """Check if path should be excluded"""
+        if self.index_file and path.name.startswith(self.index_file.name):
+            if path.parent == self.index_file.parent:
+                return True
         path_str = str(path)
         for pattern in self.exclude_patterns:
             if pattern in path_str or path.match(pattern):
@@ -150,8 +211,13 @@ class FileScanner:
             category = self._categorize_file(file_path, extension)
             file_type = self._get_file_type(extension)
 
-            # Calculate content hash
-            content_hash = self._calculate_hash(file_path)
+            # Content hash: reuse the indexed one if the file is unchanged,
+            # otherwise it is computed on demand (see _detect_duplicates)
+            self._stats[file_path] = stat
+            if self.full_hash:
+                content_hash = self._get_hash(file_path)
+            else:
+                content_hash = self.index.lookup(self._index_key(file_path), stat)
 
             # Extract version code from filename
             version_code = self._extract_version_code(file_path.name)
@@ -166,6 +232,7 @@ class FileScanner:
                 file_type=file_type,
                 content_hash=content_hash,
                 version_code=version_code,
+                hash_loader=None if content_hash else self._get_hash,
             )
 
             return metadata
@@ -204,17 +271,71 @@ class FileScanner:
         mime_type, _ = mimetypes.guess_type(f"file{extension}")
         return mime_type or "application/octet-stream"
 
-    def _calculate_hash(self, file_path: Path) -> str:
-        """Calculate MD5 hash of file content"""
+    def _new_hasher(self):
+        """Create a hasher for the configured algorithm"""
+        if self.hash_algorithm in self.XXHASH_ALGORITHMS:
+            return getattr(xxhash, self.hash_algorithm)()
+        return hashlib.new(self.hash_algorithm)
+
+    def _calculate_hash(self, file_path: Path, limit: Optional[int] = None) -> str:
+        """
+        Calculate hash of file content.
+
+        Args:
+            file_path: File to hash
+            limit: If given, only hash the first `limit` bytes
+
+        Returns:
+            Hex digest, or "" if the file could not be read
+        """
         try:
-            hash_md5 = hashlib.md5()
+            hasher = self._new_hasher()
+            remaining = limit
             with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest()
+                while True:
+                    size = self.READ_BUFFER_SIZE
+                    if remaining is not None:
+                        size = min(remaining, size)
+                    chunk = f.read(size)
+                    if not chunk:
+                        break
+                    hasher.update(chunk)
+                    self.hash_stats["bytes_hashed"] = self.hash_stats.get("bytes_hashed", 0) + len(chunk)
+                    if remaining is not None:
+                        remaining -= len(chunk)
+                        if remaining <= 0:
+                            break
+            return hasher.hexdigest()
         except Exception:
             return ""
 
+    def _index_key(self, file_path: Path) -> str:
+        """Key of a file in the scan index"""
+        try:
+            return str(file_path.relative_to(self.workspace_path))
+        except ValueError:
+            return str(file_path)
+
+    def _get_hash(self, file_path: Path, partial: bool = False) -> str:
+        """Get full (or partial) content hash, using the scan index when possible"""
+        field_name = "partial_hash" if partial else "hash"
+        key = self._index_key(file_path)
+        stat = self._stats.get(file_path)
+        if stat is None:
+            stat = file_path.stat()
+            self._stats[file_path] = stat
+
+        cached = self.index.lookup(key, stat, field_name)
+        if cached:
+            self.hash_stats["cache_hits"] = self.hash_stats.get("cache_hits", 0) + 1
+            return cached
+
+        value = self._calculate_hash(file_path, self.PARTIAL_HASH_SIZE if partial else None)
+        self.hash_stats["files_hashed"] = self.hash_stats.get("files_hashed", 0) + 1
+        if value:
+            self.index.record(key, stat, **{field_name: value})
+        return value
+
     def _extract_version_code(self, filename: str) -> Optional[str]:
         """Extract version code from filename (format: ddmm_vN)"""
         import re
@@ -235,6 +356,39 @@ class FileScanner:
 
         return None
 
+    def _detect_duplicates(self):
+        """
+        Detect duplicate files based on content hash.
+
+        Files are bucketed by size, then by a hash of their first bytes, and
+        only files still sharing a bucket are fully hashed. The first file in
+        scan order is the original; later ones are marked as its duplicates.
+        """
+        by_size: Dict[int, List[FileMetadata]] = defaultdict(list)
+        for metadata in self.scanned_files:
+            by_size[metadata.size].append(metadata)
+
+        for size, group in by_size.items():
+            if len(group) < 2:
+                continue
+
+            if size <= self.PARTIAL_HASH_SIZE:
+                # The partial hash would cover the whole file
+                candidates = [group]
+            else:
+                by_partial: Dict[str, List[FileMetadata]] = defaultdict(list)
+                for metadata in group:
+                    partial_hash = self._get_hash(metadata.path, partial=True)
+                    if partial_hash:
+                        by_partial[partial_hash].append(metadata)
+                candidates = [g for g in by_partial.values() if len(g) > 1]
+
+            for candidate_group in candidates:
+                for metadata in candidate_group:
+                    if not metadata.content_hash:
+                        metadata.content_hash = self._get_hash(metadata.path)
+                    self._check_duplicates(metadata)
+
     def _check_duplicates(self, metadata: FileMetadata):
         """Check for duplicate files based on content hash"""
         if not metadata.content_hash:
@@ -3,7 +3,7 @@ File Watcher for real-time monitoring of file system changes
 """
 
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Callable, List, Optional
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler, FileSystemEvent
 
@@ -11,34 +11,49 @@ from watchdog.events import FileSystemEventHandler, FileSystemEvent
 class FileChangeHandler(FileSystemEventHandler):
     """Handler for file system events"""
 
-    def __init__(self, callback: Callable[[str, str, Path], None]):
+    def __init__(
+        self,
+        callback: Callable[[str, str, Path], None],
+        listeners: Optional[List[Callable]] = None,
+    ):
         """
         Initialize handler.
 
         Args:
             callback: Callback function(event_type, file_path)
+            listeners: Extra callbacks(event_type, file_path, dest_path) that
+                also receive the destination of moves
         """
         self.callback = callback
+        self.listeners = listeners if listeners is not None else []
+
+    def _notify(self, event_type: str, event: FileSystemEvent):
+        """Notify callback and listeners of an event"""
+        src_path = str(Path(event.src_path))
+        dest_path = getattr(event, "dest_path", None)
+        for listener in list(self.listeners):
+            listener(event_type, src_path, str(Path(dest_path)) if dest_path else None)
+        self.callback(event_type, src_path)
 
     def on_created(self, event: FileSystemEvent):
         """Handle file creation"""
         if not event.is_directory:
-            self.callback("created", str(Path(event.src_path)))
+            self._notify("created", event)
 
     def on_modified(self, event: FileSystemEvent):
         """Handle file modification"""
         if not event.is_directory:
-            self.callback("modified", str(Path(event.src_path)))
+            self._notify("modified", event)
 
     def on_moved(self, event: FileSystemEvent):
         """Handle file move"""
         if not event.is_directory:
-            self.callback("moved", str(Path(event.src_path)))
+            self._notify("moved", event)
 
     def on_deleted(self, event: FileSystemEvent):
         """Handle file deletion"""
         if not event.is_directory:
-            self.callback("deleted", str(Path(event.src_path)))
+            self._notify("deleted", event)
 
 
 class FileWatcher:
@@ -56,15 +71,26 @@ class FileWatcher:
         """
         self.workspace_path = Path(workspace_path).resolve()
         self.callback = callback
+        self.listeners: List[Callable] = []
         self.observer: Optional[Observer] = None
         self.handler: Optional[FileChangeHandler] = None
 
+    def add_listener(self, listener: Callable):
+        """Register a listener(event_type, file_path, dest_path)"""
+        if listener not in self.listeners:
+            self.listeners.append(listener)
+
+    def remove_listener(self, listener: Callable):
+        """Unregister a listener"""
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
     def start(self, recursive: bool = True):
         """Start watching for file changes"""
         if self.observer and self.observer.is_alive():
             return
 
-        self.handler = FileChangeHandler(self.callback)
+        self.handler = FileChangeHandler(self.callback, self.listeners)
         self.observer = Observer()
         self.observer.schedule(
             self.handler, str(self.workspace_path), recursive=recursive
@@ -7,6 +7,7 @@ from pathlib import Path
 from typing import Dict, List, Optional
 
 from .file_scanner import FileMetadata, FileScanner
+from .reference_index import ReferenceIndex
 
 
 class OutdatedDetector:
@@ -31,6 +32,8 @@ class OutdatedDetector:
         self.days_threshold = days_threshold
         self.check_content = check_content
         self.check_references = check_references
+        self.reference_index: Optional[ReferenceIndex] = None
+        self._watched = False
 
     def detect_outdated(
         self, files: List[FileMetadata], workspace_path: Path
@@ -48,6 +51,9 @@ class OutdatedDetector:
         outdated_files = []
         threshold_date = datetime.now() - timedelta(days=self.days_threshold)
 
+        if self.check_references:
+            self._prepare_reference_index(files, workspace_path)
+
         for file_meta in files:
             reasons = []
 
@@ -133,6 +139,49 @@ class OutdatedDetector:
             return (date_part, version_num)
         return None
 
+    def _prepare_reference_index(self, files: List[FileMetadata], workspace_path: Path):
+        """
+        Build (or bring up to date) the reference index for all candidates.
+
+        Without a file watcher feeding events, changed source files are
+        picked up with a stat-based refresh.
+        """
+        workspace_path = Path(workspace_path).resolve()
+        if (
+            self.reference_index is None
+            or self.reference_index.workspace_path != workspace_path
+        ):
+            self.reference_index = ReferenceIndex(workspace_path)
+        elif not self._watched:
+            self.reference_index.refresh()
+
+        patterns = set()
+        for file_meta in files:
+            patterns |= ReferenceIndex.patterns_for(file_meta.path)
+        self.reference_index.ensure_patterns(patterns)
+
+    def attach_watcher(self, file_watcher):
+        """
+        Keep the reference index current from FileWatcher events.
+
+        Args:
+            file_watcher: FileWatcher to listen to
+        """
+        file_watcher.add_listener(self.handle_file_event)
+        self._watched = True
+
+    def detach_watcher(self, file_watcher):
+        """Stop listening to FileWatcher events"""
+        file_watcher.remove_listener(self.handle_file_event)
+        self._watched = False
+
+    def handle_file_event(
+        self, event_type: str, file_path: Path, dest_path: Optional[Path] = None
+    ):
+        """Forward a file system event to the reference index"""
+        if self.reference_index is not None:
+            self.reference_index.handle_event(event_type, file_path, dest_path)
+
     def _check_file_references(
         self, file_path: Path, workspace_path: Path
     ) -> bool:
@@ -146,26 +195,13 @@ class OutdatedDetector:
         Returns:
             True if file is referenced
         """
-        file_name = file_path.name
-        file_stem = file_path.stem
-
-        # Search in code files
-        code_extensions = {".py", ".js", ".ts", ".md", ".txt", ".yaml", ".yml"}
-
-        for code_file in workspace_path.rglob("*"):
-            if (
-                code_file.is_file()
-                and code_file.suffix in code_extensions
-                and code_file != file_path
-            ):
-                try:
-                    content = code_file.read_text(encoding="utf-8", errors="ignore")
-                    if file_name in content or file_stem in content:
-                        return True
-                except Exception:
-                    continue
-
-        return False
+        workspace_path = Path(workspace_path).resolve()
+        if (
+            self.reference_index is None
+            or self.reference_index.workspace_path != workspace_path
+        ):
+            self.reference_index = ReferenceIndex(workspace_path)
+        return self.reference_index.is_referenced(file_path)
 
     def _suggest_action(self, reasons: List[Dict]) -> str:
         """
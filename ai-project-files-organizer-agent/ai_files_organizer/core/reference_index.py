@@ -0,0 +1,223 @@
+"""
+Reverse reference index for outdated file detection
+"""
+
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Pattern, Set, Tuple
+
+
+class PatternMatcher:
+    """
+    Multi-pattern substring matcher (Aho-Corasick style).
+
+    All patterns are merged into a trie that is compiled to a single regex,
+    so each text is scanned once regardless of the number of patterns. At
+    every position the longest pattern starting there is matched; shorter
+    patterns that are prefixes of it are added from a precomputed table.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: Set[str] = {p for p in patterns if p}
+        self._prefixes: Dict[str, Set[str]] = {}
+        self._regex: Optional[Pattern] = None
+
+        if not self.patterns:
+            return
+
+        trie: Dict = {}
+        for pattern in self.patterns:
+            node = trie
+            for char in pattern:
+                node = node.setdefault(char, {})
+            node[""] = pattern
+
+        for pattern in self.patterns:
+            node = trie
+            prefixes = set()
+            for char in pattern:
+                node = node[char]
+                if "" in node:
+                    prefixes.add(node[""])
+            self._prefixes[pattern] = prefixes
+
+        self._regex = re.compile(f"(?=({self._trie_to_regex(trie)}))")
+
+    @classmethod
+    def _trie_to_regex(cls, node: Dict) -> str:
+        """Convert a trie node into a regex that prefers the longest match"""
+        branches = [
+            re.escape(char) + cls._trie_to_regex(child)
+            for char, child in sorted(node.items())
+            if char != ""
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        if "" in node:
+            body = f"(?:{body})?"
+        return body
+
+    def find(self, text: str) -> Set[str]:
+        """Return the set of patterns occurring in text"""
+        found: Set[str] = set()
+        if self._regex is None:
+            return found
+        seen: Set[str] = set()
+        for match in self._regex.finditer(text):
+            longest = match.group(1)
+            if longest not in seen:
+                seen.add(longest)
+                found |= self._prefixes[longest]
+        return found
+
+
+class ReferenceIndex:
+    """
+    Maps file names/stems to the source files that mention them.
+
+    Built with one pass over the workspace; afterwards reference checks are
+    dictionary lookups. The index is kept current either through file watcher
+    events (handle_event) or by a stat-based refresh that only re-reads
+    changed source files.
+    """
+
+    SOURCE_EXTENSIONS = {".py", ".js", ".ts", ".md", ".txt", ".yaml", ".yml"}
+
+    def __init__(self, workspace_path: Path):
+        """
+        Initialize reference index.
+
+        Args:
+            workspace_path: Workspace root whose source files are indexed
+        """
+        self.workspace_path = Path(workspace_path).resolve()
+        self.matcher = PatternMatcher([])
+        self.referrers: Dict[str, Set[Path]] = {}
+        self._file_matches: Dict[Path, Set[str]] = {}
+        self._file_stats: Dict[Path, Tuple[int, int]] = {}
+        self._lock = threading.RLock()
+        self._built = False
+
+    @staticmethod
+    def patterns_for(file_path: Path) -> Set[str]:
+        """Patterns that count as a reference to file_path"""
+        return {file_path.name, file_path.stem}
+
+    def _is_source(self, path: Path) -> bool:
+        return path.suffix in self.SOURCE_EXTENSIONS
+
+    def _iter_sources(self):
+        for path in self.workspace_path.rglob("*"):
+            if self._is_source(path) and path.is_file():
+                yield path
+
+    def _read(self, path: Path) -> Optional[str]:
+        try:
+            return path.read_text(encoding="utf-8", errors="ignore")
+        except Exception:
+            return None
+
+    def _set_matches(self, source: Path, matches: Set[str]):
+        for pattern in self._file_matches.get(source, set()) - matches:
+            referrers = self.referrers.get(pattern)
+            if referrers:
+                referrers.discard(source)
+        for pattern in matches:
+            self.referrers.setdefault(pattern, set()).add(source)
+        self._file_matches[source] = matches
+
+    def _index_source(self, source: Path):
+        """(Re)index a single source file against all known patterns"""
+        text = self._read(source)
+        try:
+            stat = source.stat()
+            self._file_stats[source] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            self._remove_source(source)
+            return
+        self._set_matches(source, self.matcher.find(text) if text is not None else set())
+
+    def _remove_source(self, source: Path):
+        self._set_matches(source, set())
+        self._file_matches.pop(source, None)
+        self._file_stats.pop(source, None)
+
+    def ensure_patterns(self, patterns: Iterable[str]):
+        """
+        Make sure all patterns are indexed.
+
+        New patterns are matched against every source file in one pass.
+        """
+        with self._lock:
+            new_patterns = {p for p in patterns if p} - self.matcher.patterns
+            if self._built and not new_patterns:
+                return
+
+            new_matcher = PatternMatcher(new_patterns)
+            self.matcher = PatternMatcher(self.matcher.patterns | new_patterns)
+
+            if not self._built:
+                self._built = True
+                for source in self._iter_sources():
+                    self._index_source(source)
+                return
+
+            for source in list(self._file_matches):
+                text = self._read(source)
+                if text is not None:
+                    self._set_matches(
+                        source, self._file_matches[source] | new_matcher.find(text)
+                    )
+
+    def refresh(self):
+        """Re-read only source files that were added, changed or deleted"""
+        with self._lock:
+            if not self._built:
+                return
+            seen = set()
+            for source in self._iter_sources():
+                seen.add(source)
+                try:
+                    stat = source.stat()
+                except OSError:
+                    continue
+                if self._file_stats.get(source) != (stat.st_mtime_ns, stat.st_size):
+                    self._index_source(source)
+            for source in set(self._file_matches) - seen:
+                self._remove_source(source)
+
+    def handle_event(self, event_type: str, file_path, dest_path=None):
+        """
+        Apply a file watcher event to the index.
+
+        Args:
+            event_type: "created", "modified", "moved" or "deleted"
+            file_path: Affected path (source path for moves)
+            dest_path: Destination path for moves
+        """
+        with self._lock:
+            if not self._built:
+                return
+            path = Path(file_path).resolve()
+            if event_type in ("created", "modified"):
+                if self._is_source(path) and path.is_file():
+                    self._index_source(path)
+            elif event_type in ("deleted", "moved"):
+                self._remove_source(path)
+                if event_type == "moved" and dest_path:
+                    dest = Path(dest_path).resolve()
+                    if self._is_source(dest) and dest.is_file():
+                        self._index_source(dest)
+
+    def is_referenced(self, file_path: Path) -> bool:
+        """Check whether any other source file mentions file_path's name or stem"""
+        file_path = Path(file_path).resolve()
+        with self._lock:
+            self.ensure_patterns(self.patterns_for(file_path))
+            for pattern in self.patterns_for(file_path):
+                referrers = self.referrers.get(pattern, ())
+                if any(source != file_path for source in referrers):
+                    return True
+        return False
@@ -0,0 +1,122 @@
+"""
+Persistent scan index for incremental workspace scans
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+
+class ScanIndex:
+    """
+    Persisted map of relative path -> (size, mtime, inode, hashes).
+
+    A cached hash is only reused while the file's stat signature is
+    unchanged, so subsequent scans re-hash only modified files.
+    """
+
+    VERSION = 1
+
+    def __init__(self, index_file: Optional[Path] = None, algorithm: str = "md5"):
+        """
+        Initialize scan index.
+
+        Args:
+            index_file: Optional path of the JSON index file
+            algorithm: Hash algorithm the cached hashes were computed with
+        """
+        self.index_file = Path(index_file) if index_file else None
+        self.algorithm = algorithm
+        self.entries: Dict[str, Dict] = {}
+        self._dirty = False
+        self.load()
+
+    @staticmethod
+    def _signature(stat: os.stat_result) -> Dict:
+        """Stat fields that invalidate a cached hash when they change"""
+        return {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "inode": stat.st_ino,
+        }
+
+    def load(self):
+        """Load index from file, discarding it if incompatible"""
+        self.entries = {}
+        if not self.index_file or not self.index_file.exists():
+            return
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            return
+        if data.get("version") == self.VERSION and data.get("algorithm") == self.algorithm:
+            self.entries = data.get("entries", {})
+
+    def save(self):
+        """Save index atomically (write to a temp file, then rename)"""
+        if not self.index_file or not self._dirty:
+            return
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.index_file.with_name(self.index_file.name + ".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "version": self.VERSION,
+                        "algorithm": self.algorithm,
+                        "entries": self.entries,
+                    },
+                    f,
+                    separators=(",", ":"),
+                )
+            os.replace(tmp_file, self.index_file)
+            self._dirty = False
+        except Exception:
+            pass
+
+    def lookup(self, key: str, stat: os.stat_result, field: str = "hash") -> Optional[str]:
+        """
+        Get a cached hash if the file is unchanged since it was recorded.
+
+        Args:
+            key: Relative file path
+            stat: Current stat result of the file
+            field: "hash" (full content) or "partial_hash"
+
+        Returns:
+            Cached hash or None
+        """
+        entry = self.entries.get(key)
+        if not entry:
+            return None
+        for name, value in self._signature(stat).items():
+            if entry.get(name) != value:
+                return None
+        return entry.get(field)
+
+    def record(self, key: str, stat: os.stat_result, **hashes: str):
+        """
+        Record hashes for a file, resetting the entry if its stat changed.
+
+        Args:
+            key: Relative file path
+            stat: Stat result the hashes were computed from
+            **hashes: "hash" and/or "partial_hash" values
+        """
+        signature = self._signature(stat)
+        entry = self.entries.get(key)
+        if not entry or any(entry.get(name) != value for name, value in signature.items()):
+            entry = dict(signature)
+            self.entries[key] = entry
+        entry.update(hashes)
+        self._dirty = True
+
+    def prune(self, keep: Set[str]):
+        """Drop entries for files that no longer exist in the workspace"""
+        stale = [key for key in self.entries if key not in keep]
+        for key in stale:
+            del self.entries[key]
+        if stale:
+            self._dirty = True
@@ -56,6 +56,11 @@ class ConfigValidator:
             "location": str,
             "keep_days": (int, float),
         },
+        "scanning": {
+            "persist_index": bool,
+            "hash_algorithm": str,
+            "full_hash": bool,
+        },
     }
 
     @classmethod
@@ -58,3 +58,68 @@ def test_file_scanner_duplicates(temp_workspace):
     
     # Should detect duplicate
     assert len(duplicates) >= 1
+
+
+def test_file_scanner_index_rehashes_only_changed_files(temp_workspace):
+    """Test persisted scan index skips unchanged files"""
+    index_file = temp_workspace / ".files_organizer" / "scan_index.json"
+    (temp_workspace / "copy.md").write_text("# Test")
+
+    scanner = FileScanner(str(temp_workspace), index_file=index_file, full_hash=True)
+    scanner.scan()
+    assert scanner.hash_stats["files_hashed"] == 4
+    assert index_file.exists()
+
+    (temp_workspace / "script.py").write_text("print('changed')")
+    rescanner = FileScanner(str(temp_workspace), index_file=index_file, full_hash=True)
+    files = rescanner.scan()
+
+    assert rescanner.hash_stats["files_hashed"] == 1
+    assert rescanner.hash_stats["cache_hits"] == 3
+    assert not any(f.path == index_file for f in files)
+    assert [f.name for f in rescanner.get_duplicates()] == ["copy.md"]
+
+
+def test_file_scanner_duplicates_bucket_by_size_and_partial_hash(temp_workspace):
+    """Test only same-size, same-prefix files are fully hashed"""
+    block = b"x" * (FileScanner.PARTIAL_HASH_SIZE + 10)
+    (temp_workspace / "a.bin").write_bytes(block)
+    (temp_workspace / "b.bin").write_bytes(block)
+    (temp_workspace / "c.bin").write_bytes(block[:-1] + b"y")
+    (temp_workspace / "d.bin").write_bytes(b"y" + block[1:])
+
+    scanner = FileScanner(str(temp_workspace))
+    files = {f.name: f for f in scanner.scan()}
+
+    assert files["b.bin"].is_duplicate
+    assert files["b.bin"].duplicate_of == files["a.bin"].path
+    assert not files["c.bin"].is_duplicate
+    assert not files["d.bin"].is_duplicate
+    # Unique-size files and the different-prefix file are never fully hashed
+    assert files["script.py"].content_hash is None
+    assert files["d.bin"].content_hash is None
+
+
+def test_file_scanner_hash_algorithm(temp_workspace):
+    """Test configurable hash algorithm"""
+    scanner = FileScanner(str(temp_workspace), hash_algorithm="blake2b", full_hash=True)
+    files = scanner.scan()
+    assert all(len(f.content_hash) == 128 for f in files)
+
+    with pytest.raises(ValueError):
+        FileScanner(str(temp_workspace), hash_algorithm="not-a-hash")
+
+
+def test_file_scanner_to_dict_hashes_on_demand(temp_workspace):
+    """Test serialized metadata keeps content_hash for lazily hashed files"""
+    scanner = FileScanner(str(temp_workspace))
+    files = {f.name: f for f in scanner.scan()}
+    assert files["script.py"].content_hash is None
+
+    expected = FileScanner(str(temp_workspace), full_hash=True)
+    hashes = {f.name: f.content_hash for f in expected.scan()}
+
+    data = files["script.py"].to_dict()
+    assert data["content_hash"] == hashes["script.py"]
+    assert files["script.py"].content_hash == hashes["script.py"]
+    assert all(f.to_dict()["content_hash"] == hashes[f.name] for f in files.values())
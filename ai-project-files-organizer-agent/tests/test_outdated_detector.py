@@ -44,3 +44,69 @@ def test_detect_outdated_by_date(temp_workspace):
     
     assert len(outdated) >= 1
     assert any("old_file.md" in str(o["file"]) for o in outdated)
+
+
+def test_reference_index_lookups(temp_workspace):
+    """Test reference detection through the reverse index"""
+    (temp_workspace / "used_data.csv").write_text("a,b")
+    (temp_workspace / "orphan.csv").write_text("c,d")
+    (temp_workspace / "notes.md").write_text("# Notes\nSee used_data.csv")
+
+    from ai_files_organizer.core.file_scanner import FileScanner
+    files = FileScanner(str(temp_workspace)).scan()
+
+    detector = OutdatedDetector(days_threshold=90)
+    outdated = detector.detect_outdated(files, temp_workspace)
+    unreferenced = {
+        Path(o["file"]).name
+        for o in outdated
+        if any(r["type"] == "unreferenced" for r in o["reasons"])
+    }
+
+    assert "orphan.csv" in unreferenced
+    assert "used_data.csv" not in unreferenced
+    # A file mentioning only itself is not referenced
+    assert "notes.md" in unreferenced
+
+
+def test_reference_index_refresh_and_events(temp_workspace):
+    """Test the index follows edits (refresh) and watcher events"""
+    from ai_files_organizer.core.file_scanner import FileScanner
+
+    target = temp_workspace / "report.csv"
+    target.write_text("x")
+    readme = temp_workspace / "README.md"
+    readme.write_text("nothing here")
+
+    detector = OutdatedDetector()
+    files = FileScanner(str(temp_workspace)).scan()
+    detector.detect_outdated(files, temp_workspace)
+    assert not detector._check_file_references(target, temp_workspace)
+
+    # Without a watcher, detect_outdated refreshes changed sources
+    readme.write_text("uses report.csv")
+    detector.detect_outdated(files, temp_workspace)
+    assert detector._check_file_references(target, temp_workspace)
+
+    # With a watcher attached, events keep the index current
+    detector._watched = True
+    readme.write_text("nothing here")
+    detector.handle_file_event("modified", str(readme))
+    assert not detector._check_file_references(target, temp_workspace)
+
+    moved = temp_workspace / "docs.md"
+    moved.write_text("report")
+    detector.handle_file_event("created", str(moved))
+    assert detector._check_file_references(target, temp_workspace)
+    moved.unlink()
+    detector.handle_file_event("deleted", str(moved))
+    assert not detector._check_file_references(target, temp_workspace)
+
+
+def test_pattern_matcher_overlapping_patterns():
+    """Test multi-pattern matcher finds overlapping and prefix patterns"""
+    from ai_files_organizer.core.reference_index import PatternMatcher
+
+    matcher = PatternMatcher(["config", "config.json", "fig", "json", "absent"])
+    assert matcher.find("load config.json now") == {"config", "config.json", "fig", "json"}
+    assert matcher.find("") == set()
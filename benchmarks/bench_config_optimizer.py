@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark del optimizador what-if de configuraciones.
+
+Compara, sobre la KB real, el enfoque previo (una llamada a calculate_full_quote
++ validate_autoportancia por candidato, cada una recargando la KB) con un barrido
+de optimize_panel_configuration. Luego mide el barrido sobre un catálogo
+sintético (semilla fija) con cientos/miles de configuraciones.
+
+Uso:
+    python benchmarks/bench_config_optimizer.py [--families 40] [--repeat 50]
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from panelin.tools.bom_calculator import (  # noqa: E402
+    BOM_RULES_PATH,
+    DEFAULT_KB_PATH,
+    calculate_full_quote,
+    validate_autoportancia,
+)
+from panelin.tools.config_optimizer import _preset_for, optimize_panel_configuration  # noqa: E402
+
+
+LENGTH_M, WIDTH_M, LUZ_M = 5.5, 6.0, 5.5
+
+
+def per_candidate_loop(max_apoyos_intermedios):
+    """Enfoque previo: una cotización + validación por candidato."""
+    kb = json.loads(Path(DEFAULT_KB_PATH).read_text(encoding="utf-8"))
+    sistemas = json.loads(BOM_RULES_PATH.read_text(encoding="utf-8"))["sistemas"]
+    evaluated = 0
+    for product_id, product in kb["products"].items():
+        preset = _preset_for(product_id, sistemas)[0]
+        for espesor, data in (product.get("espesores") or {}).items():
+            if not isinstance(data.get("precio"), (int, float)) or not data.get("autoportancia"):
+                continue
+            for k in range(max_apoyos_intermedios + 1):
+                separacion = LUZ_M / (k + 1)
+                validate_autoportancia(int(espesor), separacion, product_id)
+                calculate_full_quote.__wrapped__(
+                    product_id=product_id, length_m=LENGTH_M, width_m=WIDTH_M,
+                    thickness_mm=int(espesor), bom_preset=preset, luz_m=separacion,
+                )
+                evaluated += 1
+    return evaluated
+
+
+def synthetic_kb(families, seed):
+    rnd = random.Random(seed)
+    products = {}
+    for f in range(families):
+        espesores = {}
+        for thickness in (30, 50, 80, 100, 120, 150, 200, 250):
+            espesores[str(thickness)] = {
+                "autoportancia": round(1.5 + thickness / 30 + rnd.uniform(-0.5, 0.5), 1),
+                "precio": round(35 + thickness / 5 + rnd.uniform(0, 15), 2),
+            }
+        products[f"SYNTH{f:03d}_EPS"] = {
+            "nombre_comercial": f"Synth {f}",
+            "ancho_util": rnd.choice([1.0, 1.12, 1.14]),
+            "espesores": espesores,
+        }
+    return {"products": products}
+
+
+def timed_ms(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--families", type=int, default=40, help="Familias del catálogo sintético")
+    parser.add_argument("--apoyos", type=int, default=9, help="Máximo de apoyos intermedios")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    loop_ms, loop_evaluated = timed_ms(lambda: per_candidate_loop(args.apoyos), 1)
+    real_cold_ms, _ = timed_ms(
+        lambda: optimize_panel_configuration(LENGTH_M, WIDTH_M, LUZ_M, max_apoyos_intermedios=args.apoyos), 1)
+    real_ms, real = timed_ms(
+        lambda: optimize_panel_configuration(LENGTH_M, WIDTH_M, LUZ_M, max_apoyos_intermedios=args.apoyos),
+        args.repeat)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        kb_path = Path(tmp) / "synthetic_kb.json"
+        kb_path.write_text(json.dumps(synthetic_kb(args.families, args.seed)), encoding="utf-8")
+
+        def sweep():
+            return optimize_panel_configuration(
+                LENGTH_M, WIDTH_M, LUZ_M, max_apoyos_intermedios=args.apoyos,
+                kb_path=kb_path, bom_rules_path=BOM_RULES_PATH)
+
+        synth_cold_ms, _ = timed_ms(sweep, 1)
+        synth_ms, synth = timed_ms(sweep, args.repeat)
+
+    report = {
+        "real_kb": {
+            "configurations": real["configuraciones_evaluadas"],
+            "per_candidate_loop_ms": round(loop_ms, 2),
+            "per_candidate_loop_evaluated": loop_evaluated,
+            "sweep_cold_ms": round(real_cold_ms, 3),
+            "sweep_warm_ms": round(real_ms, 3),
+            "speedup": round(loop_ms / real_ms, 1),
+        },
+        "synthetic_kb": {
+            "families": args.families,
+            "configurations": synth["configuraciones_evaluadas"],
+            "sweep_cold_ms": round(synth_cold_ms, 3),
+            "sweep_warm_ms": round(synth_ms, 3),
+        },
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Guardado de la tabla de ingestion: INSERT fila por fila vs. IngestionWriter.
+
+Sobre un CSV sintético de cotizaciones (500k filas por defecto, mismo formato
+que el export del Administrador de Cotizaciones: título, encabezados, datos)
+mide filas por segundo de punta a punta (lectura del CSV + guardado):
+1. Camino original: _ingest_quotes carga el CSV entero y arma la lista
+   (closure y datetime.now() por fila) y _save_to_database abre una conexión
+   y hace un INSERT OR REPLACE por fila.
+2. IngestionWriter.write_many sobre _iter_quote_records: CSV en streaming,
+   WAL, executemany en transacciones explícitas y upsert por id.
+3. El mismo camino por la cola acotada al hilo escritor (start/submit/join),
+   como lo usa generar_tabla_ingestion.
+
+Verifica que las bases tengan el mismo contenido y que re-ingestar el mismo
+CSV no duplique filas (el camino original duplica la tabla en cada corrida,
+porque el id de cada cotización lleva la hora).
+
+Uso:
+    python benchmarks/bench_ingestion_writer.py [--rows 500000] [--seed 7]
+"""
+
+import argparse
+import contextlib
+import csv
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agente_ingestion_analisis import AgenteIngestionAnalisis, IngestionRecord  # noqa: E402
+from datetime import datetime  # noqa: E402
+
+HEADERS = ["Fecha", "Cliente", "Consulta", "Producto", "Dimensiones", "Luz", "Fijación", "Notas"]
+PRODUCTS = ["ISODEC EPS", "ISOPANEL EPS", "ISOROOF 3G", "ISOWALL PIR"]
+THICKNESS = [50, 80, 100, 150, 200]
+
+
+def write_csv(path: Path, rows: int, seed: int) -> Path:
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Administrador de Cotizaciones"])
+        writer.writerow(HEADERS)
+        for i in range(rows):
+            product = rng.choice(PRODUCTS)
+            thickness = rng.choice(THICKNESS)
+            writer.writerow([
+                f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                f"Cliente {rng.randint(1, 5000)}",
+                f"Cotizar {product} {thickness}mm para techo de {rng.randint(10, 400)} m2 #{i}",
+                product,
+                f"{rng.randint(2, 20)}x{rng.randint(2, 30)}",
+                f"{rng.uniform(1.5, 7.5):.1f}",
+                rng.choice(["varilla", "caballete", "tornillo"]),
+                "" if rng.random() < 0.7 else "Urgente",
+            ])
+    return path
+
+
+def legacy_ingest_quotes(csv_path):
+    """_ingest_quotes original."""
+    records = []
+    with open(csv_path, "r", encoding="utf-8", errors="ignore") as f:
+        rows = list(csv.reader(f))
+    headers = [h.strip() for h in rows[1]]
+    header_map = {h: i for i, h in enumerate(headers)}
+    for idx, row in enumerate(rows[2:], start=3):
+        if len(row) < len(headers):
+            row.extend([""] * (len(headers) - len(row)))
+
+        def get_value(key, default=""):
+            col_idx = header_map.get(key, -1)
+            return row[col_idx].strip() if col_idx >= 0 and col_idx < len(row) else default
+
+        consulta = get_value("Consulta", "")
+        if not consulta:
+            continue
+        records.append(IngestionRecord(
+            id=f"quote_{idx}_{datetime.now().strftime('%Y%m%d%H%M%S')}",
+            source="quote",
+            platform="csv",
+            timestamp=get_value("Fecha", datetime.now().isoformat()),
+            user_query=consulta,
+            chatbot_response=None,
+            metadata={
+                "cliente": get_value("Cliente"),
+                "producto": get_value("Producto"),
+                "dimensiones": get_value("Dimensiones"),
+                "luz": get_value("Luz"),
+                "fijacion": get_value("Fijación"),
+                "notas": get_value("Notas"),
+                "fila": idx,
+            },
+            analysis=None,
+        ))
+    return records
+
+
+def legacy_save(db_path, records):
+    """_save_to_database original: conexión nueva e INSERT por fila."""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    saved = 0
+    for record in records:
+        cursor.execute(
+            """
+            INSERT OR REPLACE INTO ingestion_table
+            (id, source, platform, timestamp, user_query, chatbot_response, metadata, analysis)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+            (
+                record.id, record.source, record.platform, record.timestamp,
+                record.user_query, record.chatbot_response,
+                json.dumps(record.metadata) if record.metadata else None,
+                json.dumps(record.analysis) if record.analysis else None,
+            ),
+        )
+        saved += 1
+    conn.commit()
+    conn.close()
+    return saved
+
+
+def content_digest(db_path):
+    """Huella del contenido de ingestion_table, sin ids ni created_at."""
+    conn = sqlite3.connect(db_path)
+    count, digest = 0, 0
+    for row in conn.execute(
+        "SELECT source, platform, timestamp, user_query, chatbot_response, metadata FROM ingestion_table"
+    ):
+        count += 1
+        digest += int(hashlib.sha1(repr(row).encode("utf-8")).hexdigest()[:16], 16)
+    conn.close()
+    return count, digest % (1 << 64)
+
+
+def make_agent(db_path, csv_path):
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        agent = AgenteIngestionAnalisis(db_path=str(db_path))
+    agent.csv_inputs = str(csv_path)
+    return agent
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        os.chdir(tmp)
+        csv_path = write_csv(tmp / "cotizaciones.csv", args.rows, args.seed)
+
+        legacy_db = tmp / "legacy.db"
+        make_agent(legacy_db, csv_path)
+        start = time.perf_counter()
+        legacy_saved = legacy_save(str(legacy_db), legacy_ingest_quotes(csv_path))
+        legacy_s = time.perf_counter() - start
+
+        writer_db = tmp / "writer.db"
+        agent = make_agent(writer_db, csv_path)
+        start = time.perf_counter()
+        writer_saved = agent._get_writer().write_many(agent._iter_quote_records())
+        writer_s = time.perf_counter() - start
+
+        # Re-ingesta del mismo CSV: no debe duplicar
+        agent._get_writer().write_many(agent._iter_quote_records())
+        agent.close()
+
+        queued_db = tmp / "queued.db"
+        agent = make_agent(queued_db, csv_path)
+        start = time.perf_counter()
+        writer = agent._get_writer().start()
+        writer.submit(agent._iter_quote_records())
+        queued_saved = writer.join()
+        queued_s = time.perf_counter() - start
+        agent.close()
+
+        legacy_content = content_digest(legacy_db)
+        writer_content = content_digest(writer_db)
+        queued_content = content_digest(queued_db)
+
+    identical = (
+        legacy_content == writer_content == queued_content
+        and legacy_saved == writer_saved == queued_saved == args.rows
+    )
+    report = {
+        "rows": args.rows,
+        "cpu_count": os.cpu_count(),
+        "legacy": {"seconds": round(legacy_s, 2), "rows_per_s": round(legacy_saved / legacy_s)},
+        "writer": {"seconds": round(writer_s, 2), "rows_per_s": round(writer_saved / writer_s)},
+        "queued_writer": {"seconds": round(queued_s, 2), "rows_per_s": round(queued_saved / queued_s)},
+        "speedup": round(legacy_s / writer_s, 2),
+        "rows_after_reingest": writer_content[0],
+        "identical_content": identical,
+    }
+    print(json.dumps(report, indent=2))
+    return 0 if identical and writer_content[0] == args.rows else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark del router de intención (camino rápido del agente híbrido).
+
+Mide, sobre un corpus de mensajes formulaicos y ambiguos, el costo de
+clasificar (regex + trie de alias) y la latencia extremo a extremo de
+PanelinHybridAgent.run por ruta, con un LLM stub para los mensajes ambiguos.
+
+Uso:
+    python benchmarks/bench_intent_router.py [--repeat 2000]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from panelin.agent.hybrid_agent import PanelinHybridAgent  # noqa: E402
+from panelin.agent.intent_router import IntentRouter  # noqa: E402
+
+
+CORPUS = [
+    "cotizar ISODEC 100mm 6x4",
+    "Necesito 20 paneles Isopanel de 3m x 1.14m, espesor 100mm",
+    "precio IDEC150 4x1.12 con iva",
+    "cotizar isoroof plus 5x1 con envío",
+    "ficha isodec pir 80mm",
+    "catálogo isopanel",
+    "¿qué espesor es más barato para 5.5 x 6 luz de 5.5m?",
+    "hola, qué tal",
+    "isodec vs isopanel para un galpón",
+    "cotizar isodec 100mm 6x4 para 3 techos",
+]
+
+
+class StubLLM:
+    def bind_tools(self, tools):
+        return self
+
+    def invoke(self, messages):
+        from langchain_core.messages import AIMessage
+
+        return AIMessage(content="stub")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    router = IntentRouter()
+    router.classify(CORPUS[0])  # compilar el trie fuera de la medición
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for message in CORPUS:
+            router.classify(message)
+    classify_us = (time.perf_counter() - start) / (args.repeat * len(CORPUS)) * 1e6
+
+    agent = PanelinHybridAgent(llm=StubLLM())
+
+    async def run_corpus():
+        for _ in range(max(1, args.repeat // 100)):
+            for message in CORPUS:
+                await agent.run(message)
+
+    asyncio.run(run_corpus())
+    report = {
+        "messages": len(CORPUS),
+        "classify_avg_us": round(classify_us, 2),
+        "agent": agent.get_route_stats(),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Evaluación por lotes de KnowledgeBaseEvaluator.benchmark_architecture.
+
+Compara sobre un dataset sintético (10k muestras por defecto):
+1. El camino original: evaluate_interaction muestra por muestra (cada métrica
+   re-tokeniza consulta y respuesta) y cinco recorridos de la lista de
+   resultados para los agregados.
+2. benchmark_architecture con tokens compartidos y agregados en una pasada,
+   en proceso y con un pool de procesos (--workers).
+
+Verifica que los puntajes y agregados sean idénticos.
+
+Uso:
+    python benchmarks/bench_kb_evaluator.py [--samples 10000] [--workers 4] [--seed 7]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from loguru import logger  # noqa: E402
+
+from kb_training_system.kb_evaluator import EvaluationResult, KnowledgeBaseEvaluator  # noqa: E402
+
+
+QUERIES = [
+    "¿Cuál es el precio de Isodec 100mm?", "¿Qué espesor necesito para 6 metros de luz?",
+    "¿Cuál es la autoportancia del isoroof 3G?", "Quiero una cotización de isopanel 50mm",
+    "¿Qué características tiene el producto isowall?", "Hola, ¿hacen envíos?",
+]
+RESPONSES = [
+    "Según BMC_Base_Conocimiento_GPT.json el precio es $45.20 + IVA por m2: incluye fijaciones.",
+    "Para 6 metros de luz necesitás 150mm de espesor (autoportancia 7.5m). " * 2,
+    "No tengo esa información, creo que depende del proyecto.",
+    "- Espesor: 100mm\n- Autoportancia: 5.5m\n- Precio: consultar",
+    "Sí, hacemos envíos a todo el país, siempre con costo adicional y nunca gratis.",
+]
+SOURCES = [[], ["BMC_Base_Conocimiento_GPT.json"], ["BMC_Base_Unificada_v4.json"], ["panelin_truth_bmcuruguay_web_only_v2.json"]]
+
+
+def synthetic_dataset(n, seed):
+    rng = random.Random(seed)
+    dataset = []
+    for i in range(n):
+        sample = {
+            "query": f"{rng.choice(QUERIES)} #{i}",
+            "response": rng.choice(RESPONSES),
+            "sources": rng.choice(SOURCES),
+        }
+        if rng.random() < 0.5:
+            sample["ground_truth"] = rng.choice(RESPONSES)
+        dataset.append(sample)
+    return dataset
+
+
+def legacy_evaluate(evaluator, query, response, sources, truth):
+    """evaluate_interaction original: cada métrica re-tokeniza."""
+    result = EvaluationResult(
+        query=query, response=response, sources_consulted=sources,
+        timestamp=datetime.now().isoformat()
+    )
+    result.relevance_score = evaluator._calculate_relevance(query, response)
+    result.groundedness_score = evaluator._calculate_groundedness(response, sources)
+    result.coherence_score = evaluator._calculate_coherence(response)
+    if truth:
+        result.accuracy_score = evaluator._calculate_accuracy(response, truth)
+    data = {"content": response, "sources": sources}
+    # El validador original serializaba la respuesta una vez por chequeo
+    for check in (evaluator.source_validator._contains_price,
+                  evaluator.source_validator._contains_formula,
+                  evaluator.source_validator._contains_specifications):
+        check(data)
+    validation = evaluator.source_validator.validate_response(data, sources)
+    result.source_validation = {
+        "valid": validation.valid, "source_level": validation.source_level,
+        "warnings": validation.warnings, "errors": validation.errors,
+    }
+    result.leaks_detected = evaluator._detect_leaks(query, response, sources)
+    result.recommendations = evaluator._generate_recommendations(result)
+    result.metrics = {
+        "relevance": result.relevance_score, "groundedness": result.groundedness_score,
+        "coherence": result.coherence_score, "accuracy": result.accuracy_score,
+        "source_compliance": 1.0 if validation.valid else 0.0,
+        "leak_count": len(result.leaks_detected),
+    }
+    evaluator.evaluation_history.append(result)
+    return result
+
+
+def legacy_benchmark(evaluator, dataset):
+    """benchmark_architecture original: serie y varios recorridos para agregados."""
+    results = [
+        legacy_evaluate(evaluator, s.get("query", ""), s.get("response", ""),
+                        s.get("sources", []), s.get("ground_truth"))
+        for s in dataset
+    ]
+    n = len(results)
+    avg_coherence = sum(r.coherence_score for r in results) / n
+    compliance = sum(1 for r in results if r.source_validation and r.source_validation["valid"]) / n
+    return {
+        "average_relevance": sum(r.relevance_score for r in results) / n,
+        "average_groundedness": sum(r.groundedness_score for r in results) / n,
+        "average_coherence": avg_coherence,
+        "average_accuracy": sum(r.accuracy_score for r in results) / n,
+        "source_compliance_rate": compliance,
+        "leak_rate": sum(len(r.leaks_detected) for r in results) / n,
+        "kb_coverage_score": evaluator._estimate_kb_coverage(results, None),
+        "instruction_effectiveness": (compliance + avg_coherence) / 2,
+        "detailed_metrics": {
+            "relevance_distribution": evaluator._calculate_distribution([r.relevance_score for r in results]),
+            "groundedness_distribution": evaluator._calculate_distribution([r.groundedness_score for r in results]),
+            "leak_types": evaluator._categorize_leaks(results),
+            "source_usage": evaluator._analyze_source_usage(results),
+        },
+    }
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--samples", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    logger.remove()
+
+    dataset = synthetic_dataset(args.samples, args.seed)
+    legacy, legacy_s = _timed(lambda: legacy_benchmark(KnowledgeBaseEvaluator(), dataset))
+    batch, batch_s = _timed(lambda: KnowledgeBaseEvaluator().benchmark_architecture(dataset))
+    pooled, pooled_s = _timed(
+        lambda: KnowledgeBaseEvaluator().benchmark_architecture(dataset, workers=args.workers)
+    )
+
+    mismatches = [
+        key for key, value in legacy.items()
+        if getattr(batch, key) != value or getattr(pooled, key) != value
+    ]
+    report = {
+        "samples": len(dataset),
+        "cpu_count": os.cpu_count(),
+        "legacy_s": round(legacy_s, 3),
+        "batch_s": round(batch_s, 3),
+        f"pool_{args.workers}_workers_s": round(pooled_s, 3),
+        "speedup_batch": round(legacy_s / batch_s, 2),
+        "speedup_pool": round(legacy_s / pooled_s, 2),
+        "identical_scores": not mismatches,
+    }
+    print(json.dumps(report, indent=2))
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Búsqueda en la KB de KBIndexingAgent: índice invertido persistido vs. scan lineal.
+
+Sobre una KB sintética (el maestro de nivel 1 escalado con
+catalogs.scale_products, --scale veces sus productos) mide:
+1. Arranque en frío hasta la primera respuesta: el scan (cargar y aplanar
+   todos los JSON) contra abrir el índice ya persistido.
+2. Latencia por consulta (mediana y p95) sobre un lote fijo de consultas,
+   verificando que ambos caminos devuelvan exactamente los mismos resultados.
+3. Refresco incremental tras modificar un solo archivo contra reconstruir
+   todo el índice.
+
+Uso:
+    python benchmarks/bench_kb_search.py [--scale 50] [--seed 7]
+"""
+
+import argparse
+import json
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agente_kb_indexing import KBIndexingAgent  # noqa: E402
+from benchmarks import catalogs  # noqa: E402
+
+WEB_KB = catalogs.ROOT / "panelin_truth_bmcuruguay_web_only_v2.json"
+QUERIES = [
+    "isodec", "ISOPANEL 100", "precio", "autoportancia", "espesor 100mm", "fórmula paneles",
+    "kits de fijación", "garantia", "isoroof 3g", "cumbrera", "SYN042", "sistema de fijación",
+]
+
+
+def build_kb(directory: Path, scale: int, seed: int) -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    master = json.loads(catalogs.BOM_KB.read_text(encoding="utf-8"))
+    catalogs.write_json(directory / catalogs.BOM_KB.name, catalogs.scale_products(master, "products", scale, seed))
+    shutil.copy(WEB_KB, directory / WEB_KB.name)
+    return directory
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def _latencies(search, repeat=5):
+    samples = []
+    for _ in range(repeat):
+        for query in QUERIES:
+            samples.append(_timed(lambda: search(query))[1])
+    samples.sort()
+    return {
+        "median_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--scale", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        kb = build_kb(Path(tmp) / "kb", args.scale, args.seed)
+        index_path = Path(tmp) / "index" / "kb_search.sqlite"
+
+        def scan_agent():
+            return KBIndexingAgent(kb_path=kb, index_path=index_path)
+
+        # Índice persistido (construcción completa, una vez)
+        builder = scan_agent()
+        _, build_ms = _timed(builder.refresh_search_index)
+        stats = builder._search_index.stats()
+        builder._search_index.close()
+
+        # Arranque en frío: agente nuevo hasta la primera respuesta
+        cold_scan = scan_agent()
+        _, scan_cold_ms = _timed(lambda: cold_scan._scan_search(QUERIES[0], None, "hybrid", 10))
+        cold_index = scan_agent()
+        _, index_cold_ms = _timed(lambda: cold_index.search_kb(QUERIES[0]))
+
+        mismatches = [
+            query for query in QUERIES
+            if cold_scan._scan_search(query, None, "hybrid", 10) != cold_index.search_kb(query)["results"]
+        ]
+        scan_latency = _latencies(lambda q: cold_scan._scan_search(q, None, "hybrid", 10))
+        index_latency = _latencies(lambda q: cold_index.search_kb(q))
+
+        # Refresco incremental: se modifica solo el archivo de nivel 3
+        web = kb / WEB_KB.name
+        data = json.loads(web.read_text(encoding="utf-8"))
+        data["meta"]["bench_touch"] = time.time()
+        catalogs.write_json(web, data)
+        refresh, incremental_ms = _timed(cold_index.refresh_search_index)
+        _, full_ms = _timed(lambda: cold_index.refresh_search_index(force=True))
+        cold_index._search_index.close()
+
+    report = {
+        "scale": args.scale,
+        "entries": stats["entries"],
+        "index_bytes": stats["size_bytes"],
+        "index_build_ms": round(build_ms, 1),
+        "cold_start_ms": {"scan": round(scan_cold_ms, 1), "index": round(index_cold_ms, 1)},
+        "query_latency": {"scan": scan_latency, "index": index_latency},
+        "refresh_ms": {
+            "incremental": round(incremental_ms, 1),
+            "reindexed": refresh["reindexed"],
+            "full": round(full_ms, 1),
+        },
+        "identical_results": not mismatches,
+    }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
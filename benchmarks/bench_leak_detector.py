@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Throughput del detector de fugas de conocimiento (kb_training_system).
+
+Genera un lote sintético de interacciones (consulta, respuesta, fuentes) y
+compara:
+1. El algoritmo original: una regex/keyword por vez más reescribir el JSON de
+   historial completo después de cada interacción.
+2. detect_leaks_in_interaction con el escáner de una sola pasada y el log JSONL.
+3. analyze_leak_patterns (detect_leaks_batch: un solo append por lote).
+
+Uso:
+    python benchmarks/bench_leak_detector.py [--interactions 2000] [--seed 7]
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from kb_training_system.kb_leak_detector import (  # noqa: E402
+    MISSING_INFO_PATTERNS,
+    SPECIFIC_INDICATORS,
+    KnowledgeBaseLeakDetector,
+)
+
+
+QUERIES = [
+    "¿Cuál es el precio del Isodec 100 mm?", "¿Qué espesor necesito para 6m de luz?",
+    "¿Cómo se calcula la fórmula de fijaciones?", "Hola, ¿hacen envíos a Maldonado?",
+    "Costo de isopanel 50mm por m2", "¿Qué autoportancia tiene el isoroof?",
+]
+RESPONSES = [
+    "No tengo esa información en este momento.", "El precio es USD 45.20 + IVA por m2.",
+    "En general depende del proyecto, puede variar.", "Para 6m necesitás 150mm de espesor.",
+    "No encuentro ese dato, consultá con ventas.", "Sí, hacemos envíos a todo el país.",
+]
+
+
+def _interactions(n, seed):
+    rng = random.Random(seed)
+    return [
+        {
+            "query": rng.choice(QUERIES),
+            "response": rng.choice(RESPONSES),
+            "sources": rng.choice([[], ["BMC_Base_Conocimiento_GPT.json"]]),
+        }
+        for _ in range(n)
+    ]
+
+
+def _legacy(detector, interactions, history_file):
+    """Costo del camino original: regex por regex y reescritura completa."""
+    history = []
+    for item in interactions:
+        response_lower = item["response"].lower()
+        query_lower = item["query"].lower()
+        leaks = []
+        for pattern in MISSING_INFO_PATTERNS:
+            if re.search(pattern, response_lower):
+                leaks.append(detector._categorize_query(item["query"]))
+        for _, keywords in SPECIFIC_INDICATORS.items():
+            if any(kw in query_lower for kw in keywords):
+                if not any(kw in response_lower for kw in keywords):
+                    if not any(p in response_lower for p in MISSING_INFO_PATTERNS):
+                        leaks.append(keywords[0])
+        history.extend({"query": item["query"], "category": c} for c in leaks)
+        with open(history_file, "w", encoding="utf-8") as f:
+            json.dump({"leaks": history}, f, indent=2, ensure_ascii=False)
+    return len(history)
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--interactions", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    interactions = _interactions(args.interactions, args.seed)
+
+    report = {"interactions": len(interactions)}
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        detector = KnowledgeBaseLeakDetector(leak_history_path=str(tmp / "legacy"))
+        _, elapsed = _timed(lambda: _legacy(detector, interactions, tmp / "legacy" / "leak_history.json"))
+        report["legacy_per_interaction_s"] = round(elapsed, 3)
+
+        detector = KnowledgeBaseLeakDetector(leak_history_path=str(tmp / "single"))
+        _, elapsed = _timed(lambda: [
+            detector.detect_leaks_in_interaction(i["query"], i["response"], i["sources"])
+            for i in interactions
+        ])
+        report["scanner_per_interaction_s"] = round(elapsed, 3)
+
+        detector = KnowledgeBaseLeakDetector(leak_history_path=str(tmp / "batch"))
+        analysis = detector.analyze_leak_patterns(interactions)
+        report["batch"] = analysis.throughput
+        report["history_bytes"] = len(
+            "".join(json.dumps(asdict(l), ensure_ascii=False) for l in analysis.detailed_leaks)
+        )
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Hit rate y ahorro de latencia del cache de respuestas del LLM, sin red.
+
+Reproduce un lote tipo entrenamiento/simulación: un conjunto de consultas
+distintas que se repiten en varias pasadas (épocas) y reintentos, contra
+StubChatModel con latencia simulada. Compara el tiempo total sin cache y con
+un LLMResponseCache en SQLite.
+
+Uso:
+    python benchmarks/bench_llm_cache.py [--prompts 40] [--epochs 5] [--llm-ms 50]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from langchain_core.messages import HumanMessage, SystemMessage  # noqa: E402
+
+from panelin_core.llm_cache import CachedChatModel, LLMResponseCache, StubChatModel  # noqa: E402
+
+
+SYSTEM = "Eres Panelin, el asistente de cotización de BMC Uruguay."
+PRODUCTS = ["isodec 100mm", "isodec 150mm", "isopanel 50mm", "isoroof 3g", "isowall 80mm"]
+
+
+def _batch(prompts, epochs):
+    questions = [
+        f"cotizar {PRODUCTS[i % len(PRODUCTS)]} {4 + i // len(PRODUCTS)}x{3 + i % 3}"
+        for i in range(prompts)
+    ]
+    return [[SystemMessage(content=SYSTEM), HumanMessage(content=q)] for q in questions] * epochs
+
+
+def _replay(llm, batch):
+    start = time.perf_counter()
+    for messages in batch:
+        llm.invoke(messages)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--prompts", type=int, default=40)
+    parser.add_argument("--epochs", type=int, default=5)
+    parser.add_argument("--llm-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    batch = _batch(args.prompts, args.epochs)
+    uncached_model = StubChatModel(latency_s=args.llm_ms / 1000)
+    uncached_ms = _replay(uncached_model, batch)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = LLMResponseCache(str(Path(tmp) / "llm_cache.db"))
+        cached_model = StubChatModel(latency_s=args.llm_ms / 1000)
+        cached_ms = _replay(CachedChatModel(cached_model, cache), batch)
+        stats = cache.stats()
+        cache.close()
+
+    report = {
+        "calls": len(batch),
+        "distinct_prompts": args.prompts,
+        "llm_latency_ms": args.llm_ms,
+        "uncached": {"total_ms": round(uncached_ms, 1), "model_calls": uncached_model.calls},
+        "cached": {"total_ms": round(cached_ms, 1), "model_calls": cached_model.calls},
+        "cache": stats,
+        "speedup": round(uncached_ms / cached_ms, 1),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la KB compilada por versión de archivo (load_compiled_kb).
+
+Compara la carga de precios que hacían los calculadores en cada cotización
+(json.load + Decimal(str(precio))) con la KB compilada una vez por versión de
+archivo. La aritmética de la cotización es la misma en ambos casos
+(decimal.Decimal), así que no se mide.
+
+Antes de medir verifica que ambos caminos dan los mismos precios; si
+difieren, termina con código 1.
+
+Uso:
+    python benchmarks/bench_pricing_kernel.py [--loads 500]
+"""
+
+import argparse
+import json
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from panelin_core import pricing_kernel as pk  # noqa: E402
+
+
+KB_PATH = Path(__file__).resolve().parent.parent / "panelin" / "data" / "panelin_truth_bmcuruguay.json"
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def load_per_call(kb_path, keys, n):
+    prices = []
+    for i in range(n):
+        with open(kb_path, "r", encoding="utf-8") as f:
+            kb = json.load(f)
+        prices.append(Decimal(str(kb["products"][keys[i % len(keys)]]["price_per_m2"])))
+    return prices
+
+
+def load_compiled(kb_path, keys, n):
+    return [pk.load_compiled_kb(kb_path).price(keys[i % len(keys)]) for i in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--loads", type=int, default=500, help="Cargas de KB por escenario")
+    args = parser.parse_args()
+
+    with open(KB_PATH, "r", encoding="utf-8") as f:
+        products = json.load(f)["products"]
+    keys = [k for k, p in products.items() if isinstance(p, dict) and "price_per_m2" in p]
+
+    per_call_time, expected = timed(load_per_call, KB_PATH, keys, args.loads)
+    compiled_time, got = timed(load_compiled, KB_PATH, keys, args.loads)
+    mismatches = sum(1 for a, b in zip(expected, got) if a != b)
+
+    report = {
+        "kb_loads": args.loads,
+        "mismatches": mismatches,
+        "kb_load_per_call_us": round(per_call_time / args.loads * 1e6, 1),
+        "kb_load_compiled_us": round(compiled_time / args.loads * 1e6, 1),
+        "kb_load_speedup": round(per_call_time / compiled_time, 1),
+    }
+    print(json.dumps(report, indent=2))
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark del motor compilado de reglas de precios (panelin_hybrid_agent).
+
+Compara, para un carrito sintético (semilla fija):
+1. legacy: implementación previa por línea (lee la KB y recorre los tramos
+   linealmente en cada llamada)
+2. per_line: apply_bulk_pricing + calculate_delivery_cost por línea sobre las
+   reglas compiladas
+3. cart: price_cart con todas las líneas en una sola llamada
+
+Además mide la selección de tramo (bisect vs búsqueda lineal) con una tabla
+de tramos grande. Verifica que los tres caminos dan los mismos montos.
+
+Uso:
+    python benchmarks/bench_pricing_rules.py [--lines 1000] [--tiers 500]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from panelin_hybrid_agent.tools import pricing_rules  # noqa: E402
+from panelin_hybrid_agent.tools.pricing_rules import (  # noqa: E402
+    _CompiledRules,
+    _round_currency,
+    _to_decimal,
+    apply_bulk_pricing,
+    calculate_delivery_cost,
+    price_cart,
+)
+
+
+def legacy_bulk_pricing(total_area_m2, base_price_per_m2):
+    """Camino previo: json.load + búsqueda lineal de tramo en cada llamada."""
+    with open(pricing_rules.KB_PATH, "r", encoding="utf-8") as f:
+        kb = json.load(f)
+    tiers = kb.get("pricing_rules", {}).get("bulk_discounts", {}).get("tiers", pricing_rules.DEFAULT_BULK_TIERS)
+    rule = next(
+        (r for r in tiers if r["min_m2"] <= total_area_m2 < r.get("max_m2", float("inf"))),
+        pricing_rules.NO_TIER,
+    )
+    discount_percent = rule.get("discount", 0)
+    area = _to_decimal(total_area_m2)
+    base_total = area * _to_decimal(base_price_per_m2)
+    amount = _round_currency(base_total * abs(_to_decimal(discount_percent)) / 100)
+    final = base_total + amount if discount_percent < 0 else base_total - amount
+    _round_currency(final / area)
+    return float(_round_currency(final))
+
+
+def make_cart(n, seed):
+    rnd = random.Random(seed)
+    return [
+        {
+            "total_area_m2": round(rnd.uniform(1, 1500), 2),
+            "base_price_per_m2": rnd.choice([39.9, 41.88, 46.07, 51.5, 55.0]),
+        }
+        for _ in range(n)
+    ]
+
+
+def timed_ms(func):
+    start = time.perf_counter()
+    result = func()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--lines", type=int, default=1000)
+    parser.add_argument("--tiers", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    cart = make_cart(args.lines, args.seed)
+    price_cart(cart[:1])  # compilar reglas fuera de la medición
+
+    legacy_ms, legacy = timed_ms(
+        lambda: [legacy_bulk_pricing(l["total_area_m2"], l["base_price_per_m2"]) for l in cart])
+    per_line_ms, per_line = timed_ms(lambda: [
+        (apply_bulk_pricing(l["total_area_m2"], l["base_price_per_m2"]),
+         calculate_delivery_cost(l["total_area_m2"], "interior"))
+        for l in cart
+    ])
+    cart_ms, batch = timed_ms(lambda: price_cart(cart, destination_zone="interior"))
+
+    mismatches = sum(
+        1 for a, (b, _), c in zip(legacy, per_line, batch["lines"])
+        if not a == b["final_total_usd"] == c["final_total_usd"]
+    )
+
+    rnd = random.Random(args.seed)
+    bounds = sorted(rnd.sample(range(1, args.tiers * 100), args.tiers))
+    tiers = [{"min_m2": lo, "max_m2": hi, "discount": i % 10}
+             for i, (lo, hi) in enumerate(zip([0] + bounds, bounds + [float("inf")]))]
+    compiled = _CompiledRules({"pricing_rules": {"bulk_discounts": {"tiers": tiers}}})
+    areas = [rnd.uniform(0, args.tiers * 100) for _ in range(10_000)]
+    linear_ms, _ = timed_ms(lambda: [
+        next(r for r in tiers if r["min_m2"] <= a < r.get("max_m2", float("inf"))) for a in areas])
+    bisect_ms, _ = timed_ms(lambda: [compiled.tier_for(a) for a in areas])
+
+    report = {
+        "cart_lines": args.lines,
+        "mismatches": mismatches,
+        "legacy_ms": round(legacy_ms, 2),
+        "per_line_compiled_ms": round(per_line_ms, 2),
+        "price_cart_ms": round(cart_ms, 2),
+        "speedup_vs_legacy": round(legacy_ms / cart_ms, 1),
+        "tier_lookups": len(areas),
+        "tiers": len(tiers),
+        "linear_tier_ms": round(linear_ms, 2),
+        "bisect_tier_ms": round(bisect_ms, 2),
+    }
+    print(json.dumps(report, indent=2))
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
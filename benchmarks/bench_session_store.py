@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Latencia por turno de follow-ups con y sin estado de sesión (panelin_agent_v2).
+
+Una conversación cotiza ISODEC EPS 100mm y luego pide variantes cortas
+("y en 150mm?", "y si es 8x5?"). Sin sesión, cada follow-up repite el ciclo
+completo LLM -> búsqueda -> cotización -> LLM; con sesión, se reutilizan el
+producto resuelto y los parámetros de la última cotización. El LLM es un stub
+con latencia simulada (--llm-ms) para aislar el costo del pipeline.
+
+Uso:
+    python benchmarks/bench_session_store.py [--conversations 50] [--llm-ms 150]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from langchain_core.messages import AIMessage  # noqa: E402
+
+from panelin_agent_v2.agent.panelin_agent import PanelinQuotationAgent  # noqa: E402
+from panelin_agent_v2.session_store import SessionStore  # noqa: E402
+
+
+FIRST_TURN = "cotizar isodec 100mm 6x4"
+FOLLOW_UPS = ["y en 150mm?", "y si es 8x5?", "y en 200mm con 5%"]
+QUOTE_ARGS = {"product_id": "ISODEC_EPS_100mm", "length_m": 6.0, "width_m": 4.0}
+
+
+class StubLLM:
+    """Búsqueda de producto, cotización y respuesta final, con latencia fija."""
+
+    def __init__(self, latency_s):
+        self.latency_s = latency_s
+        self.step = 0
+        self.calls = 0
+
+    def bind_tools(self, tools):
+        return self
+
+    def invoke(self, messages):
+        time.sleep(self.latency_s)
+        self.calls += 1
+        self.step = (self.step + 1) % 3
+        if self.step == 1:
+            return AIMessage(content="", tool_calls=[
+                {"name": "tool_find_product", "args": {"query": FIRST_TURN}, "id": "find"},
+            ])
+        if self.step == 2:
+            return AIMessage(content="", tool_calls=[
+                {"name": "tool_calculate_quote", "args": QUOTE_ARGS, "id": "quote"},
+            ])
+        return AIMessage(content="Cotización lista")
+
+
+def _run(conversations, latency_s, reuse):
+    llm = StubLLM(latency_s)
+    agent = PanelinQuotationAgent(llm=llm, session_store=SessionStore())
+    follow_up_ms = []
+    for i in range(conversations):
+        session_id = f"bench-{i}"
+        agent.invoke(FIRST_TURN, session_id=session_id)
+        for message in FOLLOW_UPS:
+            if not reuse:
+                agent.session_store.delete(session_id)
+            start = time.perf_counter()
+            agent.invoke(message, session_id=session_id)
+            follow_up_ms.append((time.perf_counter() - start) * 1000)
+    return {
+        "follow_up_avg_ms": round(statistics.mean(follow_up_ms), 3),
+        "follow_up_p95_ms": round(sorted(follow_up_ms)[int(len(follow_up_ms) * 0.95)], 3),
+        "llm_calls": llm.calls,
+        "sessions": agent.session_store.stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--conversations", type=int, default=50)
+    parser.add_argument("--llm-ms", type=float, default=150.0)
+    args = parser.parse_args()
+
+    latency_s = args.llm_ms / 1000
+    stateless = _run(args.conversations, latency_s, reuse=False)
+    with_session = _run(args.conversations, latency_s, reuse=True)
+    report = {
+        "conversations": args.conversations,
+        "follow_ups_per_conversation": len(FOLLOW_UPS),
+        "llm_latency_ms": args.llm_ms,
+        "stateless": stateless,
+        "session": with_session,
+        "speedup": round(stateless["follow_up_avg_ms"] / with_session["follow_up_avg_ms"], 1),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Ingestion social de SocialIngestionEngine: camino serial vs. pipeline asyncio.
+
+Levanta un servidor local que imita la Graph API (posts/media paginados con
+`paging.next`, comentarios por post, conversaciones y mensajes), con latencia
+fija por request y, opcionalmente, un 429 cada N requests (Retry-After y
+X-App-Usage). Mide de punta a punta:
+1. Camino serial (use_async=False): posts, luego comentarios post por post,
+   sobre la requests.Session de cada cliente.
+2. ingest_async: ambas plataformas en paralelo sobre un httpx.AsyncClient
+   compartido, max_concurrency requests en vuelo por plataforma y token
+   bucket por plataforma.
+
+Verifica que ambos caminos guarden exactamente las mismas interacciones y
+reporta requests, 429 recibidos y conexiones TCP abiertas por cada uno.
+
+Uso:
+    python benchmarks/bench_social_ingestion.py [--posts 200] [--comments 120]
+        [--latency-ms 50] [--throttle-every 0] [--concurrency 4]
+"""
+
+import argparse
+import contextlib
+import json
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional, Set
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from loguru import logger  # noqa: E402
+
+from gpt_simulation_agent.agent_system.agent_social_ingestion import SocialIngestionEngine  # noqa: E402
+from gpt_simulation_agent.agent_system.utils.facebook_api import FacebookAPIClient  # noqa: E402
+from gpt_simulation_agent.agent_system.utils.instagram_api import InstagramAPIClient  # noqa: E402
+
+API_VERSION = "v18.0"
+FB_PAGE, FB_TOKEN = "page1", "fb-token"
+IG_ACCOUNT, IG_TOKEN = "ig1", "ig-token"
+
+
+class MockGraphAPI:
+    """Graph API falsa en 127.0.0.1 con latencia, 429 y fallas inyectables."""
+
+    def __init__(
+        self,
+        posts: int = 200,
+        comments: int = 120,
+        conversations: int = 10,
+        latency_s: float = 0.05,
+        throttle_every: int = 0,
+        retry_after: str = "0.05",
+    ):
+        """
+        Args:
+            posts: Posts de la página y media de la cuenta de Instagram
+            comments: Comentarios por post
+            conversations: Conversaciones de Messenger (3 mensajes cada una)
+            latency_s: Demora de cada respuesta
+            throttle_every: Responder 429 cada N requests (0 = nunca)
+            retry_after: Valor del header Retry-After en los 429
+        """
+        self.posts = posts
+        self.comments = comments
+        self.conversations = conversations
+        self.latency_s = latency_s
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.fail_paths: Set[str] = set()  # fragmentos de "ruta?after=N" que responden 500
+        self._lock = threading.Lock()
+        self.reset_stats()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/{API_VERSION}"
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.requests = 0
+            self.throttled = 0
+            self.connections = 0
+            self.hits: Dict[str, int] = {}
+            self.in_flight: Dict[str, int] = {}
+            self.max_in_flight: Dict[str, int] = {}
+
+    def start(self) -> "MockGraphAPI":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockGraphAPI":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ------------------------------------------------------------------
+    # Datos
+    # ------------------------------------------------------------------
+
+    def _edge(self, path: str):
+        """Items de una ruta (/{id}/{edge}) o None si no existe."""
+        parts = path.strip("/").split("/")
+        if len(parts) != 3 or parts[0] != API_VERSION:
+            return None
+        node, edge = parts[1], parts[2]
+        if node == FB_PAGE and edge == "posts":
+            return [
+                {
+                    "id": f"{FB_PAGE}_post{i}",
+                    "message": f"Post {i}: ¿precio del ISODEC 100mm?" if i % 3 == 0 else f"Post {i}",
+                    "created_time": f"2025-01-{i % 28 + 1:02d}T12:00:00+0000",
+                    "likes": {"data": [], "summary": {"total_count": i % 17}},
+                    "shares": {"count": i % 5},
+                }
+                for i in range(self.posts)
+            ]
+        if node == IG_ACCOUNT and edge == "media":
+            return [
+                {
+                    "id": f"{IG_ACCOUNT}_media{i}",
+                    "caption": f"Obra {i} con ISOROOF",
+                    "like_count": i % 23,
+                    "comments_count": self.comments,
+                    "timestamp": f"2025-02-{i % 28 + 1:02d}T09:30:00+0000",
+                    "permalink": f"https://instagram.example/p/{i}",
+                }
+                for i in range(self.posts)
+            ]
+        if edge == "comments" and ("_post" in node or "_media" in node):
+            return [
+                {
+                    "id": f"{node}_c{j}",
+                    "message": f"Comentario {j}, quiero cotizar" if j % 4 == 0 else f"Comentario {j}",
+                    "text": f"Comentario {j}",
+                    "created_time": "2025-03-01T10:00:00+0000",
+                    "timestamp": "2025-03-01T10:00:00+0000",
+                    "from": {"id": f"user{j % 31}", "name": f"Usuario {j % 31}"},
+                    "username": f"user{j % 31}",
+                    "like_count": j % 7,
+                    "comment_count": j % 2,
+                }
+                for j in range(self.comments)
+            ]
+        if node == "me" and edge == "conversations":
+            return [
+                {"id": f"conv{k}", "updated_time": "2025-03-02T10:00:00+0000"}
+                for k in range(self.conversations)
+            ]
+        if node.startswith("conv") and edge == "messages":
+            return [
+                {
+                    "id": f"{node}_m{m}",
+                    "message": f"Hola, ¿tienen stock? ({m})",
+                    "created_time": "2025-03-02T10:00:00+0000",
+                    "from": {"id": "cliente", "name": "Cliente"},
+                }
+                for m in range(3)
+            ]
+        return None
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    def _handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive: las conexiones se pueden reusar
+            disable_nagle_algorithm = True  # headers y body salen en writes separados
+
+            def setup(self):
+                super().setup()
+                with api._lock:
+                    api.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: Dict, headers: Optional[Dict[str, str]] = None):
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                token = query.get("access_token", "")
+                after = int(query.get("after", 0))
+                with api._lock:
+                    api.requests += 1
+                    number = api.requests
+                    key = f"{url.path}?after={after}"
+                    api.hits[key] = api.hits.get(key, 0) + 1
+                    api.in_flight[token] = api.in_flight.get(token, 0) + 1
+                    api.max_in_flight[token] = max(api.max_in_flight.get(token, 0), api.in_flight[token])
+                try:
+                    time.sleep(api.latency_s)
+                    self._respond(url.path, query, token, after, number, key)
+                finally:
+                    with api._lock:
+                        api.in_flight[token] -= 1
+
+            def _respond(self, path, query, token, after, number, key):
+                if token not in (FB_TOKEN, IG_TOKEN):
+                    return self._send(400, {"error": {"message": "Invalid OAuth access token", "code": 190}})
+                if api.throttle_every and number % api.throttle_every == 0:
+                    with api._lock:
+                        api.throttled += 1
+                    return self._send(
+                        429,
+                        {"error": {"message": "Application request limit reached", "code": 4}},
+                        {
+                            "Retry-After": api.retry_after,
+                            "X-App-Usage": json.dumps({"call_count": 100, "total_time": 40, "total_cputime": 30}),
+                        },
+                    )
+                if any(fragment in key for fragment in api.fail_paths):
+                    return self._send(500, {"error": {"message": "An unexpected error has occurred", "code": 2}})
+
+                items = api._edge(path)
+                if items is None:
+                    return self._send(404, {"error": {"message": "Unknown path", "code": 100}})
+                limit = int(query.get("limit", 25))
+                page = items[after:after + limit]
+                body = {"data": page}
+                if after + limit < len(items):
+                    next_query = dict(query, after=after + limit)
+                    host, port = api._server.server_address[:2]
+                    body["paging"] = {
+                        "cursors": {"after": str(after + limit)},
+                        "next": f"http://{host}:{port}{path}?{urlencode(next_query)}",
+                    }
+                self._send(
+                    200, body,
+                    {"X-App-Usage": json.dumps({"call_count": 5, "total_time": 2, "total_cputime": 1})},
+                )
+
+        return Handler
+
+
+def make_engine(output_dir, base_url: str, **kwargs) -> SocialIngestionEngine:
+    facebook = FacebookAPIClient(page_access_token=FB_TOKEN, page_id=FB_PAGE)
+    instagram = InstagramAPIClient(access_token=IG_TOKEN, business_account_id=IG_ACCOUNT)
+    facebook.base_url = instagram.base_url = base_url
+    return SocialIngestionEngine(
+        output_dir=str(output_dir), facebook_client=facebook, instagram_client=instagram, **kwargs
+    )
+
+
+def saved_interactions(output_dir) -> Dict[str, list]:
+    """Interacciones guardadas por plataforma/tipo (un archivo por tipo)."""
+    saved = {}
+    for path in sorted(Path(output_dir).glob("*/*/*.json")):
+        saved[f"{path.parent.parent.name}/{path.parent.name}"] = json.loads(path.read_text(encoding="utf-8"))
+    return saved
+
+
+def _run(api: MockGraphAPI, output_dir, limit: int, **kwargs):
+    api.reset_stats()
+    engine = make_engine(output_dir, api.base_url, **kwargs)
+    start = time.perf_counter()
+    results = engine.ingest(limit_per_platform=limit)
+    elapsed = time.perf_counter() - start
+    stats = {
+        "seconds": round(elapsed, 2),
+        "requests": api.requests,
+        "throttled": api.throttled,
+        "connections": api.connections,
+        "interactions": results["facebook"]["count"] + results["instagram"]["count"],
+    }
+    return stats, saved_interactions(output_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--posts", type=int, default=200)
+    parser.add_argument("--comments", type=int, default=120)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--throttle-every", type=int, default=0)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    logger.remove()
+    with tempfile.TemporaryDirectory() as tmp, MockGraphAPI(
+        posts=args.posts,
+        comments=args.comments,
+        latency_s=args.latency_ms / 1000,
+        throttle_every=args.throttle_every,
+    ) as api:
+        with contextlib.redirect_stdout(sys.stderr):
+            serial, serial_saved = _run(api, Path(tmp) / "serial", args.posts, use_async=False)
+            concurrent, async_saved = _run(
+                api, Path(tmp) / "async", args.posts,
+                max_concurrency=args.concurrency, rate_per_s=1000.0, backoff_s=0.05,
+            )
+
+    identical = serial_saved == async_saved and concurrent["interactions"] > 0
+    report = {
+        "posts_per_platform": args.posts,
+        "comments_per_post": args.comments,
+        "latency_ms": args.latency_ms,
+        "throttle_every": args.throttle_every,
+        "serial": serial,
+        "async": concurrent,
+        "speedup": round(serial["seconds"] / concurrent["seconds"], 2),
+        "identical_interactions": identical,
+    }
+    print(json.dumps(report, indent=2))
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
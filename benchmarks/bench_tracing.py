@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Costo del tracing (panelin_core.tracing) apagado y encendido.
+
+Mide por llamada, con timeit (mínimo de varias repeticiones):
+1. Una función vacía: sin decorar, con @traced apagado y encendido. Es la cota
+   superior del overhead relativo.
+2. Herramientas reales de panelin/tools (validate_quotation, una cotización
+   servida desde el cache) contra su función original (`__wrapped__`).
+3. PanelinHybridAgent.run por el camino rápido con el tracing apagado/encendido.
+
+La diferencia medida directamente sobre una herramienta queda dentro del ruido;
+el criterio es el costo fijo del wrapper apagado (medido sobre la función
+vacía) relativo a cada herramienta. Termina con código 1 si supera --budget-pct.
+
+Uso:
+    python benchmarks/bench_tracing.py [--number 20000] [--budget-pct 2]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from panelin.agent.hybrid_agent import PanelinHybridAgent  # noqa: E402
+from panelin.tools.quotation_calculator import calculate_panel_quote, validate_quotation  # noqa: E402
+from panelin_core import tracing  # noqa: E402
+from panelin_core.llm_cache import StubChatModel  # noqa: E402
+
+
+def noop(a, b=None):
+    return a
+
+
+traced_noop = tracing.traced("bench.noop")(noop)
+
+
+def per_call_ns(func, number, repeat=7):
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e9
+
+
+def paired_ns(plain, wrapped, number, repeat=15):
+    """Mínimos por llamada de dos funciones medidas intercaladas (mismo ruido)."""
+    best_plain = best_wrapped = float("inf")
+    for _ in range(repeat):
+        best_plain = min(best_plain, timeit.timeit(plain, number=number))
+        best_wrapped = min(best_wrapped, timeit.timeit(wrapped, number=number))
+    return best_plain / number * 1e9, best_wrapped / number * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--budget-pct", type=float, default=2.0)
+    args = parser.parse_args()
+    n = args.number
+
+    quote_args = dict(panel_type="Isopanel", length_m=3.0, width_m=1.14, quantity=20, thickness_mm=100)
+    quotation = calculate_panel_quote(**quote_args)
+    raw_quote = calculate_panel_quote.__wrapped__.__wrapped__  # sin cache ni span
+
+    tracing.disable()
+    noop_plain, noop_disabled = paired_ns(lambda: noop(1), lambda: traced_noop(1), n)
+    wrapper_ns = noop_disabled - noop_plain
+    report = {"noop_ns": {
+        "plain": round(noop_plain, 1),
+        "traced_disabled": round(noop_disabled, 1),
+        "disabled_overhead_ns": round(wrapper_ns, 1),
+    }}
+    tools = {
+        "validate_quotation": (lambda: validate_quotation.__wrapped__(quotation),
+                               lambda: validate_quotation(quotation)),
+        "calculate_panel_quote": (lambda: raw_quote(**quote_args),
+                                  lambda: calculate_panel_quote.__wrapped__(**quote_args)),
+    }
+    report["tools_ns"] = {}
+    for name, (plain, wrapped) in tools.items():
+        plain_ns, disabled_ns = paired_ns(plain, wrapped, n // 20)
+        report["tools_ns"][name] = {
+            "plain": round(plain_ns, 1),
+            "traced_disabled": round(disabled_ns, 1),
+            "measured_overhead_pct": round((disabled_ns - plain_ns) / plain_ns * 100, 2),
+            # El wrapper apagado es un costo fijo: su peso sobre esta herramienta
+            "wrapper_overhead_pct": round(wrapper_ns / plain_ns * 100, 3),
+        }
+
+    agent = PanelinHybridAgent(llm=StubChatModel())
+    loop = asyncio.new_event_loop()
+    message = "Necesito 20 paneles Isopanel de 3m x 1.14m, espesor 100mm"
+
+    def run_agent():
+        loop.run_until_complete(agent.run(message))
+
+    agent_disabled = per_call_ns(run_agent, n // 100)
+    with tracing.tracing():
+        report["noop_ns"]["traced_enabled"] = round(per_call_ns(lambda: traced_noop(1), n), 1)
+        agent_enabled = per_call_ns(run_agent, n // 100)
+        report["last_trace"] = tracing.recent_traces()[-1].to_dict()
+    tracing.clear_traces()
+    loop.close()
+    report["agent_run_us"] = {
+        "disabled": round(agent_disabled / 1000, 1),
+        "enabled": round(agent_enabled / 1000, 1),
+    }
+    print(json.dumps(report, indent=2))
+
+    over = [name for name, r in report["tools_ns"].items() if r["wrapper_overhead_pct"] > args.budget_pct]
+    if over:
+        print(f"Overhead apagado > {args.budget_pct}% en: {', '.join(over)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
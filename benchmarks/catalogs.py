@@ -0,0 +1,150 @@
+"""
+Catálogos sintéticos con semilla fija para la suite de benchmarks.
+
+Cada catálogo parte de la KB real que lee la función medida y se escala a
+N× su tamaño: los productos originales se conservan (con sus claves, para
+que las consultas reales sigan resolviendo) y se agregan N-1 copias por
+producto con clave sufijada y precios perturbados con un Random sembrado.
+Misma semilla y escala -> mismo archivo byte a byte.
+"""
+
+import copy
+import json
+import random
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# KB real de cada camino medido
+AGENT_V2_KB = ROOT / "panelin_agent_v2" / "config" / "panelin_truth_bmcuruguay.json"
+PANELIN_KB = ROOT / "panelin" / "data" / "panelin_truth_bmcuruguay.json"
+BOM_KB = ROOT / "BMC_Base_Conocimiento_GPT-2.json"
+MOTOR_KB = ROOT / "GPT_panelin_claudecode" / "BMC_Base_Unificada_v4.json"
+SHIPPED_ACCESSORIES = ROOT / "panelin" / "data" / "accessories_catalog.json"
+
+# Secciones que recorre bom_calculator.lookup_accessory_price
+ACCESSORY_SECTIONS = (
+    "perfileria_goterones", "babetas", "canalones", "cumbreras", "perfiles_u",
+    "perfiles_especiales", "fijaciones", "selladores", "accesorios_varios", "montantes",
+)
+ACCESSORY_TYPES = (
+    ("gotero_frontal", "perfileria_goterones"),
+    ("gotero_lateral", "perfileria_goterones"),
+    ("babeta_adosar", "babetas"),
+    ("canalon", "canalones"),
+    ("cumbrera", "cumbreras"),
+    ("perfil_u", "perfiles_u"),
+    ("varilla", "fijaciones"),
+    ("silicona", "selladores"),
+)
+FAMILIES = ("ISODEC", "ISOPANEL", "ISOROOF", "ISOWALL")
+THICKNESSES = (30, 50, 80, 100, 150, 200)
+
+
+def _perturb_prices(node: Any, rng: random.Random) -> Any:
+    """Multiplica por ±10% todo campo numérico de precio (precio*, price*)."""
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if (isinstance(value, (int, float)) and not isinstance(value, bool)
+                    and ("precio" in key or "price" in key)):
+                node[key] = round(value * rng.uniform(0.9, 1.1), 2)
+            else:
+                _perturb_prices(value, rng)
+    elif isinstance(node, list):
+        for value in node:
+            _perturb_prices(value, rng)
+    return node
+
+
+def scale_products(catalog: Dict[str, Any], section: str, factor: int, seed: int) -> Dict[str, Any]:
+    """
+    Copia del catálogo con catalog[section] escalado a factor× productos.
+
+    Args:
+        catalog: KB tal como se carga del JSON (no se modifica)
+        section: Clave del dict de productos ("products", "productos")
+        factor: Multiplicador de tamaño (1 = mismo tamaño, precios reales)
+        seed: Semilla de las perturbaciones de precio
+    """
+    rng = random.Random(seed)
+    scaled = copy.deepcopy(catalog)
+    products = scaled[section]
+    originals = list(products.items())
+    for i in range(1, factor):
+        for key, product in originals:
+            products[f"{key}_SYN{i:03d}"] = _perturb_prices(copy.deepcopy(product), rng)
+    return scaled
+
+
+def shipped_accessory_count() -> int:
+    """Cantidad de accesorios con SKU en el catálogo real (tamaño 1×)."""
+    count = 0
+
+    def walk(node):
+        nonlocal count
+        if isinstance(node, dict):
+            if "sku" in node:
+                count += 1
+                return
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    walk(json.loads(SHIPPED_ACCESSORIES.read_text(encoding="utf-8")))
+    return count
+
+
+def synthetic_accessories(items: int, seed: int) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Catálogo de accesorios en el formato de secciones-lista que lee
+    lookup_accessory_price, con `items` accesorios.
+
+    El catálogo publicado usa secciones anidadas por familia que esa función
+    no recorre, así que se genera desde cero con el mismo tamaño.
+    """
+    rng = random.Random(seed)
+    catalog: Dict[str, List[Dict[str, Any]]] = {section: [] for section in ACCESSORY_SECTIONS}
+    for i in range(items):
+        tipo, section = ACCESSORY_TYPES[i % len(ACCESSORY_TYPES)]
+        familia = FAMILIES[(i // len(ACCESSORY_TYPES)) % len(FAMILIES)]
+        espesor = THICKNESSES[(i // (len(ACCESSORY_TYPES) * len(FAMILIES))) % len(THICKNESSES)]
+        catalog[section].append({
+            "sku": f"SYN-{tipo.upper()}-{i:05d}",
+            "name": f"{tipo.replace('_', ' ').title()} {familia} {espesor}mm",
+            "tipo": tipo,
+            "compatibilidad": [familia],
+            "espesor_panel_mm": espesor,
+            "largo_std_m": rng.choice([3.0, 3.03, 6.0]),
+            "unidad": "unit",
+            "precio_unit_iva_inc": round(rng.uniform(5, 80), 2),
+        })
+    return catalog
+
+
+def write_json(path: Path, data: Dict[str, Any]) -> Path:
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def build_catalogs(directory: Path, factor: int, seed: int) -> Dict[str, Path]:
+    """Escribe en directory los catálogos de la escala factor y retorna sus paths."""
+    directory.mkdir(parents=True, exist_ok=True)
+
+    def load(path: Path) -> Dict[str, Any]:
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    return {
+        "agent_v2_kb": write_json(directory / "agent_v2_kb.json",
+                                  scale_products(load(AGENT_V2_KB), "products", factor, seed)),
+        "panelin_kb": write_json(directory / "panelin_kb.json",
+                                 scale_products(load(PANELIN_KB), "products", factor, seed)),
+        "bom_kb": write_json(directory / "bom_kb.json",
+                             scale_products(load(BOM_KB), "products", factor, seed)),
+        "motor_kb": write_json(directory / "motor_kb.json",
+                               scale_products(load(MOTOR_KB), "productos", factor, seed)),
+        "accessories": write_json(directory / "accessories.json",
+                                  synthetic_accessories(shipped_accessory_count() * factor, seed)),
+    }
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Suite reproducible de benchmarks de los caminos calientes de cotización.
+
+Mide, sobre catálogos sintéticos con semilla fija a 1×, 10× y 100× el tamaño
+de la KB real (ver benchmarks/catalogs.py):
+
+- panelin_agent_v2: calculate_panel_quote, find_product_by_query
+- panelin: calculate_full_quote, lookup_accessory_price, search_products
+- MotorCotizacionPanelin.calcular_cotizacion
+
+Cada caso corre en dos escenarios: "warm" (caches calientes tras una pasada
+de calentamiento) y "cold" (antes de cada muestra se tocan los archivos de KB
+e invalida el cache de cotizaciones, como tras un webhook de actualización).
+El resultado es un JSON con metadatos de la máquina y del commit.
+
+`compare` contrasta dos resultados y termina con código 1 si algún caso
+empeoró más que el umbral.
+
+Uso:
+    python benchmarks/suite.py run [--scales 1 10 100] [--repeat 30] [--output base.json]
+    python benchmarks/suite.py compare base.json nuevo.json [--threshold 0.10]
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import motor_cotizacion_panelin  # noqa: E402
+from benchmarks.catalogs import ROOT, build_catalogs  # noqa: E402
+from panelin.tools import bom_calculator  # noqa: E402
+from panelin.tools.knowledge_base import search_products  # noqa: E402
+from panelin.tools.quote_cache import invalidate_quote_cache  # noqa: E402
+from panelin_agent_v2.tools import product_lookup, quotation_calculator  # noqa: E402
+
+SCHEMA_VERSION = 1
+SCENARIOS = ("warm", "cold")
+METRICS = ("min_ms", "median_ms", "mean_ms", "p95_ms")
+
+
+@contextlib.contextmanager
+def patched(module, **attrs) -> Iterator[None]:
+    """Reemplaza globals de un módulo (paths de KB) y los restaura al salir."""
+    previous = {name: getattr(module, name) for name in attrs}
+    for name, value in attrs.items():
+        setattr(module, name, value)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            setattr(module, name, value)
+
+
+# ── Casos ────────────────────────────────────────────────────────────────────
+# Cada caso recibe los paths de la escala y retorna (op, reset): op ejecuta una
+# pasada de la carga representativa; reset deja el próximo op en frío más allá
+# de tocar los archivos (p.ej. descartar una instancia ya cargada).
+
+def _agent_v2_quote(paths):
+    def op():
+        quotation_calculator.calculate_panel_quote("ISOPANEL_EPS_100mm", 6.0, 4.0)
+        quotation_calculator.calculate_panel_quote("ISODEC_EPS_150mm", 5.5, 6.0, discount_percent=5)
+        quotation_calculator.calculate_panel_quote("ISOROOF_3G", 4.0, 3.0, include_accessories=True)
+    return op, None
+
+
+def _agent_v2_find(paths):
+    def op():
+        product_lookup.find_product_by_query("panel para techo de 100mm")
+        product_lookup.find_product_by_query("isowall pir fachada 80mm")
+        product_lookup.find_product_by_query("isoroof 3g galpón")
+    return op, None
+
+
+def _full_quote(paths):
+    def op():
+        for product_id, thickness, preset in (("ISODEC_EPS", 100, "techo_isodec_eps"),
+                                              ("ISOPANEL_EPS", 150, "pared_isopanel_eps")):
+            bom_calculator.calculate_full_quote(
+                product_id=product_id, length_m=6.0, width_m=4.0, thickness_mm=thickness,
+                bom_preset=preset, kb_path=paths["bom_kb"], accessories_path=paths["accessories"],
+            )
+    return op, None
+
+
+def _accessory_price(paths):
+    accessories = paths["accessories"]
+
+    def op():
+        bom_calculator.lookup_accessory_price("gotero_frontal", "ISODEC", sku="SYN-GOTERO_FRONTAL-00000",
+                                              accessories_path=accessories)
+        bom_calculator.lookup_accessory_price("cumbrera", "ISOROOF", 150, accessories_path=accessories)
+        # Sin coincidencia: recorre todas las estrategias
+        bom_calculator.lookup_accessory_price("tapajuntas", "HIANSA", 50, accessories_path=accessories)
+    return op, None
+
+
+def _search_products(paths):
+    def op():
+        for query in ("paneles económicos para techos", "isowall pir fachada", "aislamiento 150mm"):
+            search_products(query, kb_path=paths["panelin_kb"])
+    return op, None
+
+
+def _motor(paths):
+    holder: Dict[str, Any] = {"motor": None}
+
+    def op():
+        if holder["motor"] is None:
+            holder["motor"] = motor_cotizacion_panelin.MotorCotizacionPanelin()
+        motor = holder["motor"]
+        motor.calcular_cotizacion("ISODEC EPS", "100", 6.0, 4.0)
+        motor.calcular_cotizacion("ISOPANEL", "150", 5.0, 3.0, tipo_fijacion="metal")
+        motor.calcular_cotizacion("ISOROOF 3G", "50", 4.0, 3.0, luz=1.5)
+
+    def reset():
+        holder["motor"] = None
+    return op, reset
+
+
+CASES: List[Tuple[str, Callable]] = [
+    ("agent_v2.calculate_panel_quote", _agent_v2_quote),
+    ("agent_v2.find_product_by_query", _agent_v2_find),
+    ("panelin.calculate_full_quote", _full_quote),
+    ("panelin.lookup_accessory_price", _accessory_price),
+    ("panelin.search_products", _search_products),
+    ("motor.calcular_cotizacion", _motor),
+]
+
+
+@contextlib.contextmanager
+def scale_environment(directory: Path, factor: int, seed: int) -> Iterator[Dict[str, Path]]:
+    """Escribe los catálogos de la escala y apunta los módulos a ellos."""
+    paths = build_catalogs(directory, factor, seed)
+    aleros = directory / "aleros.rtf"
+    aleros.write_text("{}", encoding="utf-8")
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(patched(quotation_calculator, KB_PATH=paths["agent_v2_kb"]))
+        stack.enter_context(patched(product_lookup, KB_PATH=paths["agent_v2_kb"]))
+        stack.enter_context(patched(
+            motor_cotizacion_panelin,
+            BASE_UNIFICADA=paths["motor_kb"],
+            WEB_ONLY=ROOT / "panelin_truth_bmcuruguay_web_only_v2.json",
+            ALEROS=aleros,
+        ))
+        yield paths
+
+
+def _touch(paths: Dict[str, Path]) -> None:
+    """Cambia la versión (mtime) de los catálogos: invalida KB compiladas y span tables."""
+    for path in paths.values():
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000))
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Estadísticos en ms de una lista de duraciones en segundos."""
+    ms = sorted(s * 1000 for s in samples)
+    p95_index = min(len(ms) - 1, max(0, round(0.95 * len(ms)) - 1))
+    return {
+        "n": len(ms),
+        "min_ms": round(ms[0], 4),
+        "median_ms": round(statistics.median(ms), 4),
+        "mean_ms": round(statistics.fmean(ms), 4),
+        "p95_ms": round(ms[p95_index], 4),
+        "stdev_ms": round(statistics.stdev(ms), 4) if len(ms) > 1 else 0.0,
+    }
+
+
+def measure(op: Callable[[], None], reset: Callable[[], None], scenario: str, repeat: int) -> Dict[str, float]:
+    """Corre op repeat veces en el escenario dado y resume las duraciones."""
+    samples = []
+    if scenario == "warm":
+        op()
+    for _ in range(repeat):
+        if scenario == "cold":
+            reset()
+        start = time.perf_counter()
+        op()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        out = subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() if out.returncode == 0 else None
+
+
+def machine_metadata() -> Dict[str, Any]:
+    """Máquina, intérprete y commit en que se midió."""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor() or None,
+        "cpu_count": os.cpu_count(),
+        "git_commit": _git("rev-parse", "HEAD"),
+        "git_dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+    }
+
+
+def run_suite(scales=(1, 10, 100), repeat: int = 30, cold_repeat: int = 10, seed: int = 42,
+              only: Optional[str] = None, log=None) -> Dict[str, Any]:
+    """Corre todos los casos (o los que contienen `only`) en todas las escalas."""
+    results = []
+    cases = [(name, factory) for name, factory in CASES if not only or only in name]
+    with tempfile.TemporaryDirectory(prefix="panelin_bench_") as tmp:
+        for factor in scales:
+            with scale_environment(Path(tmp) / f"{factor}x", factor, seed) as paths:
+                for name, factory in cases:
+                    op, case_reset = factory(paths)
+
+                    def reset():
+                        _touch(paths)
+                        invalidate_quote_cache()
+                        if case_reset:
+                            case_reset()
+
+                    for scenario in SCENARIOS:
+                        stats = measure(op, reset, scenario, repeat if scenario == "warm" else cold_repeat)
+                        results.append({"benchmark": name, "scale": factor, "scenario": scenario, **stats})
+                        if log:
+                            log(f"{name:34s} {factor:>4d}x {scenario:5s} median {stats['median_ms']:>10.3f} ms")
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "metadata": machine_metadata(),
+        "config": {"scales": list(scales), "repeat": repeat, "cold_repeat": cold_repeat,
+                   "seed": seed, "only": only},
+        "results": results,
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.10,
+            metric: str = "median_ms", min_delta_ms: float = 0.05) -> List[Dict[str, Any]]:
+    """
+    Contrasta dos resultados caso por caso.
+
+    Un caso es "regression" si current/baseline > 1 + threshold y además
+    empeoró más de min_delta_ms (evita marcar ruido de microsegundos);
+    "improvement" en el caso simétrico; "new"/"missing" si falta de un lado.
+    """
+    def index(report):
+        return {(r["benchmark"], r["scale"], r["scenario"]): r for r in report["results"]}
+
+    base, new = index(baseline), index(current)
+    rows = []
+    for key in sorted(set(base) | set(new), key=lambda k: (k[0], k[1], k[2])):
+        before = base.get(key, {}).get(metric)
+        after = new.get(key, {}).get(metric)
+        row = {"benchmark": key[0], "scale": key[1], "scenario": key[2],
+               "baseline": before, "current": after, "ratio": None}
+        if before is None:
+            row["status"] = "new"
+        elif after is None:
+            row["status"] = "missing"
+        else:
+            row["ratio"] = round(after / before, 3) if before else None
+            delta = after - before
+            if before and after / before > 1 + threshold and delta > min_delta_ms:
+                row["status"] = "regression"
+            elif before and after / before < 1 - threshold and -delta > min_delta_ms:
+                row["status"] = "improvement"
+            else:
+                row["status"] = "ok"
+        rows.append(row)
+    return rows
+
+
+def _format_rows(rows: List[Dict[str, Any]], metric: str) -> str:
+    def fmt(value):
+        return "-" if value is None else f"{value:.3f}"
+
+    lines = [f"{'benchmark':34s} {'scale':>5s} {'scen.':5s} {'base ' + metric:>16s} "
+             f"{'current':>10s} {'ratio':>6s}  status"]
+    for r in rows:
+        lines.append(f"{r['benchmark']:34s} {str(r['scale']) + 'x':>5s} {r['scenario']:5s} "
+                     f"{fmt(r['baseline']):>16s} {fmt(r['current']):>10s} "
+                     f"{fmt(r['ratio']) if r['ratio'] is not None else '-':>6s}  {r['status']}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Corre la suite y escribe el JSON de resultados")
+    run.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    run.add_argument("--repeat", type=int, default=30, help="Muestras warm por caso")
+    run.add_argument("--cold-repeat", type=int, default=10, help="Muestras cold por caso")
+    run.add_argument("--seed", type=int, default=42)
+    run.add_argument("--only", help="Solo casos cuyo nombre contiene este texto")
+    run.add_argument("--output", type=Path, help="Archivo JSON (por defecto stdout)")
+
+    cmp_ = sub.add_parser("compare", help="Compara dos resultados y marca regresiones")
+    cmp_.add_argument("baseline", type=Path)
+    cmp_.add_argument("current", type=Path)
+    cmp_.add_argument("--threshold", type=float, default=0.10, help="Empeoramiento relativo tolerado")
+    cmp_.add_argument("--metric", choices=METRICS, default="median_ms")
+    cmp_.add_argument("--min-delta-ms", type=float, default=0.05)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        report = run_suite(args.scales, args.repeat, args.cold_repeat, args.seed, args.only,
+                           log=lambda line: print(line, file=sys.stderr))
+        text = json.dumps(report, indent=2)
+        if args.output:
+            args.output.write_text(text + "\n", encoding="utf-8")
+        else:
+            print(text)
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    current = json.loads(args.current.read_text(encoding="utf-8"))
+    rows = compare(baseline, current, args.threshold, args.metric, args.min_delta_ms)
+    print(_format_rows(rows, args.metric))
+    regressions = [r for r in rows if r["status"] == "regression"]
+    if baseline["metadata"].get("machine") != current["metadata"].get("machine") or \
+            baseline["metadata"].get("cpu_count") != current["metadata"].get("cpu_count"):
+        print("\n⚠️  Los resultados provienen de máquinas distintas", file=sys.stderr)
+    if regressions:
+        print(f"\n{len(regressions)} regresión(es) > {args.threshold:.0%} en {args.metric}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
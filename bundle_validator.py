@@ -10,26 +10,291 @@ Uso:
     python bundle_validator.py bundle.json
     python bundle_validator.py bundle.json --fix-roles
     python bundle_validator.py bundle.json --full-report
+    python bundle_validator.py bundle.jsonl --workers 4 --max-errors 200
 """
 
+import copy
 import json
+import os
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 import jsonschema
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
+
+# ijson es opcional: permite validar bundles .json sin cargarlos completos
+try:
+    import ijson
+    from ijson.common import ObjectBuilder
+except ImportError:
+    ijson = None
+    ObjectBuilder = None
 
 # Importar módulos locales
 try:
     from role_mapper import RoleMapper
-    from kpi_calculator import KPICalculator
+    from kpi_calculator import KPIAccumulator, KPICalculator
 except ImportError:
     print("⚠️  Advertencia: No se encontraron role_mapper.py o kpi_calculator.py")
     print("   Asegúrate de que estén en el mismo directorio.")
     RoleMapper = None
+    KPIAccumulator = None
     KPICalculator = None
 
 
+DEFAULT_SCHEMA_PATH = Path(__file__).parent / 'training_bundle_schema.json'
+
+# Tipos de error usados para derivar el estado de cada validación en streaming
+_STRUCTURE_ERROR_TYPES = {'invalid_conversation', 'missing_conversation_id', 'missing_messages'}
+_SCHEMA_ERROR_TYPES = {'schema_validation', 'schema_error'}
+_ROLE_ERROR_TYPES = {'invalid_role', 'invalid_message'}
+
+
+@lru_cache(maxsize=8)
+def _compile_schema(schema_path: str, mtime: float) -> Tuple[Dict, Any, Any, Any]:
+    """Compila el schema una vez por archivo (y versión en disco)."""
+    with open(schema_path, 'r', encoding='utf-8') as f:
+        schema = json.load(f)
+    
+    cls = validator_for(schema)
+    cls.check_schema(schema)
+    
+    # Schema de cabecera: todo salvo los items de 'conversations', que se
+    # validan por separado conversación a conversación.
+    conversations_schema = schema.get('properties', {}).get('conversations', {})
+    head_schema = copy.deepcopy(schema)
+    if 'conversations' in head_schema.get('properties', {}):
+        head_schema['properties']['conversations'] = {
+            key: value for key, value in conversations_schema.items() if key != 'items'
+        }
+    
+    return (
+        schema,
+        cls(schema),
+        cls(head_schema),
+        cls(conversations_schema.get('items', {})),
+    )
+
+
+def get_compiled_validators(schema_path: Optional[str] = None) -> Tuple[Dict, Any, Any, Any]:
+    """
+    Devuelve (schema, validador completo, validador de cabecera, validador de conversación).
+    
+    Los validadores se cachean por ruta del schema y se recompilan sólo si
+    el archivo cambia.
+    """
+    path = Path(schema_path) if schema_path else DEFAULT_SCHEMA_PATH
+    path = str(path.resolve())
+    return _compile_schema(path, os.path.getmtime(path))
+
+
+def _check_conversation_structure(index: int, conv: Any, errors: List[Dict]) -> bool:
+    """Valida la estructura mínima de una conversación."""
+    if not isinstance(conv, dict):
+        errors.append({
+            'type': 'invalid_conversation',
+            'index': index,
+            'message': f"Conversación {index} no es un objeto válido",
+            'severity': 'error'
+        })
+        return False
+    if 'id' not in conv:
+        errors.append({
+            'type': 'missing_conversation_id',
+            'index': index,
+            'message': f"Conversación {index} no tiene 'id'",
+            'severity': 'error'
+        })
+        return False
+    if 'messages' not in conv:
+        errors.append({
+            'type': 'missing_messages',
+            'index': index,
+            'conversation_id': conv.get('id', 'unknown'),
+            'message': f"Conversación {conv.get('id', index)} no tiene 'messages'",
+            'severity': 'error'
+        })
+        return False
+    return True
+
+
+def _check_conversation_roles(conv: Dict, errors: List[Dict], warnings: List[Dict]) -> bool:
+    """Valida roles y alternancia user/assistant de una conversación."""
+    if not isinstance(conv, dict) or not isinstance(conv.get('messages', []), list):
+        # Estructura y schema ya lo reportan
+        return False
+    
+    is_valid = True
+    previous_role = None
+    
+    for i, msg in enumerate(conv.get('messages', [])):
+        if not isinstance(msg, dict) or not isinstance(msg.get('role', ''), str):
+            errors.append({
+                'type': 'invalid_message',
+                'conversation_id': conv.get('id', 'unknown'),
+                'message_index': i,
+                'message': f"Mensaje {i} no es un objeto con 'role' válido",
+                'severity': 'error'
+            })
+            is_valid = False
+            continue
+        role = msg.get('role', '').lower()
+        
+        # Validar que el rol sea válido
+        if role not in ['user', 'assistant', 'system']:
+            errors.append({
+                'type': 'invalid_role',
+                'conversation_id': conv.get('id', 'unknown'),
+                'message_index': i,
+                'role': role,
+                'message': f"Rol inválido '{role}' en mensaje {i}",
+                'severity': 'error'
+            })
+            is_valid = False
+        
+        # Validar alternancia (excepto system)
+        if role in ['user', 'assistant']:
+            if previous_role and previous_role == role:
+                warnings.append({
+                    'type': 'role_alternation',
+                    'conversation_id': conv.get('id', 'unknown'),
+                    'message_index': i,
+                    'message': f"Rol '{role}' se repite después de '{previous_role}'",
+                    'severity': 'warning'
+                })
+            previous_role = role
+    
+    return is_valid
+
+
+def _validate_conversation_chunk(
+    schema_path: Optional[str],
+    chunk: List[Tuple[int, Any]],
+    check_roles: bool,
+) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Valida un bloque de conversaciones (estructura, schema y roles).
+    
+    Se ejecuta tanto en el proceso actual como en los workers del pool;
+    cada proceso compila el schema una sola vez gracias a la caché.
+    """
+    conversation_validator = get_compiled_validators(schema_path)[3]
+    errors = []
+    warnings = []
+    
+    for index, conv in chunk:
+        if not _check_conversation_structure(index, conv, errors):
+            continue
+        
+        error = best_match(conversation_validator.iter_errors(conv))
+        if error is not None:
+            errors.append({
+                'type': 'schema_validation',
+                'path': '/'.join(['conversations', str(index)] + [str(p) for p in error.path]),
+                'message': error.message,
+                'severity': 'error'
+            })
+        
+        if check_roles:
+            _check_conversation_roles(conv, errors, warnings)
+    
+    return errors, warnings
+
+
+def _iter_json_records(f) -> Iterator[Tuple[str, Any, Any]]:
+    """Recorre un bundle .json con ijson, conversación a conversación."""
+    builder = None
+    depth = 0
+    target = None
+    index = 0
+    
+    for prefix, event, value in ijson.parse(f, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if event in ('start_map', 'start_array'):
+                depth += 1
+            elif event in ('end_map', 'end_array'):
+                depth -= 1
+            if depth == 0:
+                yield target + (builder.value,)
+                builder = None
+            continue
+        
+        if prefix == '':
+            continue
+        if prefix == 'conversations' and event in ('start_array', 'end_array'):
+            if event == 'start_array':
+                yield ('head', 'conversations', [])
+            continue
+        
+        if prefix == 'conversations.item':
+            target = ('conversation', index)
+            index += 1
+        else:
+            target = ('head', prefix)
+        
+        if event in ('start_map', 'start_array'):
+            builder = ObjectBuilder()
+            builder.event(event, value)
+            depth = 1
+        else:
+            yield target + (value,)
+
+
+def iter_bundle_records(path: str) -> Iterator[Tuple[str, Any, Any]]:
+    """
+    Itera un bundle de forma incremental.
+    
+    Produce tuplas ('head', campo, valor), ('conversation', índice, conversación)
+    o ('invalid_json', línea, mensaje). Soporta:
+    - JSONL: una conversación por línea; una línea {"meta": ..., "instructions": ...}
+      aporta la cabecera del bundle.
+    - JSON: con ijson instalado se recorre sin cargar el archivo; si no, se
+      carga completo como fallback.
+    """
+    if str(path).endswith('.jsonl'):
+        yield ('head', 'conversations', [])
+        index = 0
+        with open(path, 'rb') as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield ('invalid_json', line_number, str(e))
+                    continue
+                if isinstance(record, dict) and 'meta' in record and 'messages' not in record:
+                    for key, value in record.items():
+                        yield ('head', key, value)
+                    continue
+                yield ('conversation', index, record)
+                index += 1
+        return
+    
+    with open(path, 'rb') as f:
+        if ijson is not None:
+            yield from _iter_json_records(f)
+            return
+        
+        bundle = json.load(f)
+    
+    if not isinstance(bundle, dict):
+        return
+    for key, value in bundle.items():
+        if key == 'conversations' and isinstance(value, list):
+            yield ('head', 'conversations', [])
+            for index, conv in enumerate(value):
+                yield ('conversation', index, conv)
+        else:
+            yield ('head', key, value)
+
+
 class BundleValidator:
     """Validador completo para bundles de entrenamiento."""
     
@@ -40,11 +305,8 @@ class BundleValidator:
         Args:
             schema_path: Ruta al archivo schema JSON. Si None, busca en el mismo directorio.
         """
-        if schema_path is None:
-            schema_path = Path(__file__).parent / 'training_bundle_schema.json'
-        
-        with open(schema_path, 'r', encoding='utf-8') as f:
-            self.schema = json.load(f)
+        self.schema_path = schema_path
+        self.schema, self._validator, self._head_validator, _ = get_compiled_validators(schema_path)
         
         self.errors = []
         self.warnings = []
@@ -61,7 +323,7 @@ class BundleValidator:
             True si es válido, False si hay errores
         """
         try:
-            validate(instance=bundle, schema=self.schema)
+            self._validator.validate(bundle)
             self.info.append("✅ Schema válido")
             return True
         except ValidationError as e:
@@ -90,6 +352,19 @@ class BundleValidator:
         Returns:
             True si la estructura es válida
         """
+        is_valid = self._validate_head_structure(bundle)
+        
+        # Validar cada conversación
+        conversations = bundle.get('conversations')
+        if isinstance(conversations, list):
+            for i, conv in enumerate(conversations):
+                if not _check_conversation_structure(i, conv, self.errors):
+                    is_valid = False
+        
+        return is_valid
+    
+    def _validate_head_structure(self, bundle: Dict) -> bool:
+        """Valida campos requeridos, meta y el tipo de 'conversations'."""
         is_valid = True
         
         # Validar campos requeridos
@@ -135,34 +410,6 @@ class BundleValidator:
                     'message': "No hay conversaciones en el bundle",
                     'severity': 'warning'
                 })
-            else:
-                # Validar cada conversación
-                for i, conv in enumerate(conversations):
-                    if not isinstance(conv, dict):
-                        self.errors.append({
-                            'type': 'invalid_conversation',
-                            'index': i,
-                            'message': f"Conversación {i} no es un objeto válido",
-                            'severity': 'error'
-                        })
-                        is_valid = False
-                    elif 'id' not in conv:
-                        self.errors.append({
-                            'type': 'missing_conversation_id',
-                            'index': i,
-                            'message': f"Conversación {i} no tiene 'id'",
-                            'severity': 'error'
-                        })
-                        is_valid = False
-                    elif 'messages' not in conv:
-                        self.errors.append({
-                            'type': 'missing_messages',
-                            'index': i,
-                            'conversation_id': conv.get('id', 'unknown'),
-                            'message': f"Conversación {conv.get('id', i)} no tiene 'messages'",
-                            'severity': 'error'
-                        })
-                        is_valid = False
         
         return is_valid
     
@@ -187,35 +434,8 @@ class BundleValidator:
         conversations = bundle.get('conversations', [])
         
         for conv in conversations:
-            messages = conv.get('messages', [])
-            previous_role = None
-            
-            for i, msg in enumerate(messages):
-                role = msg.get('role', '').lower()
-                
-                # Validar que el rol sea válido
-                if role not in ['user', 'assistant', 'system']:
-                    self.errors.append({
-                        'type': 'invalid_role',
-                        'conversation_id': conv.get('id', 'unknown'),
-                        'message_index': i,
-                        'role': role,
-                        'message': f"Rol inválido '{role}' en mensaje {i}",
-                        'severity': 'error'
-                    })
-                    is_valid = False
-                
-                # Validar alternancia (excepto system)
-                if role in ['user', 'assistant']:
-                    if previous_role and previous_role == role:
-                        self.warnings.append({
-                            'type': 'role_alternation',
-                            'conversation_id': conv.get('id', 'unknown'),
-                            'message_index': i,
-                            'message': f"Rol '{role}' se repite después de '{previous_role}'",
-                            'severity': 'warning'
-                        })
-                    previous_role = role
+            if not _check_conversation_roles(conv, self.errors, self.warnings):
+                is_valid = False
         
         return is_valid
     
@@ -287,6 +507,213 @@ class BundleValidator:
             }
         }
     
+    def validate_stream(
+        self,
+        path: str,
+        workers: int = 1,
+        chunk_size: int = 200,
+        max_errors: int = 1000,
+        on_error: Optional[Callable[[Dict], None]] = None,
+        max_warnings: int = 1000,
+    ) -> Dict:
+        """
+        Valida un bundle .json/.jsonl en streaming, con memoria acotada.
+        
+        Las conversaciones se leen de a una, se agrupan en bloques y se validan
+        (estructura, schema y roles) en un pool de procesos con a lo sumo
+        ``2 * workers`` bloques en vuelo. Los errores se reportan a medida que
+        aparecen vía ``on_error`` y la validación se corta al llegar a
+        ``max_errors``. Las advertencias se cuentan todas pero solo se guardan
+        las primeras ``max_warnings``. Los KPIs se acumulan en la misma pasada.
+        
+        Args:
+            path: Ruta al bundle (.jsonl, o .json)
+            workers: Procesos de validación (1 = en el proceso actual)
+            chunk_size: Conversaciones por bloque
+            max_errors: Máximo de errores a registrar antes de cortar
+            on_error: Callback invocado con cada error registrado
+            max_warnings: Máximo de advertencias a guardar en el reporte
+            
+        Returns:
+            Reporte de validación (mismo formato que validate_all, más 'streaming')
+        """
+        self.errors = []
+        self.warnings = []
+        self.info = []
+        error_counts = {}
+        warning_counts = {}
+        
+        def record_warnings(warnings: List[Dict]) -> None:
+            """Cuenta todas las advertencias; guarda solo las primeras max_warnings."""
+            for warning in warnings:
+                warning_counts[warning['type']] = warning_counts.get(warning['type'], 0) + 1
+                if len(self.warnings) < max_warnings:
+                    self.warnings.append(warning)
+        
+        check_roles = RoleMapper is not None
+        if not check_roles:
+            record_warnings([{
+                'type': 'role_mapper_unavailable',
+                'message': "RoleMapper no disponible, saltando validación de roles"
+            }])
+        
+        accumulator = KPIAccumulator() if KPIAccumulator else None
+        head = {}
+        total_conversations = 0
+        truncated = False
+        
+        def record_errors(errors: List[Dict]) -> bool:
+            """Registra errores respetando el tope; False si se alcanzó."""
+            for error in errors:
+                error_counts[error['type']] = error_counts.get(error['type'], 0) + 1
+                if len(self.errors) >= max_errors:
+                    return False
+                self.errors.append(error)
+                if on_error:
+                    on_error(error)
+            return True
+        
+        def record_chunk(result: Tuple[List[Dict], List[Dict]]) -> bool:
+            errors, warnings = result
+            record_warnings(warnings)
+            return record_errors(errors)
+        
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        pending = deque()
+        chunk = []
+        
+        try:
+            for kind, key, value in iter_bundle_records(path):
+                if kind == 'head':
+                    head[key] = value
+                    continue
+                if kind == 'invalid_json':
+                    if not record_errors([{
+                        'type': 'invalid_json',
+                        'line': key,
+                        'message': f"JSON inválido en línea {key}: {value}",
+                        'severity': 'error'
+                    }]):
+                        truncated = True
+                        break
+                    continue
+                
+                total_conversations += 1
+                if accumulator is not None and isinstance(value, dict):
+                    try:
+                        accumulator.add_conversation(value)
+                    except Exception as e:
+                        accumulator = None
+                        record_warnings([{
+                            'type': 'kpi_calculation_error',
+                            'message': f"Error calculando KPIs: {str(e)}",
+                            'severity': 'warning'
+                        }])
+                
+                chunk.append((key, value))
+                if len(chunk) < chunk_size:
+                    continue
+                
+                if executor is None:
+                    ok = record_chunk(_validate_conversation_chunk(self.schema_path, chunk, check_roles))
+                else:
+                    pending.append(executor.submit(
+                        _validate_conversation_chunk, self.schema_path, chunk, check_roles
+                    ))
+                    ok = True
+                    while ok and len(pending) > 2 * workers:
+                        ok = record_chunk(pending.popleft().result())
+                chunk = []
+                if not ok:
+                    truncated = True
+                    break
+            
+            if not truncated and chunk:
+                if executor is None:
+                    truncated = not record_chunk(
+                        _validate_conversation_chunk(self.schema_path, chunk, check_roles)
+                    )
+                else:
+                    pending.append(executor.submit(
+                        _validate_conversation_chunk, self.schema_path, chunk, check_roles
+                    ))
+            while pending and not truncated:
+                truncated = not record_chunk(pending.popleft().result())
+        finally:
+            if executor is not None:
+                for future in pending:
+                    future.cancel()
+                executor.shutdown(wait=True)
+        
+        # Cabecera: estructura y schema sin los items de 'conversations'
+        if isinstance(head.get('conversations'), list):
+            # Representa la lista ya validada conversación a conversación
+            head['conversations'] = [{}] if total_conversations else []
+        head_structure_valid = self._validate_head_structure(head)
+        head_schema_valid = False
+        if head_structure_valid:
+            error = best_match(self._head_validator.iter_errors(head))
+            head_schema_valid = error is None
+            if error is not None:
+                truncated = not record_errors([{
+                    'type': 'schema_validation',
+                    'path': '/'.join(str(p) for p in error.path),
+                    'message': error.message,
+                    'severity': 'error'
+                }]) or truncated
+        
+        def has_errors(types):
+            return any(error_counts.get(t) for t in types)
+        
+        structure_valid = (
+            head_structure_valid
+            and not has_errors(_STRUCTURE_ERROR_TYPES)
+            and not error_counts.get('invalid_json')
+        )
+        schema_valid = structure_valid and head_schema_valid and not has_errors(_SCHEMA_ERROR_TYPES)
+        roles_valid = structure_valid and not has_errors(_ROLE_ERROR_TYPES)
+        if schema_valid:
+            self.info.append("✅ Schema válido")
+        
+        kpis = None
+        if accumulator is not None:
+            accumulator.meta = head.get('meta') if isinstance(head.get('meta'), dict) else {}
+            try:
+                kpis = KPICalculator().build_report(accumulator)
+                self.info.append("✅ KPIs calculados")
+            except Exception as e:
+                record_warnings([{
+                    'type': 'kpi_calculation_error',
+                    'message': f"Error calculando KPIs: {str(e)}",
+                    'severity': 'warning'
+                }])
+        
+        is_valid = structure_valid and schema_valid and roles_valid and len(self.errors) == 0
+        
+        return {
+            'valid': is_valid and not truncated,
+            'structure_valid': structure_valid,
+            'schema_valid': schema_valid,
+            'roles_valid': roles_valid,
+            'errors': self.errors,
+            'warnings': self.warnings,
+            'info': self.info,
+            'kpis': kpis,
+            'summary': {
+                'total_errors': len(self.errors),
+                'total_warnings': len(self.warnings),
+                'total_info': len(self.info)
+            },
+            'streaming': {
+                'total_conversations': total_conversations,
+                'errors_found': sum(error_counts.values()),
+                'max_errors': max_errors,
+                'warnings_found': sum(warning_counts.values()),
+                'max_warnings': max_warnings,
+                'truncated': truncated,
+            }
+        }
+    
     def print_report(self, report: Dict, format: str = 'human'):
         """
         Imprime el reporte de validación.
@@ -361,36 +788,64 @@ def main():
     parser = argparse.ArgumentParser(
         description='Valida bundles de entrenamiento contra el schema JSON Schema'
     )
-    parser.add_argument('input_file', type=str, help='Archivo JSON del bundle a validar')
+    parser.add_argument('input_file', type=str, help='Archivo JSON o JSONL del bundle a validar')
     parser.add_argument('-s', '--schema', type=str, help='Ruta al schema JSON (opcional)')
     parser.add_argument('--fix-roles', action='store_true', help='Corregir roles automáticamente')
     parser.add_argument('--full-report', action='store_true', help='Incluir KPIs en el reporte')
     parser.add_argument('-o', '--output', type=str, help='Guardar reporte en archivo JSON')
     parser.add_argument('--format', choices=['human', 'json'], default='human', help='Formato de salida')
+    parser.add_argument('--stream', action='store_true', help='Validar en streaming (implícito para .jsonl)')
+    parser.add_argument('--workers', type=int, default=1, help='Procesos de validación en modo streaming')
+    parser.add_argument('--max-errors', type=int, default=1000, help='Tope de errores en modo streaming')
     
     args = parser.parse_args()
     
-    # Leer bundle
-    try:
-        with open(args.input_file, 'r', encoding='utf-8') as f:
-            bundle = json.load(f)
-    except FileNotFoundError:
-        print(f"❌ Error: No se encontró el archivo '{args.input_file}'")
-        sys.exit(1)
-    except json.JSONDecodeError as e:
-        print(f"❌ Error: JSON inválido en '{args.input_file}': {e}")
+    stream = args.stream or args.input_file.endswith('.jsonl')
+    if stream and args.fix_roles:
+        print("❌ Error: --fix-roles no está disponible en modo streaming")
         sys.exit(1)
     
-    # Validar
     validator = BundleValidator(schema_path=args.schema)
-    report = validator.validate_all(bundle, fix_roles=args.fix_roles)
     
-    # Si se corrigieron roles, guardar bundle actualizado
-    if args.fix_roles and report['roles_valid']:
-        output_bundle = args.input_file.replace('.json', '_validated.json')
-        with open(output_bundle, 'w', encoding='utf-8') as f:
-            json.dump(bundle, f, indent=2, ensure_ascii=False)
-        print(f"✅ Bundle con roles corregidos guardado en: {output_bundle}")
+    if stream:
+        # Validar en streaming, mostrando errores a medida que aparecen
+        def print_error(error: Dict):
+            print(f"   ❌ [{error.get('type', 'unknown')}] {error.get('message', '')}")
+        
+        try:
+            report = validator.validate_stream(
+                args.input_file,
+                workers=args.workers,
+                max_errors=args.max_errors,
+                on_error=print_error if args.format == 'human' else None,
+            )
+        except FileNotFoundError:
+            print(f"❌ Error: No se encontró el archivo '{args.input_file}'")
+            sys.exit(1)
+        except ValueError as e:
+            print(f"❌ Error: JSON inválido en '{args.input_file}': {e}")
+            sys.exit(1)
+    else:
+        # Leer bundle
+        try:
+            with open(args.input_file, 'r', encoding='utf-8') as f:
+                bundle = json.load(f)
+        except FileNotFoundError:
+            print(f"❌ Error: No se encontró el archivo '{args.input_file}'")
+            sys.exit(1)
+        except json.JSONDecodeError as e:
+            print(f"❌ Error: JSON inválido en '{args.input_file}': {e}")
+            sys.exit(1)
+        
+        # Validar
+        report = validator.validate_all(bundle, fix_roles=args.fix_roles)
+        
+        # Si se corrigieron roles, guardar bundle actualizado
+        if args.fix_roles and report['roles_valid']:
+            output_bundle = args.input_file.replace('.json', '_validated.json')
+            with open(output_bundle, 'w', encoding='utf-8') as f:
+                json.dump(bundle, f, indent=2, ensure_ascii=False)
+            print(f"✅ Bundle con roles corregidos guardado en: {output_bundle}")
     
     # Mostrar reporte
     validator.print_report(report, format=args.format)
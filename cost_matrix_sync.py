@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Cost Matrix Sync
+================
+
+Incremental, debounced push of edited cost-matrix rows.
+
+KBIndexingAgent.update_product_prices marks the products it changed as dirty
+in a CostMatrixSyncQueue; the queue coalesces edits per product code and,
+once no new edit arrived for `debounce_s` seconds (or on flush()), sends only
+those rows to a pluggable CostMatrixSyncBackend:
+- GoogleSheetsSyncBackend: updates/appends the rows in the PRODUCTS sheet
+  (gsheets_manager.push_rows), instead of rewriting the whole sheet.
+- LocalSyncBackend: in-memory fake that records every push (tests, dry runs).
+
+A failed push keeps its rows dirty (unless a newer edit superseded them) so
+the next flush retries them. Pending rows are also pushed at interpreter exit
+(atexit), so a short-lived process does not lose edits whose debounce timer
+never fired; close() pushes them earlier and drops the exit hook.
+"""
+
+import atexit
+import copy
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+class CostMatrixSyncBackend:
+    """Destination for dirty cost-matrix rows"""
+
+    name = "base"
+
+    def push_rows(self, products: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Send product records (one per code); raise on failure"""
+        raise NotImplementedError
+
+
+class GoogleSheetsSyncBackend(CostMatrixSyncBackend):
+    """Pushes dirty rows to the Google Sheets PRODUCTS worksheet"""
+
+    name = "gsheets"
+
+    def __init__(self, credentials_path: str, spreadsheet_name: str):
+        self.credentials_path = credentials_path
+        self.spreadsheet_name = spreadsheet_name
+
+    def push_rows(self, products: List[Dict[str, Any]]) -> Dict[str, Any]:
+        from panelin_improvements.cost_matrix_tools import gsheets_manager
+        return gsheets_manager.push_rows(self.credentials_path, self.spreadsheet_name, products)
+
+
+class LocalSyncBackend(CostMatrixSyncBackend):
+    """In-memory fake backend: keeps the pushed rows and a log of every push"""
+
+    name = "local"
+
+    def __init__(self, fail: bool = False):
+        self.rows: Dict[str, Dict[str, Any]] = {}
+        self.pushes: List[List[str]] = []
+        self.fail = fail
+
+    def push_rows(self, products: List[Dict[str, Any]]) -> Dict[str, Any]:
+        if self.fail:
+            raise ConnectionError("local backend configured to fail")
+        codes = [p.get("codigo", "") for p in products]
+        self.pushes.append(codes)
+        for code, product in zip(codes, products):
+            self.rows[code] = copy.deepcopy(product)
+        return {"updated": len(codes), "appended": 0}
+
+
+class CostMatrixSyncQueue:
+    """Coalesces dirty rows by product code and pushes them debounced"""
+
+    def __init__(
+        self,
+        backend: CostMatrixSyncBackend,
+        debounce_s: Optional[float] = 5.0,
+        on_synced: Optional[Callable[[Dict[str, Any]], None]] = None
+    ):
+        """
+        Args:
+            backend: Where dirty rows are sent
+            debounce_s: Push after this many seconds without new edits
+                (None = only on explicit flush())
+            on_synced: Called with the flush result after each successful push
+        """
+        self.backend = backend
+        self.debounce_s = debounce_s
+        self.on_synced = on_synced
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._dirty: Dict[str, Dict[str, Any]] = {}
+        self._timer: Optional[threading.Timer] = None
+        self._exit_hook = False
+        self.last_sync_at: Optional[str] = None
+        self.last_error: Optional[str] = None
+
+    def mark_dirty(self, products: Iterable[Dict[str, Any]]) -> int:
+        """Queue snapshots of edited products; returns the pending row count"""
+        with self._lock:
+            for product in products:
+                self._dirty[product.get("codigo", "")] = copy.deepcopy(product)
+            pending = len(self._dirty)
+            if not self._exit_hook:
+                # The debounce timer is a daemon thread: push leftovers at exit
+                atexit.register(self.flush)
+                self._exit_hook = True
+            if self.debounce_s is not None:
+                if self._timer is not None:
+                    self._timer.cancel()
+                self._timer = threading.Timer(self.debounce_s, self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+        return pending
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._dirty)
+
+    def flush(self) -> Dict[str, Any]:
+        """Push every pending row now"""
+        with self._flush_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                batch, self._dirty = self._dirty, {}
+            if not batch:
+                return {"status": "noop", "pushed": 0}
+
+            try:
+                detail = self.backend.push_rows(list(batch.values()))
+            except Exception as e:
+                with self._lock:
+                    # Newer edits queued meanwhile win over the failed snapshot
+                    for code, product in batch.items():
+                        self._dirty.setdefault(code, product)
+                self.last_error = str(e)
+                return {"status": "failed", "pushed": 0, "pending": self.pending, "error": self.last_error}
+
+            self.last_error = None
+            self.last_sync_at = datetime.now().isoformat()
+            result = {
+                "status": "synced",
+                "backend": self.backend.name,
+                "pushed": len(batch),
+                "codes": list(batch),
+                "detail": detail,
+                "last_sync_at": self.last_sync_at,
+            }
+        if self.on_synced:
+            self.on_synced(result)
+        return result
+
+    def _flush_from_timer(self) -> None:
+        self.flush()
+
+    def close(self) -> Dict[str, Any]:
+        """Cancel the debounce timer, push what is pending and drop the exit hook"""
+        with self._lock:
+            if self._exit_hook:
+                atexit.unregister(self.flush)
+                self._exit_hook = False
+        return self.flush()
@@ -16,10 +16,12 @@ Capacidades:
 """
 
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 import json
 import copy
+import os
+import shutil
 from loguru import logger
 
 
@@ -229,7 +231,6 @@ class GPTCorrectionAgent:
             backup_path.parent.mkdir(parents=True, exist_ok=True)
             
             # Copiar archivo
-            import shutil
             shutil.copy2(source, backup_path)
             backup_info[file_path] = str(backup_path)
             logger.info(f"Backup creado: {backup_path}")
@@ -291,6 +292,39 @@ class GPTCorrectionAgent:
         with open(file_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
         
+        applied_changes = self._apply_json_correction(data, correction_type, changes, correction_id)
+        
+        # Guardar archivo modificado
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        
+        return {
+            "success": True,
+            "changes_applied": applied_changes,
+            "file_modified": str(file_path)
+        }
+    
+    def _apply_json_correction(
+        self,
+        data: Dict[str, Any],
+        correction_type: str,
+        changes: Dict[str, Any],
+        correction_id: str
+    ) -> List[str]:
+        """
+        Aplica una corrección sobre un JSON ya cargado en memoria.
+        
+        Incluye el incremento de versión y el registro en meta.correcciones.
+        
+        Args:
+            data: Contenido JSON a modificar (in-place)
+            correction_type: Tipo de corrección
+            changes: Diccionario con los cambios a aplicar
+            correction_id: ID de la corrección
+        
+        Returns:
+            Lista de cambios aplicados
+        """
         applied_changes = []
         
         # Aplicar cambios según el tipo de corrección
@@ -347,15 +381,7 @@ class GPTCorrectionAgent:
                 "cambios": applied_changes
             })
         
-        # Guardar archivo modificado
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        
-        return {
-            "success": True,
-            "changes_applied": applied_changes,
-            "file_modified": str(file_path)
-        }
+        return applied_changes
     
     def _apply_institucional_changes(
         self,
@@ -397,12 +423,18 @@ class GPTCorrectionAgent:
         """Aplica cambios a productos."""
         applied = []
         
-        if "products" not in data:
-            data["products"] = {}
-        
+        # Validar antes de modificar: un ValueError no debe dejar cambios a medias
         product_id = changes.get("product_id")
         if not product_id:
             raise ValueError("product_id es requerido para cambios de producto")
+        nuevo_espesor = changes.get("nuevo_espesor")
+        if "nuevo_espesor" in changes and not (
+            isinstance(nuevo_espesor, dict) and "valor" in nuevo_espesor and "datos" in nuevo_espesor
+        ):
+            raise ValueError("nuevo_espesor requiere 'valor' y 'datos'")
+        
+        if "products" not in data:
+            data["products"] = {}
         
         if product_id not in data["products"]:
             # Crear nuevo producto
@@ -606,6 +638,33 @@ class GPTCorrectionAgent:
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
+        content, applied_changes = self._apply_text_correction(content, changes)
+        
+        # Guardar archivo modificado
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        
+        return {
+            "success": True,
+            "changes_applied": applied_changes,
+            "file_modified": str(file_path)
+        }
+    
+    def _apply_text_correction(
+        self,
+        content: str,
+        changes: Dict[str, Any]
+    ) -> Tuple[str, List[str]]:
+        """
+        Aplica cambios (replace / insert_after / insert_before) a un texto en memoria.
+        
+        Args:
+            content: Contenido del archivo
+            changes: Diccionario con los cambios a aplicar
+        
+        Returns:
+            Tupla (contenido modificado, lista de cambios aplicados)
+        """
         applied_changes = []
         
         # Aplicar cambios según el tipo
@@ -630,15 +689,7 @@ class GPTCorrectionAgent:
                     content = content.replace(pattern, new_text + "\n" + pattern)
                     applied_changes.append(f"Insertado texto antes de patrón")
         
-        # Guardar archivo modificado
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        
-        return {
-            "success": True,
-            "changes_applied": applied_changes,
-            "file_modified": str(file_path)
-        }
+        return content, applied_changes
     
     def _save_correction_report(self, report: Dict[str, Any]) -> Path:
         """
@@ -669,24 +720,79 @@ class GPTCorrectionAgent:
         """
         Aplica múltiples correcciones en lote.
         
+        Las correcciones se agrupan por archivo destino: cada archivo se
+        respalda, carga, valida y escribe (con rename atómico) una sola vez,
+        aplicando en memoria todas las correcciones que lo afectan en el orden
+        recibido. El resultado final es el mismo que aplicarlas una por una.
+        
         Args:
             corrections: Lista de diccionarios con correcciones a aplicar
+                (mismos argumentos que apply_correction)
         
         Returns:
             Diccionario con resultados de todas las correcciones
         """
         logger.info(f"Aplicando lote de {len(corrections)} correcciones")
         
+        # Planificar: archivos afectados por cada corrección, agrupados por archivo
+        plan = []
+        corrections_by_file: Dict[str, List[int]] = {}
+        for index, correction in enumerate(corrections):
+            affected_files = correction.get("affected_files")
+            if affected_files is None:
+                affected_files = self._identify_affected_files(correction["correction_type"])
+            plan.append(affected_files)
+            for file_path in affected_files:
+                corrections_by_file.setdefault(file_path, []).append(index)
+        
+        # Un único backup para todo el lote
+        backup_info = {}
+        if self.backup_enabled:
+            backup_info = self._create_backup(list(corrections_by_file), "batch")
+        
+        file_results: List[Dict[str, Dict[str, Any]]] = [{} for _ in corrections]
+        file_errors: List[List[str]] = [[] for _ in corrections]
+        
+        for file_path, indices in corrections_by_file.items():
+            outcomes = self._apply_batch_to_file(
+                file_path, [(i, corrections[i]) for i in indices]
+            )
+            for index, (result, error) in outcomes.items():
+                file_results[index][file_path] = result
+                if error:
+                    file_errors[index].append(error)
+        
+        # Reporte por corrección (mismo formato y archivo que apply_correction)
         results = []
-        for correction in corrections:
-            result = self.apply_correction(**correction)
-            results.append(result)
+        for index, correction in enumerate(corrections):
+            report = {
+                "correction_id": correction["correction_id"],
+                "correction_type": correction["correction_type"],
+                "description": correction.get("description", ""),
+                "priority": correction.get("priority", "P1"),
+                "timestamp": datetime.now().isoformat(),
+                "affected_files": plan[index],
+                "results": {
+                    file_path: file_results[index][file_path]
+                    for file_path in plan[index]
+                    if file_path in file_results[index]
+                },
+                "errors": file_errors[index],
+                "backup_info": backup_info,
+                "success": len(file_errors[index]) == 0
+            }
+            self._save_correction_report(report)
+            results.append(report)
         
         summary = {
             "timestamp": datetime.now().isoformat(),
             "total_corrections": len(corrections),
             "successful": sum(1 for r in results if r["success"]),
             "failed": sum(1 for r in results if not r["success"]),
+            "files_written": sum(
+                1 for file_path in corrections_by_file
+                if any(file_results[i].get(file_path, {}).get("success") for i in corrections_by_file[file_path])
+            ),
             "results": results
         }
         
@@ -701,6 +807,109 @@ class GPTCorrectionAgent:
         
         return summary
     
+    def _apply_batch_to_file(
+        self,
+        file_path: str,
+        items: List[Tuple[int, Dict[str, Any]]]
+    ) -> Dict[int, Tuple[Dict[str, Any], Optional[str]]]:
+        """
+        Aplica en memoria todas las correcciones de un archivo y lo escribe una vez.
+        
+        Un ValueError (validación de la corrección, antes de modificar datos)
+        solo descarta esa corrección. Cualquier otro error, o una validación que
+        introduzca errores nuevos, descarta el archivo completo sin escribirlo.
+        
+        Args:
+            file_path: Ruta relativa del archivo destino
+            items: Lista de (índice, corrección) en orden de aplicación
+        
+        Returns:
+            Diccionario índice -> (resultado del archivo, mensaje de error o None)
+        """
+        full_path = self.project_root / file_path
+        
+        def fail_all(message: str, detail: str):
+            logger.error(message)
+            return {index: ({"success": False, "error": detail}, message) for index, _ in items}
+        
+        if not full_path.exists():
+            logger.warning(f"Archivo no encontrado: {file_path}")
+            return {index: ({"success": False, "error": "Archivo no encontrado"},
+                            f"Archivo no encontrado: {file_path}") for index, _ in items}
+        
+        if full_path.suffix not in [".json", ".md", ".txt"]:
+            return {index: ({"success": False, "error": f"Tipo de archivo no soportado: {full_path.suffix}"}, None)
+                    for index, _ in items}
+        
+        is_json = full_path.suffix == ".json"
+        try:
+            with open(full_path, 'r', encoding='utf-8') as f:
+                content = json.load(f) if is_json else f.read()
+        except Exception as e:
+            return fail_all(f"Error aplicando cambios a {file_path}: {str(e)}", str(e))
+        
+        errors_before = set(self._safe_validation_errors(content, full_path)) if is_json else set()
+        
+        outcomes = {}
+        applied_any = False
+        for index, correction in items:
+            try:
+                if is_json:
+                    applied = self._apply_json_correction(
+                        content,
+                        correction["correction_type"],
+                        correction["changes"],
+                        correction["correction_id"]
+                    )
+                else:
+                    content, applied = self._apply_text_correction(content, correction["changes"])
+            except ValueError as e:
+                error_msg = f"Error aplicando cambios a {file_path}: {str(e)}"
+                logger.error(error_msg)
+                outcomes[index] = ({"success": False, "error": str(e)}, error_msg)
+                continue
+            except Exception as e:
+                # Estado en memoria inconsistente: no escribir el archivo
+                return fail_all(f"Error aplicando cambios a {file_path}: {str(e)}", str(e))
+            
+            applied_any = True
+            outcomes[index] = ({
+                "success": True,
+                "changes_applied": applied,
+                "file_modified": str(full_path)
+            }, None)
+        
+        if not applied_any:
+            return outcomes
+        
+        # Validar una sola vez: rechazar si el lote introduce errores nuevos
+        if is_json:
+            new_errors = [
+                e for e in self._safe_validation_errors(content, full_path)
+                if e not in errors_before
+            ]
+            if new_errors:
+                detail = "Validación falló: " + "; ".join(new_errors)
+                return fail_all(f"Error aplicando cambios a {file_path}: {detail}", detail)
+        
+        # Escribir una sola vez con rename atómico
+        tmp_path = full_path.with_name(full_path.name + ".tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                if is_json:
+                    json.dump(content, f, ensure_ascii=False, indent=2)
+                else:
+                    f.write(content)
+            shutil.copymode(full_path, tmp_path)
+            os.replace(tmp_path, full_path)
+        except Exception as e:
+            if tmp_path.exists():
+                tmp_path.unlink()
+            return fail_all(f"Error escribiendo {file_path}: {str(e)}", str(e))
+        
+        logger.info(f"{sum(1 for r, _ in outcomes.values() if r['success'])} correcciones aplicadas a {file_path}")
+        return outcomes
+    
     def validate_changes(self, file_path: Path) -> Dict[str, Any]:
         """
         Valida que los cambios aplicados no rompan la estructura del archivo.
@@ -722,35 +931,7 @@ class GPTCorrectionAgent:
             with open(file_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             
-            # Validaciones básicas
-            errors = []
-            warnings = []
-            
-            # Verificar estructura requerida para BMC_Base_Conocimiento_GPT-2.json
-            if "BMC_Base_Conocimiento_GPT-2.json" in str(file_path):
-                required_sections = ["meta", "identidad", "products"]
-                for section in required_sections:
-                    if section not in data:
-                        errors.append(f"Sección requerida faltante: {section}")
-                
-                # Validar estructura de productos
-                if "products" in data:
-                    for product_id, product in data["products"].items():
-                        if "espesores" in product:
-                            for espesor, datos in product["espesores"].items():
-                                required_fields = ["precio", "autoportancia"]
-                                for field in required_fields:
-                                    if field not in datos:
-                                        warnings.append(
-                                            f"Campo recomendado faltante: {product_id}.espesores.{espesor}.{field}"
-                                        )
-            
-            return {
-                "valid": len(errors) == 0,
-                "errors": errors,
-                "warnings": warnings,
-                "file": str(file_path)
-            }
+            return self._validate_json_data(data, file_path)
         except json.JSONDecodeError as e:
             return {
                 "valid": False,
@@ -763,3 +944,42 @@ class GPTCorrectionAgent:
                 "errors": [f"Error validando archivo: {str(e)}"],
                 "file": str(file_path)
             }
+    
+    def _safe_validation_errors(self, data: Any, file_path: Path) -> List[str]:
+        """Errores de validación de un JSON en memoria, sin propagar excepciones."""
+        try:
+            return self._validate_json_data(data, file_path)["errors"]
+        except Exception as e:
+            return [f"Error validando archivo: {str(e)}"]
+    
+    def _validate_json_data(self, data: Dict[str, Any], file_path: Path) -> Dict[str, Any]:
+        """Valida la estructura de un JSON ya cargado en memoria."""
+        # Validaciones básicas
+        errors = []
+        warnings = []
+        
+        # Verificar estructura requerida para BMC_Base_Conocimiento_GPT-2.json
+        if "BMC_Base_Conocimiento_GPT-2.json" in str(file_path):
+            required_sections = ["meta", "identidad", "products"]
+            for section in required_sections:
+                if section not in data:
+                    errors.append(f"Sección requerida faltante: {section}")
+            
+            # Validar estructura de productos
+            if "products" in data:
+                for product_id, product in data["products"].items():
+                    if "espesores" in product:
+                        for espesor, datos in product["espesores"].items():
+                            required_fields = ["precio", "autoportancia"]
+                            for field in required_fields:
+                                if field not in datos:
+                                    warnings.append(
+                                        f"Campo recomendado faltante: {product_id}.espesores.{espesor}.{field}"
+                                    )
+        
+        return {
+            "valid": len(errors) == 0,
+            "errors": errors,
+            "warnings": warnings,
+            "file": str(file_path)
+        }
@@ -2,8 +2,23 @@
 Social Media Ingestion Engine
 
 Ingests real interactions from Facebook and Instagram.
+
+ingest() runs the asyncio pipeline (ingest_async) when httpx is available
+and the engine uses the stock FacebookAPIClient/InstagramAPIClient: both
+platforms in parallel over one pooled httpx.AsyncClient, comments and
+conversation messages fetched concurrently (max_concurrency in-flight
+requests per platform), a token bucket per platform that follows the Graph
+API usage headers, and paging cursors persisted under
+<output_dir>/.cursors so an interrupted run resumes instead of starting
+over. As in the serial path, a failing edge (one post's comments, the
+conversations edge without Messenger permission) is logged and skipped;
+the rest of the platform is still saved and only that edge keeps its
+cursor. The async pipeline talks to the Graph API directly, so custom or
+stubbed clients (whose get_posts/get_comments/get_messages would be
+bypassed), httpx missing or a running event loop use the serial path.
 """
 
+import asyncio
 from pathlib import Path
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
@@ -12,6 +27,11 @@ import json
 
 from .utils.facebook_api import FacebookAPIClient
 from .utils.instagram_api import InstagramAPIClient
+from .utils.graph_async import AsyncGraphClient, CursorStore, TokenBucket, httpx
+
+# Posts whose comments are fetched (limits API calls, as in the serial path)
+COMMENTS_POSTS_LIMIT = 50
+COMMENTS_PER_POST = 100
 
 
 class SocialIngestionEngine:
@@ -22,6 +42,11 @@ class SocialIngestionEngine:
         output_dir: Optional[str] = None,
         facebook_client: Optional[FacebookAPIClient] = None,
         instagram_client: Optional[InstagramAPIClient] = None,
+        use_async: bool = True,
+        max_concurrency: int = 4,
+        rate_per_s: float = 10.0,
+        max_retries: int = 4,
+        backoff_s: float = 1.0,
     ):
         """
         Initialize social ingestion engine
@@ -30,13 +55,26 @@ class SocialIngestionEngine:
             output_dir: Directory to save ingested data
             facebook_client: Facebook API client (optional)
             instagram_client: Instagram API client (optional)
+            use_async: Use the asyncio pipeline when httpx is installed and
+                both clients are the stock API clients
+            max_concurrency: In-flight requests per platform (async pipeline)
+            rate_per_s: Token-bucket rate per platform while API usage is low
+            max_retries: Retries per request on 429/throttling/5xx
+            backoff_s: Base of the exponential backoff between retries
         """
         self.output_dir = Path(output_dir) if output_dir else Path("training_data/social_media")
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.cursor_dir = self.output_dir / ".cursors"
 
         self.facebook_client = facebook_client or FacebookAPIClient()
         self.instagram_client = instagram_client or InstagramAPIClient()
 
+        self.use_async = use_async
+        self.max_concurrency = max_concurrency
+        self.rate_per_s = rate_per_s
+        self.max_retries = max_retries
+        self.backoff_s = backoff_s
+
     def ingest(
         self,
         platforms: List[str] = ["facebook", "instagram"],
@@ -54,6 +92,13 @@ class SocialIngestionEngine:
         Returns:
             Dictionary with ingestion results
         """
+        if self._can_use_async():
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return asyncio.run(self.ingest_async(platforms, days_back, limit_per_platform))
+            logger.warning("Event loop already running; use ingest_async(). Falling back to serial ingestion")
+
         logger.info(f"Starting social media ingestion from {platforms}")
 
         since_date = datetime.now() - timedelta(days=days_back)
@@ -75,6 +120,250 @@ class SocialIngestionEngine:
 
         return results
 
+    def _can_use_async(self) -> bool:
+        """Async pipeline only for the stock clients (it bypasses their get_* methods)"""
+        if not self.use_async or httpx is None:
+            return False
+        stock = (
+            type(self.facebook_client) is FacebookAPIClient
+            and type(self.instagram_client) is InstagramAPIClient
+        )
+        if not stock:
+            logger.debug("Custom API clients injected; using serial ingestion")
+        return stock
+
+    async def ingest_async(
+        self,
+        platforms: List[str] = ["facebook", "instagram"],
+        days_back: int = 30,
+        limit_per_platform: int = 1000,
+        resume: bool = True,
+    ) -> Dict:
+        """
+        Ingest interactions from specified platforms concurrently
+
+        Same arguments and result shape as ingest(). Edges that fail are
+        skipped and listed under "errors" (with "resumable": True); they keep
+        their paging cursors and the next call continues them from the last
+        fetched page (resume=False starts over). Reads the Graph API directly
+        from the clients' base_url and tokens.
+        """
+        if httpx is None:
+            raise ImportError("httpx is required for async ingestion (pip install httpx)")
+
+        logger.info(f"Starting async social media ingestion from {platforms}")
+
+        since_date = datetime.now() - timedelta(days=days_back)
+        results = {
+            "facebook": {"count": 0, "files": []},
+            "instagram": {"count": 0, "files": []},
+        }
+        cursors = CursorStore(str(self.cursor_dir))
+        if not resume:
+            cursors.clear()
+
+        # One connection pool for the whole run, sized for every platform
+        limits = httpx.Limits(
+            max_connections=self.max_concurrency * 2,
+            max_keepalive_connections=self.max_concurrency * 2,
+        )
+        async with httpx.AsyncClient(limits=limits, timeout=30.0) as http:
+            runners = {
+                "facebook": self._ingest_facebook_async,
+                "instagram": self._ingest_instagram_async,
+            }
+            selected = [p for p in ("facebook", "instagram") if p in platforms]
+            outcomes = await asyncio.gather(*(
+                runners[platform](http, cursors, since_date, limit_per_platform)
+                for platform in selected
+            ))
+            for platform, outcome in zip(selected, outcomes):
+                results[platform] = outcome
+
+        total_count = results["facebook"]["count"] + results["instagram"]["count"]
+        logger.info(f"Ingestion completed. Total interactions: {total_count}")
+
+        return results
+
+    def _graph_client(
+        self, http: "httpx.AsyncClient", cursors: CursorStore, platform: str, base_url: str, token: str
+    ) -> AsyncGraphClient:
+        return AsyncGraphClient(
+            http,
+            base_url,
+            token,
+            cursors,
+            limiter=TokenBucket(self.rate_per_s),
+            max_concurrency=self.max_concurrency,
+            max_retries=self.max_retries,
+            backoff_s=self.backoff_s,
+            platform=platform,
+        )
+
+    async def _fetch_edge(
+        self, graph: AsyncGraphClient, errors: Dict[str, str], key: str, *args, **kwargs
+    ) -> List[Dict]:
+        """
+        fetch_edge that, like the serial client methods, logs a failure and
+        returns what was fetched before it instead of raising
+        """
+        try:
+            return await graph.fetch_edge(key, *args, **kwargs)
+        except Exception as e:
+            logger.error(f"Error fetching {key}: {e}")
+            errors[key] = str(e)
+            return graph.cursors.items(key)
+
+    async def _run_platform(self, platform: str, cursors: CursorStore, fetch) -> Dict:
+        """Fetch every edge of a platform, save them and forget the cursors of the edges that completed"""
+        results = {"count": 0, "files": []}
+        errors: Dict[str, str] = {}
+        try:
+            collected = await fetch(errors)
+        except Exception as e:
+            logger.error(f"Error ingesting {platform.capitalize()} data: {e}")
+            results.update({"errors": {platform: str(e)}, "resumable": True})
+            return results
+
+        for interaction_type, interactions in collected:
+            if interactions:
+                self._save_interactions(interactions, platform, interaction_type)
+                results["files"].append(f"{platform}/{interaction_type}")
+                results["count"] += len(interactions)
+        cursors.clear(f"{platform}:", keep=errors)
+        if errors:
+            results.update({"errors": errors, "resumable": True})
+        return results
+
+    async def _fetch_comments(
+        self, graph: AsyncGraphClient, errors: Dict[str, str], client, posts: List[Dict], fields: str
+    ) -> List[Dict]:
+        """Comments of the first COMMENTS_POSTS_LIMIT posts, fetched concurrently"""
+        post_ids = [p.get("id") for p in posts[:COMMENTS_POSTS_LIMIT] if p.get("id")]
+        pages = await asyncio.gather(*(
+            self._fetch_edge(
+                graph,
+                errors,
+                f"{graph.platform}:comments:{post_id}",
+                f"{post_id}/comments",
+                {"fields": fields, "limit": COMMENTS_PER_POST},
+                COMMENTS_PER_POST,
+            )
+            for post_id in post_ids
+        ))
+        all_comments = []
+        for post_id, comments in zip(post_ids, pages):
+            for comment in comments:
+                normalized = client.normalize_interaction(comment, "comment")
+                normalized["context"]["post_id"] = post_id
+                all_comments.append(normalized)
+        return all_comments
+
+    async def _ingest_facebook_async(
+        self, http: "httpx.AsyncClient", cursors: CursorStore, since_date: datetime, limit: int
+    ) -> Dict:
+        """Ingest Facebook interactions (async pipeline)"""
+        client = self.facebook_client
+        if not client.page_id or not client.page_access_token:
+            logger.error("Error ingesting Facebook data: Page ID and Access Token required")
+            return {"count": 0, "files": []}
+        graph = self._graph_client(http, cursors, "facebook", client.base_url, client.page_access_token)
+
+        async def fetch(errors):
+            posts = await self._fetch_edge(
+                graph,
+                errors,
+                "facebook:posts",
+                f"{client.page_id}/posts",
+                {
+                    "fields": "id,message,created_time,likes.summary(true),comments.summary(true),shares",
+                    "limit": min(limit, 100),
+                    "since": int(since_date.timestamp()),
+                },
+                limit,
+            )
+            logger.info(f"Fetched {len(posts)} Facebook posts")
+            normalized_posts = [client.normalize_interaction(post, "post") for post in posts]
+
+            comments = await self._fetch_comments(
+                graph, errors, client, posts, "id,message,created_time,from,like_count,comment_count"
+            )
+
+            # Conversations: first page only, then their messages concurrently
+            message_limit = min(limit, 500)
+            conversations = await self._fetch_edge(
+                graph,
+                errors,
+                "facebook:conversations",
+                "me/conversations",
+                {"fields": "id,updated_time", "limit": min(message_limit, 100)},
+                message_limit,
+                follow_paging=False,
+            )
+            conv_ids = [c.get("id") for c in conversations if c.get("id")]
+            pages = await asyncio.gather(*(
+                self._fetch_edge(
+                    graph,
+                    errors,
+                    f"facebook:messages:{conv_id}",
+                    f"{conv_id}/messages",
+                    {"fields": "id,message,created_time,from,to", "limit": 50},
+                    50,
+                    follow_paging=False,
+                )
+                for conv_id in conv_ids
+            ))
+            messages = [msg for page in pages for msg in page][:message_limit]
+            normalized_messages = [client.normalize_interaction(msg, "message") for msg in messages]
+
+            logger.info(
+                f"Facebook: {graph.requests} requests, {graph.throttled} throttled responses"
+            )
+            return [("posts", normalized_posts), ("comments", comments), ("messages", normalized_messages)]
+
+        return await self._run_platform("facebook", cursors, fetch)
+
+    async def _ingest_instagram_async(
+        self, http: "httpx.AsyncClient", cursors: CursorStore, since_date: datetime, limit: int
+    ) -> Dict:
+        """Ingest Instagram interactions (async pipeline)"""
+        client = self.instagram_client
+        if not client.business_account_id or not client.access_token:
+            logger.error("Error ingesting Instagram data: Business Account ID and Access Token required")
+            return {"count": 0, "files": []}
+        graph = self._graph_client(http, cursors, "instagram", client.base_url, client.access_token)
+
+        async def fetch(errors):
+            media = await self._fetch_edge(
+                graph,
+                errors,
+                "instagram:media",
+                f"{client.business_account_id}/media",
+                {
+                    "fields": "id,caption,like_count,comments_count,timestamp,permalink",
+                    "limit": min(limit, 100),
+                    "since": int(since_date.timestamp()),
+                },
+                limit,
+            )
+            logger.info(f"Fetched {len(media)} Instagram posts")
+            normalized_posts = [client.normalize_interaction(post, "post") for post in media]
+
+            comments = await self._fetch_comments(
+                graph, errors, client, media, "id,text,timestamp,username,like_count"
+            )
+
+            # DMs require special setup
+            dms = client.get_direct_messages(limit=100)
+            normalized_dms = [client.normalize_interaction(dm, "dm") for dm in dms]
+
+            logger.info(
+                f"Instagram: {graph.requests} requests, {graph.throttled} throttled responses"
+            )
+            return [("posts", normalized_posts), ("comments", comments), ("dms", normalized_dms)]
+
+        return await self._run_platform("instagram", cursors, fetch)
+
     def _ingest_facebook(
         self, since_date: datetime, limit: int
     ) -> Dict:
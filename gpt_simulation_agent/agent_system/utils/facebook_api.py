@@ -39,6 +39,8 @@ class FacebookAPIClient:
         self.page_id = page_id or os.getenv("FACEBOOK_PAGE_ID")
         self.api_version = api_version or os.getenv("FACEBOOK_API_VERSION", "v18.0")
         self.base_url = f"https://graph.facebook.com/{self.api_version}"
+        # Keep-alive pool shared by every request (pages reuse the connection)
+        self.session = requests.Session()
 
         if not self.page_access_token:
             logger.warning("Facebook Page Access Token not provided")
@@ -84,7 +86,7 @@ class FacebookAPIClient:
             while len(posts) < limit and "paging" in response:
                 next_url = response["paging"].get("next")
                 if next_url:
-                    response = requests.get(next_url).json()
+                    response = self._make_request(next_url, {})
                     posts.extend(response.get("data", []))
                 else:
                     break
@@ -124,7 +126,7 @@ class FacebookAPIClient:
             while len(comments) < limit and "paging" in response:
                 next_url = response["paging"].get("next")
                 if next_url:
-                    response = requests.get(next_url).json()
+                    response = self._make_request(next_url, {})
                     comments.extend(response.get("data", []))
                 else:
                     break
@@ -223,7 +225,7 @@ class FacebookAPIClient:
         """Make API request with retry logic"""
         for attempt in range(retries):
             try:
-                response = requests.get(url, params=params, timeout=30)
+                response = self.session.get(url, params=params, timeout=30)
                 response.raise_for_status()
                 return response.json()
             except requests.exceptions.RequestException as e:
@@ -0,0 +1,361 @@
+"""
+Async Graph API Client
+
+Pooled, rate-limited and resumable paging over the Facebook/Instagram Graph
+API, used by SocialIngestionEngine.ingest_async:
+- One httpx.AsyncClient (keep-alive connection pool) shared by every request
+  of an ingestion run, instead of a fresh connection per page.
+- Per-platform asyncio.Semaphore bounding in-flight requests.
+- TokenBucket limiter that slows down as the X-App-Usage / X-Page-Usage /
+  X-Business-Use-Case-Usage headers approach 100% and pauses on 429,
+  Retry-After or Graph throttling error codes.
+- CursorStore: the `paging.next` URL of every edge (without access_token) and
+  the pages already fetched are persisted after each page, so an interrupted
+  run resumes where it stopped.
+"""
+
+import asyncio
+import json
+import os
+import random
+import re
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from loguru import logger
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+# Graph API error codes that mean "throttled, retry later"
+THROTTLE_ERROR_CODES = {4, 17, 32, 613, 80001, 80002}
+USAGE_HEADERS = ("x-app-usage", "x-page-usage", "x-ad-account-usage", "x-business-use-case-usage")
+
+
+class GraphAPIError(Exception):
+    """A Graph API request failed after all retries"""
+
+
+def graph_usage(headers: Mapping[str, str]) -> Dict[str, float]:
+    """
+    Parse Graph API usage headers
+
+    Returns:
+        {"percent": highest call_count/total_time/total_cputime percentage,
+         "regain_s": estimated seconds until access is regained}
+    """
+    percent = 0.0
+    regain_minutes = 0.0
+    for name in USAGE_HEADERS:
+        raw = headers.get(name)
+        if not raw:
+            continue
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            continue
+        # X-Business-Use-Case-Usage: {"<business id>": [{...}, ...]}
+        if name == "x-business-use-case-usage" and isinstance(data, dict):
+            entries = [e for values in data.values() if isinstance(values, list) for e in values]
+        else:
+            entries = [data]
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            for key in ("call_count", "total_time", "total_cputime", "acc_id_util_pct"):
+                try:
+                    percent = max(percent, float(entry.get(key) or 0))
+                except (TypeError, ValueError):
+                    pass
+            try:
+                regain_minutes = max(regain_minutes, float(entry.get("estimated_time_to_regain_access") or 0))
+            except (TypeError, ValueError):
+                pass
+    return {"percent": percent, "regain_s": regain_minutes * 60}
+
+
+def retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Seconds from a Retry-After header (None if absent or an HTTP date)"""
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+class TokenBucket:
+    """Async token bucket adapted from the Graph API usage headers"""
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        capacity: Optional[float] = None,
+        slowdown_at: float = 75.0,
+        min_fraction: float = 0.05,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            rate: Requests per second while usage is low
+            capacity: Burst size (default: one second worth of requests)
+            slowdown_at: Usage percentage from which the rate is reduced
+                linearly, down to min_fraction of `rate` at 100%
+            min_fraction: Lowest fraction of `rate` used near the limit
+            clock: Monotonic clock (tests)
+        """
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.slowdown_at = slowdown_at
+        self.min_fraction = min_fraction
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait for a token (waiters are served in arrival order)"""
+        async with self._lock:
+            while True:
+                now = self._clock()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for `seconds` and drop the burst"""
+        now = self._clock()
+        self._refill(now)
+        self._paused_until = max(self._paused_until, now + seconds)
+        self._tokens = 0.0
+
+    def observe(self, headers: Mapping[str, str]) -> Dict[str, float]:
+        """Adapt the rate (and pause if needed) from a response's headers"""
+        usage = graph_usage(headers)
+        self._refill(self._clock())
+        if usage["percent"] >= self.slowdown_at:
+            headroom = max(0.0, 100.0 - usage["percent"]) / max(1e-9, 100.0 - self.slowdown_at)
+            self.rate = self.base_rate * max(self.min_fraction, headroom)
+        else:
+            self.rate = self.base_rate
+        if usage["regain_s"] > 0:
+            self.pause(usage["regain_s"])
+        return usage
+
+
+def _strip_token(url: str) -> str:
+    """Drop access_token from a paging URL (it is never written to disk)"""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != "access_token"]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+class CursorStore:
+    """Persisted paging state per edge: next URL, done flag and spooled pages"""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / "cursors.json"
+        self._state: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            try:
+                self._state = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable cursor file {self.path}: {e}")
+
+    def _spool_path(self, key: str) -> Path:
+        return self.directory / (re.sub(r"[^A-Za-z0-9_.-]", "_", key) + ".jsonl")
+
+    def _save(self) -> None:
+        tmp = self.path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(self._state, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def get(self, key: str) -> Dict[str, Any]:
+        return self._state.get(key, {"next": None, "done": False, "count": 0})
+
+    def items(self, key: str) -> List[Dict]:
+        """Items spooled for an edge, in order and without repeated ids"""
+        spool = self._spool_path(key)
+        if not spool.exists():
+            return []
+        items, seen = [], set()
+        with open(spool, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    item = json.loads(line)
+                except ValueError:
+                    continue  # torn last line from an interrupted write
+                item_id = item.get("id") if isinstance(item, dict) else None
+                if item_id is not None:
+                    if item_id in seen:
+                        continue
+                    seen.add(item_id)
+                items.append(item)
+        return items
+
+    def record_page(self, key: str, page: Iterable[Dict], next_url: Optional[str], count: int) -> None:
+        """Spool a page, then advance the cursor (a crash in between refetches the page)"""
+        with open(self._spool_path(key), "a", encoding="utf-8") as f:
+            for item in page:
+                f.write(json.dumps(item, ensure_ascii=False) + "\n")
+        self._state[key] = {
+            "next": _strip_token(next_url) if next_url else None,
+            "done": next_url is None,
+            "count": count,
+        }
+        self._save()
+
+    def clear(self, prefix: str = "", keep: Iterable[str] = ()) -> None:
+        """Forget the state (and spooled pages) of every edge under `prefix`, except `keep`"""
+        keep = set(keep)
+        for key in [k for k in self._state if k.startswith(prefix) and k not in keep]:
+            del self._state[key]
+            self._spool_path(key).unlink(missing_ok=True)
+        self._save()
+
+
+class AsyncGraphClient:
+    """Graph API reads over a shared pool, for one platform"""
+
+    def __init__(
+        self,
+        http: "httpx.AsyncClient",
+        base_url: str,
+        access_token: str,
+        cursors: CursorStore,
+        limiter: Optional[TokenBucket] = None,
+        max_concurrency: int = 4,
+        max_retries: int = 4,
+        backoff_s: float = 1.0,
+        platform: str = "graph",
+    ):
+        """
+        Args:
+            http: Shared httpx.AsyncClient (connection pool)
+            base_url: e.g. https://graph.facebook.com/v18.0
+            access_token: Sent on every request, never persisted
+            cursors: Paging state store
+            limiter: Token bucket for this platform
+            max_concurrency: In-flight requests for this platform
+            max_retries: Retries on 429, throttling errors, 5xx and transport errors
+            backoff_s: Base of the exponential backoff (when no Retry-After)
+            platform: Name used in logs and cursor keys
+        """
+        self.http = http
+        self.base_url = base_url.rstrip("/")
+        self.access_token = access_token
+        self.cursors = cursors
+        self.limiter = limiter or TokenBucket()
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.max_retries = max_retries
+        self.backoff_s = backoff_s
+        self.platform = platform
+        self.requests = 0
+        self.throttled = 0
+
+    def _backoff(self, attempt: int) -> float:
+        return self.backoff_s * (2 ** attempt) * (0.5 + random.random() / 2)
+
+    async def get_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Dict:
+        """GET with rate limiting, bounded concurrency and retries"""
+        # Paging URLs carry their own query; httpx would replace it with `params`
+        parts = urlsplit(url)
+        query = dict(parse_qsl(parts.query, keep_blank_values=True))
+        query.update(params or {})
+        query["access_token"] = self.access_token
+        url = urlunsplit(parts._replace(query=""))
+        error: Optional[str] = None
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire()
+            async with self.semaphore:
+                self.requests += 1
+                try:
+                    response = await self.http.get(url, params=query)
+                except httpx.TransportError as e:
+                    response = None
+                    error = f"{type(e).__name__}: {e}"
+            delay = self._backoff(attempt)
+            if response is not None:
+                self.limiter.observe(response.headers)
+                throttled = response.status_code == 429
+                if response.status_code in (400, 403) and not throttled:
+                    try:
+                        code = response.json().get("error", {}).get("code")
+                    except ValueError:
+                        code = None
+                    throttled = code in THROTTLE_ERROR_CODES
+                if throttled:
+                    self.throttled += 1
+                    wait = retry_after(response.headers)
+                    self.limiter.pause(delay if wait is None else wait)
+                    error = f"HTTP {response.status_code} (throttled)"
+                    if attempt < self.max_retries:
+                        logger.warning(f"{self.platform}: throttled, pausing requests")
+                    continue  # acquire() waits out the pause
+                if response.status_code >= 500:
+                    error = f"HTTP {response.status_code}"
+                else:
+                    response.raise_for_status()
+                    return response.json()
+            if attempt < self.max_retries:
+                logger.warning(f"{self.platform}: request failed ({error}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+        raise GraphAPIError(f"{self.platform}: {url} failed after {self.max_retries + 1} attempts: {error}")
+
+    async def fetch_edge(
+        self,
+        key: str,
+        path: str,
+        params: Dict[str, Any],
+        limit: int,
+        follow_paging: bool = True,
+    ) -> List[Dict]:
+        """
+        Read up to `limit` items of an edge, resuming from its persisted cursor
+
+        Args:
+            key: Cursor key (e.g. "facebook:comments:<post id>")
+            path: Edge path relative to base_url (e.g. "<page id>/posts")
+            params: Query parameters of the first page
+            limit: Maximum items
+            follow_paging: False to read only the first page
+        """
+        state = self.cursors.get(key)
+        items = self.cursors.items(key)
+        if state.get("done") or len(items) >= limit:
+            return items[:limit]
+
+        if state.get("next"):
+            url, query = state["next"], None
+        else:
+            url, query = f"{self.base_url}/{path}", params
+
+        while True:
+            payload = await self.get_json(url, query)
+            page = payload.get("data") or []
+            items.extend(page)
+            next_url = (payload.get("paging") or {}).get("next") if follow_paging else None
+            if not page or len(items) >= limit:
+                next_url = None
+            self.cursors.record_page(key, page, next_url, len(items))
+            if not next_url:
+                return items[:limit]
+            url, query = _strip_token(next_url), None
@@ -39,6 +39,8 @@ class InstagramAPIClient:
         self.business_account_id = business_account_id or os.getenv("INSTAGRAM_BUSINESS_ACCOUNT_ID")
         self.api_version = api_version or os.getenv("INSTAGRAM_API_VERSION", "v18.0")
         self.base_url = f"https://graph.facebook.com/{self.api_version}"
+        # Keep-alive pool shared by every request (pages reuse the connection)
+        self.session = requests.Session()
 
         if not self.access_token:
             logger.warning("Instagram Access Token not provided")
@@ -76,7 +78,7 @@ class InstagramAPIClient:
             while len(media) < limit and "paging" in response:
                 next_url = response["paging"].get("next")
                 if next_url:
-                    response = requests.get(next_url).json()
+                    response = self._make_request(next_url, {})
                     media.extend(response.get("data", []))
                 else:
                     break
@@ -116,7 +118,7 @@ class InstagramAPIClient:
             while len(comments) < limit and "paging" in response:
                 next_url = response["paging"].get("next")
                 if next_url:
-                    response = requests.get(next_url).json()
+                    response = self._make_request(next_url, {})
                     comments.extend(response.get("data", []))
                 else:
                     break
@@ -187,7 +189,7 @@ class InstagramAPIClient:
         """Make API request with retry logic"""
         for attempt in range(retries):
             try:
-                response = requests.get(url, params=params, timeout=30)
+                response = self.session.get(url, params=params, timeout=30)
                 response.raise_for_status()
                 return response.json()
             except requests.exceptions.RequestException as e:
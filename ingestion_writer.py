@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Escritor SQLite de larga vida para la tabla de ingestion.
+
+Reemplaza la conexión nueva + INSERT fila por fila de
+AgenteIngestionAnalisis._save_to_database:
+
+- Una sola conexión por agente, en modo WAL (synchronous=NORMAL), para que los
+  análisis puedan leer mientras se escribe.
+- Lotes con executemany dentro de transacciones explícitas (BEGIN ... COMMIT),
+  con un SAVEPOINT por lote y un COMMIT cada commit_rows filas: cada commit
+  reescribe en el WAL todas las páginas de índice tocadas, así que commits
+  frecuentes multiplican la escritura.
+- Upsert por id (ON CONFLICT(id) DO UPDATE) en lugar de INSERT OR REPLACE: la
+  fila se actualiza en su lugar (conserva rowid y created_at) sin borrar y
+  reinsertar en todos los índices. El id es la clave de deduplicación: las
+  fuentes externas ya traen un id estable y las cotizaciones del CSV usan
+  content_key (antes llevaban la hora de la corrida y cada re-ingesta
+  duplicaba la tabla).
+- Cola acotada (start/submit/join/close): los loops de ingestion entregan lotes
+  y un hilo escritor los persiste mientras se sigue leyendo o descargando;
+  submit bloquea si la cola está llena, así que nunca hay más de
+  queue_batches lotes esperando a SQLite.
+
+Si un lote falla en SQLite se reintenta fila por fila y se informan solo las
+filas con error, como hacía el camino original.
+"""
+
+import hashlib
+import json
+import queue
+import sqlite3
+import threading
+from typing import Any, Iterable, List, Optional, Tuple
+
+
+DEFAULT_BATCH_SIZE = 5_000
+DEFAULT_COMMIT_ROWS = 100_000
+DEFAULT_QUEUE_BATCHES = 8
+
+UPSERT_SQL = """
+    INSERT INTO ingestion_table
+    (id, source, platform, timestamp, user_query, chatbot_response, metadata, analysis)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        source = excluded.source,
+        platform = excluded.platform,
+        timestamp = excluded.timestamp,
+        user_query = excluded.user_query,
+        chatbot_response = excluded.chatbot_response,
+        metadata = excluded.metadata,
+        analysis = excluded.analysis
+"""
+
+_STOP = object()
+
+
+def content_key(*parts: str) -> str:
+    """Clave estable derivada del contenido (para ids de fuentes sin id propio)."""
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()[:20]
+
+
+def record_row(record: Any) -> Tuple:
+    """Fila de ingestion_table para un IngestionRecord (mismo formato que antes)."""
+    return (
+        record.id,
+        record.source,
+        record.platform,
+        record.timestamp,
+        record.user_query,
+        record.chatbot_response,
+        json.dumps(record.metadata) if record.metadata else None,
+        json.dumps(record.analysis) if record.analysis else None,
+    )
+
+
+class IngestionWriter:
+    """Escritor por lotes de IngestionRecord sobre una conexión WAL persistente."""
+
+    def __init__(
+        self,
+        db_path: str,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        commit_rows: int = DEFAULT_COMMIT_ROWS,
+        queue_batches: int = DEFAULT_QUEUE_BATCHES,
+    ):
+        """
+        Args:
+            db_path: Base SQLite (la tabla ingestion_table ya debe existir)
+            batch_size: Filas por executemany (y por lote encolado)
+            commit_rows: Filas por transacción
+            queue_batches: Lotes en espera antes de que submit bloquee
+        """
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.commit_rows = commit_rows
+        self.queue_batches = queue_batches
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._queued_saved = 0
+        self._queued_error: Optional[BaseException] = None
+
+    # ------------------------------------------------------------------
+    # Escritura sincrónica
+    # ------------------------------------------------------------------
+
+    def write_many(self, records: Iterable[Any]) -> int:
+        """Persiste registros en lotes; devuelve cuántos se guardaron."""
+        saved = 0
+        uncommitted = 0
+        batch: List[Any] = []
+        with self._lock:
+            try:
+                for record in records:
+                    batch.append(record)
+                    if len(batch) >= self.batch_size:
+                        written = self._write_batch(batch)
+                        saved += written
+                        uncommitted += written
+                        batch = []
+                        if uncommitted >= self.commit_rows:
+                            self._commit()
+                            uncommitted = 0
+                if batch:
+                    saved += self._write_batch(batch)
+            finally:
+                self._commit()
+        return saved
+
+    def _rows(self, records: List[Any]) -> List[Tuple]:
+        rows = []
+        for record in records:
+            try:
+                rows.append(record_row(record))
+            except Exception as e:
+                print(f"   ⚠️  Error guardando registro {getattr(record, 'id', '?')}: {e}")
+        return rows
+
+    def _write_batch(self, records: List[Any]) -> int:
+        """executemany de un lote en la transacción abierta (la abre si hace falta)"""
+        rows = self._rows(records)
+        if not self._conn.in_transaction:
+            self._conn.execute("BEGIN")
+        self._conn.execute("SAVEPOINT ingestion_batch")
+        try:
+            self._conn.executemany(UPSERT_SQL, rows)
+            self._conn.execute("RELEASE ingestion_batch")
+            return len(rows)
+        except sqlite3.Error:
+            self._conn.execute("ROLLBACK TO ingestion_batch")
+
+        # Aislar las filas problemáticas sin perder el resto del lote
+        saved = 0
+        for row in rows:
+            try:
+                self._conn.execute(UPSERT_SQL, row)
+                saved += 1
+            except sqlite3.Error as e:
+                print(f"   ⚠️  Error guardando registro {row[0]}: {e}")
+        self._conn.execute("RELEASE ingestion_batch")
+        return saved
+
+    def _commit(self) -> None:
+        if self._conn.in_transaction:
+            self._conn.execute("COMMIT")
+
+    # ------------------------------------------------------------------
+    # Cola acotada + hilo escritor
+    # ------------------------------------------------------------------
+
+    def start(self) -> "IngestionWriter":
+        """Arranca el hilo escritor que consume la cola acotada."""
+        if self._thread is None:
+            self._queue = queue.Queue(maxsize=self.queue_batches)
+            self._queued_saved = 0
+            self._queued_error = None
+            self._thread = threading.Thread(target=self._drain, name="ingestion-writer", daemon=True)
+            self._thread.start()
+        return self
+
+    def submit(self, records: Iterable[Any]) -> None:
+        """Encola registros en lotes de batch_size (bloquea si la cola está llena)."""
+        if self._thread is None:
+            self.start()
+        batch: List[Any] = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= self.batch_size:
+                self._queue.put(batch)
+                batch = []
+        if batch:
+            self._queue.put(batch)
+
+    def _drain(self) -> None:
+        uncommitted = 0
+        while True:
+            batch = self._queue.get()
+            with self._lock:
+                try:
+                    if batch is _STOP:
+                        self._commit()
+                        return
+                    written = self._write_batch(batch)
+                    self._queued_saved += written
+                    uncommitted += written
+                    if uncommitted >= self.commit_rows:
+                        self._commit()
+                        uncommitted = 0
+                except BaseException as e:  # se re-lanza en join()
+                    self._queued_error = e
+                    if batch is _STOP:
+                        return
+
+    def join(self) -> int:
+        """Espera a que se persista todo lo encolado; devuelve las filas guardadas."""
+        if self._thread is None:
+            return 0
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        if self._queued_error is not None:
+            raise self._queued_error
+        return self._queued_saved
+
+    def close(self) -> None:
+        """Vacía la cola y cierra la conexión."""
+        self.join()
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "IngestionWriter":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+KB Search Index
+===============
+
+Persistent inverted index behind KBIndexingAgent.search_kb.
+
+The flattened KB entries (see KBIndexingAgent._index_json_structure) are stored
+once in a SQLite file together with:
+- words: search word -> packed entry ids (the words search_kb scores on:
+  key parts split on "_", path tokens, value tokens)
+- terms: \\w+ token -> packed entry ids, used to find the candidates of the
+  exact-substring match (every entry containing the query contains its
+  longest \\w+ run inside one of its terms)
+- an index on the entry path, used for path-prefix lookups
+
+Only candidates are scored: word matches are counted from the postings and
+the exact-substring check runs in SQL over stored lowercased key/path/value,
+mirroring score_entry (the scan's scoring) so results are identical. Entry
+JSON is only decoded for the returned top results.
+
+Each source file is tracked by size, mtime and sha256, so the agent
+re-indexes only files whose hash changed. Opening the index is lazy and
+SQLite reads pages on demand, so cold start does not parse the KB.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Path terms that get the structured-search boost
+STRUCTURED_PATH_TERMS = ["producto", "precio", "espesor", "autoportancia"]
+
+_WORD_RE = re.compile(r'\w+')
+_MAX_SQL_VARS = 900
+
+
+def score_entry(
+    entry: Dict[str, Any],
+    query_lower: str,
+    query_words: Set[str],
+    search_type: str
+) -> Tuple[float, Optional[str]]:
+    """Score one index entry for a query (shared by the scan and the index)"""
+    score = 0.0
+    match_type = None
+
+    # Keyword matching
+    if search_type in ["hybrid", "keyword"]:
+        key_lower = entry.get("key", "").lower()
+        path_lower = entry.get("path", "").lower()
+        value_lower = entry.get("value", "").lower() if entry.get("value") else ""
+
+        # Exact match
+        if query_lower in key_lower or query_lower in path_lower:
+            score += 10.0
+            match_type = "exact_key"
+        elif query_lower in value_lower:
+            score += 8.0
+            match_type = "exact_value"
+
+        # Word matching
+        key_words = set(key_lower.split("_"))
+        path_words = set(_WORD_RE.findall(path_lower))
+        value_words = set(value_lower.split()) if value_lower else set()
+
+        common_words = query_words.intersection(key_words.union(path_words).union(value_words))
+        if common_words:
+            score += len(common_words) * 2.0
+            match_type = match_type or "word_match"
+
+    # Structured search (path-based)
+    if search_type in ["hybrid", "structured"]:
+        path = entry.get("path", "")
+        # Boost score for product-related paths
+        if any(term in path for term in STRUCTURED_PATH_TERMS):
+            score += 1.0
+
+    return score, match_type
+
+
+def entry_words(entry: Dict[str, Any]) -> Set[str]:
+    """Words an entry can match in score_entry's word matching"""
+    key_lower = entry.get("key", "").lower()
+    value_lower = entry.get("value", "").lower() if entry.get("value") else ""
+    words = set(key_lower.split("_"))
+    words.update(_WORD_RE.findall(entry.get("path", "").lower()))
+    words.update(value_lower.split())
+    return words
+
+
+def entry_terms(entry: Dict[str, Any]) -> Set[str]:
+    """\\w+ tokens of key, path and value (substring-match candidates)"""
+    terms = set(_WORD_RE.findall(entry.get("key", "").lower()))
+    terms.update(_WORD_RE.findall(entry.get("path", "").lower()))
+    if entry.get("value"):
+        terms.update(_WORD_RE.findall(entry["value"].lower()))
+    return terms
+
+
+def _pack(ids: List[int]) -> bytes:
+    return array("I", ids).tobytes()
+
+
+def _unpack(blob: bytes) -> array:
+    ids = array("I")
+    ids.frombytes(blob)
+    return ids
+
+
+class KBSearchIndex:
+    """Inverted index of KB entries persisted in a SQLite file"""
+
+    SCHEMA_VERSION = 1
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is not None:
+            return self._conn
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != self.SCHEMA_VERSION:
+            conn.executescript(
+                "DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS entries;"
+                "DROP TABLE IF EXISTS words; DROP TABLE IF EXISTS terms;"
+            )
+        conn.executescript(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL, level INTEGER, rank INTEGER,"
+            " size INTEGER, mtime_ns INTEGER, sha256 TEXT, metadata TEXT);"
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " id INTEGER PRIMARY KEY, file_id INTEGER NOT NULL, ord INTEGER NOT NULL,"
+            " level INTEGER NOT NULL, rank INTEGER NOT NULL, path TEXT NOT NULL,"
+            " boosted INTEGER NOT NULL, key_l TEXT NOT NULL, path_l TEXT NOT NULL,"
+            " value_l TEXT NOT NULL, entry TEXT NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS idx_entries_boosted ON entries (boosted, level, rank, ord);"
+            "CREATE INDEX IF NOT EXISTS idx_entries_path ON entries (path);"
+            "CREATE INDEX IF NOT EXISTS idx_entries_file ON entries (file_id);"
+            "CREATE TABLE IF NOT EXISTS words ("
+            " word TEXT NOT NULL, file_id INTEGER NOT NULL, ids BLOB NOT NULL,"
+            " PRIMARY KEY (word, file_id)) WITHOUT ROWID;"
+            "CREATE TABLE IF NOT EXISTS terms ("
+            " term TEXT NOT NULL, file_id INTEGER NOT NULL, ids BLOB NOT NULL,"
+            " PRIMARY KEY (term, file_id)) WITHOUT ROWID;"
+            f"PRAGMA user_version = {self.SCHEMA_VERSION};"
+        )
+        self._conn = conn
+        return conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def file_states(self) -> Dict[str, Dict[str, Any]]:
+        """Indexed files: name -> {size, mtime_ns, sha256, level, rank}"""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT name, size, mtime_ns, sha256, level, rank FROM files"
+            ).fetchall()
+        return {
+            name: {"size": size, "mtime_ns": mtime_ns, "sha256": sha256, "level": level, "rank": rank}
+            for name, size, mtime_ns, sha256, level, rank in rows
+        }
+
+    def touch_file(self, name: str, size: int, mtime_ns: int) -> None:
+        """Record a new stat for a file whose content hash did not change"""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "UPDATE files SET size = ?, mtime_ns = ? WHERE name = ?", (size, mtime_ns, name)
+                )
+
+    def replace_file(
+        self,
+        name: str,
+        level: int,
+        rank: int,
+        size: int,
+        mtime_ns: int,
+        sha256: str,
+        metadata: Dict[str, Any],
+        entries: List[Dict[str, Any]]
+    ) -> None:
+        """Replace every entry and posting of one source file"""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                self._delete_file(conn, name)
+                file_id = conn.execute(
+                    "INSERT INTO files (name, level, rank, size, mtime_ns, sha256, metadata) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (name, level, rank, size, mtime_ns, sha256, json.dumps(metadata))
+                ).lastrowid
+
+                words: Dict[str, List[int]] = {}
+                terms: Dict[str, List[int]] = {}
+                for ord_, entry in enumerate(entries):
+                    path = entry.get("path", "")
+                    entry_id = conn.execute(
+                        "INSERT INTO entries (file_id, ord, level, rank, path, boosted,"
+                        " key_l, path_l, value_l, entry) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (file_id, ord_, level, rank, path,
+                         int(any(term in path for term in STRUCTURED_PATH_TERMS)),
+                         entry.get("key", "").lower(), path.lower(),
+                         entry.get("value", "").lower() if entry.get("value") else "",
+                         json.dumps(entry, ensure_ascii=False, separators=(",", ":")))
+                    ).lastrowid
+                    for word in entry_words(entry):
+                        words.setdefault(word, []).append(entry_id)
+                    for term in entry_terms(entry):
+                        terms.setdefault(term, []).append(entry_id)
+
+                conn.executemany(
+                    "INSERT INTO words (word, file_id, ids) VALUES (?, ?, ?)",
+                    ((word, file_id, _pack(ids)) for word, ids in words.items())
+                )
+                conn.executemany(
+                    "INSERT INTO terms (term, file_id, ids) VALUES (?, ?, ?)",
+                    ((term, file_id, _pack(ids)) for term, ids in terms.items())
+                )
+
+    def remove_files(self, names: Iterable[str]) -> None:
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                for name in names:
+                    self._delete_file(conn, name)
+
+    def _delete_file(self, conn: sqlite3.Connection, name: str) -> None:
+        row = conn.execute("SELECT id FROM files WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return
+        conn.execute("DELETE FROM words WHERE file_id = ?", row)
+        conn.execute("DELETE FROM terms WHERE file_id = ?", row)
+        conn.execute("DELETE FROM entries WHERE file_id = ?", row)
+        conn.execute("DELETE FROM files WHERE id = ?", row)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            conn = self._connect()
+            counts = {
+                table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("files", "entries", "words", "terms")
+            }
+        counts["size_bytes"] = self.path.stat().st_size if self.path.exists() else 0
+        return counts
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def search(
+        self,
+        query: str,
+        level_priority: Optional[int] = None,
+        search_type: str = "hybrid",
+        max_results: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Same results (and order) as scanning every entry with score_entry"""
+        query_lower = query.lower()
+        query_words = set(query_lower.split())
+        keyword = search_type in ["hybrid", "keyword"]
+        structured = search_type in ["hybrid", "structured"]
+
+        with self._lock:
+            conn = self._connect()
+            # id -> (score, match_type, (level, rank, ord))
+            scored: Dict[int, Tuple[float, Optional[str], tuple]] = {}
+            if keyword:
+                word_counts = self._word_counts(conn, query_words)
+                substring_ids = self._substring_candidates(conn, query_lower)
+                ids = None if substring_ids is None else substring_ids.union(word_counts)
+                for entry_id, level, rank, ord_, boosted, exact in self._candidate_rows(
+                    conn, ids, query_lower, level_priority
+                ):
+                    score = float(exact)
+                    match_type = "exact_key" if exact == 10 else "exact_value" if exact == 8 else None
+                    common = word_counts.get(entry_id, 0)
+                    if common:
+                        score += common * 2.0
+                        match_type = match_type or "word_match"
+                    if structured and boosted:
+                        score += 1.0
+                    if score > 0:
+                        scored[entry_id] = (score, match_type, (level, rank, ord_))
+
+            # Entries that only get the structured boost all score 1.0; they can
+            # only reach the top max_results when fewer entries matched a keyword
+            if structured:
+                matched = sum(1 for score, _, _ in scored.values() if score > 1.0)
+                needed = max_results - matched
+                if needed > 0:
+                    for entry_id, level, rank, ord_ in self._boosted_entries(conn, level_priority, needed + matched):
+                        if entry_id not in scored:
+                            scored[entry_id] = (1.0, None, (level, rank, ord_))
+
+            # Score desc, then level asc, then scan order (file rank, entry order)
+            ranked = sorted(scored.items(), key=lambda item: (-item[1][0], item[1][2]))[:max_results]
+            rows = self._entry_documents(conn, [entry_id for entry_id, _ in ranked])
+            files = self._file_metadata(conn)
+
+        results = []
+        for entry_id, (score, match_type, (level, _, _)) in ranked:
+            file_id, entry = rows[entry_id]
+            results.append({
+                "entry": json.loads(entry),
+                "score": score,
+                "level": level,
+                "file": files[file_id][0],
+                "match_type": match_type,
+                "metadata": files[file_id][1],
+            })
+        return results
+
+    def search_path(
+        self,
+        prefix: str,
+        level_priority: Optional[int] = None,
+        max_results: int = 50
+    ) -> List[Dict[str, Any]]:
+        """Entries whose path starts with prefix (range scan on the path index)"""
+        sql = (
+            "SELECT e.entry, e.level, f.name FROM entries e JOIN files f ON f.id = e.file_id "
+            "WHERE e.path >= ? AND e.path < ?"
+        )
+        params: List[Any] = [prefix, prefix + "\U0010ffff"]
+        if level_priority:
+            sql += " AND e.level = ?"
+            params.append(level_priority)
+        sql += " ORDER BY e.path LIMIT ?"
+        params.append(max_results)
+        with self._lock:
+            rows = self._connect().execute(sql, params).fetchall()
+        return [{"entry": json.loads(entry), "level": level, "file": name} for entry, level, name in rows]
+
+    def _word_counts(self, conn: sqlite3.Connection, query_words: Set[str]) -> Dict[int, int]:
+        """Entry id -> number of query words it contains"""
+        counts: Dict[int, int] = {}
+        words = list(query_words)
+        for start in range(0, len(words), _MAX_SQL_VARS):
+            chunk = words[start:start + _MAX_SQL_VARS]
+            for (blob,) in conn.execute(
+                f"SELECT ids FROM words WHERE word IN ({','.join('?' * len(chunk))})", chunk
+            ):
+                for entry_id in _unpack(blob):
+                    counts[entry_id] = counts.get(entry_id, 0) + 1
+        return counts
+
+    def _substring_candidates(self, conn: sqlite3.Connection, query_lower: str) -> Optional[Set[int]]:
+        """Entry ids that may contain the whole query (None = every entry)"""
+        runs = _WORD_RE.findall(query_lower)
+        if not runs:
+            # No \w run to anchor the substring match: any entry may contain the query
+            return None
+        candidates: Set[int] = set()
+        for (blob,) in conn.execute(
+            "SELECT ids FROM terms WHERE instr(term, ?) > 0", (max(runs, key=len),)
+        ):
+            candidates.update(_unpack(blob))
+        return candidates
+
+    def _candidate_rows(
+        self,
+        conn: sqlite3.Connection,
+        ids: Optional[Set[int]],
+        query_lower: str,
+        level_priority: Optional[int]
+    ) -> Iterable[tuple]:
+        """(id, level, rank, ord, boosted, exact score) of the candidate entries"""
+        columns = (
+            "SELECT id, level, rank, ord, boosted,"
+            " CASE WHEN instr(key_l, ?1) > 0 OR instr(path_l, ?1) > 0 THEN 10"
+            " WHEN instr(value_l, ?1) > 0 THEN 8 ELSE 0 END FROM entries"
+        )
+        level_sql = " AND level = ?2" if level_priority else ""
+        params: List[Any] = [query_lower, level_priority] if level_priority else [query_lower]
+        if ids is None:
+            yield from conn.execute(columns + " WHERE 1" + level_sql, params)
+            return
+        ids = sorted(ids)
+        offset = len(params) + 1
+        for start in range(0, len(ids), _MAX_SQL_VARS):
+            chunk = ids[start:start + _MAX_SQL_VARS]
+            placeholders = ",".join(f"?{offset + i}" for i in range(len(chunk)))
+            yield from conn.execute(f"{columns} WHERE id IN ({placeholders}){level_sql}", params + chunk)
+
+    def _boosted_entries(
+        self, conn: sqlite3.Connection, level_priority: Optional[int], limit: int
+    ) -> List[tuple]:
+        sql = "SELECT id, level, rank, ord FROM entries WHERE boosted = 1"
+        params: List[Any] = []
+        if level_priority:
+            sql += " AND level = ?"
+            params.append(level_priority)
+        sql += " ORDER BY level, rank, ord LIMIT ?"
+        params.append(limit)
+        return conn.execute(sql, params).fetchall()
+
+    def _entry_documents(self, conn: sqlite3.Connection, ids: List[int]) -> Dict[int, Tuple[int, str]]:
+        if not ids:
+            return {}
+        rows = conn.execute(
+            f"SELECT id, file_id, entry FROM entries WHERE id IN ({','.join('?' * len(ids))})", ids
+        )
+        return {entry_id: (file_id, entry) for entry_id, file_id, entry in rows}
+
+    def _file_metadata(self, conn: sqlite3.Connection) -> Dict[int, Tuple[str, Dict[str, Any]]]:
+        return {
+            file_id: (name, json.loads(metadata) if metadata else {})
+            for file_id, name, metadata in conn.execute("SELECT id, name, metadata FROM files")
+        }
@@ -8,14 +8,20 @@ Evaluates chatbot interactions with knowledge base using industry-standard metri
 - Coherence (logical consistency)
 - Accuracy (BLEU, Precision, Recall, F1)
 - Source of Truth compliance
+
+Batch evaluation tokenizes each sample once (SampleTokens) and shares the
+tokens across all metrics; benchmark_architecture can fan samples out to a
+process pool and builds its aggregates in a single streaming pass
+(BenchmarkAccumulator).
 """
 
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Iterable, Iterator, Set
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 import json
-from collections import Counter
+from collections import Counter, deque
 import re
 from loguru import logger
 
@@ -39,6 +45,40 @@ class EvaluationResult:
     recommendations: List[str] = field(default_factory=list)
 
 
+_QUERY_TERM_RE = re.compile(r'\b\w{4,}\b')
+
+
+@dataclass
+class SampleTokens:
+    """Normalized text and tokens of one sample, shared by every metric"""
+    query_lower: str
+    response_lower: str
+    query_terms: Set[str]
+    word_count: int
+    response_words: Optional[Set[str]] = None
+    truth_words: Optional[Set[str]] = None
+
+
+def tokenize_sample(query: str, response: str, ground_truth: Optional[str] = None) -> SampleTokens:
+    """
+    Tokenize a sample once for relevance, groundedness, coherence and accuracy
+    
+    Word sets for accuracy are only built when there is a ground truth.
+    """
+    query_lower = query.lower()
+    response_lower = response.lower()
+    tokens = SampleTokens(
+        query_lower=query_lower,
+        response_lower=response_lower,
+        query_terms=set(_QUERY_TERM_RE.findall(query_lower)),
+        word_count=len(response.split())
+    )
+    if ground_truth:
+        tokens.response_words = set(response_lower.split())
+        tokens.truth_words = set(ground_truth.lower().split())
+    return tokens
+
+
 @dataclass
 class BenchmarkResult:
     """Benchmark result for KB architecture"""
@@ -103,6 +143,83 @@ class KnowledgeBaseEvaluator:
         Returns:
             EvaluationResult with metrics
         """
+        result = self._evaluate(
+            query, response, sources_consulted, ground_truth, expected_sources
+        )
+        self.evaluation_history.append(result)
+        return result
+    
+    def evaluate_batch(
+        self,
+        samples: Iterable[Dict[str, Any]],
+        workers: int = 1,
+        chunk_size: int = 500
+    ) -> List[EvaluationResult]:
+        """
+        Evaluate many samples, optionally across a process pool
+        
+        Args:
+            samples: Iterable of {query, response, sources, ground_truth, expected_sources}
+            workers: Number of processes (1 = in the current process)
+            chunk_size: Samples per task sent to a worker
+            
+        Returns:
+            EvaluationResults in input order (scores identical to evaluate_interaction)
+        """
+        return list(self.iter_evaluations(samples, workers, chunk_size))
+    
+    def iter_evaluations(
+        self,
+        samples: Iterable[Dict[str, Any]],
+        workers: int = 1,
+        chunk_size: int = 500
+    ) -> Iterator[EvaluationResult]:
+        """Yield EvaluationResults in input order, appending them to the history"""
+        kb_path = str(self.kb_path) if self.kb_path else None
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        pending = deque()
+        
+        try:
+            for chunk in _chunks(samples, chunk_size):
+                if executor is None:
+                    yield from self._extend_history(self._evaluate_samples(chunk))
+                    continue
+                pending.append(executor.submit(_evaluate_chunk, kb_path, chunk))
+                # Bounded window: at most 2 chunks per worker in flight
+                while len(pending) > 2 * workers:
+                    yield from self._extend_history(pending.popleft().result())
+            while pending:
+                yield from self._extend_history(pending.popleft().result())
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+    
+    def _extend_history(self, results: List[EvaluationResult]) -> List[EvaluationResult]:
+        self.evaluation_history.extend(results)
+        return results
+    
+    def _evaluate_samples(self, samples: List[Dict[str, Any]]) -> List[EvaluationResult]:
+        return [
+            self._evaluate(
+                query=sample.get("query", ""),
+                response=sample.get("response", ""),
+                sources_consulted=sample.get("sources", []),
+                ground_truth=sample.get("ground_truth"),
+                expected_sources=sample.get("expected_sources")
+            )
+            for sample in samples
+        ]
+    
+    def _evaluate(
+        self,
+        query: str,
+        response: str,
+        sources_consulted: List[str],
+        ground_truth: Optional[str] = None,
+        expected_sources: Optional[List[str]] = None
+    ) -> EvaluationResult:
+        """Evaluate a sample without recording it in the history"""
+        tokens = tokenize_sample(query, response, ground_truth)
         result = EvaluationResult(
             query=query,
             response=response,
@@ -111,19 +228,19 @@ class KnowledgeBaseEvaluator:
         )
         
         # 1. Relevance Score (0-1): How well answer matches query
-        result.relevance_score = self._calculate_relevance(query, response)
+        result.relevance_score = self._calculate_relevance(query, response, tokens)
         
         # 2. Groundedness Score (0-1): How much answer relies on KB
         result.groundedness_score = self._calculate_groundedness(
-            response, sources_consulted
+            response, sources_consulted, tokens
         )
         
         # 3. Coherence Score (0-1): Logical consistency
-        result.coherence_score = self._calculate_coherence(response)
+        result.coherence_score = self._calculate_coherence(response, tokens)
         
         # 4. Accuracy Score (0-1): If ground truth available
         if ground_truth:
-            result.accuracy_score = self._calculate_accuracy(response, ground_truth)
+            result.accuracy_score = self._calculate_accuracy(response, ground_truth, tokens)
         
         # 5. Source of Truth Validation
         response_data = {"content": response, "sources": sources_consulted}
@@ -138,7 +255,7 @@ class KnowledgeBaseEvaluator:
         }
         
         # 6. Detect leaks (missing information)
-        result.leaks_detected = self._detect_leaks(query, response, sources_consulted)
+        result.leaks_detected = self._detect_leaks(query, response, sources_consulted, tokens)
         
         # 7. Generate recommendations
         result.recommendations = self._generate_recommendations(result)
@@ -153,20 +270,22 @@ class KnowledgeBaseEvaluator:
             "leak_count": len(result.leaks_detected)
         }
         
-        self.evaluation_history.append(result)
         return result
     
-    def _calculate_relevance(self, query: str, response: str) -> float:
+    def _calculate_relevance(
+        self, query: str, response: str, tokens: Optional[SampleTokens] = None
+    ) -> float:
         """
         Calculate relevance: how well answer matches query intent
         
         Uses keyword overlap and semantic similarity heuristics
         """
-        query_lower = query.lower()
-        response_lower = response.lower()
+        tokens = tokens or tokenize_sample(query, response)
+        query_lower = tokens.query_lower
+        response_lower = tokens.response_lower
         
         # Extract key terms from query
-        query_terms = set(re.findall(r'\b\w{4,}\b', query_lower))
+        query_terms = tokens.query_terms
         
         # Check if response addresses query terms
         matches = sum(1 for term in query_terms if term in response_lower)
@@ -185,7 +304,9 @@ class KnowledgeBaseEvaluator:
         
         return min(1.0, relevance)
     
-    def _calculate_groundedness(self, response: str, sources: List[str]) -> float:
+    def _calculate_groundedness(
+        self, response: str, sources: List[str], tokens: Optional[SampleTokens] = None
+    ) -> float:
         """
         Calculate groundedness: how much answer relies on KB data
         
@@ -201,7 +322,7 @@ class KnowledgeBaseEvaluator:
             "BMC_Base", "json", "archivo"
         ]
         
-        response_lower = response.lower()
+        response_lower = tokens.response_lower if tokens else response.lower()
         indicators_found = sum(1 for indicator in data_indicators 
                               if indicator in response_lower)
         
@@ -220,7 +341,7 @@ class KnowledgeBaseEvaluator:
         groundedness = base_score + indicator_score - vague_penalty
         return max(0.0, min(1.0, groundedness))
     
-    def _calculate_coherence(self, response: str) -> float:
+    def _calculate_coherence(self, response: str, tokens: Optional[SampleTokens] = None) -> float:
         """
         Calculate coherence: logical consistency of response
         """
@@ -231,7 +352,7 @@ class KnowledgeBaseEvaluator:
             ("siempre", "nunca"),
         ]
         
-        response_lower = response.lower()
+        response_lower = tokens.response_lower if tokens else response.lower()
         contradiction_count = sum(
             1 for (term1, term2) in contradictions
             if term1 in response_lower and term2 in response_lower
@@ -245,18 +366,22 @@ class KnowledgeBaseEvaluator:
         structure_score = 0.3 if has_structure else 0.0
         
         # Check completeness (not too short, not too long)
-        word_count = len(response.split())
+        word_count = tokens.word_count if tokens else len(response.split())
         length_score = 0.4 if 20 <= word_count <= 500 else 0.2
         
         return min(1.0, structure_score + length_score + 0.3)
     
-    def _calculate_accuracy(self, response: str, ground_truth: str) -> float:
+    def _calculate_accuracy(
+        self, response: str, ground_truth: str, tokens: Optional[SampleTokens] = None
+    ) -> float:
         """
         Calculate accuracy using BLEU-like metrics
         """
+        if tokens is None or tokens.truth_words is None:
+            tokens = tokenize_sample("", response, ground_truth)
         # Simple word overlap
-        response_words = set(response.lower().split())
-        truth_words = set(ground_truth.lower().split())
+        response_words = tokens.response_words
+        truth_words = tokens.truth_words
         
         if not truth_words:
             return 0.0
@@ -275,7 +400,8 @@ class KnowledgeBaseEvaluator:
         self, 
         query: str, 
         response: str, 
-        sources: List[str]
+        sources: List[str],
+        tokens: Optional[SampleTokens] = None
     ) -> List[str]:
         """
         Detect knowledge leaks: information gaps in KB
@@ -288,13 +414,14 @@ class KnowledgeBaseEvaluator:
             "no tengo esa información", "no disponible en base"
         ]
         
-        response_lower = response.lower()
+        response_lower = tokens.response_lower if tokens else response.lower()
+        query_lower = tokens.query_lower if tokens else query.lower()
         if any(pattern in response_lower for pattern in unknown_patterns):
             leaks.append(f"Missing information for query: {query[:100]}")
         
         # Check if query asks for specific data but response is vague
         specific_indicators = ["precio de", "costo de", "espesor", "autoportancia"]
-        if any(indicator in query.lower() for indicator in specific_indicators):
+        if any(indicator in query_lower for indicator in specific_indicators):
             if not any(indicator in response_lower for indicator in specific_indicators):
                 leaks.append(f"Specific data requested but not provided: {query[:100]}")
         
@@ -343,7 +470,9 @@ class KnowledgeBaseEvaluator:
     def benchmark_architecture(
         self,
         evaluation_dataset: List[Dict[str, Any]],
-        kb_structure: Optional[Dict] = None
+        kb_structure: Optional[Dict] = None,
+        workers: int = 1,
+        chunk_size: int = 500
     ) -> BenchmarkResult:
         """
         Benchmark entire KB architecture
@@ -351,70 +480,18 @@ class KnowledgeBaseEvaluator:
         Args:
             evaluation_dataset: List of {query, response, sources, ground_truth}
             kb_structure: KB structure metadata
+            workers: Number of processes (1 = in the current process)
+            chunk_size: Samples per task sent to a worker
             
         Returns:
             BenchmarkResult with comprehensive metrics
         """
         logger.info(f"Benchmarking KB architecture with {len(evaluation_dataset)} samples")
         
-        results = []
-        for sample in evaluation_dataset:
-            result = self.evaluate_interaction(
-                query=sample.get("query", ""),
-                response=sample.get("response", ""),
-                sources_consulted=sample.get("sources", []),
-                ground_truth=sample.get("ground_truth"),
-                expected_sources=sample.get("expected_sources")
-            )
-            results.append(result)
-        
-        # Calculate aggregate metrics
-        avg_relevance = sum(r.relevance_score for r in results) / len(results)
-        avg_groundedness = sum(r.groundedness_score for r in results) / len(results)
-        avg_coherence = sum(r.coherence_score for r in results) / len(results)
-        avg_accuracy = sum(r.accuracy_score for r in results) / len(results)
-        
-        # Source compliance
-        compliant = sum(
-            1 for r in results 
-            if r.source_validation and r.source_validation["valid"]
-        )
-        compliance_rate = compliant / len(results) if results else 0.0
-        
-        # Leak rate
-        total_leaks = sum(len(r.leaks_detected) for r in results)
-        leak_rate = total_leaks / len(results) if results else 0.0
-        
-        # KB coverage (estimated)
-        kb_coverage = self._estimate_kb_coverage(results, kb_structure)
-        
-        # Instruction effectiveness (based on source compliance and coherence)
-        instruction_effectiveness = (compliance_rate + avg_coherence) / 2
-        
-        benchmark = BenchmarkResult(
-            timestamp=datetime.now().isoformat(),
-            total_evaluations=len(results),
-            average_relevance=avg_relevance,
-            average_groundedness=avg_groundedness,
-            average_coherence=avg_coherence,
-            average_accuracy=avg_accuracy,
-            source_compliance_rate=compliance_rate,
-            leak_rate=leak_rate,
-            kb_coverage_score=kb_coverage,
-            instruction_effectiveness=instruction_effectiveness,
-            detailed_metrics={
-                "relevance_distribution": self._calculate_distribution(
-                    [r.relevance_score for r in results]
-                ),
-                "groundedness_distribution": self._calculate_distribution(
-                    [r.groundedness_score for r in results]
-                ),
-                "leak_types": self._categorize_leaks(results),
-                "source_usage": self._analyze_source_usage(results)
-            }
-        )
-        
-        return benchmark
+        accumulator = BenchmarkAccumulator()
+        for result in self.iter_evaluations(evaluation_dataset, workers, chunk_size):
+            accumulator.add(result)
+        return accumulator.build(kb_structure)
     
     def _estimate_kb_coverage(
         self, 
@@ -434,15 +511,7 @@ class KnowledgeBaseEvaluator:
     
     def _calculate_distribution(self, scores: List[float]) -> Dict[str, float]:
         """Calculate score distribution"""
-        if not scores:
-            return {}
-        
-        return {
-            "min": min(scores),
-            "max": max(scores),
-            "mean": sum(scores) / len(scores),
-            "median": sorted(scores)[len(scores) // 2]
-        }
+        return _distribution(scores)
     
     def _categorize_leaks(self, results: List[EvaluationResult]) -> Dict[str, int]:
         """Categorize types of leaks detected"""
@@ -450,14 +519,7 @@ class KnowledgeBaseEvaluator:
         
         for result in results:
             for leak in result.leaks_detected:
-                if "precio" in leak.lower() or "costo" in leak.lower():
-                    categories["pricing"] += 1
-                elif "espesor" in leak.lower() or "autoportancia" in leak.lower():
-                    categories["specifications"] += 1
-                elif "no sources" in leak.lower():
-                    categories["source_missing"] += 1
-                else:
-                    categories["general"] += 1
+                categories[_leak_category(leak)] += 1
         
         return dict(categories)
     
@@ -543,3 +605,119 @@ Generated: {benchmark.timestamp}
         
         logger.info(f"Evaluation report exported to {output_path}")
         return report
+
+
+class BenchmarkAccumulator:
+    """
+    Aggregates EvaluationResults in one streaming pass.
+    
+    Sums are accumulated in input order, so the averages are identical to
+    summing the full results list; only relevance and groundedness scores
+    are kept (for the distribution medians).
+    """
+    
+    def __init__(self):
+        self.count = 0
+        self.relevance_sum = 0
+        self.groundedness_sum = 0
+        self.coherence_sum = 0
+        self.accuracy_sum = 0
+        self.compliant = 0
+        self.total_leaks = 0
+        self.covered = 0
+        self.relevance_scores: List[float] = []
+        self.groundedness_scores: List[float] = []
+        self.leak_types = Counter()
+        self.source_usage = Counter()
+    
+    def add(self, result: EvaluationResult):
+        """Add one evaluation to the aggregates"""
+        self.count += 1
+        self.relevance_sum += result.relevance_score
+        self.groundedness_sum += result.groundedness_score
+        self.coherence_sum += result.coherence_score
+        self.accuracy_sum += result.accuracy_score
+        if result.source_validation and result.source_validation["valid"]:
+            self.compliant += 1
+        self.total_leaks += len(result.leaks_detected)
+        if not result.leaks_detected and result.relevance_score > 0.6:
+            self.covered += 1
+        self.relevance_scores.append(result.relevance_score)
+        self.groundedness_scores.append(result.groundedness_score)
+        for leak in result.leaks_detected:
+            self.leak_types[_leak_category(leak)] += 1
+        for source in result.sources_consulted:
+            self.source_usage[source] += 1
+    
+    def build(self, kb_structure: Optional[Dict] = None) -> BenchmarkResult:
+        """Build the BenchmarkResult from the aggregates"""
+        n = self.count
+        avg_coherence = self.coherence_sum / n if n else 0.0
+        compliance_rate = self.compliant / n if n else 0.0
+        
+        return BenchmarkResult(
+            timestamp=datetime.now().isoformat(),
+            total_evaluations=n,
+            average_relevance=self.relevance_sum / n if n else 0.0,
+            average_groundedness=self.groundedness_sum / n if n else 0.0,
+            average_coherence=avg_coherence,
+            average_accuracy=self.accuracy_sum / n if n else 0.0,
+            source_compliance_rate=compliance_rate,
+            leak_rate=self.total_leaks / n if n else 0.0,
+            # KB coverage (estimated): queries without leaks and with good relevance
+            kb_coverage_score=self.covered / n if n else 0.0,
+            # Instruction effectiveness (based on source compliance and coherence)
+            instruction_effectiveness=(compliance_rate + avg_coherence) / 2,
+            detailed_metrics={
+                "relevance_distribution": _distribution(self.relevance_scores),
+                "groundedness_distribution": _distribution(self.groundedness_scores),
+                "leak_types": dict(self.leak_types),
+                "source_usage": dict(self.source_usage)
+            }
+        )
+
+
+def _distribution(scores: List[float]) -> Dict[str, float]:
+    """Score distribution (min, max, mean, median)"""
+    if not scores:
+        return {}
+    
+    return {
+        "min": min(scores),
+        "max": max(scores),
+        "mean": sum(scores) / len(scores),
+        "median": sorted(scores)[len(scores) // 2]
+    }
+
+
+def _leak_category(leak: str) -> str:
+    leak_lower = leak.lower()
+    if "precio" in leak_lower or "costo" in leak_lower:
+        return "pricing"
+    if "espesor" in leak_lower or "autoportancia" in leak_lower:
+        return "specifications"
+    if "no sources" in leak_lower:
+        return "source_missing"
+    return "general"
+
+
+def _chunks(samples: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    chunk = []
+    for sample in samples:
+        chunk.append(sample)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+_WORKER_EVALUATORS: Dict[Optional[str], KnowledgeBaseEvaluator] = {}
+
+
+def _evaluate_chunk(kb_path: Optional[str], samples: List[Dict[str, Any]]) -> List[EvaluationResult]:
+    """Process-pool task: evaluate a chunk with a per-process evaluator"""
+    evaluator = _WORKER_EVALUATORS.get(kb_path)
+    if evaluator is None:
+        evaluator = _WORKER_EVALUATORS[kb_path] = KnowledgeBaseEvaluator(kb_path)
+    return evaluator._evaluate_samples(samples)
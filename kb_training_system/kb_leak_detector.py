@@ -4,18 +4,115 @@ Knowledge Base Leak Detector
 
 Detects knowledge gaps and leaks in chatbot interactions.
 Identifies missing information, incorrect responses, and KB coverage issues.
+
+All response/query patterns are compiled into a single PatternScanner, so each
+text is scanned once. Leak history is an append-only JSONL log
+(leak_history.jsonl) compacted periodically; a legacy leak_history.json is
+migrated on first load.
 """
 
-from typing import Dict, List, Any, Optional, Set
-from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Any, Optional, Set
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from pathlib import Path
 import json
+import os
 import re
+import time
 from collections import defaultdict
 from loguru import logger
 
 
+# Patterns indicating missing information
+MISSING_INFO_PATTERNS = [
+    r"no tengo (esa|la) información",
+    r"no (está|estan) disponible",
+    r"no encuentro",
+    r"no sé",
+    r"no disponible en base",
+    r"no (tengo|tiene) (esa|ese|esa) (información|dato|precio)"
+]
+
+# Query asks for specific data -> response should contain it
+SPECIFIC_INDICATORS = {
+    "precio": ["precio", "costo", "valor", "$"],
+    "espesor": ["espesor", "thickness", "grosor"],
+    "autoportancia": ["autoportancia", "luz", "span", "distancia"],
+    "fórmula": ["fórmula", "cálculo", "formula", "calcular"]
+}
+
+# First match wins
+CATEGORY_KEYWORDS = [
+    ("pricing", ["precio", "costo", "valor", "$"]),
+    ("specifications", ["espesor", "thickness", "grosor"]),
+    ("specifications", ["autoportancia", "luz", "span"]),
+    ("formulas", ["fórmula", "calcular", "cálculo"]),
+]
+
+PRODUCT_KEYWORDS = ["isodec", "isoroof", "isopanel", "isowall"]
+
+# Generic/hallucinated phrasing when no source was consulted
+GENERIC_PHRASES = [
+    "en general", "típicamente", "usualmente",
+    "puede variar", "depende"
+]
+
+_MEASUREMENT_RE = re.compile(r'\d+\s*(mm|m|cm)')
+_NUMBER_RE = re.compile(r'\d+\.?\d*')
+
+
+class PatternScanner:
+    """
+    Several regexes compiled into one alternation, matched in a single scan.
+
+    Each pattern sits in its own optional lookahead, so patterns that match at
+    the same position or overlap are all reported (plain alternation would only
+    report the first). A leading lookahead over the whole alternation lets the
+    regex engine skip positions where no pattern can start.
+    """
+
+    def __init__(self, patterns: Dict[str, str]):
+        self.names = list(patterns)
+        gate = "|".join(f"(?:{pattern})" for pattern in patterns.values())
+        body = "".join(
+            f"(?:(?=(?P<g{i}>{pattern}))|)" for i, pattern in enumerate(patterns.values())
+        )
+        self._regex = re.compile(f"(?=(?:{gate})){body}")
+        self._groups = {f"g{i}": name for i, name in enumerate(self.names)}
+
+    def scan(self, text: str) -> Set[str]:
+        """Names of all patterns found anywhere in text"""
+        found: Set[str] = set()
+        for match in self._regex.finditer(text):
+            for group, value in match.groupdict().items():
+                if value is not None:
+                    found.add(self._groups[group])
+            if len(found) == len(self.names):
+                break
+        return found
+
+
+def _build_scanner() -> PatternScanner:
+    patterns: Dict[str, str] = {}
+    for i, pattern in enumerate(MISSING_INFO_PATTERNS):
+        patterns[f"missing:{i}"] = pattern
+        # The vague-response check tests the raw pattern text as a substring
+        patterns[f"raw:{i}"] = re.escape(pattern)
+    keywords = {kw for kws in SPECIFIC_INDICATORS.values() for kw in kws}
+    keywords |= {kw for _, kws in CATEGORY_KEYWORDS for kw in kws}
+    keywords |= set(PRODUCT_KEYWORDS) | set(GENERIC_PHRASES)
+    for kw in sorted(keywords):
+        patterns[f"kw:{kw}"] = re.escape(kw)
+    return PatternScanner(patterns)
+
+
+_SCANNER = _build_scanner()
+
+
+def _has_any(hits: Set[str], keywords: Iterable[str]) -> bool:
+    return any(f"kw:{kw}" in hits for kw in keywords)
+
+
 @dataclass
 class KnowledgeLeak:
     """Represents a detected knowledge leak"""
@@ -44,6 +141,8 @@ class LeakAnalysisReport:
     kb_coverage_gaps: List[str]
     recommendations: List[str]
     detailed_leaks: List[KnowledgeLeak] = field(default_factory=list)
+    # interactions, leaks, elapsed_s, interactions_per_s
+    throughput: Dict[str, float] = field(default_factory=dict)
 
 
 class KnowledgeBaseLeakDetector:
@@ -57,10 +156,15 @@ class KnowledgeBaseLeakDetector:
     4. Coverage Gap: KB doesn't cover common query patterns
     """
     
+    HISTORY_FILE = "leak_history.jsonl"
+    LEGACY_HISTORY_FILE = "leak_history.json"
+
     def __init__(
         self,
         knowledge_base_path: Optional[str] = None,
-        leak_history_path: Optional[str] = None
+        leak_history_path: Optional[str] = None,
+        max_history: Optional[int] = None,
+        compact_every: int = 1000
     ):
         """
         Initialize leak detector
@@ -68,11 +172,19 @@ class KnowledgeBaseLeakDetector:
         Args:
             knowledge_base_path: Path to knowledge base directory
             leak_history_path: Path to store leak history
+            max_history: Keep only the most recent N leaks (None = keep all)
+            compact_every: Check whether the history log needs compaction
+                every N appended leaks
         """
         self.kb_path = Path(knowledge_base_path) if knowledge_base_path else None
         self.leak_history_path = Path(leak_history_path) if leak_history_path else Path("kb_training_system/leak_history")
         self.leak_history_path.mkdir(parents=True, exist_ok=True)
+        self.history_file = self.leak_history_path / self.HISTORY_FILE
+        self.max_history = max_history
+        self.compact_every = compact_every
         self.detected_leaks: List[KnowledgeLeak] = []
+        self._history_lines = 0  # lines in the log, including dropped/corrupt ones
+        self._appended_since_check = 0
         
         # Load existing leak history
         self._load_leak_history()
@@ -98,16 +210,58 @@ class KnowledgeBaseLeakDetector:
         Returns:
             List of detected leaks
         """
+        leaks = self._detect(query, response, sources_consulted, ground_truth, expected_sources)
+        
+        # Store leaks
+        self._record_leaks(leaks)
+        
+        return leaks
+    
+    def detect_leaks_batch(self, interactions: Iterable[Dict[str, Any]]) -> List[KnowledgeLeak]:
+        """
+        Detect leaks in many interactions, writing the history once at the end
+        
+        Args:
+            interactions: Iterable of {query, response, sources, ground_truth, expected_sources}
+            
+        Returns:
+            All detected leaks, in interaction order
+        """
+        leaks: List[KnowledgeLeak] = []
+        for interaction in interactions:
+            leaks.extend(self._detect(
+                query=interaction.get("query", ""),
+                response=interaction.get("response", ""),
+                sources_consulted=interaction.get("sources", []),
+                ground_truth=interaction.get("ground_truth"),
+                expected_sources=interaction.get("expected_sources")
+            ))
+        self._record_leaks(leaks)
+        return leaks
+    
+    def _detect(
+        self,
+        query: str,
+        response: str,
+        sources_consulted: List[str],
+        ground_truth: Optional[str] = None,
+        expected_sources: Optional[List[str]] = None
+    ) -> List[KnowledgeLeak]:
+        """Run every detector on one interaction (no history I/O)"""
         leaks = []
+        query_hits = _SCANNER.scan(query.lower())
+        response_hits = _SCANNER.scan(response.lower())
         
         # 1. Missing Information Leak
-        missing_leaks = self._detect_missing_information(query, response, sources_consulted)
+        missing_leaks = self._detect_missing_information(
+            query, response, sources_consulted, query_hits, response_hits
+        )
         leaks.extend(missing_leaks)
         
         # 2. Incorrect Response Leak
         if ground_truth:
             incorrect_leaks = self._detect_incorrect_response(
-                query, response, ground_truth, sources_consulted
+                query, response, ground_truth, sources_consulted, query_hits
             )
             leaks.extend(incorrect_leaks)
         
@@ -120,74 +274,62 @@ class KnowledgeBaseLeakDetector:
         
         # 4. Coverage Gap (if no sources consulted)
         if not sources_consulted:
-            coverage_leak = self._detect_coverage_gap(query, response)
+            coverage_leak = self._detect_coverage_gap(query, response, query_hits, response_hits)
             if coverage_leak:
                 leaks.append(coverage_leak)
         
-        # Store leaks
-        self.detected_leaks.extend(leaks)
-        self._save_leak_history()
-        
         return leaks
     
     def _detect_missing_information(
         self,
         query: str,
         response: str,
-        sources: List[str]
+        sources: List[str],
+        query_hits: Optional[Set[str]] = None,
+        response_hits: Optional[Set[str]] = None
     ) -> List[KnowledgeLeak]:
         """Detect missing information leaks"""
         leaks = []
-        
-        # Patterns indicating missing information
-        missing_patterns = [
-            r"no tengo (esa|la) información",
-            r"no (está|estan) disponible",
-            r"no encuentro",
-            r"no sé",
-            r"no disponible en base",
-            r"no (tengo|tiene) (esa|ese|esa) (información|dato|precio)"
+        if query_hits is None:
+            query_hits = _SCANNER.scan(query.lower())
+        if response_hits is None:
+            response_hits = _SCANNER.scan(response.lower())
+        
+        # One leak per matching pattern
+        matched = [
+            i for i in range(len(MISSING_INFO_PATTERNS)) if f"missing:{i}" in response_hits
         ]
-        
-        response_lower = response.lower()
-        
-        for pattern in missing_patterns:
-            if re.search(pattern, response_lower):
-                # Extract what's missing
-                query_lower = query.lower()
-                category = self._categorize_query(query)
-                
-                leak = KnowledgeLeak(
-                    leak_id=f"LEAK-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{len(leaks)}",
-                    leak_type="missing_info",
-                    query=query,
-                    response=response,
-                    detected_at=datetime.now().isoformat(),
-                    severity=self._assess_severity(query, category),
-                    category=category,
-                    missing_information=self._extract_missing_info(query, response),
-                    actual_sources=sources,
-                    recommendations=[
-                        f"Add information about {category} to knowledge base",
-                        f"Consider adding to Level 1 (Master) source for {category}"
-                    ]
-                )
-                leaks.append(leak)
+        if matched:
+            category = self._categorize_query(query, query_hits)
+            severity = self._assess_severity(query, category)
+            missing_information = self._extract_missing_info(query, response, query_hits)
+        for _ in matched:
+            leak = KnowledgeLeak(
+                leak_id=f"LEAK-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{len(leaks)}",
+                leak_type="missing_info",
+                query=query,
+                response=response,
+                detected_at=datetime.now().isoformat(),
+                severity=severity,
+                category=category,
+                missing_information=missing_information,
+                actual_sources=sources,
+                recommendations=[
+                    f"Add information about {category} to knowledge base",
+                    f"Consider adding to Level 1 (Master) source for {category}"
+                ]
+            )
+            leaks.append(leak)
         
         # Check for vague responses to specific queries
-        specific_indicators = {
-            "precio": ["precio", "costo", "valor", "$"],
-            "espesor": ["espesor", "thickness", "grosor"],
-            "autoportancia": ["autoportancia", "luz", "span", "distancia"],
-            "fórmula": ["fórmula", "cálculo", "formula", "calcular"]
-        }
-        
-        query_lower = query.lower()
-        for indicator_type, keywords in specific_indicators.items():
-            if any(kw in query_lower for kw in keywords):
+        raw_pattern_in_response = any(
+            f"raw:{i}" in response_hits for i in range(len(MISSING_INFO_PATTERNS))
+        )
+        for indicator_type, keywords in SPECIFIC_INDICATORS.items():
+            if _has_any(query_hits, keywords):
                 # Check if response contains the specific data
-                if not any(kw in response_lower for kw in keywords):
-                    if not any(pattern in response_lower for pattern in missing_patterns):
+                if not _has_any(response_hits, keywords):
+                    if not raw_pattern_in_response:
                         # Vague response to specific query
                         leak = KnowledgeLeak(
                             leak_id=f"LEAK-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{len(leaks)}",
@@ -213,7 +355,8 @@ class KnowledgeBaseLeakDetector:
         query: str,
         response: str,
         ground_truth: str,
-        sources: List[str]
+        sources: List[str],
+        query_hits: Optional[Set[str]] = None
     ) -> List[KnowledgeLeak]:
         """Detect incorrect response leaks"""
         leaks = []
@@ -223,8 +366,8 @@ class KnowledgeBaseLeakDetector:
         truth_lower = ground_truth.lower()
         
         # Extract key numbers (prices, measurements)
-        response_numbers = set(re.findall(r'\d+\.?\d*', response))
-        truth_numbers = set(re.findall(r'\d+\.?\d*', truth_lower))
+        response_numbers = set(_NUMBER_RE.findall(response))
+        truth_numbers = set(_NUMBER_RE.findall(truth_lower))
         
         # Check for significant number mismatches
         if truth_numbers:
@@ -237,7 +380,7 @@ class KnowledgeBaseLeakDetector:
                     response=response,
                     detected_at=datetime.now().isoformat(),
                     severity="critical",
-                    category=self._categorize_query(query),
+                    category=self._categorize_query(query, query_hits),
                     missing_information=f"Response doesn't match ground truth. Expected: {ground_truth[:100]}",
                     actual_sources=sources,
                     recommendations=[
@@ -298,19 +441,17 @@ class KnowledgeBaseLeakDetector:
     def _detect_coverage_gap(
         self,
         query: str,
-        response: str
+        response: str,
+        query_hits: Optional[Set[str]] = None,
+        response_hits: Optional[Set[str]] = None
     ) -> Optional[KnowledgeLeak]:
         """Detect coverage gap leaks"""
         # If no sources consulted, it's a coverage gap
-        response_lower = response.lower()
+        if response_hits is None:
+            response_hits = _SCANNER.scan(response.lower())
         
         # Check if response is generic/hallucinated
-        generic_phrases = [
-            "en general", "típicamente", "usualmente",
-            "puede variar", "depende"
-        ]
-        
-        if any(phrase in response_lower for phrase in generic_phrases):
+        if _has_any(response_hits, GENERIC_PHRASES):
             return KnowledgeLeak(
                 leak_id=f"LEAK-{datetime.now().strftime('%Y%m%d-%H%M%S')}-COVERAGE",
                 leak_type="coverage_gap",
@@ -318,7 +459,7 @@ class KnowledgeBaseLeakDetector:
                 response=response,
                 detected_at=datetime.now().isoformat(),
                 severity="medium",
-                category=self._categorize_query(query),
+                category=self._categorize_query(query, query_hits),
                 recommendations=[
                     "Add specific information to KB for this query type",
                     "Consider adding examples or FAQs"
@@ -327,20 +468,15 @@ class KnowledgeBaseLeakDetector:
         
         return None
     
-    def _categorize_query(self, query: str) -> str:
+    def _categorize_query(self, query: str, query_hits: Optional[Set[str]] = None) -> str:
         """Categorize query type"""
-        query_lower = query.lower()
+        if query_hits is None:
+            query_hits = _SCANNER.scan(query.lower())
         
-        if any(kw in query_lower for kw in ["precio", "costo", "valor", "$"]):
-            return "pricing"
-        elif any(kw in query_lower for kw in ["espesor", "thickness", "grosor"]):
-            return "specifications"
-        elif any(kw in query_lower for kw in ["autoportancia", "luz", "span"]):
-            return "specifications"
-        elif any(kw in query_lower for kw in ["fórmula", "calcular", "cálculo"]):
-            return "formulas"
-        else:
-            return "general"
+        for category, keywords in CATEGORY_KEYWORDS:
+            if _has_any(query_hits, keywords):
+                return category
+        return "general"
     
     def _assess_severity(self, query: str, category: str) -> str:
         """Assess leak severity"""
@@ -355,20 +491,26 @@ class KnowledgeBaseLeakDetector:
         # Medium by default
         return "medium"
     
-    def _extract_missing_info(self, query: str, response: str) -> str:
+    def _extract_missing_info(
+        self,
+        query: str,
+        response: str,
+        query_hits: Optional[Set[str]] = None
+    ) -> str:
         """Extract what information is missing"""
         # Try to extract key terms from query
         query_lower = query.lower()
+        if query_hits is None:
+            query_hits = _SCANNER.scan(query_lower)
         
         # Extract product names, measurements, etc.
-        product_keywords = ["isodec", "isoroof", "isopanel", "isowall"]
-        found_products = [kw for kw in product_keywords if kw in query_lower]
+        found_products = [kw for kw in PRODUCT_KEYWORDS if f"kw:{kw}" in query_hits]
         
         if found_products:
             return f"Information about {', '.join(found_products)}"
         
         # Extract measurements
-        measurements = re.findall(r'\d+\s*(mm|m|cm)', query_lower)
+        measurements = _MEASUREMENT_RE.findall(query_lower)
         if measurements:
             return f"Information for {measurements[0]} specification"
         
@@ -389,17 +531,19 @@ class KnowledgeBaseLeakDetector:
         """
         logger.info(f"Analyzing leak patterns in {len(interactions)} interactions")
         
-        all_leaks = []
-        
-        for interaction in interactions:
-            leaks = self.detect_leaks_in_interaction(
-                query=interaction.get("query", ""),
-                response=interaction.get("response", ""),
-                sources_consulted=interaction.get("sources", []),
-                ground_truth=interaction.get("ground_truth"),
-                expected_sources=interaction.get("expected_sources")
-            )
-            all_leaks.extend(leaks)
+        start = time.perf_counter()
+        all_leaks = self.detect_leaks_batch(interactions)
+        elapsed = time.perf_counter() - start
+        throughput = {
+            "interactions": len(interactions),
+            "leaks": len(all_leaks),
+            "elapsed_s": round(elapsed, 4),
+            "interactions_per_s": round(len(interactions) / elapsed, 1) if elapsed > 0 else 0.0,
+        }
+        logger.info(
+            f"Analyzed {len(interactions)} interactions in {elapsed:.3f}s "
+            f"({throughput['interactions_per_s']} interactions/s)"
+        )
         
         # Aggregate analysis
         leaks_by_type = defaultdict(int)
@@ -428,7 +572,8 @@ class KnowledgeBaseLeakDetector:
             critical_leaks=critical_leaks,
             kb_coverage_gaps=coverage_gaps,
             recommendations=recommendations,
-            detailed_leaks=all_leaks
+            detailed_leaks=all_leaks,
+            throughput=throughput
         )
         
         return report
@@ -493,12 +638,42 @@ class KnowledgeBaseLeakDetector:
         
         return recommendations
     
+    def _record_leaks(self, leaks: List[KnowledgeLeak]):
+        """Keep leaks in memory and append them to the history log"""
+        if not leaks:
+            return
+        self.detected_leaks.extend(leaks)
+        if self.max_history is not None and len(self.detected_leaks) > self.max_history:
+            del self.detected_leaks[:len(self.detected_leaks) - self.max_history]
+        self._append_leak_history(leaks)
+    
     def _load_leak_history(self):
-        """Load leak history from file"""
-        history_file = self.leak_history_path / "leak_history.json"
-        if history_file.exists():
+        """Load leak history from the JSONL log (or migrate the legacy JSON file)"""
+        if self.history_file.exists():
+            leaks = []
+            lines = 0
+            try:
+                with open(self.history_file, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        lines += 1
+                        try:
+                            leaks.append(KnowledgeLeak(**json.loads(line)))
+                        except (ValueError, TypeError):
+                            # Torn last line after a crash: dropped on next compaction
+                            continue
+            except OSError as e:
+                logger.warning(f"Error loading leak history: {e}")
+                return
+            if self.max_history is not None:
+                leaks = leaks[-self.max_history:] if self.max_history else []
+            self.detected_leaks = leaks
+            self._history_lines = lines
+            return
+        
+        legacy_file = self.leak_history_path / self.LEGACY_HISTORY_FILE
+        if legacy_file.exists():
             try:
-                with open(history_file, 'r', encoding='utf-8') as f:
+                with open(legacy_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
                     # Convert back to KnowledgeLeak objects
                     self.detected_leaks = [
@@ -507,33 +682,42 @@ class KnowledgeBaseLeakDetector:
                     ]
             except Exception as e:
                 logger.warning(f"Error loading leak history: {e}")
+                return
+            if self.max_history is not None:
+                self.detected_leaks = self.detected_leaks[-self.max_history:] if self.max_history else []
+            self._save_leak_history()
+    
+    def _append_leak_history(self, leaks: List[KnowledgeLeak]):
+        """Append leaks to the history log, compacting it every compact_every leaks"""
+        try:
+            with open(self.history_file, 'a', encoding='utf-8') as f:
+                f.write("".join(
+                    json.dumps(asdict(leak), ensure_ascii=False) + "\n" for leak in leaks
+                ))
+        except OSError as e:
+            logger.error(f"Error saving leak history: {e}")
+            return
+        self._history_lines += len(leaks)
+        self._appended_since_check += len(leaks)
+        if self._appended_since_check >= self.compact_every:
+            self._appended_since_check = 0
+            if self._history_lines > len(self.detected_leaks):
+                self.compact_history()
+    
+    def compact_history(self):
+        """Rewrite the history log with only the retained leaks"""
+        self._save_leak_history()
     
     def _save_leak_history(self):
-        """Save leak history to file"""
-        history_file = self.leak_history_path / "leak_history.json"
+        """Atomically rewrite the history log from memory"""
+        tmp_file = self.history_file.with_suffix(".jsonl.tmp")
         try:
-            data = {
-                "timestamp": datetime.now().isoformat(),
-                "leaks": [
-                    {
-                        "leak_id": leak.leak_id,
-                        "leak_type": leak.leak_type,
-                        "query": leak.query,
-                        "response": leak.response,
-                        "detected_at": leak.detected_at,
-                        "severity": leak.severity,
-                        "category": leak.category,
-                        "missing_information": leak.missing_information,
-                        "expected_source": leak.expected_source,
-                        "actual_sources": leak.actual_sources,
-                        "recommendations": leak.recommendations
-                    }
-                    for leak in self.detected_leaks
-                ]
-            }
-            with open(history_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-        except Exception as e:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                for leak in self.detected_leaks:
+                    f.write(json.dumps(asdict(leak), ensure_ascii=False) + "\n")
+            os.replace(tmp_file, self.history_file)
+            self._history_lines = len(self.detected_leaks)
+        except OSError as e:
             logger.error(f"Error saving leak history: {e}")
     
     def export_leak_report(
@@ -550,6 +734,7 @@ Generated: {report.timestamp}
 - Total Leaks Detected: {report.total_leaks}
 - Critical Leaks: {len(report.critical_leaks)}
 - Coverage Gaps Identified: {len(report.kb_coverage_gaps)}
+- Throughput: {report.throughput.get("interactions_per_s", "n/a")} interactions/s
 
 ## Leak Distribution
 
@@ -13,16 +13,326 @@ KPIs incluidos:
 - Distribución de Roles
 - Métricas de Conversación
 - Validación de Consistencia
+
+Todos los KPIs se calculan en una sola pasada (KPIAccumulator), también
+sobre bundles JSONL que no entran en memoria.
 """
 
 import json
 import math
-from typing import Dict, List, Optional, Tuple
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
 from collections import Counter, defaultdict
 from pathlib import Path
 
 
+# Formato válido de IDs de conversación
+_CONVERSATION_ID_RE = re.compile(r'^[A-Z0-9_-]+$')
+
+
+class KPIAccumulator:
+    """
+    Acumulador de KPIs en una sola pasada.
+
+    Consume conversaciones de a una (cada mensaje se recorre una única vez)
+    y mantiene sólo contadores, por lo que funciona sobre bundles JSONL que
+    no entran en memoria. Los acumuladores parciales de distintos shards se
+    combinan con ``merge``.
+    """
+
+    def __init__(self):
+        self.meta = {}
+
+        # Básicas
+        self.total_conversations = 0
+        self.total_messages = 0
+        self.user_messages = 0
+        self.assistant_messages = 0
+        self.system_messages = 0
+        self.total_chars = 0
+        self.total_words = 0
+
+        # Anotaciones
+        self.annotated_messages = 0
+        self.intent_annotated = 0
+        self.sentiment_annotated = 0
+        self.entities_annotated = 0
+        self.intent_distribution = Counter()
+        self.sentiment_distribution = Counter()
+        self.entity_types = Counter()
+
+        # Calidad
+        self.conversations_with_quality = 0
+        self.completeness_sum = 0
+        self.completeness_count = 0
+        self.accuracy_sum = 0
+        self.accuracy_count = 0
+        self.relevance_sum = 0
+        self.relevance_count = 0
+        self.role_alternation_errors = 0
+        self.empty_messages = 0
+        self.very_short_messages = 0  # < 10 caracteres
+        self.very_long_messages = 0   # > 5000 caracteres
+
+        # Distribución
+        self.conversation_types = Counter()
+        self.outcomes = Counter()
+        self.user_names = Counter()
+        self.quotations_generated = 0
+        self.pdfs_generated = 0
+        self.sop_commands_used = Counter()
+
+        # Consistencia
+        self.unique_ids = set()
+        self.invalid_ids = 0
+        self.messages_with_timestamp = 0
+        self.messages_without_timestamp = 0
+        self.invalid_timestamps = 0
+
+        # Entrenamiento
+        self.classification_ready = 0
+        self.generation_ready = 0
+
+    def add_conversation(self, conv: Dict):
+        """Incorpora una conversación recorriendo sus mensajes una sola vez."""
+        self.total_conversations += 1
+        messages = conv.get('messages', [])
+        self.total_messages += len(messages)
+
+        previous_role = None
+        has_classification = False
+        has_generation = False
+
+        for msg in messages:
+            raw_role = msg.get('role', '')
+            role = raw_role.lower()
+            content = msg.get('content', '')
+
+            # Básicas
+            if role == 'user':
+                self.user_messages += 1
+            elif role == 'assistant':
+                self.assistant_messages += 1
+            elif role == 'system':
+                self.system_messages += 1
+            self.total_chars += len(content)
+            self.total_words += len(content.split())
+
+            # Anotaciones
+            annotations = msg.get('annotations', {})
+            if annotations:
+                self.annotated_messages += 1
+                if 'intent' in annotations:
+                    self.intent_annotated += 1
+                    self.intent_distribution[annotations['intent']] += 1
+                if 'sentiment' in annotations:
+                    self.sentiment_annotated += 1
+                    self.sentiment_distribution[annotations['sentiment']] += 1
+                if 'entities' in annotations and annotations['entities']:
+                    self.entities_annotated += 1
+                    for entity in annotations['entities']:
+                        self.entity_types[entity.get('type', 'unknown')] += 1
+                if annotations.get('intent') or annotations.get('sentiment'):
+                    has_classification = True
+
+            # Calidad
+            stripped = content.strip()
+            if not stripped:
+                self.empty_messages += 1
+            elif len(content) < 10:
+                self.very_short_messages += 1
+            elif len(content) > 5000:
+                self.very_long_messages += 1
+
+            if role in ['user', 'assistant']:
+                if previous_role and previous_role == role:
+                    self.role_alternation_errors += 1
+                previous_role = role
+
+            # Consistencia
+            if 'timestamp' in msg:
+                self.messages_with_timestamp += 1
+                try:
+                    datetime.fromisoformat(msg['timestamp'].replace('Z', '+00:00'))
+                except:
+                    self.invalid_timestamps += 1
+            else:
+                self.messages_without_timestamp += 1
+
+            # Entrenamiento (el rol se compara sin normalizar)
+            if raw_role == 'assistant' and stripped:
+                has_generation = True
+
+        if has_classification:
+            self.classification_ready += 1
+        if has_generation:
+            self.generation_ready += 1
+
+        # Quality scores de la conversación
+        quality_scores = conv.get('quality_scores', {})
+        if quality_scores:
+            self.conversations_with_quality += 1
+            if 'completeness' in quality_scores:
+                self.completeness_sum += quality_scores['completeness']
+                self.completeness_count += 1
+            if 'accuracy' in quality_scores:
+                self.accuracy_sum += quality_scores['accuracy']
+                self.accuracy_count += 1
+            if 'relevance' in quality_scores:
+                self.relevance_sum += quality_scores['relevance']
+                self.relevance_count += 1
+
+        # Distribución
+        metadata = conv.get('metadata', {})
+        if 'conversation_type' in metadata:
+            self.conversation_types[metadata['conversation_type']] += 1
+        if 'outcome' in metadata:
+            self.outcomes[metadata['outcome']] += 1
+        if 'user_name' in metadata:
+            self.user_names[metadata['user_name']] += 1
+        if metadata.get('quotation_generated'):
+            self.quotations_generated += 1
+        if metadata.get('pdf_generated'):
+            self.pdfs_generated += 1
+        if 'sop_commands_used' in metadata:
+            for cmd in metadata['sop_commands_used']:
+                self.sop_commands_used[cmd] += 1
+
+        # Validar ID de conversación
+        conv_id = conv.get('id')
+        self.unique_ids.add(conv_id)
+        if not conv_id or not isinstance(conv_id, str):
+            self.invalid_ids += 1
+        elif not _CONVERSATION_ID_RE.match(conv_id):
+            self.invalid_ids += 1
+
+    def merge(self, other: 'KPIAccumulator') -> 'KPIAccumulator':
+        """Combina otro acumulador parcial (p. ej. de otro shard) en éste."""
+        if not self.meta and other.meta:
+            self.meta = other.meta
+        for name, value in vars(other).items():
+            if name == 'meta':
+                continue
+            current = getattr(self, name)
+            if isinstance(current, set):
+                current.update(value)
+            elif isinstance(current, Counter):
+                current.update(value)
+            else:
+                setattr(self, name, current + value)
+        return self
+
+    def build_kpis(self) -> Dict:
+        """Construye las familias de KPIs (sin resumen ejecutivo)."""
+        n_convs = self.total_conversations
+        n_msgs = self.total_messages
+
+        def ratio(value, total, digits=4):
+            return round(value / total, digits) if total else 0
+
+        return {
+            'basic': {
+                'total_conversations': n_convs,
+                'total_messages': n_msgs,
+                'user_messages': self.user_messages,
+                'assistant_messages': self.assistant_messages,
+                'system_messages': self.system_messages,
+                'avg_messages_per_conversation': ratio(n_msgs, n_convs, 2),
+                'total_characters': self.total_chars,
+                'total_words': self.total_words,
+                'avg_chars_per_message': ratio(self.total_chars, n_msgs, 2),
+                'avg_words_per_message': ratio(self.total_words, n_msgs, 2),
+            },
+            'annotations': {
+                'total_messages': n_msgs,
+                'annotated_messages': self.annotated_messages,
+                'annotation_coverage': ratio(self.annotated_messages, n_msgs),
+                'intent_annotated': self.intent_annotated,
+                'intent_coverage': ratio(self.intent_annotated, n_msgs),
+                'sentiment_annotated': self.sentiment_annotated,
+                'sentiment_coverage': ratio(self.sentiment_annotated, n_msgs),
+                'entities_annotated': self.entities_annotated,
+                'entities_coverage': ratio(self.entities_annotated, n_msgs),
+                'intent_distribution': dict(self.intent_distribution),
+                'sentiment_distribution': dict(self.sentiment_distribution),
+                'entity_types_distribution': dict(self.entity_types),
+            },
+            'quality': {
+                'conversations_with_quality_scores': self.conversations_with_quality,
+                'quality_coverage': ratio(self.conversations_with_quality, n_convs),
+                'avg_completeness': ratio(self.completeness_sum, self.completeness_count),
+                'avg_accuracy': ratio(self.accuracy_sum, self.accuracy_count),
+                'avg_relevance': ratio(self.relevance_sum, self.relevance_count),
+                'role_alternation_errors': self.role_alternation_errors,
+                'data_quality_issues': {
+                    'empty_messages': self.empty_messages,
+                    'very_short_messages': self.very_short_messages,
+                    'very_long_messages': self.very_long_messages,
+                }
+            },
+            'distribution': {
+                'conversation_types': dict(self.conversation_types),
+                'outcomes': dict(self.outcomes),
+                'user_names': dict(self.user_names),
+                'quotations_generated': self.quotations_generated,
+                'quotation_rate': ratio(self.quotations_generated, n_convs),
+                'pdfs_generated': self.pdfs_generated,
+                'pdf_rate': ratio(self.pdfs_generated, n_convs),
+                'sop_commands_distribution': dict(self.sop_commands_used),
+            },
+            'consistency': {
+                'unique_conversation_ids': len(self.unique_ids),
+                'duplicate_conversation_ids': n_convs - len(self.unique_ids),
+                'invalid_conversation_ids': self.invalid_ids,
+                'messages_with_timestamp': self.messages_with_timestamp,
+                'messages_without_timestamp': self.messages_without_timestamp,
+                'timestamp_coverage': ratio(self.messages_with_timestamp, n_msgs),
+                'invalid_timestamps': self.invalid_timestamps,
+            },
+            'training': {
+                'training_types': self.meta.get('training_type', []),
+                'classification_ready_conversations': self.classification_ready,
+                'classification_readiness': ratio(self.classification_ready, n_convs),
+                'generation_ready_conversations': self.generation_ready,
+                'generation_readiness': ratio(self.generation_ready, n_convs),
+                'both_ready_conversations': min(self.classification_ready, self.generation_ready),
+            },
+        }
+
+
+def _accumulate_jsonl_shard(path: str, start: int, end: int) -> KPIAccumulator:
+    """
+    Acumula las líneas JSONL que comienzan en el rango de bytes [start, end).
+
+    Una línea con clave 'meta' se toma como metadatos del bundle; cualquier
+    otra línea se interpreta como una conversación.
+    """
+    acc = KPIAccumulator()
+    with open(path, 'rb') as f:
+        pos = start
+        if start > 0:
+            # Alinear al inicio de la siguiente línea completa
+            f.seek(start - 1)
+            pos = start - 1 + len(f.readline())
+        while pos < end:
+            line = f.readline()
+            if not line:
+                break
+            pos += len(line)
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if 'meta' in record and 'messages' not in record:
+                if not acc.meta:
+                    acc.meta = record['meta']
+                continue
+            acc.add_conversation(record)
+    return acc
+
+
 class KPICalculator:
     """Calculador de KPIs auditables para bundles de entrenamiento."""
     
@@ -41,27 +351,64 @@ class KPICalculator:
         Returns:
             Diccionario con todos los KPIs calculados
         """
-        self.kpis = {}
-        self.errors = []
-        self.warnings = []
-        
-        # KPIs básicos
-        self._calculate_basic_metrics(bundle)
-        
-        # KPIs de anotaciones
-        self._calculate_annotation_metrics(bundle)
-        
-        # KPIs de calidad
-        self._calculate_quality_metrics(bundle)
+        return self.calculate_stream(bundle.get('conversations', []), bundle.get('meta', {}))
+    
+    def calculate_stream(self, conversations: Iterable[Dict], meta: Optional[Dict] = None) -> Dict:
+        """
+        Calcula todos los KPIs en una sola pasada sobre un iterable de conversaciones.
         
-        # KPIs de distribución
-        self._calculate_distribution_metrics(bundle)
+        Args:
+            conversations: Iterable (p. ej. un generador) de conversaciones
+            meta: Metadatos del bundle ('version', 'training_type', ...)
+            
+        Returns:
+            Diccionario con todos los KPIs calculados
+        """
+        acc = KPIAccumulator()
+        acc.meta = meta or {}
+        for conv in conversations:
+            acc.add_conversation(conv)
+        return self.build_report(acc)
+    
+    def calculate_jsonl(self, path: str, workers: int = 1) -> Dict:
+        """
+        Calcula KPIs sobre un bundle JSONL sin cargarlo completo en memoria.
         
-        # KPIs de consistencia
-        self._calculate_consistency_metrics(bundle)
+        Cada línea es una conversación; una línea opcional {"meta": {...}}
+        aporta los metadatos del bundle. Con workers > 1 el archivo se divide
+        en rangos de bytes que se procesan en paralelo y luego se combinan.
         
-        # KPIs de entrenamiento
-        self._calculate_training_metrics(bundle)
+        Args:
+            path: Ruta al archivo JSONL
+            workers: Número de procesos (1 = en el proceso actual)
+            
+        Returns:
+            Diccionario con todos los KPIs calculados
+        """
+        size = os.path.getsize(path)
+        if workers <= 1 or size == 0:
+            return self.build_report(_accumulate_jsonl_shard(path, 0, size))
+        
+        step = -(-size // workers)
+        bounds = [(start, min(start + step, size)) for start in range(0, size, step)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            partials = list(executor.map(
+                _accumulate_jsonl_shard,
+                [path] * len(bounds),
+                [b[0] for b in bounds],
+                [b[1] for b in bounds],
+            ))
+        
+        acc = partials[0]
+        for partial in partials[1:]:
+            acc.merge(partial)
+        return self.build_report(acc)
+    
+    def build_report(self, acc: KPIAccumulator) -> Dict:
+        """Arma el reporte final a partir de un acumulador."""
+        self.kpis = acc.build_kpis()
+        self.errors = []
+        self.warnings = []
         
         # Resumen ejecutivo
         self._calculate_executive_summary()
@@ -72,298 +419,11 @@ class KPICalculator:
             'errors': self.errors,
             'warnings': self.warnings,
             'metadata': {
-                'total_conversations': len(bundle.get('conversations', [])),
-                'schema_version': bundle.get('meta', {}).get('version', 'unknown')
+                'total_conversations': acc.total_conversations,
+                'schema_version': acc.meta.get('version', 'unknown')
             }
         }
     
-    def _calculate_basic_metrics(self, bundle: Dict):
-        """Calcula métricas básicas del bundle."""
-        conversations = bundle.get('conversations', [])
-        
-        total_messages = 0
-        user_messages = 0
-        assistant_messages = 0
-        system_messages = 0
-        total_chars = 0
-        total_words = 0
-        
-        for conv in conversations:
-            messages = conv.get('messages', [])
-            total_messages += len(messages)
-            
-            for msg in messages:
-                role = msg.get('role', '').lower()
-                content = msg.get('content', '')
-                
-                if role == 'user':
-                    user_messages += 1
-                elif role == 'assistant':
-                    assistant_messages += 1
-                elif role == 'system':
-                    system_messages += 1
-                
-                total_chars += len(content)
-                total_words += len(content.split())
-        
-        self.kpis['basic'] = {
-            'total_conversations': len(conversations),
-            'total_messages': total_messages,
-            'user_messages': user_messages,
-            'assistant_messages': assistant_messages,
-            'system_messages': system_messages,
-            'avg_messages_per_conversation': round(total_messages / len(conversations), 2) if conversations else 0,
-            'total_characters': total_chars,
-            'total_words': total_words,
-            'avg_chars_per_message': round(total_chars / total_messages, 2) if total_messages else 0,
-            'avg_words_per_message': round(total_words / total_messages, 2) if total_messages else 0,
-        }
-    
-    def _calculate_annotation_metrics(self, bundle: Dict):
-        """Calcula métricas de anotaciones (intención, sentimiento, entidades)."""
-        conversations = bundle.get('conversations', [])
-        
-        total_messages = 0
-        annotated_messages = 0
-        intent_annotated = 0
-        sentiment_annotated = 0
-        entities_annotated = 0
-        
-        intent_distribution = Counter()
-        sentiment_distribution = Counter()
-        entity_types = Counter()
-        
-        for conv in conversations:
-            messages = conv.get('messages', [])
-            
-            for msg in messages:
-                total_messages += 1
-                annotations = msg.get('annotations', {})
-                
-                if annotations:
-                    annotated_messages += 1
-                    
-                    if 'intent' in annotations:
-                        intent_annotated += 1
-                        intent_distribution[annotations['intent']] += 1
-                    
-                    if 'sentiment' in annotations:
-                        sentiment_annotated += 1
-                        sentiment_distribution[annotations['sentiment']] += 1
-                    
-                    if 'entities' in annotations and annotations['entities']:
-                        entities_annotated += 1
-                        for entity in annotations['entities']:
-                            entity_types[entity.get('type', 'unknown')] += 1
-        
-        self.kpis['annotations'] = {
-            'total_messages': total_messages,
-            'annotated_messages': annotated_messages,
-            'annotation_coverage': round(annotated_messages / total_messages, 4) if total_messages else 0,
-            'intent_annotated': intent_annotated,
-            'intent_coverage': round(intent_annotated / total_messages, 4) if total_messages else 0,
-            'sentiment_annotated': sentiment_annotated,
-            'sentiment_coverage': round(sentiment_annotated / total_messages, 4) if total_messages else 0,
-            'entities_annotated': entities_annotated,
-            'entities_coverage': round(entities_annotated / total_messages, 4) if total_messages else 0,
-            'intent_distribution': dict(intent_distribution),
-            'sentiment_distribution': dict(sentiment_distribution),
-            'entity_types_distribution': dict(entity_types),
-        }
-    
-    def _calculate_quality_metrics(self, bundle: Dict):
-        """Calcula métricas de calidad de datos."""
-        conversations = bundle.get('conversations', [])
-        
-        conversations_with_quality = 0
-        total_quality_score = 0
-        completeness_scores = []
-        accuracy_scores = []
-        relevance_scores = []
-        
-        role_alternation_errors = 0
-        empty_messages = 0
-        very_short_messages = 0  # < 10 caracteres
-        very_long_messages = 0   # > 5000 caracteres
-        
-        for conv in conversations:
-            messages = conv.get('messages', [])
-            
-            # Validar alternancia de roles
-            previous_role = None
-            for msg in messages:
-                role = msg.get('role', '').lower()
-                content = msg.get('content', '')
-                
-                if not content.strip():
-                    empty_messages += 1
-                elif len(content) < 10:
-                    very_short_messages += 1
-                elif len(content) > 5000:
-                    very_long_messages += 1
-                
-                if role in ['user', 'assistant']:
-                    if previous_role and previous_role == role:
-                        role_alternation_errors += 1
-                    previous_role = role
-            
-            # Quality scores de la conversación
-            quality_scores = conv.get('quality_scores', {})
-            if quality_scores:
-                conversations_with_quality += 1
-                if 'completeness' in quality_scores:
-                    completeness_scores.append(quality_scores['completeness'])
-                if 'accuracy' in quality_scores:
-                    accuracy_scores.append(quality_scores['accuracy'])
-                if 'relevance' in quality_scores:
-                    relevance_scores.append(quality_scores['relevance'])
-        
-        self.kpis['quality'] = {
-            'conversations_with_quality_scores': conversations_with_quality,
-            'quality_coverage': round(conversations_with_quality / len(conversations), 4) if conversations else 0,
-            'avg_completeness': round(sum(completeness_scores) / len(completeness_scores), 4) if completeness_scores else 0,
-            'avg_accuracy': round(sum(accuracy_scores) / len(accuracy_scores), 4) if accuracy_scores else 0,
-            'avg_relevance': round(sum(relevance_scores) / len(relevance_scores), 4) if relevance_scores else 0,
-            'role_alternation_errors': role_alternation_errors,
-            'data_quality_issues': {
-                'empty_messages': empty_messages,
-                'very_short_messages': very_short_messages,
-                'very_long_messages': very_long_messages,
-            }
-        }
-    
-    def _calculate_distribution_metrics(self, bundle: Dict):
-        """Calcula métricas de distribución (roles, tipos, etc.)."""
-        conversations = bundle.get('conversations', [])
-        
-        conversation_types = Counter()
-        outcomes = Counter()
-        user_names = Counter()
-        quotations_generated = 0
-        pdfs_generated = 0
-        sop_commands_used = Counter()
-        
-        for conv in conversations:
-            metadata = conv.get('metadata', {})
-            
-            if 'conversation_type' in metadata:
-                conversation_types[metadata['conversation_type']] += 1
-            
-            if 'outcome' in metadata:
-                outcomes[metadata['outcome']] += 1
-            
-            if 'user_name' in metadata:
-                user_names[metadata['user_name']] += 1
-            
-            if metadata.get('quotation_generated'):
-                quotations_generated += 1
-            
-            if metadata.get('pdf_generated'):
-                pdfs_generated += 1
-            
-            if 'sop_commands_used' in metadata:
-                for cmd in metadata['sop_commands_used']:
-                    sop_commands_used[cmd] += 1
-        
-        self.kpis['distribution'] = {
-            'conversation_types': dict(conversation_types),
-            'outcomes': dict(outcomes),
-            'user_names': dict(user_names),
-            'quotations_generated': quotations_generated,
-            'quotation_rate': round(quotations_generated / len(conversations), 4) if conversations else 0,
-            'pdfs_generated': pdfs_generated,
-            'pdf_rate': round(pdfs_generated / len(conversations), 4) if conversations else 0,
-            'sop_commands_distribution': dict(sop_commands_used),
-        }
-    
-    def _calculate_consistency_metrics(self, bundle: Dict):
-        """Calcula métricas de consistencia."""
-        conversations = bundle.get('conversations', [])
-        
-        # Validar que todas las conversaciones tengan ID único
-        conversation_ids = [conv.get('id') for conv in conversations]
-        unique_ids = set(conversation_ids)
-        duplicate_ids = len(conversation_ids) - len(unique_ids)
-        
-        # Validar formato de IDs
-        invalid_ids = 0
-        for conv_id in conversation_ids:
-            if not conv_id or not isinstance(conv_id, str):
-                invalid_ids += 1
-            elif not re.match(r'^[A-Z0-9_-]+$', conv_id):
-                invalid_ids += 1
-        
-        # Validar timestamps
-        messages_with_timestamp = 0
-        messages_without_timestamp = 0
-        invalid_timestamps = 0
-        
-        for conv in conversations:
-            for msg in conv.get('messages', []):
-                if 'timestamp' in msg:
-                    messages_with_timestamp += 1
-                    try:
-                        datetime.fromisoformat(msg['timestamp'].replace('Z', '+00:00'))
-                    except:
-                        invalid_timestamps += 1
-                else:
-                    messages_without_timestamp += 1
-        
-        self.kpis['consistency'] = {
-            'unique_conversation_ids': len(unique_ids),
-            'duplicate_conversation_ids': duplicate_ids,
-            'invalid_conversation_ids': invalid_ids,
-            'messages_with_timestamp': messages_with_timestamp,
-            'messages_without_timestamp': messages_without_timestamp,
-            'timestamp_coverage': round(messages_with_timestamp / self.kpis['basic']['total_messages'], 4) if self.kpis['basic']['total_messages'] else 0,
-            'invalid_timestamps': invalid_timestamps,
-        }
-    
-    def _calculate_training_metrics(self, bundle: Dict):
-        """Calcula métricas específicas para entrenamiento."""
-        meta = bundle.get('meta', {})
-        training_types = meta.get('training_type', [])
-        
-        conversations = bundle.get('conversations', [])
-        
-        # Contar conversaciones útiles para cada tipo de entrenamiento
-        classification_ready = 0
-        generation_ready = 0
-        
-        for conv in conversations:
-            messages = conv.get('messages', [])
-            
-            # Para clasificación: necesita anotaciones de intención/sentimiento
-            has_intent_annotations = any(
-                msg.get('annotations', {}).get('intent') 
-                for msg in messages
-            )
-            has_sentiment_annotations = any(
-                msg.get('annotations', {}).get('sentiment') 
-                for msg in messages
-            )
-            
-            if has_intent_annotations or has_sentiment_annotations:
-                classification_ready += 1
-            
-            # Para generación: necesita mensajes assistant con contenido
-            has_assistant_messages = any(
-                msg.get('role') == 'assistant' and msg.get('content', '').strip()
-                for msg in messages
-            )
-            
-            if has_assistant_messages:
-                generation_ready += 1
-        
-        self.kpis['training'] = {
-            'training_types': training_types,
-            'classification_ready_conversations': classification_ready,
-            'classification_readiness': round(classification_ready / len(conversations), 4) if conversations else 0,
-            'generation_ready_conversations': generation_ready,
-            'generation_readiness': round(generation_ready / len(conversations), 4) if conversations else 0,
-            'both_ready_conversations': min(classification_ready, generation_ready),
-        }
-    
     def _calculate_executive_summary(self):
         """Calcula resumen ejecutivo de KPIs."""
         basic = self.kpis.get('basic', {})
@@ -481,10 +541,6 @@ class KPICalculator:
         return recommendations
 
 
-# Importar regex para validación de IDs
-import re
-
-
 def main():
     """Función principal para ejecutar el calculador desde línea de comandos."""
     import argparse
@@ -492,23 +548,28 @@ def main():
     parser = argparse.ArgumentParser(
         description='Calcula KPIs auditables para bundles de entrenamiento'
     )
-    parser.add_argument('input_file', type=str, help='Archivo JSON del bundle')
+    parser.add_argument('input_file', type=str, help='Archivo JSON o JSONL del bundle')
     parser.add_argument('-o', '--output', type=str, help='Archivo JSON de salida para KPIs')
     parser.add_argument('--format', choices=['json', 'human'], default='json', help='Formato de salida')
+    parser.add_argument('--workers', type=int, default=1, help='Procesos para bundles JSONL grandes')
     
     args = parser.parse_args()
     
-    # Leer bundle
-    with open(args.input_file, 'r', encoding='utf-8') as f:
-        bundle = json.load(f)
-    
-    # Calcular KPIs
     calculator = KPICalculator()
-    report = calculator.calculate_all(bundle)
+    if args.input_file.endswith('.jsonl'):
+        # Bundle JSONL: una pasada en streaming, opcionalmente en paralelo
+        report = calculator.calculate_jsonl(args.input_file, workers=args.workers)
+    else:
+        # Leer bundle
+        with open(args.input_file, 'r', encoding='utf-8') as f:
+            bundle = json.load(f)
+        
+        # Calcular KPIs
+        report = calculator.calculate_all(bundle)
     
     # Guardar o mostrar
     if args.format == 'json':
-        output_file = args.output or args.input_file.replace('.json', '_kpis.json')
+        output_file = args.output or re.sub(r'\.jsonl?$', '', args.input_file) + '_kpis.json'
         with open(output_file, 'w', encoding='utf-8') as f:
             json.dump(report, f, indent=2, ensure_ascii=False)
         print(f"✅ KPIs calculados y guardados en: {output_file}")
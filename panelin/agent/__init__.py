@@ -12,9 +12,12 @@ from panelin.agent.hybrid_agent import (
     create_panelin_agent,
     run_quotation_workflow,
 )
+from panelin.agent.intent_router import IntentRouter, RouteDecision
 
 __all__ = [
     "PanelinHybridAgent",
     "create_panelin_agent",
     "run_quotation_workflow",
+    "IntentRouter",
+    "RouteDecision",
 ]
@@ -28,6 +28,7 @@ Principios:
 import json
 import logging
 import os
+import time
 from typing import Annotated, Any, Dict, List, Literal, Optional, TypedDict, Union
 from datetime import datetime
 
@@ -35,7 +36,7 @@ from datetime import datetime
 try:
     from langgraph.graph import StateGraph, END
     from langgraph.graph.message import add_messages
-    from langgraph.prebuilt import ToolNode, tools_condition
+    from langgraph.prebuilt import tools_condition
     LANGGRAPH_AVAILABLE = True
 except ImportError:
     LANGGRAPH_AVAILABLE = False
@@ -64,6 +65,19 @@ from panelin.tools.knowledge_base import (
     search_products,
     get_available_products,
 )
+from panelin.tools.config_optimizer import optimize_panel_configuration
+from panelin.agent.intent_router import (
+    ROUTE_CATALOG,
+    ROUTE_LLM,
+    ROUTE_LOOKUP,
+    ROUTE_OPTIMIZE,
+    ROUTE_QUOTE,
+    IntentRouter,
+    RouteDecision,
+)
+from panelin_core.llm_cache import CachedChatModel, LLMResponseCache
+from panelin_core.tool_executor import DEFAULT_MAX_WORKERS, DEFAULT_TIMEOUT_S, ToolExecutor
+from panelin_core.tracing import span, traced
 from panelin.models.schemas import (
     QuotationResult,
     ValidationResult,
@@ -133,7 +147,8 @@ class PanelinHybridAgent:
     Agente híbrido para cotización de paneles BMC.
     
     Combina:
-    - LLM para comprensión de lenguaje natural
+    - Router determinista (camino rápido) para mensajes formulaicos
+    - LLM para comprensión de lenguaje natural en casos ambiguos
     - Herramientas deterministas para cálculos precisos
     
     Example:
@@ -148,6 +163,12 @@ class PanelinHybridAgent:
         temperature: float = 0,
         fallback_model: str = "gpt-4o",
         api_key: Optional[str] = None,
+        llm: Optional[Any] = None,
+        router: Optional[IntentRouter] = None,
+        fast_path: bool = True,
+        max_tool_workers: int = DEFAULT_MAX_WORKERS,
+        tool_timeout_s: float = DEFAULT_TIMEOUT_S,
+        response_cache: Optional[LLMResponseCache] = None,
     ):
         """
         Inicializa el agente híbrido.
@@ -157,35 +178,52 @@ class PanelinHybridAgent:
             temperature: Temperatura para generación (0 para determinismo)
             fallback_model: Modelo de respaldo para casos difíciles
             api_key: API key de OpenAI (o de env var)
+            llm: Chat model ya construido (con bind_tools); reemplaza a ChatOpenAI
+            router: Router de intención a usar (por defecto uno sobre la KB del cotizador)
+            fast_path: Despachar mensajes formulaicos sin pasar por el LLM
+            max_tool_workers: Herramientas de un mismo turno ejecutadas en paralelo
+            tool_timeout_s: Timeout de cada herramienta
+            response_cache: Cache de respuestas del LLM (panelin_core.llm_cache)
         """
         self.model_name = model_name
         self.temperature = temperature
         self.fallback_model = fallback_model
         self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
+        self.router = (router or IntentRouter()) if fast_path else None
+        self.max_tool_workers = max_tool_workers
+        self.tool_timeout_s = tool_timeout_s
+        self.response_cache = response_cache
         
         # Initialize LLM if available
         self.llm = None
         self.graph = None
         
-        if LANGCHAIN_AVAILABLE and self.api_key:
-            self._initialize_llm()
+        if LANGCHAIN_AVAILABLE and (llm is not None or self.api_key):
+            self._initialize_llm(llm)
         
         if LANGGRAPH_AVAILABLE and self.llm:
             self._build_graph()
         
         logger.info(f"PanelinHybridAgent initialized with {model_name}")
     
-    def _initialize_llm(self) -> None:
+    def _initialize_llm(self, llm: Optional[Any] = None) -> None:
         """Inicializa el modelo LLM con herramientas."""
-        self.llm = ChatOpenAI(
+        self.llm = llm or ChatOpenAI(
             model=self.model_name,
             temperature=self.temperature,
             api_key=self.api_key,
         )
+        if self.response_cache is not None:
+            self.llm = CachedChatModel(self.llm, self.response_cache)
         
         # Bind tools to LLM
         self.tools = self._create_tools()
         self.llm_with_tools = self.llm.bind_tools(self.tools)
+        self.tool_executor = ToolExecutor.from_langchain_tools(
+            self.tools,
+            max_workers=self.max_tool_workers,
+            timeout_s=self.tool_timeout_s,
+        )
     
     def _create_tools(self) -> list:
         """Crea las herramientas LangChain para el agente."""
@@ -288,12 +326,39 @@ class PanelinHybridAgent:
             except Exception as e:
                 return [{"error": str(e)}]
         
+        @tool
+        def optimize_configuration(
+            length_m: float,
+            width_m: float,
+            luz_m: Optional[float] = None,
+            familias: Optional[List[str]] = None,
+            max_apoyos_intermedios: int = 3,
+        ) -> dict:
+            """
+            Compara todas las familias, espesores y separaciones de apoyos.
+            Usar para preguntas como '¿qué espesor es más barato para 5.5m de luz?'.
+            Retorna la opción más económica que cumple autoportancia y el
+            frente de Pareto costo vs margen de seguridad.
+            """
+            try:
+                result = optimize_panel_configuration(
+                    length_m=length_m,
+                    width_m=width_m,
+                    luz_m=luz_m,
+                    familias=familias,
+                    max_apoyos_intermedios=max_apoyos_intermedios,
+                )
+                return dict(result)
+            except Exception as e:
+                return {"error": str(e)}
+        
         return [
             calculate_quote,
             lookup_product,
             search_products_kb,
             validate_quote,
             list_available_products,
+            optimize_configuration,
         ]
     
     def _build_graph(self) -> None:
@@ -306,7 +371,7 @@ class PanelinHybridAgent:
         
         # Add nodes
         workflow.add_node("agent", self._agent_node)
-        workflow.add_node("tools", ToolNode(self.tools))
+        workflow.add_node("tools", self._tools_node)
         workflow.add_node("validate", self._validation_node)
         
         # Set entry point
@@ -336,10 +401,33 @@ class PanelinHybridAgent:
             messages = [SystemMessage(content=PANELIN_SYSTEM_PROMPT)] + messages
         
         # Call LLM
-        response = self.llm_with_tools.invoke(messages)
+        with span("agent.llm", messages=len(messages)):
+            response = self.llm_with_tools.invoke(messages)
         
         return {"messages": [response], "step": "agent"}
     
+    def _tools_node(self, state: AgentState) -> Dict[str, Any]:
+        """
+        Ejecuta las tool calls del último mensaje del LLM.
+        
+        Las llamadas de un mismo turno son independientes entre sí y corren en
+        paralelo (ToolExecutor); los ToolMessage conservan el orden pedido.
+        """
+        calls = state["messages"][-1].tool_calls
+        with span("agent.tools", calls=len(calls)):
+            outcomes = self.tool_executor.run(calls)
+        return {
+            "messages": [
+                ToolMessage(
+                    content=outcome.content(),
+                    name=outcome.name,
+                    tool_call_id=outcome.call_id,
+                    status="success" if outcome.ok else "error",
+                )
+                for outcome in outcomes
+            ]
+        }
+    
     def _validation_node(self, state: AgentState) -> Dict[str, Any]:
         """Nodo de validación de cotización."""
         messages = state.get("messages", [])
@@ -361,16 +449,139 @@ class PanelinHybridAgent:
         
         return {"step": "no_quotation_found"}
     
+    @traced("agent.run")
     async def run(self, user_message: str) -> Dict[str, Any]:
         """
         Ejecuta el agente con un mensaje de usuario.
         
+        Los mensajes que el router clasifica con confianza suficiente se
+        despachan directo a las herramientas; el resto va al LLM.
+        
         Args:
             user_message: Mensaje del usuario en lenguaje natural
         
         Returns:
             Diccionario con respuesta, cotización y validación
+            (y "route" cuando se resolvió por el camino rápido)
+        """
+        start = time.perf_counter()
+        if self.router is not None:
+            result = self._run_fast_path(user_message)
+            if result is not None:
+                self.router.stats.record(result["route"]["name"], (time.perf_counter() - start) * 1000)
+                return result
+        
+        result = await self._run_llm(user_message)
+        if self.router is not None:
+            self.router.stats.record(ROUTE_LLM, (time.perf_counter() - start) * 1000)
+        return result
+    
+    def get_route_stats(self) -> Dict[str, Any]:
+        """Proporción de mensajes por ruta y latencia por ruta."""
+        if self.router is None:
+            return {"messages": 0, "fast_path_hits": 0, "fast_path_ratio": 0.0, "routes": {}}
+        return self.router.stats.stats()
+    
+    def _run_fast_path(self, user_message: str) -> Optional[Dict[str, Any]]:
         """
+        Resuelve el mensaje sin LLM si el router tiene confianza suficiente.
+        
+        Returns:
+            Resultado del despacho, o None para delegar en el LLM
+        """
+        try:
+            with span("agent.route"):
+                decision = self.router.classify(user_message)
+        except FileNotFoundError as e:
+            logger.warning(f"Router sin KB, se delega al LLM: {e}")
+            return None
+        if not self.router.should_dispatch(decision):
+            return None
+        
+        try:
+            result = self._dispatch(decision)
+        except (ValueError, FileNotFoundError, ImportError) as e:
+            # Parámetros fuera de rango, etc.: el LLM puede explicarlo o repreguntar
+            logger.info(f"Camino rápido '{decision.route}' delegado al LLM: {e}")
+            return None
+        result["route"] = {
+            "name": decision.route,
+            "confidence": decision.confidence,
+            "params": decision.params,
+        }
+        return result
+    
+    def _dispatch(self, decision: RouteDecision) -> Dict[str, Any]:
+        """Llama a la herramienta determinista de la ruta y formatea la respuesta."""
+        params = decision.params
+        
+        if decision.route == ROUTE_QUOTE:
+            quotation = calculate_panel_quote(
+                panel_type=params["panel_type"],
+                length_m=params["length_m"],
+                width_m=params["width_m"],
+                quantity=params["quantity"],
+                thickness_mm=params["thickness_mm"],
+                discount_percent=params.get("discount_percent", 0.0),
+                include_delivery=params["include_delivery"],
+                include_tax=params["include_tax"],
+            )
+            validation = validate_quotation(quotation)
+            response = self._format_quotation_response(quotation, validation)
+            if decision.notes:
+                response = "\n".join(f"_{note}_" for note in decision.notes) + "\n\n" + response
+            return {"response": response, "quotation": quotation, "validation": dict(validation)}
+        
+        if decision.route == ROUTE_LOOKUP:
+            spec = lookup_product_specs(product_identifier=params["product_key"])
+            if spec is None:
+                raise ValueError(f"Producto no encontrado: {params['product_key']}")
+            lines = [
+                f"## {spec['name']}",
+                f"**SKU:** {spec['sku']}",
+                f"**Precio:** {spec['currency']} {spec['price_per_m2']:.2f} por m²",
+                f"**Ancho útil:** {spec['ancho_util_m']}m",
+                f"**Largo:** {spec['largo_min_m']}m a {spec['largo_max_m']}m",
+                f"**Stock:** {spec['stock_status']}",
+            ]
+            return {"response": "\n".join(lines), "product": dict(spec),
+                    "quotation": None, "validation": None}
+        
+        if decision.route == ROUTE_CATALOG:
+            products = get_available_products(familia=params.get("familia"))
+            lines = ["## Productos disponibles\n"]
+            for product in products:
+                lines.append(
+                    f"- **{product['name']}**: {product['currency']} "
+                    f"{product['price_per_m2']:.2f}/m² ({product['stock_status']})"
+                )
+            return {"response": "\n".join(lines), "products": products,
+                    "quotation": None, "validation": None}
+        
+        if decision.route == ROUTE_OPTIMIZE:
+            result = optimize_panel_configuration(
+                length_m=params["length_m"],
+                width_m=params["width_m"],
+                luz_m=params.get("luz_m"),
+            )
+            best = result["mas_economica"]
+            if best is None:
+                response = "\n".join(result["notes"])
+            else:
+                response = (
+                    f"## Configuración más económica\n\n"
+                    f"**{best['nombre']} {best['espesor_mm']}mm** con {best['apoyos']} apoyos "
+                    f"(separación {best['separacion_m']}m, autoportancia {best['autoportancia_m']}m, "
+                    f"margen {best['margen_seguridad_pct']}%)\n"
+                    f"**Costo comparativo:** USD {best['costo_comparativo_usd']:.2f}"
+                )
+            return {"response": response, "optimization": dict(result),
+                    "quotation": None, "validation": None}
+        
+        raise ValueError(f"Ruta sin despacho: {decision.route}")
+    
+    async def _run_llm(self, user_message: str) -> Dict[str, Any]:
+        """Ejecuta el grafo LangGraph (o el modo simple si no hay LLM)."""
         if not self.graph:
             return await self._run_simple(user_message)
         
@@ -411,7 +622,8 @@ class PanelinHybridAgent:
         3. Valida resultado
         """
         # Simple parameter extraction using keywords
-        params = self._extract_parameters_simple(user_message)
+        with span("agent.extract"):
+            params = self._extract_parameters_simple(user_message)
         
         if not params:
             return {
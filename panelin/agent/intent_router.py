@@ -0,0 +1,409 @@
+"""
+Panelin Intent Router - Camino rápido determinista delante del LLM.
+
+La mayor parte del tráfico es formulaico ("cotizar ISODEC 100mm 6x4"). Para
+esos mensajes, clasificar la intención y extraer los parámetros no necesita un
+LLM: alcanza con una pasada de una regex de alternación precompilada y un trie
+de alias de producto construido desde la KB.
+
+Componentes:
+- RouteTable: trie de alias (familia, clave de producto, SKU) -> productos,
+  compilado una vez por versión de la KB (CompiledKB.derived)
+- IntentRouter: clasifica un mensaje en RouteDecision con confianza; solo las
+  decisiones completas y sin ambigüedad se despachan sin LLM
+- RouteStats: hits por ruta y latencia por ruta (incluida la ruta "llm")
+
+Ante cualquier duda (dos productos, espesor inexistente, palabras de
+comparación, parámetros incompletos) la decisión queda por debajo del umbral y
+el mensaje va al LLM.
+"""
+
+import re
+import threading
+from dataclasses import dataclass, field
+from decimal import ROUND_CEILING, Decimal
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from panelin.tools.quotation_calculator import _load_compiled_kb
+
+
+# Rutas que se despachan directamente a herramientas deterministas
+ROUTE_QUOTE = "quote"
+ROUTE_LOOKUP = "lookup"
+ROUTE_CATALOG = "catalog"
+ROUTE_OPTIMIZE = "optimize"
+ROUTE_LLM = "llm"
+
+# Ancho máximo de panel que acepta calculate_panel_quote; una medida mayor
+# es el ancho de la superficie a cubrir
+MAX_PANEL_WIDTH_M = Decimal("2.0")
+
+DEFAULT_MIN_CONFIDENCE = 1.0
+
+_NUMBER = r"\d+(?:[.,]\d+)?"
+_METERS = r"(?:\s*(?:m|mts?|metros?)\b)?"
+# "sin envío", "no incluir entrega", "ni iva": la opción queda excluida
+_NEGATOR = r"\b(?:sin|no|ni|excluir|excluyendo)"
+_NEGATED = rf"{_NEGATOR}\s+(?:incluir\s+)?(?:el\s+|la\s+|los\s+)?"
+
+# Una sola regex de alternación: cada match es un slot o una palabra clave
+_TOKEN_RE = re.compile(
+    rf"""
+    (?P<dims>(?P<dim_a>{_NUMBER}){_METERS}\s*[x×*]\s*(?P<dim_b>{_NUMBER}){_METERS})
+    |(?P<luz>\bluz\s*(?:de\s*)?(?P<luz_value>{_NUMBER}){_METERS})
+    |(?P<thickness>\b(?P<thickness_value>\d{{2,3}})\s*(?:mm|mil[ií]metros?)\b)
+    |(?P<quantity>\b(?P<quantity_value>\d+)\s*(?:paneles?|unidades?|piezas?)\b)
+    |(?P<quantity_verb>\b(?:necesito|quiero)\s+(?P<quantity_verb_value>\d+)\b(?![.,]\d))
+    |(?P<discount>\b(?P<discount_value>{_NUMBER})\s*%)
+    |(?P<delivery>(?P<delivery_neg>{_NEGATED})?\b(?:env[ií]o|entrega|flete)\b)
+    |(?P<tax>(?P<tax_neg>{_NEGATED})?\b(?:iva|(?:con\s+)?impuestos?)\b)
+    |(?P<negation>{_NEGATOR}\b)
+    |(?P<optimize>\b(?:m[aá]s\s+(?:barat|econ[oó]mic)\w*|qu[eé]\s+espesor|optimi[zc]\w*|conviene)\b)
+    |(?P<lookup>\b(?:ficha|especificaci[oó]n(?:es)?|specs?|caracter[ií]sticas?|datos\s+t[eé]cnicos)\b)
+    |(?P<catalog>\b(?:cat[aá]logo|qu[eé]\s+productos|productos\s+disponibles|lista(?:do)?\s+de\s+productos)\b)
+    |(?P<quote>\b(?:cotiz\w*|presupuest\w*|precio|cu[aá]nto\s+(?:sale|cuesta|vale)|necesito|quiero)\b)
+    |(?P<hedge>\b(?:vs|versus|compar\w*|diferencias?|recomend\w*|mejor|alternativas?)\b)
+    |(?P<stray>\b{_NUMBER}\b)
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_THICKNESS_SUFFIX_RE = re.compile(r"^(?P<base>.+)_(?P<mm>\d+)mm$")
+
+# Slots que cada ruta necesita completos para despacharse sin LLM
+_REQUIRED_SLOTS = {
+    ROUTE_QUOTE: ("product", "thickness", "dimensions"),
+    ROUTE_LOOKUP: ("product", "thickness"),
+    ROUTE_CATALOG: (),
+    ROUTE_OPTIMIZE: ("dimensions",),
+}
+
+
+def _to_decimal(text: str) -> Decimal:
+    return Decimal(text.replace(",", "."))
+
+
+def _option(matches: List[re.Match], negated_group: str) -> Optional[bool]:
+    """
+    Valor de una opción (envío, IVA) según sus menciones en el mensaje.
+
+    Returns:
+        True si se pide, False si no se menciona o se excluye ("sin iva"),
+        None si el mensaje la pide y la excluye a la vez
+    """
+    values = {match.group(negated_group) is None for match in matches}
+    if len(values) > 1:
+        return None
+    return values == {True}
+
+
+@dataclass
+class _ProductLine:
+    """Línea de producto (clave base de la KB) con sus variantes de espesor."""
+    base_key: str
+    familia: str
+    ancho_util_m: Optional[float]
+    variants: Dict[Optional[int], str] = field(default_factory=dict)
+
+
+class RouteTable:
+    """
+    Trie de alias de producto compilado desde la KB.
+
+    Cada alias es una secuencia de palabras (familia, clave base, SKU) y mapea
+    al conjunto de líneas de producto que puede designar. La búsqueda recorre
+    el mensaje una vez y se queda con el match más largo en cada posición.
+    """
+
+    def __init__(self, catalog: Dict[str, Any]):
+        self.lines: Dict[str, _ProductLine] = {}
+        self._trie: Dict[str, Any] = {}
+
+        for key, product in catalog.get("products", {}).items():
+            if not isinstance(product, dict):
+                continue
+            match = _THICKNESS_SUFFIX_RE.match(key)
+            base_key = match.group("base") if match else key
+            thickness = int(match.group("mm")) if match else None
+            line = self.lines.get(base_key)
+            if line is None:
+                line = self.lines[base_key] = _ProductLine(
+                    base_key=base_key,
+                    familia=product.get("familia", ""),
+                    ancho_util_m=product.get("ancho_util_m"),
+                )
+            line.variants[thickness] = key
+
+            # Prefijos de la clave base: "isoroof", "isoroof plus", "isoroof plus 3g"
+            words = _WORD_RE.findall(base_key.lower())
+            for end in range(1, len(words) + 1):
+                self._insert(words[:end], base_key, None)
+            self._insert(_WORD_RE.findall(line.familia.lower()), base_key, None)
+            sku = product.get("sku")
+            if sku:
+                self._insert(_WORD_RE.findall(sku.lower()), base_key, thickness)
+
+    def _insert(self, words: List[str], base_key: str, thickness: Optional[int]) -> None:
+        if not words:
+            return
+        node = self._trie
+        for word in words:
+            node = node.setdefault(word, {})
+        node.setdefault(None, set()).add((base_key, thickness))
+
+    def match_products(self, message: str) -> List[Set[Tuple[str, Optional[int]]]]:
+        """
+        Alias de producto mencionados en el mensaje, en orden de aparición.
+
+        Returns:
+            Un conjunto de candidatos (clave base, espesor del SKU) por mención
+        """
+        words = _WORD_RE.findall(message.lower())
+        mentions = []
+        i = 0
+        while i < len(words):
+            node, best, best_end = self._trie, None, i
+            for j in range(i, len(words)):
+                node = node.get(words[j])
+                if node is None:
+                    break
+                if None in node:
+                    best, best_end = node[None], j + 1
+            if best is None:
+                i += 1
+                continue
+            mentions.append(best)
+            i = best_end
+        return mentions
+
+    def resolve(
+        self,
+        candidates: Set[Tuple[str, Optional[int]]],
+        thickness_mm: Optional[int],
+    ) -> Optional[Tuple[_ProductLine, Optional[int]]]:
+        """
+        Reduce los candidatos de una mención a una única (línea, espesor).
+
+        Se descartan las líneas sin el espesor pedido; si quedan varias, gana la
+        de clave más corta ("isoroof" -> isoroof_3g) salvo empate.
+        """
+        viable = []
+        for base_key, sku_thickness in candidates:
+            if None not in (sku_thickness, thickness_mm) and sku_thickness != thickness_mm:
+                continue
+            line = self.lines[base_key]
+            thickness = sku_thickness if sku_thickness is not None else thickness_mm
+            if thickness is None and len(line.variants) == 1:
+                thickness = next(iter(line.variants))
+            if thickness in line.variants:
+                viable.append((line, thickness))
+        if not viable:
+            return None
+        shortest = min(len(line.base_key.split("_")) for line, _ in viable)
+        viable = {(line.base_key, t): (line, t) for line, t in viable
+                  if len(line.base_key.split("_")) == shortest}
+        if len(viable) != 1:
+            return None
+        return next(iter(viable.values()))
+
+
+@dataclass
+class RouteDecision:
+    """Resultado de clasificar un mensaje."""
+    route: str
+    confidence: float
+    params: Dict[str, Any] = field(default_factory=dict)
+    missing: List[str] = field(default_factory=list)
+    notes: List[str] = field(default_factory=list)
+
+
+class RouteStats:
+    """Hits y latencia por ruta. Thread-safe."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[str, Dict[str, float]] = {}
+
+    def record(self, route: str, elapsed_ms: float) -> None:
+        with self._lock:
+            entry = self._routes.setdefault(route, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Total de mensajes, proporción resuelta sin LLM y latencia por ruta."""
+        with self._lock:
+            total = sum(entry["count"] for entry in self._routes.values())
+            fast = total - self._routes.get(ROUTE_LLM, {}).get("count", 0)
+            return {
+                "messages": total,
+                "fast_path_hits": fast,
+                "fast_path_ratio": fast / total if total else 0.0,
+                "routes": {
+                    route: {
+                        "count": entry["count"],
+                        "hit_ratio": entry["count"] / total,
+                        "avg_ms": entry["total_ms"] / entry["count"],
+                        "max_ms": entry["max_ms"],
+                    }
+                    for route, entry in sorted(self._routes.items())
+                },
+            }
+
+
+class IntentRouter:
+    """
+    Clasificador determinista de intención y extractor de parámetros.
+
+    Example:
+        >>> router = IntentRouter()
+        >>> decision = router.classify("cotizar ISODEC 100mm 6x4")
+        >>> decision.route, decision.confidence
+        ('quote', 1.0)
+    """
+
+    def __init__(
+        self,
+        kb_path: Optional[Path] = None,
+        min_confidence: float = DEFAULT_MIN_CONFIDENCE,
+    ):
+        """
+        Args:
+            kb_path: KB de la que se construye el trie (default: la del cotizador)
+            min_confidence: Confianza mínima para despachar sin LLM
+        """
+        self.kb_path = kb_path
+        self.min_confidence = min_confidence
+        self.stats = RouteStats()
+
+    def table(self) -> RouteTable:
+        """Trie de alias de la versión actual de la KB."""
+        return _load_compiled_kb(self.kb_path).derived("intent_routes", RouteTable)
+
+    def should_dispatch(self, decision: RouteDecision) -> bool:
+        return decision.route != ROUTE_LLM and decision.confidence >= self.min_confidence
+
+    def classify(self, message: str) -> RouteDecision:
+        """Clasifica el mensaje y extrae los parámetros de su ruta."""
+        slots: Dict[str, List[re.Match]] = {}
+        for match in _TOKEN_RE.finditer(message):
+            slots.setdefault(match.lastgroup, []).append(match)
+        quantities = [m.group("quantity_value") for m in slots.get("quantity", ())]
+        quantities += [m.group("quantity_verb_value") for m in slots.get("quantity_verb", ())]
+
+        table = self.table()
+        mentions = table.match_products(message)
+
+        if "optimize" in slots:
+            route = ROUTE_OPTIMIZE
+        elif "lookup" in slots:
+            route = ROUTE_LOOKUP
+        elif "catalog" in slots:
+            route = ROUTE_CATALOG
+        elif "quote" in slots or "quantity_verb" in slots or (mentions and "dims" in slots):
+            route = ROUTE_QUOTE
+        else:
+            return RouteDecision(route=ROUTE_LLM, confidence=0.0)
+
+        params: Dict[str, Any] = {}
+        filled: Set[str] = set()
+        notes: List[str] = []
+        # Una negación que no acompaña a una opción conocida ("no necesito
+        # envío") no se puede interpretar sin el LLM
+        ambiguous = (
+            "hedge" in slots
+            or "stray" in slots
+            or "negation" in slots
+            or len(mentions) > 1
+            or len(quantities) > 1
+            or any(len(slots.get(name, ())) > 1 for name in ("dims", "thickness", "discount", "luz"))
+        )
+
+        thickness_mm = None
+        if "thickness" in slots:
+            thickness_mm = int(slots["thickness"][0].group("thickness_value"))
+
+        line = None
+        if len(mentions) == 1:
+            resolved = table.resolve(mentions[0], thickness_mm)
+            if resolved is not None:
+                line, thickness_mm = resolved
+                filled.update(("product", "thickness"))
+                params["product_key"] = line.variants[thickness_mm]
+                params["panel_type"] = line.base_key
+                params["thickness_mm"] = thickness_mm
+            familias = {table.lines[base_key].familia for base_key, _ in mentions[0]}
+            if len(familias) == 1:
+                params["familia"] = familias.pop()
+
+        if "dims" in slots:
+            dims = slots["dims"][0]
+            a, b = _to_decimal(dims.group("dim_a")), _to_decimal(dims.group("dim_b"))
+            params["length_m"], params["width_m"] = float(a), float(b)
+            filled.add("dimensions")
+
+        if route == ROUTE_QUOTE:
+            if quantities:
+                params["quantity"] = int(quantities[0])
+            if "dimensions" in filled and not self._panel_layout(params, a, b, line, notes):
+                filled.discard("dimensions")
+            params.setdefault("quantity", 1)
+            if "discount" in slots:
+                params["discount_percent"] = float(_to_decimal(slots["discount"][0].group("discount_value")))
+            for param, name in (("include_delivery", "delivery"), ("include_tax", "tax")):
+                value = _option(slots.get(name, []), f"{name}_neg")
+                ambiguous = ambiguous or value is None
+                params[param] = bool(value)
+        elif route == ROUTE_OPTIMIZE:
+            if "luz" in slots:
+                params["luz_m"] = float(_to_decimal(slots["luz"][0].group("luz_value")))
+            # El optimizador usa su propio catálogo; con producto mencionado decide el LLM
+            ambiguous = ambiguous or bool(mentions)
+        elif route == ROUTE_CATALOG:
+            ambiguous = ambiguous or (bool(mentions) and "familia" not in params)
+
+        required = _REQUIRED_SLOTS[route]
+        missing = [slot for slot in required if slot not in filled]
+        confidence = (len(required) - len(missing)) / len(required) if required else 1.0
+        if ambiguous:
+            confidence = min(confidence, 0.5)
+        return RouteDecision(route=route, confidence=confidence, params=params,
+                             missing=missing, notes=notes)
+
+    @staticmethod
+    def _panel_layout(
+        params: Dict[str, Any],
+        a: Decimal,
+        b: Decimal,
+        line: Optional[_ProductLine],
+        notes: List[str],
+    ) -> bool:
+        """
+        Interpreta "AxB" como panel (ancho <= 2m) o como superficie a cubrir.
+
+        Para una superficie, la cantidad es ceil(B / ancho útil) paneles de
+        largo A; si el mensaje ya trae cantidad, la medida es inconsistente.
+
+        Returns:
+            False si las medidas no se pueden interpretar sin ambigüedad
+        """
+        if b <= MAX_PANEL_WIDTH_M:
+            return True
+        if line is None or not line.ancho_util_m or "quantity" in params:
+            return False
+        ancho = Decimal(str(line.ancho_util_m))
+        quantity = int((b / ancho).to_integral_value(rounding=ROUND_CEILING))
+        params["width_m"] = line.ancho_util_m
+        params["quantity"] = quantity
+        notes.append(
+            f"Superficie de {a}m x {b}m: {quantity} paneles de {a}m "
+            f"(ancho útil {line.ancho_util_m}m)."
+        )
+        return True
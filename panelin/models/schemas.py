@@ -115,6 +115,39 @@ class FullQuotationResult(TypedDict):
     items_sin_precio: List[str]
 
 
+class ConfigOption(TypedDict):
+    """Una configuración evaluada por el optimizador what-if."""
+    product_id: str
+    nombre: str
+    bom_preset: Optional[str]
+    espesor_mm: int
+    apoyos: int
+    separacion_m: float
+    autoportancia_m: float
+    cumple: bool
+    margen_seguridad_pct: float
+    panels_needed: int
+    area_m2: float
+    costo_paneles_usd: float
+    costo_fijaciones_usd: float
+    costo_apoyos_usd: float
+    costo_comparativo_usd: float
+    pareto: bool
+
+
+class ConfigOptimizationResult(TypedDict):
+    """Resultado del barrido familia × espesor × separación de apoyos."""
+    luz_m: float
+    largo_m: float
+    ancho_m: float
+    configuraciones_evaluadas: int
+    configuraciones_cumplen: int
+    mas_economica: Optional[ConfigOption]
+    pareto: List[ConfigOption]
+    ranking: List[ConfigOption]
+    notes: List[str]
+
+
 class QuotationResult(TypedDict):
     """Resultado de una cotización calculada deterministicamente."""
     quotation_id: str
@@ -0,0 +1,133 @@
+"""
+Tests del optimizador what-if de configuraciones.
+
+El barrido vectorizado debe coincidir con calculate_full_quote y
+validate_autoportancia configuración por configuración, y el frente de
+Pareto no debe contener opciones dominadas.
+"""
+
+import json
+import shutil
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from panelin.tools.bom_calculator import (
+    DEFAULT_KB_PATH,
+    calculate_full_quote,
+    validate_autoportancia,
+)
+from panelin.tools.config_optimizer import optimize_panel_configuration
+
+
+def _all_options(**params):
+    result = optimize_panel_configuration(top_n=10_000, **params)
+    return result, result["ranking"]
+
+
+class TestMatchesPerCandidateCalls:
+    @pytest.mark.parametrize("length_m,width_m", [(5.5, 6.0), (3.3, 7.25), (8.0, 2.24)])
+    def test_panel_cost_matches_full_quote(self, length_m, width_m):
+        _, options = _all_options(length_m=length_m, width_m=width_m)
+        seen = set()
+        for option in options:
+            key = (option["product_id"], option["espesor_mm"])
+            if key in seen:
+                continue
+            seen.add(key)
+            quote = calculate_full_quote.__wrapped__(
+                product_id=option["product_id"],
+                length_m=length_m,
+                width_m=width_m,
+                thickness_mm=option["espesor_mm"],
+                bom_preset=option["bom_preset"],
+            )
+            assert option["panels_needed"] == quote["panels_needed"]
+            assert option["area_m2"] == quote["area_m2"]
+            assert option["costo_paneles_usd"] == quote["subtotal_paneles"]
+        assert seen
+
+    def test_autoportancia_matches_validator(self):
+        result = optimize_panel_configuration(length_m=5.5, width_m=6.0, max_apoyos_intermedios=0)
+        assert result["configuraciones_evaluadas"] > result["configuraciones_cumplen"]
+        for option in result["ranking"]:
+            check = validate_autoportancia(option["espesor_mm"], 5.5, option["product_id"])
+            assert option["cumple"] == check["cumple"]
+            assert option["margen_seguridad_pct"] == check["margen_seguridad_pct"]
+
+
+class TestPareto:
+    def test_front_is_non_dominated_and_sorted(self):
+        _, options = _all_options(length_m=6.0, width_m=10.0, costo_apoyo_ml=12.5,
+                                  max_apoyos_intermedios=5)
+        front = [o for o in options if o["pareto"]]
+        assert front
+        for a in front:
+            for b in options:
+                dominated = (
+                    b["costo_comparativo_usd"] <= a["costo_comparativo_usd"]
+                    and b["margen_seguridad_pct"] >= a["margen_seguridad_pct"]
+                    and (b["costo_comparativo_usd"] < a["costo_comparativo_usd"]
+                         or b["margen_seguridad_pct"] > a["margen_seguridad_pct"])
+                )
+                assert not dominated, (a, b)
+        costs = [o["costo_comparativo_usd"] for o in front]
+        assert costs == sorted(costs)
+
+    def test_cheapest_is_compliant_minimum(self):
+        result, options = _all_options(length_m=5.5, width_m=6.0, luz_m=5.5)
+        assert all(o["cumple"] for o in options)
+        assert result["mas_economica"] == options[0]
+        assert options[0]["costo_comparativo_usd"] == min(o["costo_comparativo_usd"] for o in options)
+
+    def test_support_cost_penalizes_extra_supports(self):
+        result = optimize_panel_configuration(length_m=5.5, width_m=6.0, familias=["ISODEC EPS"],
+                                              espesores=[100], costo_apoyo_ml=10.0)
+        cheapest = result["mas_economica"]
+        assert cheapest["apoyos"] == 2
+        assert cheapest["costo_apoyos_usd"] == 120.0
+
+    def test_no_compliant_configuration(self):
+        result = optimize_panel_configuration(length_m=30.0, width_m=5.0, max_apoyos_intermedios=0)
+        assert result["mas_economica"] is None
+        assert result["pareto"] == []
+        assert any("Ninguna configuración" in n for n in result["notes"])
+
+
+class TestCompiledTables:
+    def test_kb_change_recompiles(self, tmp_path):
+        kb_copy = tmp_path / "kb.json"
+        shutil.copy(DEFAULT_KB_PATH, kb_copy)
+        params = dict(length_m=5.5, width_m=6.0, familias=["ISODEC_EPS"], espesores=[100],
+                      max_apoyos_intermedios=0, kb_path=kb_copy)
+        before = optimize_panel_configuration(**params)["mas_economica"]
+
+        catalog = json.loads(kb_copy.read_text(encoding="utf-8"))
+        catalog["products"]["ISODEC_EPS"]["espesores"]["100"]["precio"] = 99.99
+        kb_copy.write_text(json.dumps(catalog), encoding="utf-8")
+
+        after = optimize_panel_configuration(**params)["mas_economica"]
+        assert after["costo_paneles_usd"] != before["costo_paneles_usd"]
+
+    def test_fixation_prices_from_bom_rules(self, tmp_path):
+        from panelin.tools.bom_calculator import BOM_RULES_PATH
+
+        rules = json.loads(BOM_RULES_PATH.read_text(encoding="utf-8"))
+        rules["sistemas"]["techo_isoroof_3g"]["sistema_fijacion"] = "caballete_tornillo"
+        rules["precios_fijaciones_referencia"] = {
+            "caballete_isoroof": {"nombre": "Caballete", "precio_iva_inc": 1.255},
+        }
+        rules_copy = tmp_path / "bom_rules.json"
+        rules_copy.write_text(json.dumps(rules), encoding="utf-8")
+
+        result = optimize_panel_configuration(length_m=2.5, width_m=6.0, familias=["ISOROOF"],
+                                              espesores=[30], bom_rules_path=rules_copy)
+        for option in result["ranking"]:
+            # 6 paneles x apoyos x 1.255, redondeo por línea
+            expected = float((6 * option["apoyos"] * 1255 + 5) // 10) / 100
+            assert option["costo_fijaciones_usd"] == expected
+
+    def test_invalid_dimensions(self):
+        with pytest.raises(ValueError):
+            optimize_panel_configuration(length_m=0, width_m=6.0)
@@ -0,0 +1,163 @@
+"""
+Tests del camino rápido (IntentRouter) delante del LLM.
+
+Usan un LLM stub que cuenta invocaciones: los mensajes formulaicos no deben
+llegar al LLM y deben dar la misma cotización que la herramienta directa; los
+ambiguos sí deben llegar.
+"""
+
+import asyncio
+import json
+import shutil
+
+import pytest
+
+from panelin.agent.hybrid_agent import PanelinHybridAgent
+from panelin.agent.intent_router import IntentRouter
+from panelin.tools.quotation_calculator import DEFAULT_KB_PATH, calculate_panel_quote
+
+
+class StubLLM:
+    """Chat model mínimo: nunca llama herramientas y cuenta invocaciones."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def bind_tools(self, tools):
+        return self
+
+    def invoke(self, messages):
+        from langchain_core.messages import AIMessage
+
+        self.calls += 1
+        return AIMessage(content="respuesta del LLM")
+
+
+@pytest.fixture
+def router():
+    return IntentRouter()
+
+
+@pytest.fixture
+def stub_agent():
+    pytest.importorskip("langgraph")
+    llm = StubLLM()
+    return PanelinHybridAgent(llm=llm), llm
+
+
+class TestClassify:
+    def test_surface_dimensions(self, router):
+        decision = router.classify("cotizar ISODEC 100mm 6x4")
+        assert decision.route == "quote"
+        assert decision.confidence == 1.0
+        # 4m / 1.12m de ancho útil -> 4 paneles de 6m
+        assert decision.params["product_key"] == "isodec_eps_100mm"
+        assert decision.params["quantity"] == 4
+        assert decision.params["width_m"] == 1.12
+
+    def test_panel_dimensions_and_options(self, router):
+        decision = router.classify("Necesito 20 paneles Isopanel de 3m x 1.14m, espesor 100mm, con IVA y envío")
+        assert decision.confidence == 1.0
+        assert decision.params["product_key"] == "isopanel_eps_100mm"
+        assert (decision.params["length_m"], decision.params["width_m"]) == (3.0, 1.14)
+        assert decision.params["quantity"] == 20
+        assert decision.params["include_tax"] and decision.params["include_delivery"]
+
+    @pytest.mark.parametrize("message, delivery, tax", [
+        ("cotizar isodec 100mm 6x1 sin iva", False, False),
+        ("cotizar isodec 100mm 6x1 sin envío", False, False),
+        ("cotizar isodec 100mm 6x1, no incluir entrega", False, False),
+        ("cotizar isodec 100mm 6x1 sin flete ni iva", False, False),
+        ("cotizar isodec 100mm 6x1 con iva, sin incluir el envío", False, True),
+        ("cotizar isodec 100mm 6x1 con envío y sin impuestos", True, False),
+    ])
+    def test_negated_options(self, router, message, delivery, tax):
+        decision = router.classify(message)
+        assert decision.confidence == 1.0
+        assert decision.params["include_delivery"] is delivery
+        assert decision.params["include_tax"] is tax
+
+    def test_sku_and_fixed_thickness_products(self, router):
+        assert router.classify("precio IDEC150 4x1.12").params["product_key"] == "isodec_eps_150mm"
+        assert router.classify("cotizar isoroof 5x1").params["product_key"] == "isoroof_3g"
+        assert router.classify("cotizar isoroof plus 5x1").params["product_key"] == "isoroof_plus_3g"
+
+    def test_thickness_disambiguates_family(self, router):
+        # isodec existe en EPS (100/150) y PIR (50/80)
+        assert router.classify("cotizar isodec 80mm 5x1.12").params["product_key"] == "isodec_pir_80mm"
+        assert router.classify("cotizar isodec 5x1.12").confidence < 1.0
+
+    @pytest.mark.parametrize("message", [
+        "hola, qué tal",
+        "isodec vs isopanel 100mm 6x1.12",
+        "cotizar isodec 100mm 6x4 para 3 techos",
+        "cotizar isodec 200mm 6x1.12",
+        "cotizar isodec 100mm 6x1.12 y 4x1.12",
+        "¿cuál me recomendás para un galpón?",
+        "cotizar isodec 100mm 6x1 con envío, bueno no, sin envío",
+        "cotizar isodec 100mm 6x1, no necesito envío",
+    ])
+    def test_ambiguous_messages_go_to_llm(self, router, message):
+        assert not router.should_dispatch(router.classify(message))
+
+    def test_alias_trie_follows_kb_version(self, tmp_path):
+        kb_copy = tmp_path / "kb.json"
+        shutil.copy(DEFAULT_KB_PATH, kb_copy)
+        router = IntentRouter(kb_path=kb_copy)
+        assert router.classify("ficha isodec eps 200mm").confidence < 1.0
+
+        catalog = json.loads(kb_copy.read_text(encoding="utf-8"))
+        catalog["products"]["isodec_eps_200mm"] = dict(catalog["products"]["isodec_eps_150mm"], sku="IDEC200")
+        kb_copy.write_text(json.dumps(catalog), encoding="utf-8")
+
+        decision = router.classify("ficha isodec eps 200mm")
+        assert decision.confidence == 1.0
+        assert decision.params["product_key"] == "isodec_eps_200mm"
+
+
+class TestAgentFastPath:
+    def test_formulaic_quote_skips_llm(self, stub_agent):
+        agent, llm = stub_agent
+        result = asyncio.run(agent.run("cotizar ISODEC 100mm 6x4"))
+        assert llm.calls == 0
+        assert result["route"]["name"] == "quote"
+
+        direct = calculate_panel_quote.__wrapped__(
+            panel_type="isodec_eps", length_m=6.0, width_m=1.12, quantity=4, thickness_mm=100,
+        )
+        assert result["quotation"]["total_usd"] == direct["total_usd"]
+        assert result["quotation"]["verification_checksum"] == direct["verification_checksum"]
+        assert result["validation"]["is_valid"]
+
+    def test_ambiguous_message_calls_llm(self, stub_agent):
+        agent, llm = stub_agent
+        result = asyncio.run(agent.run("¿qué panel me recomendás para un galpón?"))
+        assert llm.calls == 1
+        assert result["response"] == "respuesta del LLM"
+        assert "route" not in result
+
+    def test_calculator_error_falls_back_to_llm(self, stub_agent):
+        agent, llm = stub_agent
+        asyncio.run(agent.run("cotizar isodec 100mm 30x1.12"))  # largo > máximo
+        assert llm.calls == 1
+
+    def test_route_stats(self, stub_agent):
+        agent, _ = stub_agent
+        for message in ("cotizar ISODEC 100mm 6x4", "ficha isodec pir 80mm", "catálogo isopanel", "hola"):
+            asyncio.run(agent.run(message))
+        stats = agent.get_route_stats()
+        assert stats["messages"] == 4
+        assert stats["fast_path_hits"] == 3
+        assert stats["fast_path_ratio"] == 0.75
+        assert set(stats["routes"]) == {"quote", "lookup", "catalog", "llm"}
+        for route in stats["routes"].values():
+            assert route["count"] == 1
+            assert 0 <= route["avg_ms"] <= route["max_ms"]
+
+    def test_fast_path_disabled(self):
+        pytest.importorskip("langgraph")
+        llm = StubLLM()
+        agent = PanelinHybridAgent(llm=llm, fast_path=False)
+        asyncio.run(agent.run("cotizar ISODEC 100mm 6x4"))
+        assert llm.calls == 1
+        assert agent.get_route_stats()["messages"] == 0
@@ -0,0 +1,172 @@
+"""
+Tests del cache versionado de cotizaciones.
+
+Verifican que un resultado servido desde cache es idéntico byte a byte al
+recalculado (checksum incluido) y que cualquier cambio de la KB lo invalida.
+"""
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from panelin.tools import quote_cache
+from panelin.tools.bom_calculator import calculate_full_quote
+from panelin.tools.quotation_calculator import calculate_panel_quote, validate_quotation
+from panelin.tools.quote_cache import QuoteCache, get_quote_cache_stats
+from panelin.tools.shopify_sync import handle_shopify_webhook
+
+
+TEST_KB_PATH = Path(__file__).parent.parent / "data" / "panelin_truth_bmcuruguay.json"
+
+# Campos que identifican a la cotización emitida, no a su contenido
+IDENTITY_FIELDS = ("quotation_id", "timestamp")
+
+
+def _content_bytes(result) -> bytes:
+    content = {k: v for k, v in result.items() if k not in IDENTITY_FIELDS}
+    return json.dumps(content, sort_keys=True, ensure_ascii=False).encode("utf-8")
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    """Cache vacío y aislado para cada test."""
+    cache = QuoteCache()
+    monkeypatch.setattr(quote_cache, "QUOTE_CACHE", cache)
+    return cache
+
+
+@pytest.fixture
+def kb_copy(tmp_path):
+    path = tmp_path / "panelin_truth_bmcuruguay.json"
+    shutil.copy(TEST_KB_PATH, path)
+    return path
+
+
+class TestCachedResultsIdentical:
+    """Cache hit == cálculo sin cache."""
+
+    @pytest.mark.parametrize("params", [
+        dict(panel_type="Isopanel EPS", thickness_mm=50, length_m=3.0, width_m=1.14, quantity=10),
+        dict(panel_type="Isodec EPS", thickness_mm=100, length_m=1.2, width_m=1.12, quantity=40,
+             discount_percent=7.5, include_delivery=True, include_tax=True),
+    ])
+    def test_panel_quote_byte_identical(self, params):
+        uncached = calculate_panel_quote.__wrapped__(kb_path=TEST_KB_PATH, **params)
+        first = calculate_panel_quote(kb_path=TEST_KB_PATH, **params)
+        second = calculate_panel_quote(kb_path=TEST_KB_PATH, **params)
+
+        assert get_quote_cache_stats()["hits"] == 1
+        assert _content_bytes(first) == _content_bytes(uncached)
+        assert _content_bytes(second) == _content_bytes(uncached)
+        assert second["verification_checksum"] == uncached["verification_checksum"]
+        assert second["quotation_id"] != first["quotation_id"]
+        assert validate_quotation(second)["is_valid"]
+
+    def test_full_quote_byte_identical(self):
+        params = dict(product_id="ISODEC_EPS", length_m=6.0, width_m=5.0,
+                      thickness_mm=100, bom_preset="techo_isodec_eps", luz_m=4.5)
+        uncached = calculate_full_quote.__wrapped__(**params)
+        calculate_full_quote(**params)
+        cached = calculate_full_quote(**params)
+
+        assert get_quote_cache_stats()["hits"] == 1
+        assert _content_bytes(cached) == _content_bytes(uncached)
+        assert cached["verification_checksum"] == uncached["verification_checksum"]
+
+    def test_positional_and_keyword_calls_share_entry(self):
+        calculate_panel_quote("Isopanel EPS", 3.0, 1.14, 10, 50, kb_path=TEST_KB_PATH)
+        calculate_panel_quote(panel_type="Isopanel EPS", length_m=3.0, width_m=1.14,
+                              quantity=10, thickness_mm=50, discount_percent=0.0,
+                              kb_path=TEST_KB_PATH)
+        assert get_quote_cache_stats()["hits"] == 1
+
+    def test_mutating_result_does_not_corrupt_cache(self):
+        params = dict(panel_type="Isopanel EPS", thickness_mm=50, length_m=3.0,
+                      width_m=1.14, quantity=10, kb_path=TEST_KB_PATH)
+        first = calculate_panel_quote(**params)
+        expected = _content_bytes(first)
+        first["line_items"][0]["line_total_usd"] = 0
+        first["notes"].append("editado")
+        assert _content_bytes(calculate_panel_quote(**params)) == expected
+
+    def test_errors_are_not_cached(self):
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                calculate_panel_quote(panel_type="Inexistente", thickness_mm=50, length_m=3.0,
+                                      width_m=1.14, quantity=1, kb_path=TEST_KB_PATH)
+        assert get_quote_cache_stats()["size"] == 0
+
+
+class TestInvalidation:
+    """Cambios en la KB nunca sirven cotizaciones obsoletas."""
+
+    def test_kb_file_change_invalidates(self, kb_copy):
+        params = dict(panel_type="Isopanel EPS", thickness_mm=50, length_m=3.0,
+                      width_m=1.14, quantity=10, kb_path=kb_copy)
+        before = calculate_panel_quote(**params)
+
+        catalog = json.loads(kb_copy.read_text(encoding="utf-8"))
+        catalog["products"]["isopanel_eps_50mm"]["price_per_m2"] = 50.0
+        kb_copy.write_text(json.dumps(catalog), encoding="utf-8")
+
+        after = calculate_panel_quote(**params)
+        assert get_quote_cache_stats()["hits"] == 0
+        assert after["total_usd"] != before["total_usd"]
+        assert _content_bytes(after) == _content_bytes(calculate_panel_quote.__wrapped__(**params))
+
+    def test_shopify_webhook_invalidates(self, kb_copy, fresh_cache, monkeypatch):
+        monkeypatch.setattr("panelin.tools.shopify_sync._log_sync_event", lambda event: None)
+        params = dict(panel_type="Isopanel EPS", thickness_mm=50, length_m=3.0,
+                      width_m=1.14, quantity=10, kb_path=kb_copy)
+        before = calculate_panel_quote(**params)
+
+        event = handle_shopify_webhook(
+            "products/update",
+            {
+                "id": "gid://shopify/Product/isopanel-eps-50",
+                "title": "ISOPANEL EPS 50mm",
+                "variants": [{"sku": "IPANEL50", "price": "45.00", "inventory_quantity": 10}],
+            },
+            kb_path=kb_copy,
+        )
+        assert event["sync_status"] == "success"
+        assert fresh_cache.stats()["invalidations"] == 1
+
+        after = calculate_panel_quote(**params)
+        assert after["total_usd"] != before["total_usd"]
+
+
+class TestQuoteCache:
+    """Política LRU/TTL y contadores."""
+
+    def test_lru_eviction(self):
+        cache = QuoteCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == (True, 1)
+        cache.put("c", 3)
+
+        assert cache.get("b") == (False, None)
+        assert cache.get("a") == (True, 1)
+        stats = cache.stats()
+        assert stats["evictions"] == 1
+        assert stats["hits"] == 2 and stats["misses"] == 1
+
+    def test_ttl_expiration(self):
+        now = [0.0]
+        cache = QuoteCache(ttl_seconds=10, clock=lambda: now[0])
+        cache.put("a", 1)
+        now[0] = 9.9
+        assert cache.get("a") == (True, 1)
+        now[0] = 10.0
+        assert cache.get("a") == (False, None)
+        assert cache.stats()["expirations"] == 1
+
+    def test_put_from_stale_generation_is_dropped(self):
+        cache = QuoteCache()
+        generation = cache.generation
+        cache.invalidate()
+        cache.put("a", 1, generation)
+        assert cache.get("a") == (False, None)
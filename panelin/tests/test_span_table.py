@@ -0,0 +1,105 @@
+"""
+Tests de la tabla compilada de autoportancia.
+
+La tabla debe responder igual que la búsqueda lineal original sobre la KB y
+recompilarse cuando cambia el archivo.
+"""
+
+import json
+import random
+import shutil
+
+import pytest
+
+from panelin.tools.bom_calculator import (
+    BOM_RULES_PATH,
+    DEFAULT_KB_PATH,
+    _load_span_table,
+    validate_autoportancia,
+)
+from panelin.tools.span_table import SpanTable
+
+
+KB = {
+    "products": {
+        # Autoportancia no monótona y espesores sin dato
+        "FAM_A": {"espesores": {
+            "150": {"autoportancia": 4.0},
+            "50": {"autoportancia": 3.0},
+            "100": {"autoportancia": 2.5},
+            "80": {},
+            "200": {"autoportancia": 7.5},
+        }},
+        "FAM_B": {"espesores": {"50": {"precio": 10.0}}},
+    }
+}
+BOM_RULES = {
+    "sistemas": {
+        "techo_b": {"producto_base": "FAM_B",
+                    "autoportancia": {"tabla": {"50": {"autoportancia_m": 2.2}}}},
+        "techo_b_bis": {"producto_base": "FAM_B",
+                        "autoportancia": {"tabla": {"50": {"autoportancia_m": 9.9}}}},
+    }
+}
+
+
+def _linear_min_thickness(espesores, luz_m):
+    """Búsqueda lineal original de validate_autoportancia."""
+    for esp in sorted(espesores, key=int):
+        esp_auto = espesores[esp].get("autoportancia")
+        if esp_auto and luz_m <= esp_auto:
+            return esp, esp_auto
+    return None
+
+
+class TestSpanTable:
+    def test_lookup_prefers_kb_then_first_bom_system(self):
+        table = SpanTable(KB, BOM_RULES)
+        assert table.autoportancia("FAM_A", 150) == 4.0
+        assert table.autoportancia("FAM_A", "80") is None
+        assert table.autoportancia("FAM_B", 50) == 2.2
+        assert table.autoportancia("FAM_X", 50) is None
+
+    def test_min_thickness_matches_linear_scan(self):
+        table = SpanTable(KB, BOM_RULES)
+        espesores = KB["products"]["FAM_A"]["espesores"]
+        rnd = random.Random(7)
+        for luz in [0.0, 2.5, 2.51, 3.0, 4.0, 7.5, 7.6] + [rnd.uniform(0, 9) for _ in range(500)]:
+            assert table.min_thickness("FAM_A", luz) == _linear_min_thickness(espesores, luz)
+        assert table.min_thickness("FAM_B", 1.0) is None
+        assert table.max_span("FAM_A") == 7.5
+        assert table.max_span("FAM_B") is None
+
+    def test_real_kb_matches_linear_scan(self):
+        kb = json.loads(DEFAULT_KB_PATH.read_text(encoding="utf-8"))
+        table = _load_span_table()
+        for product_id, product in kb["products"].items():
+            espesores = product.get("espesores", {})
+            for luz in (1.0, 3.3, 5.5, 5.51, 8.0, 12.0):
+                expected = _linear_min_thickness(espesores, luz) if espesores else None
+                assert table.min_thickness(product_id, luz) == expected
+
+
+class TestSharedTable:
+    def test_compiled_once_per_version(self, tmp_path):
+        kb_copy = tmp_path / "kb.json"
+        shutil.copy(DEFAULT_KB_PATH, kb_copy)
+        first = _load_span_table(kb_copy, BOM_RULES_PATH)
+        assert _load_span_table(kb_copy, BOM_RULES_PATH) is first
+
+        catalog = json.loads(kb_copy.read_text(encoding="utf-8"))
+        catalog["products"]["ISODEC_EPS"]["espesores"]["100"]["autoportancia"] = 6.0
+        kb_copy.write_text(json.dumps(catalog), encoding="utf-8")
+
+        result = validate_autoportancia(100, 5.8, "ISODEC_EPS", kb_path=kb_copy)
+        assert result["cumple"] is True
+        assert result["autoportancia_m"] == 6.0
+
+    def test_validator_recommendation(self):
+        result = validate_autoportancia(100, 6.0, "ISODEC_EPS")
+        assert result["cumple"] is False
+        assert "usar 150mm (autoportancia 7.5m)" in result["recomendacion"]
+
+    def test_missing_kb_raises(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            validate_autoportancia(100, 5.0, "ISODEC_EPS", kb_path=tmp_path / "missing.json")
@@ -17,6 +17,11 @@ from panelin.tools.knowledge_base import (
     get_available_products,
     get_product_by_sku,
 )
+from panelin.tools.config_optimizer import optimize_panel_configuration
+from panelin.tools.quote_cache import (
+    get_quote_cache_stats,
+    invalidate_quote_cache,
+)
 from panelin.tools.shopify_sync import (
     handle_shopify_webhook,
     sync_product_from_shopify,
@@ -34,6 +39,11 @@ __all__ = [
     "search_products",
     "get_available_products",
     "get_product_by_sku",
+    # Config Optimizer
+    "optimize_panel_configuration",
+    # Quote Cache
+    "get_quote_cache_stats",
+    "invalidate_quote_cache",
     # Shopify Sync
     "handle_shopify_webhook",
     "sync_product_from_shopify",
@@ -27,6 +27,9 @@ from panelin.models.schemas import (
     AutoportanciaResult,
     FullQuotationResult,
 )
+from panelin.tools.quote_cache import cached_quote
+from panelin.tools.span_table import SpanTable, load_span_table
+from panelin_core.tracing import traced
 
 
 # Constants
@@ -55,24 +58,31 @@ def _round_currency(value: Decimal) -> Decimal:
     return value.quantize(DECIMAL_PLACES, rounding=ROUND_HALF_UP)
 
 
-def _load_json(path: Path) -> Dict[str, Any]:
-    """Carga un archivo JSON, trying multiple paths."""
-    if path.exists():
-        with open(path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-
-    # Try alternate locations
-    alt_paths = [
+def _alternate_paths(path: Path) -> List[Path]:
+    """Ubicaciones alternativas donde buscar un archivo de datos."""
+    return [
         Path(__file__).parent.parent / "data" / path.name,
         Path(__file__).parent.parent.parent / path.name,
         Path(__file__).parent.parent / path.name,
     ]
-    for alt in alt_paths:
-        if alt.exists():
-            with open(alt, 'r', encoding='utf-8') as f:
-                return json.load(f)
 
-    raise FileNotFoundError(f"File not found: {path} (also tried {alt_paths})")
+
+def _resolve_json_path(path: Path) -> Optional[Path]:
+    """Retorna el path que _load_json leería, o None si no existe."""
+    for candidate in [path] + _alternate_paths(path):
+        if candidate.exists():
+            return candidate
+    return None
+
+
+@traced("kb.load")
+def _load_json(path: Path) -> Dict[str, Any]:
+    """Carga un archivo JSON, trying multiple paths."""
+    resolved = _resolve_json_path(path)
+    if resolved is None:
+        raise FileNotFoundError(f"File not found: {path} (also tried {_alternate_paths(path)})")
+    with open(resolved, 'r', encoding='utf-8') as f:
+        return json.load(f)
 
 
 def _generate_checksum(data: Dict[str, Any]) -> str:
@@ -92,6 +102,18 @@ def _generate_checksum(data: Dict[str, Any]) -> str:
     return hashlib.sha256(json_str.encode()).hexdigest()[:16]
 
 
+def _load_span_table(kb_path: Optional[Path] = None, bom_rules_path: Optional[Path] = None) -> SpanTable:
+    """Tabla de autoportancia compilada para la KB y reglas BOM dadas."""
+    files = []
+    for path in (Path(kb_path or DEFAULT_KB_PATH), Path(bom_rules_path or BOM_RULES_PATH)):
+        resolved = _resolve_json_path(path)
+        if resolved is None:
+            raise FileNotFoundError(f"File not found: {path} (also tried {_alternate_paths(path)})")
+        files.append(resolved)
+    return load_span_table(*files)
+
+
+@traced("tool.validate_autoportancia")
 def validate_autoportancia(
     espesor_mm: int,
     luz_m: float,
@@ -112,23 +134,8 @@ def validate_autoportancia(
     Returns:
         AutoportanciaResult con cumple/no cumple y recomendación
     """
-    kb = _load_json(kb_path or DEFAULT_KB_PATH)
-    bom_rules = _load_json(bom_rules_path or BOM_RULES_PATH)
-
-    # Get autoportancia from KB first, then from BOM rules
-    product = kb.get("products", {}).get(producto_base, {})
-    espesores = product.get("espesores", {})
-    espesor_data = espesores.get(str(espesor_mm), {})
-    autoportancia_m = espesor_data.get("autoportancia")
-
-    # Fallback to BOM rules
-    if autoportancia_m is None:
-        for sistema_key, sistema in bom_rules.get("sistemas", {}).items():
-            if sistema.get("producto_base") == producto_base:
-                tabla = sistema.get("autoportancia", {}).get("tabla", {})
-                entry = tabla.get(str(espesor_mm), {})
-                autoportancia_m = entry.get("autoportancia_m")
-                break
+    spans = _load_span_table(kb_path, bom_rules_path)
+    autoportancia_m = spans.autoportancia(producto_base, espesor_mm)
 
     if autoportancia_m is None:
         return AutoportanciaResult(
@@ -145,16 +152,14 @@ def validate_autoportancia(
 
     recomendacion = None
     if not cumple:
-        # Find next espesor that works
-        all_espesores = sorted(espesores.keys(), key=lambda x: int(x))
-        for esp in all_espesores:
-            esp_auto = espesores[esp].get("autoportancia")
-            if esp_auto and luz_m <= esp_auto:
-                recomendacion = (
-                    f"El espesor {espesor_mm}mm (autoportancia {autoportancia_m}m) NO cubre la luz de {luz_m}m. "
-                    f"Recomendación: usar {esp}mm (autoportancia {esp_auto}m) o agregar apoyo intermedio."
-                )
-                break
+        # Menor espesor que cubre la luz (bisección sobre la tabla compilada)
+        siguiente = spans.min_thickness(producto_base, luz_m)
+        if siguiente:
+            esp, esp_auto = siguiente
+            recomendacion = (
+                f"El espesor {espesor_mm}mm (autoportancia {autoportancia_m}m) NO cubre la luz de {luz_m}m. "
+                f"Recomendación: usar {esp}mm (autoportancia {esp_auto}m) o agregar apoyo intermedio."
+            )
         if not recomendacion:
             recomendacion = (
                 f"El espesor {espesor_mm}mm (autoportancia {autoportancia_m}m) NO cubre la luz de {luz_m}m. "
@@ -176,6 +181,7 @@ def validate_autoportancia(
     )
 
 
+@traced("tool.lookup_accessory_price")
 def lookup_accessory_price(
     tipo: str,
     familia: str,
@@ -273,6 +279,20 @@ def _get_fijacion_price(nombre_key: str, accessories_path: Optional[Path] = None
     return 0, nombre_key
 
 
+def _full_quote_kb_files(bound) -> List[Optional[Path]]:
+    """Archivos de datos que determinan el resultado de calculate_full_quote."""
+    args = bound.arguments
+    return [
+        _resolve_json_path(args["kb_path"] or DEFAULT_KB_PATH),
+        _resolve_json_path(args["bom_rules_path"] or BOM_RULES_PATH),
+        _resolve_json_path(args["accessories_path"] or ACCESSORIES_PATH),
+        # _get_fijacion_price siempre lee las reglas BOM por defecto
+        _resolve_json_path(BOM_RULES_PATH),
+    ]
+
+
+@cached_quote(_full_quote_kb_files)
+@traced("tool.calculate_full_quote")
 def calculate_full_quote(
     product_id: str,
     length_m: float,
@@ -311,6 +331,10 @@ def calculate_full_quote(
 
     Returns:
         FullQuotationResult con BOM completo valorizado
+
+    Note:
+        Resultados memoizados por parámetros + versión de contenido de KB,
+        reglas BOM y catálogo de accesorios (ver panelin.tools.quote_cache).
     """
     kb = _load_json(kb_path or DEFAULT_KB_PATH)
     bom_rules = _load_json(bom_rules_path or BOM_RULES_PATH)
@@ -0,0 +1,339 @@
+"""
+Panelin Config Optimizer - Barrido what-if de configuraciones de panel.
+
+Responde preguntas como "¿qué espesor es el más barato para una luz de 5.5 m?"
+evaluando todas las combinaciones familia × espesor × separación de apoyos en
+una sola pasada vectorizada (NumPy), en lugar de llamar calculate_full_quote y
+validate_autoportancia una vez por candidato.
+
+Las tablas de precio, ancho útil y fijaciones se compilan una vez por versión
+de la KB y de las reglas BOM (mtime_ns, size), así que en estado estable un
+barrido no lee ni parsea ningún JSON. La autoportancia sale de la misma tabla
+compilada que usa validate_autoportancia (panelin.tools.span_table).
+
+Costo comparativo = paneles + fijaciones de paneles + apoyos (opcional), con la
+misma aritmética y redondeo que calculate_full_quote. Perfilería y selladores
+no entran en el ranking: para el BOM completo de la configuración elegida usar
+calculate_full_quote con el bom_preset y la luz retornados.
+"""
+
+import math
+import os
+import threading
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+from panelin.models.schemas import ConfigOption, ConfigOptimizationResult
+from panelin.tools.bom_calculator import (
+    BOM_RULES_PATH,
+    DEFAULT_KB_PATH,
+    _resolve_json_path,
+    _load_json,
+    _round_currency,
+    _to_decimal,
+)
+from panelin.tools.span_table import SpanTable, load_span_table
+from panelin_core.tracing import traced
+
+
+DEFAULT_MAX_APOYOS_INTERMEDIOS = 3
+
+# Fijaciones por sistema: (clave en precios_fijaciones_referencia, cantidad por punto)
+_FIJACIONES_KEYS = (
+    "varilla_roscada_3_8_1m",
+    "tuerca_3_8",
+    "taco_expansivo_3_8",
+    "arandela_carrocero_3_8",
+    "arandela_plana_3_8",
+    "tortuga_pvc_blanca",
+    "caballete_isoroof",
+)
+
+
+class _ConfigTables:
+    """
+    Tablas compiladas de una versión de KB + reglas BOM.
+
+    Una fila por (producto, espesor) con precio y autoportancia numéricos.
+    Los precios de fijaciones se guardan como enteros escalados a 10**-scale
+    para que el redondeo de cada línea sea exacto en int64.
+    """
+
+    def __init__(self, kb: Dict[str, Any], bom_rules: Dict[str, Any], spans: SpanTable):
+        sistemas = bom_rules.get("sistemas", {})
+        ref_prices = bom_rules.get("precios_fijaciones_referencia") or {}
+
+        self.product_ids: List[str] = []
+        self.nombres: List[str] = []
+        self.presets: List[Optional[str]] = []
+        self.espesores: List[int] = []
+        self.autoportancia: List[float] = []
+        self.precios: List[Decimal] = []
+        self.anchos_util: List[Decimal] = []
+        self.sistemas_fijacion: List[Optional[str]] = []
+        self.skipped: List[str] = []
+
+        for product_id, product in kb.get("products", {}).items():
+            if not isinstance(product, dict) or not product.get("espesores"):
+                continue
+            preset, sistema = _preset_for(product_id, sistemas)
+            ancho_util = sistema.get("ancho_util_m", product.get("ancho_util", 1.0))
+            for espesor, data in product["espesores"].items():
+                if not isinstance(data, dict):
+                    continue
+                precio = data.get("precio") or data.get("price_per_m2")
+                autoportancia = spans.autoportancia(product_id, espesor)
+                if (not isinstance(precio, (int, float)) or isinstance(precio, bool)
+                        or not isinstance(autoportancia, (int, float)) or autoportancia <= 0):
+                    self.skipped.append(f"{product_id} {espesor}mm")
+                    continue
+                self.product_ids.append(product_id)
+                self.nombres.append(product.get("nombre_comercial", product_id))
+                self.presets.append(preset)
+                self.espesores.append(int(espesor))
+                self.autoportancia.append(float(autoportancia))
+                self.precios.append(_to_decimal(precio))
+                self.anchos_util.append(_to_decimal(ancho_util))
+                self.sistemas_fijacion.append(sistema.get("sistema_fijacion"))
+
+        fijaciones = {}
+        for key in _FIJACIONES_KEYS:
+            entry = ref_prices.get(key)
+            fijaciones[key] = _to_decimal(entry["precio_iva_inc"]) if entry else Decimal(0)
+        self.fijacion_scale = max([2] + [-p.as_tuple().exponent for p in fijaciones.values()])
+        self.fijacion_precios = {
+            key: int(p.scaleb(self.fijacion_scale)) for key, p in fijaciones.items()
+        }
+
+        self.autoportancia_arr = np.array(self.autoportancia, dtype=np.float64)
+        self.varilla_mask = np.array([s == "varilla_tuerca" for s in self.sistemas_fijacion])
+        self.caballete_mask = np.array([s == "caballete_tornillo" for s in self.sistemas_fijacion])
+
+
+def _preset_for(product_id: str, sistemas: Dict[str, Any]) -> Tuple[Optional[str], Dict[str, Any]]:
+    """Sistema BOM compatible con el producto (coincidencia exacta primero)."""
+    prefix_match = None
+    for key, sistema in sistemas.items():
+        for familia in sistema.get("familias_compatibles", []):
+            familia_id = familia.upper().replace(" ", "_")
+            if familia_id == product_id.upper():
+                return key, sistema
+            if prefix_match is None and product_id.upper().startswith(familia_id + "_"):
+                prefix_match = (key, sistema)
+    return prefix_match or (None, {})
+
+
+_compiled: Dict[Tuple[str, str], Tuple[Tuple, _ConfigTables]] = {}
+_compiled_lock = threading.Lock()
+
+
+def _load_tables(kb_path: Optional[Path], bom_rules_path: Optional[Path]) -> _ConfigTables:
+    """Tablas compiladas, recompiladas solo si cambia la KB o las reglas BOM."""
+    paths = []
+    for path in (kb_path or DEFAULT_KB_PATH, bom_rules_path or BOM_RULES_PATH):
+        resolved = _resolve_json_path(Path(path))
+        if resolved is None:
+            raise FileNotFoundError(f"File not found: {path}")
+        paths.append(os.fspath(resolved))
+    version = tuple((os.stat(p).st_mtime_ns, os.stat(p).st_size) for p in paths)
+    cache_key = (paths[0], paths[1])
+    with _compiled_lock:
+        cached = _compiled.get(cache_key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    tables = _ConfigTables(_load_json(Path(paths[0])), _load_json(Path(paths[1])),
+                           load_span_table(*paths))
+    with _compiled_lock:
+        _compiled[cache_key] = (version, tables)
+    return tables
+
+
+def _cents(value: Decimal) -> int:
+    """Monto redondeado a centavos (ROUND_HALF_UP), como entero."""
+    return int(_round_currency(value).scaleb(2))
+
+
+def _line_cents(qty, price_scaled: int, scale: int):
+    """round_half_up(price * qty) en centavos, vectorizado (qty >= 0)."""
+    divisor = 10 ** (scale - 2)
+    return (qty * price_scaled + divisor // 2) // divisor
+
+
+@traced("tool.optimize_panel_configuration")
+def optimize_panel_configuration(
+    length_m: float,
+    width_m: float,
+    luz_m: Optional[float] = None,
+    familias: Optional[Sequence[str]] = None,
+    espesores: Optional[Sequence[int]] = None,
+    max_apoyos_intermedios: int = DEFAULT_MAX_APOYOS_INTERMEDIOS,
+    tipo_fijacion: str = "metal",
+    costo_apoyo_ml: float = 0.0,
+    top_n: int = 10,
+    kb_path: Optional[Path] = None,
+    bom_rules_path: Optional[Path] = None,
+) -> ConfigOptimizationResult:
+    """
+    Evalúa todas las configuraciones y retorna el frente de Pareto costo vs margen.
+
+    Para cada producto con autoportancia en la KB, cada espesor y cada cantidad
+    de apoyos intermedios k (0..max_apoyos_intermedios), la separación entre
+    apoyos es luz / (k + 1). Una configuración cumple si esa separación no supera
+    la autoportancia del espesor.
+
+    Args:
+        length_m: Largo de los paneles en metros
+        width_m: Ancho total a cubrir en metros
+        luz_m: Luz a cubrir (default: length_m, igual que calculate_full_quote)
+        familias: Filtrar por product_id o prefijo (ej: ["ISODEC"])
+        espesores: Filtrar por espesores en mm
+        max_apoyos_intermedios: Máximo de apoyos intermedios a considerar
+        tipo_fijacion: "metal", "hormigon", o "madera"
+        costo_apoyo_ml: Costo por metro lineal de apoyo/correa (no está en la KB)
+        top_n: Largo máximo del ranking
+        kb_path: Path a KB principal
+        bom_rules_path: Path a reglas BOM
+
+    Returns:
+        ConfigOptimizationResult con la opción más económica, el frente de Pareto
+        (ordenado por costo) y el ranking de configuraciones que cumplen
+
+    Raises:
+        ValueError: Si las dimensiones o parámetros son inválidos
+        ImportError: Si NumPy no está instalado
+    """
+    if not NUMPY_AVAILABLE:
+        raise ImportError("optimize_panel_configuration requiere NumPy: pip install numpy")
+
+    luz = length_m if luz_m is None else luz_m
+    if length_m <= 0 or width_m <= 0 or luz <= 0:
+        raise ValueError("Largo, ancho y luz deben ser mayores a 0")
+    if max_apoyos_intermedios < 0:
+        raise ValueError("max_apoyos_intermedios no puede ser negativo")
+    if costo_apoyo_ml < 0:
+        raise ValueError("costo_apoyo_ml no puede ser negativo")
+
+    tables = _load_tables(kb_path, bom_rules_path)
+
+    # ─── Filas seleccionadas (producto × espesor) ───
+    familias_up = [f.upper().replace(" ", "_") for f in familias] if familias else None
+    rows = [
+        i for i, product_id in enumerate(tables.product_ids)
+        if (familias_up is None or any(product_id.upper().startswith(f) for f in familias_up))
+        and (espesores is None or tables.espesores[i] in espesores)
+    ]
+    notes: List[str] = []
+    if tables.skipped:
+        notes.append(f"Sin precio o autoportancia en KB (no evaluados): {', '.join(tables.skipped)}")
+
+    # ─── Costo de paneles por fila (no depende de los apoyos) ───
+    largo = _to_decimal(length_m)
+    ancho = _to_decimal(width_m)
+    panels, area_cents, paneles_cents = [], [], []
+    for i in rows:
+        ancho_util = tables.anchos_util[i]
+        n_panels = math.ceil(float(ancho / ancho_util))
+        area = _round_currency(n_panels * largo * ancho_util)
+        panels.append(n_panels)
+        area_cents.append(_cents(area))
+        paneles_cents.append(_cents(tables.precios[i] * area))
+
+    # ─── Grilla filas × separaciones, en una pasada ───
+    k = np.arange(max_apoyos_intermedios + 1)
+    apoyos = (k + 2)[np.newaxis, :]
+    separacion = (luz / (k + 1))[np.newaxis, :]
+    idx = np.array(rows, dtype=np.intp)
+    autoportancia = tables.autoportancia_arr[idx][:, np.newaxis]
+    panels_arr = np.array(panels, dtype=np.int64)[:, np.newaxis]
+
+    cumple = separacion <= autoportancia
+    margen = (autoportancia - separacion) / autoportancia * 100
+
+    puntos = np.ceil(panels_arr * apoyos * 2 + float(length_m) * 2 / 2.5).astype(np.int64)
+    precios = tables.fijacion_precios
+    scale = tables.fijacion_scale
+    varilla = (
+        _line_cents(-(-puntos // 4), precios["varilla_roscada_3_8_1m"], scale)
+        + _line_cents(puntos * (2 if tipo_fijacion == "metal" else 1), precios["tuerca_3_8"], scale)
+        + (_line_cents(puntos, precios["taco_expansivo_3_8"], scale) if tipo_fijacion == "hormigon" else 0)
+        + _line_cents(puntos, precios["arandela_carrocero_3_8"], scale)
+        + _line_cents(puntos, precios["arandela_plana_3_8"], scale)
+        + _line_cents(puntos, precios["tortuga_pvc_blanca"], scale)
+    )
+    caballete = _line_cents(panels_arr * apoyos, precios["caballete_isoroof"], scale)
+    fijaciones_cents = (
+        np.where(tables.varilla_mask[idx][:, np.newaxis], varilla, 0)
+        + np.where(tables.caballete_mask[idx][:, np.newaxis], caballete, 0)
+    ).astype(np.int64)
+
+    costo_ml = _to_decimal(costo_apoyo_ml) * ancho
+    apoyos_cents = np.array(
+        [[_cents(costo_ml * int(a)) for a in apoyos[0]]], dtype=np.int64
+    )
+    total_cents = np.array(paneles_cents, dtype=np.int64)[:, np.newaxis] + fijaciones_cents + apoyos_cents
+
+    # ─── Frente de Pareto: menor costo, mayor margen (solo las que cumplen) ───
+    flat_ok = np.flatnonzero(cumple.ravel())
+    costs = total_cents.ravel()[flat_ok]
+    margins = margen.ravel()[flat_ok]
+    order = np.lexsort((-margins, costs))
+    best_so_far = np.concatenate(([-np.inf], np.maximum.accumulate(margins[order])[:-1]))
+    on_front = margins[order] > best_so_far
+    pareto_flat = set(flat_ok[order][on_front].tolist())
+    ranked_flat = flat_ok[order].tolist()
+
+    n_sep = len(k)
+
+    def _option(flat: int) -> ConfigOption:
+        r, s = divmod(flat, n_sep)
+        i = rows[r]
+        return ConfigOption(
+            product_id=tables.product_ids[i],
+            nombre=tables.nombres[i],
+            bom_preset=tables.presets[i],
+            espesor_mm=tables.espesores[i],
+            apoyos=int(apoyos[0, s]),
+            separacion_m=round(float(separacion[0, s]), 3),
+            autoportancia_m=tables.autoportancia[i],
+            cumple=bool(cumple[r, s]),
+            margen_seguridad_pct=round(float(margen[r, s]), 1),
+            panels_needed=panels[r],
+            area_m2=area_cents[r] / 100,
+            costo_paneles_usd=paneles_cents[r] / 100,
+            costo_fijaciones_usd=int(fijaciones_cents[r, s]) / 100,
+            costo_apoyos_usd=int(apoyos_cents[0, s]) / 100,
+            costo_comparativo_usd=int(total_cents[r, s]) / 100,
+            pareto=flat in pareto_flat,
+        )
+
+    pareto = [_option(f) for f in ranked_flat if f in pareto_flat]
+    ranking = [_option(f) for f in ranked_flat[:top_n]]
+
+    if not ranked_flat:
+        notes.append(
+            f"Ninguna configuración cubre {luz}m con hasta {max_apoyos_intermedios} "
+            f"apoyos intermedios. Consultar con ingeniería."
+        )
+    if costo_apoyo_ml == 0:
+        notes.append("Apoyos sin costo (costo_apoyo_ml=0): más apoyos solo suman fijaciones.")
+    notes.append("Costo comparativo: paneles + fijaciones. Usar calculate_full_quote para el BOM completo.")
+
+    return ConfigOptimizationResult(
+        luz_m=luz,
+        largo_m=length_m,
+        ancho_m=width_m,
+        configuraciones_evaluadas=int(cumple.size),
+        configuraciones_cumplen=len(ranked_flat),
+        mas_economica=ranking[0] if ranking else None,
+        pareto=pareto,
+        ranking=ranking,
+        notes=notes,
+    )
@@ -18,12 +18,14 @@ from pathlib import Path
 from datetime import datetime
 
 from panelin.models.schemas import ProductSpec
+from panelin_core.tracing import traced
 
 
 # Default KB path
 DEFAULT_KB_PATH = Path(__file__).parent.parent / "data" / "panelin_truth_bmcuruguay.json"
 
 
+@traced("kb.load")
 def _load_knowledge_base(kb_path: Optional[Path] = None) -> Dict[str, Any]:
     """Carga la base de conocimiento desde JSON."""
     path = kb_path or DEFAULT_KB_PATH
@@ -44,6 +46,7 @@ def _load_knowledge_base(kb_path: Optional[Path] = None) -> Dict[str, Any]:
     raise FileNotFoundError(f"Knowledge base not found. Tried: {possible_paths}")
 
 
+@traced("tool.lookup_product_specs")
 def lookup_product_specs(
     product_identifier: str,
     thickness_mm: Optional[int] = None,
@@ -112,6 +115,7 @@ def lookup_product_specs(
     return None
 
 
+@traced("tool.search_products")
 def search_products(
     query: str,
     filters: Optional[Dict[str, Any]] = None,
@@ -208,6 +212,7 @@ def search_products(
     return results
 
 
+@traced("tool.get_available_products")
 def get_available_products(
     familia: Optional[str] = None,
     in_stock_only: bool = False,
@@ -251,6 +256,7 @@ def get_available_products(
     return sorted(result, key=lambda x: x["name"])
 
 
+@traced("tool.get_product_by_sku")
 def get_product_by_sku(
     sku: str,
     kb_path: Optional[Path] = None,
@@ -285,6 +291,7 @@ def get_product_by_sku(
     return None
 
 
+@traced("tool.get_pricing_rules")
 def get_pricing_rules(kb_path: Optional[Path] = None) -> Dict[str, Any]:
     """
     Obtiene las reglas generales de pricing.
@@ -296,6 +303,7 @@ def get_pricing_rules(kb_path: Optional[Path] = None) -> Dict[str, Any]:
     return catalog.get("pricing_rules", {})
 
 
+@traced("tool.get_kb_metadata")
 def get_kb_metadata(kb_path: Optional[Path] = None) -> Dict[str, Any]:
     """
     Obtiene metadata de la base de conocimiento.
@@ -32,6 +32,9 @@ from panelin.models.schemas import (
     ValidationResult,
     PricingRules,
 )
+from panelin.tools.quote_cache import cached_quote
+from panelin_core.tracing import traced
+from panelin_core.pricing_kernel import CompiledKB, load_compiled_kb
 
 
 # Constants
@@ -39,8 +42,8 @@ DECIMAL_PLACES = Decimal('0.01')
 DEFAULT_KB_PATH = Path(__file__).parent.parent / "data" / "panelin_truth_bmcuruguay.json"
 
 
-def _load_knowledge_base(kb_path: Optional[Path] = None) -> Dict[str, Any]:
-    """Carga la base de conocimiento desde JSON."""
+def _resolve_kb_path(kb_path: Optional[Path] = None) -> Optional[Path]:
+    """Retorna el primer path existente de la KB, o None."""
     path = kb_path or DEFAULT_KB_PATH
     
     # Try multiple possible paths
@@ -52,10 +55,36 @@ def _load_knowledge_base(kb_path: Optional[Path] = None) -> Dict[str, Any]:
     
     for p in possible_paths:
         if p.exists():
-            with open(p, 'r', encoding='utf-8') as f:
-                return json.load(f)
-    
-    raise FileNotFoundError(f"Knowledge base not found. Tried: {possible_paths}")
+            return p
+    return None
+
+
+@traced("kb.load")
+def _load_knowledge_base(kb_path: Optional[Path] = None) -> Dict[str, Any]:
+    """Carga la base de conocimiento desde JSON."""
+    path = _resolve_kb_path(kb_path)
+    if path is None:
+        raise FileNotFoundError(
+            f"Knowledge base not found: {kb_path or DEFAULT_KB_PATH}"
+        )
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _load_compiled_kb(kb_path: Optional[Path] = None) -> CompiledKB:
+    """Carga la KB con precios precompilados (cacheada por versión de archivo)."""
+    path = _resolve_kb_path(kb_path)
+    if path is None:
+        raise FileNotFoundError(
+            f"Knowledge base not found: {kb_path or DEFAULT_KB_PATH}"
+        )
+    return load_compiled_kb(path)
+
+
+def _product_price(kb: CompiledKB, key: str, product: Dict[str, Any]) -> Decimal:
+    """Precio por m² precompilado del producto."""
+    price = kb.price(key)
+    return price if price is not None else _to_decimal(product["price_per_m2"])
 
 
 def _to_decimal(value: float | int | str | Decimal) -> Decimal:
@@ -93,6 +122,8 @@ def _generate_checksum(data: Dict[str, Any]) -> str:
     return hashlib.sha256(json_str.encode()).hexdigest()[:16]
 
 
+@cached_quote(lambda bound: [_resolve_kb_path(bound.arguments["kb_path"])])
+@traced("tool.calculate_panel_quote")
 def calculate_panel_quote(
     panel_type: str,
     length_m: float,
@@ -126,9 +157,15 @@ def calculate_panel_quote(
     
     Raises:
         ValueError: Si el producto no existe o parámetros inválidos
+    
+    Note:
+        Resultados memoizados por parámetros + versión de contenido de la KB
+        (ver panelin.tools.quote_cache). `calculate_panel_quote.__wrapped__`
+        calcula siempre sin cache.
     """
     # Load knowledge base
-    catalog = _load_knowledge_base(kb_path)
+    kb = _load_compiled_kb(kb_path)
+    catalog = kb.catalog
     
     # Normalize panel type for lookup
     panel_key = _normalize_panel_key(panel_type, thickness_mm)
@@ -153,7 +190,7 @@ def calculate_panel_quote(
     _validate_discount(discount_percent)
     
     # Get pricing info
-    price_per_m2 = _to_decimal(product["price_per_m2"])
+    price_per_m2 = _product_price(kb, panel_key, product)
     pricing_rules = catalog.get("pricing_rules", {})
     
     # Calculate with Decimal precision using adjusted length
@@ -263,6 +300,7 @@ def calculate_panel_quote(
     return result
 
 
+@traced("tool.calculate_multi_panel_quote")
 def calculate_multi_panel_quote(
     items: List[Dict[str, Any]],
     global_discount_percent: float = 0.0,
@@ -283,7 +321,8 @@ def calculate_multi_panel_quote(
     Returns:
         QuotationResult consolidado
     """
-    catalog = _load_knowledge_base(kb_path)
+    kb = _load_compiled_kb(kb_path)
+    catalog = kb.catalog
     products = catalog.get("products", {})
     pricing_rules = catalog.get("pricing_rules", {})
     
@@ -311,7 +350,7 @@ def calculate_multi_panel_quote(
         adjusted_length, item_notes = _validate_dimensions(length_m, width_m, product)
         
         # Calculate line item using adjusted length
-        price_per_m2 = _to_decimal(product["price_per_m2"])
+        price_per_m2 = _product_price(kb, panel_key, product)
         area = _round_currency(_to_decimal(adjusted_length) * _to_decimal(width_m))
         unit_price = _round_currency(area * price_per_m2)
         line_total = _round_currency(unit_price * _to_decimal(quantity))
@@ -384,6 +423,7 @@ def calculate_multi_panel_quote(
     return result
 
 
+@traced("tool.apply_pricing_rules")
 def apply_pricing_rules(
     subtotal: float,
     total_area_m2: float,
@@ -450,6 +490,7 @@ def apply_pricing_rules(
     }
 
 
+@traced("tool.validate_quotation")
 def validate_quotation(quotation: QuotationResult) -> ValidationResult:
     """
     Valida una cotización para verificar integridad y consistencia.
@@ -0,0 +1,233 @@
+"""
+Panelin Quote Cache - Memoización versionada de cotizaciones deterministas.
+
+Las cotizaciones son funciones puras de (parámetros, contenido de la KB), así que
+un reintento del agente o una consulta repetida con las mismas dimensiones puede
+servirse desde memoria sin recalcular.
+
+Garantías:
+- La clave incluye los parámetros normalizados (defaults aplicados, paths resueltos)
+  y la versión de contenido de cada archivo de KB involucrado.
+- Cualquier cambio de contenido en la KB produce una versión nueva, y las escrituras
+  in-process (webhooks de Shopify) invalidan el cache explícitamente.
+- El resultado cacheado es idéntico al recalculado (checksum incluido); solo
+  quotation_id y timestamp se regeneran en cada llamada, porque identifican a la
+  cotización emitida y no a su contenido.
+- Errores (ValueError, FileNotFoundError) nunca se cachean.
+"""
+
+import copy
+import functools
+import hashlib
+import inspect
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+
+DEFAULT_MAXSIZE = 256
+DEFAULT_TTL_SECONDS = 3600
+
+
+class QuoteCache:
+    """
+    Cache LRU acotado con expiración TTL y contadores de hit/miss/eviction.
+
+    Thread-safe: el agente puede ejecutar herramientas desde varios hilos.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_MAXSIZE,
+        ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            maxsize: Máximo de cotizaciones retenidas (0 desactiva el cache)
+            ttl_seconds: Vida máxima de una entrada (None = sin expiración)
+            clock: Reloj monotónico (inyectable para testing)
+        """
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: Tuple) -> Tuple[bool, Any]:
+        """Retorna (encontrado, valor) y actualiza contadores y orden LRU."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if self.ttl_seconds is None or self._clock() - stored_at < self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return False, None
+
+    def put(self, key: Tuple, value: Any, generation: Optional[int] = None) -> None:
+        """
+        Guarda un valor, desalojando el menos usado si se excede maxsize.
+
+        Si generation no coincide con la actual, el valor se calculó antes de
+        una invalidación y se descarta.
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (self._clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self) -> None:
+        """Descarta todas las entradas (p.ej. tras escribir la KB)."""
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+            self.invalidations += 1
+
+    def reset_stats(self) -> None:
+        """Pone a cero los contadores sin tocar las entradas."""
+        with self._lock:
+            self.hits = self.misses = self.evictions = 0
+            self.expirations = self.invalidations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores actuales del cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# Cache compartido por todas las funciones de cotización
+QUOTE_CACHE = QuoteCache()
+
+# (path, mtime_ns, size) -> sha256 del contenido
+_content_hashes: Dict[Tuple[str, int, int], str] = {}
+_content_lock = threading.Lock()
+
+
+def kb_content_version(paths: Iterable[Optional[Path]]) -> Tuple[Tuple[str, Optional[str]], ...]:
+    """
+    Versión de contenido de un conjunto de archivos de KB.
+
+    El hash del contenido se memoiza por firma de stat, así que en estado
+    estable el costo es un stat() por archivo.
+    """
+    version = []
+    for path in paths:
+        if path is None:
+            continue
+        path = Path(path)
+        try:
+            stat = path.stat()
+        except OSError:
+            version.append((str(path), None))
+            continue
+        signature = (str(path), stat.st_mtime_ns, stat.st_size)
+        with _content_lock:
+            digest = _content_hashes.get(signature)
+        if digest is None:
+            digest = hashlib.sha256(path.read_bytes()).hexdigest()
+            with _content_lock:
+                _content_hashes[signature] = digest
+        version.append((str(path), digest))
+    return tuple(version)
+
+
+def _normalize_value(value: Any) -> Any:
+    """Convierte un argumento a una forma hashable que preserve su tipo."""
+    if isinstance(value, Path):
+        return ("path", str(value.resolve()))
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(_normalize_value(v) for v in value))
+    if isinstance(value, dict):
+        return ("dict", tuple(sorted((k, _normalize_value(v)) for k, v in value.items())))
+    # El tipo es parte de la clave: 50 y 50.0 se formatean distinto en notas/keys
+    return (type(value).__name__, value)
+
+
+def cached_quote(
+    kb_files: Callable[[inspect.BoundArguments], Iterable[Optional[Path]]],
+    cache: Optional[QuoteCache] = None,
+) -> Callable:
+    """
+    Decorador de memoización versionada para funciones de cotización.
+
+    Args:
+        kb_files: Recibe los argumentos ligados y retorna los archivos de KB que
+                  determinan el resultado (su contenido forma parte de la clave)
+        cache: Cache a usar (por defecto QUOTE_CACHE)
+
+    La función original queda disponible como `func.__wrapped__` (sin cache).
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            store = cache if cache is not None else QUOTE_CACHE
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            generation = store.generation
+            key = (
+                func.__qualname__,
+                tuple((name, _normalize_value(v)) for name, v in bound.arguments.items()),
+                kb_content_version(kb_files(bound)),
+            )
+            found, value = store.get(key)
+            if not found:
+                value = func(*bound.args, **bound.kwargs)
+                store.put(key, copy.deepcopy(value), generation)
+                return value
+            return _reissue(value)
+
+        return wrapper
+
+    return decorator
+
+
+def _reissue(cached: Dict[str, Any]) -> Dict[str, Any]:
+    """Copia un resultado cacheado con quotation_id y timestamp nuevos."""
+    result = copy.deepcopy(cached)
+    result["quotation_id"] = f"BMC-{datetime.now().strftime('%Y%m%d')}-{uuid.uuid4().hex[:8].upper()}"
+    result["timestamp"] = datetime.utcnow().isoformat() + "Z"
+    return result
+
+
+def get_quote_cache_stats() -> Dict[str, Any]:
+    """Contadores hit/miss/eviction del cache de cotizaciones."""
+    return QUOTE_CACHE.stats()
+
+
+def invalidate_quote_cache() -> None:
+    """Invalida todas las cotizaciones cacheadas."""
+    QUOTE_CACHE.invalidate()
@@ -42,6 +42,8 @@ from typing import Any, Dict, List, Optional, Tuple
 import os
 
 from panelin.models.schemas import ShopifySyncEvent
+from panelin.tools.quote_cache import invalidate_quote_cache
+from panelin_core.tracing import traced
 
 
 # Configure logging
@@ -123,6 +125,7 @@ def verify_webhook_signature(
     return hmac.compare_digest(computed_b64, hmac_header)
 
 
+@traced("tool.handle_shopify_webhook")
 def handle_shopify_webhook(
     topic: str,
     payload: Dict[str, Any],
@@ -479,6 +482,8 @@ def _save_kb(catalog: Dict[str, Any], kb_path: Path) -> None:
     kb_path.parent.mkdir(parents=True, exist_ok=True)
     with open(kb_path, 'w', encoding='utf-8') as f:
         json.dump(catalog, f, indent=2, ensure_ascii=False)
+    # Cotizaciones cacheadas pueden depender de precios recién cambiados
+    invalidate_quote_cache()
     logger.info(f"Saved KB to {kb_path}")
 
 
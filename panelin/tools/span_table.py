@@ -0,0 +1,128 @@
+"""
+Panelin Span Table - Tabla compilada de autoportancia (luz máxima entre apoyos).
+
+Se construye una vez por versión de la KB y de las reglas BOM. Después, cada
+chequeo estructural es una búsqueda en dict (autoportancia de un espesor) o una
+bisección sobre la envolvente de autoportancia (espesor mínimo para una luz),
+sin releer ni recorrer JSON.
+
+Semántica idéntica a la validación original:
+- La autoportancia sale de products[familia].espesores[espesor] en la KB y, si
+  no está, de la tabla del primer sistema BOM con ese producto_base.
+- El espesor recomendado es el menor espesor de la KB cuya autoportancia cubre
+  la luz.
+"""
+
+import bisect
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from panelin_core.tracing import traced
+
+
+class SpanTable:
+    """Autoportancia por (familia, espesor) con consultas O(1) / O(log n)."""
+
+    def __init__(self, kb: Dict[str, Any], bom_rules: Dict[str, Any]):
+        self._spans: Dict[Tuple[str, str], Any] = {}
+        self._thicknesses: Dict[str, List[str]] = {}
+        self._autoportancias: Dict[str, List[Any]] = {}
+        self._envelopes: Dict[str, List[float]] = {}
+
+        # Fallback: tabla del primer sistema BOM de cada producto_base
+        seen_bases = set()
+        for sistema in bom_rules.get("sistemas", {}).values():
+            producto_base = sistema.get("producto_base")
+            if producto_base is None or producto_base in seen_bases:
+                continue
+            seen_bases.add(producto_base)
+            tabla = (sistema.get("autoportancia") or {}).get("tabla", {})
+            if not isinstance(tabla, dict):
+                continue
+            for espesor, entry in tabla.items():
+                if isinstance(entry, dict) and entry.get("autoportancia_m") is not None:
+                    self._spans[(producto_base, str(espesor))] = entry["autoportancia_m"]
+
+        for product_id, product in kb.get("products", {}).items():
+            if not isinstance(product, dict):
+                continue
+            espesores = product.get("espesores", {})
+            if not isinstance(espesores, dict):
+                continue
+            for espesor, data in espesores.items():
+                value = data.get("autoportancia") if isinstance(data, dict) else None
+                if value is not None:
+                    self._spans[(product_id, str(espesor))] = value
+
+            numeric = sorted((e for e in espesores if str(e).isdigit()), key=int)
+            autos = [
+                espesores[e].get("autoportancia") if isinstance(espesores[e], dict) else None
+                for e in numeric
+            ]
+            envelope, best = [], float("-inf")
+            for value in autos:
+                if value and isinstance(value, (int, float)):
+                    best = max(best, value)
+                envelope.append(best)
+            self._thicknesses[product_id] = numeric
+            self._autoportancias[product_id] = autos
+            self._envelopes[product_id] = envelope
+
+    def autoportancia(self, producto: str, espesor_mm: Any) -> Optional[Any]:
+        """Luz máxima (m) de un espesor, o None si no hay dato."""
+        return self._spans.get((producto, str(espesor_mm)))
+
+    def max_span(self, producto: str) -> Optional[float]:
+        """Mayor luz que cubre algún espesor de la familia."""
+        envelope = self._envelopes.get(producto)
+        if not envelope or envelope[-1] == float("-inf"):
+            return None
+        return envelope[-1]
+
+    def min_thickness(self, producto: str, luz_m: float) -> Optional[Tuple[str, Any]]:
+        """
+        Menor espesor de la KB que cubre la luz.
+
+        Returns:
+            (espesor tal como figura en la KB, autoportancia) o None
+        """
+        envelope = self._envelopes.get(producto)
+        if not envelope:
+            return None
+        i = bisect.bisect_left(envelope, luz_m)
+        if i == len(envelope):
+            return None
+        return self._thicknesses[producto][i], self._autoportancias[producto][i]
+
+
+_compiled: Dict[Tuple[str, str], Tuple[Tuple, SpanTable]] = {}
+_compiled_lock = threading.Lock()
+
+
+@traced("kb.span_table")
+def load_span_table(kb_file: Path, bom_rules_file: Path) -> SpanTable:
+    """
+    Tabla compilada para un par (KB, reglas BOM) ya resueltos.
+
+    Se recompila solo si cambia (mtime_ns, size) de alguno de los dos archivos.
+
+    Raises:
+        FileNotFoundError: Si alguno de los archivos no existe
+    """
+    paths = (os.fspath(kb_file), os.fspath(bom_rules_file))
+    version = tuple((s.st_mtime_ns, s.st_size) for s in map(os.stat, paths))
+    with _compiled_lock:
+        cached = _compiled.get(paths)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    loaded = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            loaded.append(json.load(f))
+    table = SpanTable(*loaded)
+    with _compiled_lock:
+        _compiled[paths] = (version, table)
+    return table
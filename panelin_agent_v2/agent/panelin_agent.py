@@ -16,7 +16,7 @@ The agent uses LangGraph 1.0 patterns:
 - Conditional routing based on tool results
 """
 
-from typing import TypedDict, Annotated, Sequence, Optional, Any, Dict, List, Literal
+from typing import TypedDict, Annotated, Sequence, Optional, Any, Dict, Iterator, List, Literal
 from dataclasses import dataclass
 import json
 import logging
@@ -24,8 +24,9 @@ import logging
 # LangGraph/LangChain imports (with fallback for development)
 try:
     from langgraph.graph import StateGraph, END
-    from langgraph.prebuilt import ToolNode
-    from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, ToolMessage
+    from langchain_core.messages import (
+        BaseMessage, HumanMessage, AIMessage, AIMessageChunk, SystemMessage, ToolMessage
+    )
     from langchain_core.tools import tool
     from langchain_openai import ChatOpenAI
     LANGGRAPH_AVAILABLE = True
@@ -33,15 +34,19 @@ except ImportError:
     LANGGRAPH_AVAILABLE = False
     StateGraph = None
     END = None
-    ToolNode = None
     BaseMessage = None
     HumanMessage = None
     AIMessage = None
+    AIMessageChunk = None
+    SystemMessage = None
     ToolMessage = None
     tool = None
     ChatOpenAI = None
     logging.warning("LangGraph not installed. Using fallback implementation.")
 
+from panelin_core.llm_cache import CachedChatModel, LLMResponseCache
+from panelin_core.tool_executor import DEFAULT_MAX_WORKERS, DEFAULT_TIMEOUT_S, ToolExecutor
+
 # Import deterministic tools
 from ..tools.quotation_calculator import (
     calculate_panel_quote,
@@ -57,6 +62,7 @@ from ..tools.product_lookup import (
     list_all_products,
     get_pricing_rules,
 )
+from ..session_store import ANONYMOUS_SESSION_ID, SessionState, SessionStore, follow_up_params
 
 
 # Configure logging
@@ -286,7 +292,12 @@ class PanelinQuotationAgent:
         self,
         model_name: str = "gpt-4o-mini",
         temperature: float = 0,
-        api_key: Optional[str] = None
+        api_key: Optional[str] = None,
+        llm: Optional[Any] = None,
+        max_tool_workers: int = DEFAULT_MAX_WORKERS,
+        tool_timeout_s: float = DEFAULT_TIMEOUT_S,
+        session_store: Optional[SessionStore] = None,
+        response_cache: Optional[LLMResponseCache] = None
     ):
         """
         Initialize the Panelin quotation agent.
@@ -295,9 +306,18 @@ class PanelinQuotationAgent:
             model_name: LLM model to use (default: gpt-4o-mini for cost efficiency)
             temperature: LLM temperature (0 for deterministic extraction)
             api_key: Optional OpenAI API key (uses env var if not provided)
+            llm: Optional pre-built chat model (must support bind_tools);
+                 replaces ChatOpenAI, e.g. a fake model in tests
+            max_tool_workers: Max tool calls of one turn executed concurrently
+            tool_timeout_s: Per-tool timeout in seconds
+            session_store: Per-session state (resolved products, last quote,
+                 compacted history); defaults to an in-memory SessionStore
+            response_cache: Optional cache of LLM responses keyed by model,
+                 system prompt, messages and tool schema
         """
         self.model_name = model_name
         self.temperature = temperature
+        self.session_store = session_store if session_store is not None else SessionStore()
         
         if not LANGGRAPH_AVAILABLE:
             logger.warning("LangGraph not available - using fallback mode")
@@ -305,11 +325,20 @@ class PanelinQuotationAgent:
             return
         
         # Initialize LLM
-        self.llm = ChatOpenAI(
-            model=model_name,
-            temperature=temperature,
-            api_key=api_key
-        ).bind_tools(AGENT_TOOLS)
+        if llm is None:
+            llm = ChatOpenAI(
+                model=model_name,
+                temperature=temperature,
+                api_key=api_key
+            )
+        if response_cache is not None:
+            llm = CachedChatModel(llm, response_cache)
+        self.llm = llm.bind_tools(AGENT_TOOLS)
+        self.tool_executor = ToolExecutor.from_langchain_tools(
+            AGENT_TOOLS,
+            max_workers=max_tool_workers,
+            timeout_s=tool_timeout_s
+        )
         
         # Build the graph
         self.graph = self._build_graph()
@@ -322,7 +351,7 @@ class PanelinQuotationAgent:
         
         # Add nodes
         graph.add_node("agent", self._agent_node)
-        graph.add_node("tools", ToolNode(AGENT_TOOLS))
+        graph.add_node("tools", self._tools_node)
         graph.add_node("validate", self._validate_node)
         
         # Add edges
@@ -377,6 +406,33 @@ class PanelinQuotationAgent:
         
         return new_state
     
+    def _tools_node(self, state: AgentState) -> Dict[str, Any]:
+        """
+        Tools node - executes the tool calls of the last LLM message.
+        
+        Calls emitted in the same turn cannot depend on each other's results,
+        so they run concurrently (ToolExecutor). ToolMessages keep call order.
+        Each call's args and output are also kept in tool_results (by tool
+        name) so the turn's quote can be stored in the session.
+        """
+        calls = state["messages"][-1].tool_calls
+        outcomes = self.tool_executor.run(calls)
+        tool_results = dict(state.get("tool_results") or {})
+        for call, outcome in zip(calls, outcomes):
+            tool_results[outcome.name] = {"args": call.get("args") or {}, "content": outcome.content()}
+        return {
+            "messages": [
+                ToolMessage(
+                    content=outcome.content(),
+                    name=outcome.name,
+                    tool_call_id=outcome.call_id,
+                    status="success" if outcome.ok else "error"
+                )
+                for outcome in outcomes
+            ],
+            "tool_results": tool_results
+        }
+    
     def _validate_node(self, state: AgentState) -> AgentState:
         """
         Validation node - ensures quotation results are verified.
@@ -428,35 +484,251 @@ class PanelinQuotationAgent:
         if not LANGGRAPH_AVAILABLE or self.graph is None:
             return self._fallback_invoke(user_message)
         
-        # Initialize state
-        initial_state = AgentState(
-            messages=[HumanMessage(content=user_message)],
-            extracted_params=None,
-            current_quotation=None,
-            validation_passed=True,
-            validation_errors=[],
-            last_tool_called=None,
-            tool_results={},
-            session_id=session_id,
-            turn_count=0
-        )
+        session = self._load_session(session_id)
+        follow_up = self._follow_up(user_message, session)
+        if follow_up is not None:
+            return dict(follow_up, tools_used=[], session_id=session_id)
         
         # Run the graph
-        final_state = self.graph.invoke(initial_state)
+        final_state = self.graph.invoke(self._initial_state(user_message, session_id, session))
         
         # Extract response
         last_message = final_state["messages"][-1]
         response_text = last_message.content if hasattr(last_message, "content") else str(last_message)
+        quotation = self._record_turn(
+            session, user_message, response_text, final_state.get("tool_results")
+        )
         
         return {
             "response": response_text,
-            "quotation": final_state.get("current_quotation"),
+            "quotation": final_state.get("current_quotation") or quotation,
             "validation_passed": final_state.get("validation_passed", True),
             "validation_errors": final_state.get("validation_errors", []),
             "tools_used": [m for m in final_state["messages"] if hasattr(m, "tool_calls")],
+            "session_reused": False,
             "session_id": session_id
         }
     
+    def stream(self, user_message: str, session_id: str = "default") -> Iterator[Dict[str, Any]]:
+        """
+        Process a user message, yielding events as the agent runs.
+        
+        Event types (each a dict with "event" and "data"):
+        - token: partial LLM text ({"text": ...})
+        - tool_call: the LLM requested a tool ({"name", "args", "id"})
+        - tool_result: a tool finished ({"name", "id", "ok", "error"})
+        - quote: a verified quotation from tool_calculate_quote
+        - done: final response, same fields as invoke() minus tools_used
+        
+        A follow-up answered from the session yields quote, token and done only.
+        
+        Closing the iterator stops the graph between events.
+        
+        Args:
+            user_message: User's query in natural language
+            session_id: Session identifier for state tracking
+        """
+        if not LANGGRAPH_AVAILABLE or self.graph is None:
+            result = self._fallback_invoke(user_message)
+            yield {"event": "token", "data": {"text": result["response"]}}
+            yield {"event": "done", "data": dict(result, session_id=session_id)}
+            return
+        
+        session = self._load_session(session_id)
+        follow_up = self._follow_up(user_message, session)
+        if follow_up is not None:
+            yield {"event": "quote", "data": follow_up["quotation"]}
+            yield {"event": "token", "data": {"text": follow_up["response"]}}
+            yield {"event": "done", "data": dict(follow_up, session_id=session_id)}
+            return
+        
+        response_text = ""
+        quotation = None
+        tool_results: Dict[str, Any] = {}
+        validation = {"validation_passed": True, "validation_errors": []}
+        
+        for mode, payload in self.graph.stream(
+            self._initial_state(user_message, session_id, session),
+            stream_mode=["messages", "updates"],
+        ):
+            if mode == "messages":
+                chunk, metadata = payload
+                if isinstance(chunk, AIMessageChunk) and chunk.content:
+                    yield {"event": "token", "data": {"text": chunk.content}}
+                continue
+            
+            for node, update in payload.items():
+                if not update:
+                    continue
+                if node == "validate":
+                    validation = {
+                        "validation_passed": update.get("validation_passed", True),
+                        "validation_errors": update.get("validation_errors", []),
+                    }
+                    continue
+                messages = update.get("messages") or []
+                if node == "agent" and messages:
+                    last = messages[-1]
+                    for call in getattr(last, "tool_calls", None) or []:
+                        yield {
+                            "event": "tool_call",
+                            "data": {"name": call["name"], "args": call["args"], "id": call.get("id")},
+                        }
+                    if not getattr(last, "tool_calls", None):
+                        response_text = last.content
+                elif node == "tools":
+                    tool_results.update(update.get("tool_results") or {})
+                    for message in messages:
+                        if not isinstance(message, ToolMessage):
+                            continue
+                        try:
+                            content = json.loads(message.content)
+                        except (TypeError, ValueError):
+                            content = None
+                        error = content.get("error") if isinstance(content, dict) else None
+                        yield {
+                            "event": "tool_result",
+                            "data": {
+                                "name": message.name,
+                                "id": message.tool_call_id,
+                                "ok": error is None,
+                                "error": error,
+                            },
+                        }
+                        if (message.name == "tool_calculate_quote" and error is None
+                                and isinstance(content, dict)):
+                            quotation = content
+                            yield {"event": "quote", "data": content}
+        
+        self._record_turn(session, user_message, response_text, tool_results)
+        yield {
+            "event": "done",
+            "data": {
+                "response": response_text,
+                "quotation": quotation,
+                **validation,
+                "session_reused": False,
+                "session_id": session_id,
+            },
+        }
+    
+    # ------------------------------------------------------------------
+    # Session state
+    # ------------------------------------------------------------------
+    
+    def _load_session(self, session_id: str) -> Optional[SessionState]:
+        """Session for this id, or None for the shared anonymous id"""
+        if not session_id or session_id == ANONYMOUS_SESSION_ID:
+            return None
+        return self.session_store.get_or_create(session_id)
+    
+    def _follow_up(self, user_message: str, session: Optional[SessionState]) -> Optional[Dict[str, Any]]:
+        """
+        Answer a follow-up that only edits the last quote, without the LLM.
+        
+        Reuses the session's quote parameters and product resolution and runs
+        calculate_panel_quote directly. Returns None when the message is not
+        such a follow-up or the edited quote is invalid (the agent handles it).
+        """
+        if session is None:
+            return None
+        params = follow_up_params(user_message, session)
+        if params is None:
+            return None
+        try:
+            quotation = calculate_panel_quote(**params)
+        except (TypeError, ValueError) as e:
+            logger.info(f"Session follow-up not reusable ({e}); running the agent")
+            return None
+        
+        is_valid, errors = validate_quotation(quotation)
+        response_text = (
+            f"Cotización actualizada: {quotation['product_name']}, "
+            f"{quotation['length_m']}m x {quotation['width_m']}m, "
+            f"{quotation['panels_needed']} paneles. "
+            f"Subtotal USD {quotation['subtotal_usd']:.2f}, "
+            f"IVA USD {quotation['tax_amount_usd']:.2f}, "
+            f"TOTAL USD {quotation['total_usd']:.2f}."
+        )
+        product = lookup_product_specs(product_id=params["product_id"])
+        session.remember_quote(params, dict(quotation), product)
+        session.add_turn(user_message, response_text, self.session_store.max_history)
+        self.session_store.save(session)
+        return {
+            "response": response_text,
+            "quotation": quotation,
+            "validation_passed": is_valid,
+            "validation_errors": errors,
+            "session_reused": True,
+        }
+    
+    def _record_turn(
+        self,
+        session: Optional[SessionState],
+        user_message: str,
+        response_text: str,
+        tool_results: Optional[Dict[str, Any]],
+    ) -> Optional[Dict[str, Any]]:
+        """Store the turn (and its verified quote, if any) in the session; returns the quote"""
+        quotation = None
+        result = (tool_results or {}).get("tool_calculate_quote")
+        if result:
+            try:
+                content = json.loads(result["content"])
+            except (TypeError, ValueError):
+                content = None
+            if isinstance(content, dict) and "error" not in content:
+                quotation = content
+        if session is None:
+            return quotation
+        if quotation is not None:
+            product = lookup_product_specs(product_id=quotation["product_id"])
+            if product is not None:
+                session.remember_quote(result["args"], quotation, product)
+        session.add_turn(user_message, response_text, self.session_store.max_history)
+        self.session_store.save(session)
+        return quotation
+    
+    def _session_messages(self, session: Optional[SessionState]) -> List[Any]:
+        """Compacted session context plus recent history, as chat messages"""
+        if session is None:
+            return []
+        messages: List[Any] = []
+        context = []
+        if session.summary:
+            context.append("Consultas anteriores de esta sesión:")
+            context.extend(f"- {line}" for line in session.summary)
+        if session.last_quote_params:
+            context.append(
+                "Última cotización (parámetros de calculate_panel_quote): "
+                + json.dumps(session.last_quote_params, ensure_ascii=False)
+            )
+        if context:
+            messages.append(SystemMessage(content="\n".join(context)))
+        for entry in session.history:
+            cls = HumanMessage if entry["role"] == "user" else AIMessage
+            messages.append(cls(content=entry["content"]))
+        return messages
+    
+    def _initial_state(
+        self,
+        user_message: str,
+        session_id: str,
+        session: Optional[SessionState] = None
+    ) -> AgentState:
+        """Graph state for one user message, seeded with the session's context"""
+        return AgentState(
+            messages=self._session_messages(session) + [HumanMessage(content=user_message)],
+            extracted_params=None,
+            current_quotation=None,
+            validation_passed=True,
+            validation_errors=[],
+            last_tool_called=None,
+            tool_results={},
+            session_id=session_id,
+            turn_count=0
+        )
+    
     def _fallback_invoke(self, user_message: str) -> Dict[str, Any]:
         """
         Fallback implementation when LangGraph is not available.
@@ -497,7 +769,8 @@ class PanelinQuotationAgent:
 def create_agent(
     model_name: str = "gpt-4o-mini",
     temperature: float = 0,
-    api_key: Optional[str] = None
+    api_key: Optional[str] = None,
+    llm: Optional[Any] = None
 ) -> PanelinQuotationAgent:
     """
     Factory function to create a Panelin quotation agent.
@@ -506,6 +779,7 @@ def create_agent(
         model_name: LLM model to use
         temperature: LLM temperature
         api_key: OpenAI API key
+        llm: Optional pre-built chat model (overrides model_name/api_key)
         
     Returns:
         Configured PanelinQuotationAgent instance
@@ -513,7 +787,8 @@ def create_agent(
     return PanelinQuotationAgent(
         model_name=model_name,
         temperature=temperature,
-        api_key=api_key
+        api_key=api_key,
+        llm=llm
     )
 
 
@@ -1,8 +1,8 @@
-from fastapi import FastAPI, HTTPException, Security, Request
+from fastapi import Depends, FastAPI, HTTPException, Security, Request
 from fastapi.security import APIKeyHeader
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
-from typing import Optional, List, Literal, Any
+from typing import Optional, List, Literal, Any, Dict, Iterator
 import sys
 import os
 from pathlib import Path
@@ -12,18 +12,21 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 sys.path.append(str(PROJECT_ROOT))
 
 from config.settings import settings
-from panelin_agent_v2.tools.quotation_calculator import calculate_panel_quote
+from panelin_agent_v2.tools.quotation_calculator import calculate_panel_quote, validate_quotation
 from panelin_agent_v2.tools.product_lookup import (
     find_product_by_query,
     get_product_price,
     check_product_availability
 )
+from panelin_agent_v2.streaming import sse_response
+from panelin_core.metrics import REGISTRY, instrument_app
 
 app = FastAPI(
     title="Panelin Wolf API",
     description="Secure Deterministic API for BMC Uruguay Quotations",
     version="2.0.0"
 )
+instrument_app(app, service="panelin_wolf_api")
 
 # --- Security Configuration ---
 API_KEY_NAME = "X-API-Key"
@@ -70,6 +73,27 @@ class ProductSearchRequest(BaseModel):
 class ProductPriceRequest(BaseModel):
     product_id: str
 
+class ChatRequest(BaseModel):
+    message: str = Field(..., min_length=1, description="Mensaje del usuario")
+    session_id: str = Field("default", description="Identificador de sesión")
+
+# --- Agent ---
+
+_agent = None
+
+def get_agent():
+    """Shared agent instance, created on first use (overridable in tests)."""
+    global _agent
+    if _agent is None:
+        from panelin_agent_v2.agent.panelin_agent import create_agent
+        _agent = create_agent()
+    return _agent
+
+REGISTRY.register_cache(
+    "agent_sessions",
+    lambda: _agent.session_store.stats() if getattr(_agent, "session_store", None) else None
+)
+
 # --- Endpoints ---
 
 @app.get("/", dependencies=[Security(get_api_key)])
@@ -117,6 +141,48 @@ async def api_calculate_quote(request: QuoteRequest):
         print(f"Error calculating quote: {e}")
         raise HTTPException(status_code=500, detail="Internal calculation error")
 
+def _quote_events(request: QuoteRequest) -> Iterator[Dict[str, Any]]:
+    """Quote pipeline as events: progress stages, the quote, then done."""
+    yield {"event": "progress", "data": {"stage": "calculating"}}
+    result = calculate_panel_quote(
+        product_id=request.product_id,
+        length_m=request.length_m,
+        width_m=request.width_m,
+        quantity=request.quantity,
+        discount_percent=request.discount_percent,
+        include_accessories=request.include_accessories,
+        include_tax=request.include_tax,
+        installation_type=request.installation_type
+    )
+    yield {"event": "progress", "data": {"stage": "validating"}}
+    is_valid, errors = validate_quotation(result)
+    yield {"event": "quote", "data": result}
+    yield {"event": "done", "data": {"validation_passed": is_valid, "validation_errors": errors}}
+
+def _stream_error(exc: Exception) -> Dict[str, Any]:
+    """Same status/detail mapping as the non-streaming endpoints."""
+    if isinstance(exc, ValueError):
+        return {"status_code": 400, "detail": str(exc)}
+    print(f"Error while streaming: {exc}")
+    return {"status_code": 500, "detail": "Internal calculation error"}
+
+@app.post("/calculate_quote/stream", dependencies=[Security(get_api_key)])
+async def api_calculate_quote_stream(request: QuoteRequest, http_request: Request):
+    """SSE variant of /calculate_quote: progress, quote and done events."""
+    return sse_response(http_request, lambda: _quote_events(request), on_error=_stream_error)
+
+@app.post("/chat/stream", dependencies=[Security(get_api_key)])
+async def api_chat_stream(request: ChatRequest, http_request: Request, agent=Depends(get_agent)):
+    """
+    Run the agent and stream token, tool_call, tool_result, quote and done
+    events. Disconnecting stops the agent run.
+    """
+    return sse_response(
+        http_request,
+        lambda: agent.stream(request.message, session_id=request.session_id),
+        on_error=_stream_error,
+    )
+
 @app.post("/find_products", dependencies=[Security(get_api_key)])
 async def api_find_products(request: ProductSearchRequest):
     results = find_product_by_query(request.query, request.max_results)
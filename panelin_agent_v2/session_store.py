@@ -0,0 +1,363 @@
+"""
+Session-scoped conversation state for the quotation agent.
+
+Each session keeps what the previous turns already resolved, so a follow-up
+like "y en 150mm?" does not re-run product lookup and the whole LLM/tool loop:
+
+- resolved_products: (family, sub_family, thickness_mm) -> product_id
+- last_quote_params: arguments of the last successful calculate_panel_quote
+- last_quotation: its verified result
+- history: the last turns verbatim, older turns compacted into a short summary
+
+Sessions live in an in-process LRU with TTL. With a spill_path, sessions
+evicted from memory are written to SQLite and loaded back on the next turn,
+so a long tail of idle sessions does not grow the process memory. Spilled
+sessions past their TTL are deleted when the store opens and, at most once
+per TTL, whenever another session spills.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from .tools.product_lookup import _match_product_family, list_all_products
+
+
+DEFAULT_MAXSIZE = 1024
+DEFAULT_TTL_SECONDS = 1800
+DEFAULT_MAX_HISTORY = 6
+MAX_SUMMARY_LINES = 10
+
+# Sessions with this id are shared by every anonymous caller: never reused
+ANONYMOUS_SESSION_ID = "default"
+
+# Follow-ups are short edits of the last quote; longer messages go to the LLM
+FOLLOW_UP_MAX_WORDS = 8
+
+_THICKNESS_RE = re.compile(r"(\d{2,3})\s*(?:mm|milimetros|milímetros)\b")
+_DIMENSIONS_RE = re.compile(r"(\d+(?:[.,]\d+)?)\s*(?:m\s*)?[x×]\s*(\d+(?:[.,]\d+)?)")
+_DISCOUNT_RE = re.compile(r"(\d+(?:[.,]\d+)?)\s*%")
+_QUANTITY_RE = re.compile(r"(\d+)\s*(?:unidades|juegos|techos|paredes)\b")
+
+
+@dataclass
+class SessionState:
+    """What one conversation has resolved so far."""
+    session_id: str
+    resolved_products: Dict[str, str] = field(default_factory=dict)
+    last_quote_params: Optional[Dict[str, Any]] = None
+    last_quotation: Optional[Dict[str, Any]] = None
+    last_product: Optional[Dict[str, Any]] = None
+    history: List[Dict[str, str]] = field(default_factory=list)
+    summary: List[str] = field(default_factory=list)
+    turn_count: int = 0
+    updated_at: float = 0.0
+
+    def add_turn(self, user_message: str, response: str, max_history: int = DEFAULT_MAX_HISTORY) -> None:
+        """Append a turn and compact the history beyond max_history messages."""
+        self.history.append({"role": "user", "content": user_message})
+        self.history.append({"role": "assistant", "content": response})
+        self.turn_count += 1
+        overflow = len(self.history) - max_history
+        if overflow > 0:
+            for message in self.history[:overflow]:
+                if message["role"] == "user":
+                    self.summary.append(message["content"][:120])
+            del self.history[:overflow]
+            del self.summary[:-MAX_SUMMARY_LINES]
+
+    def remember_quote(
+        self,
+        params: Dict[str, Any],
+        quotation: Dict[str, Any],
+        product: Dict[str, Any],
+    ) -> None:
+        """Record a successful quote and the product (ProductSpecs) it resolved to."""
+        self.last_quote_params = dict(params)
+        self.last_quotation = quotation
+        self.last_product = {
+            "product_id": product["product_id"],
+            "family": product["family"],
+            "sub_family": product.get("sub_family"),
+            "thickness_mm": product["thickness_mm"],
+        }
+        key = _product_key(product["family"], product.get("sub_family"), product["thickness_mm"])
+        self.resolved_products[key] = product["product_id"]
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), ensure_ascii=False, default=str)
+
+    @classmethod
+    def from_json(cls, payload: str) -> "SessionState":
+        return cls(**json.loads(payload))
+
+
+def _product_key(family: str, sub_family: Optional[str], thickness_mm: int) -> str:
+    return f"{family}|{sub_family or ''}|{thickness_mm}"
+
+
+def _number(text: str) -> float:
+    return float(text.replace(",", "."))
+
+
+def resolve_product(
+    session: SessionState,
+    family: str,
+    sub_family: Optional[str],
+    thickness_mm: int,
+) -> Optional[str]:
+    """
+    Product id for family/sub_family/thickness, cached in the session.
+
+    Returns None when the KB has no such product.
+    """
+    key = _product_key(family, sub_family, thickness_mm)
+    if key in session.resolved_products:
+        return session.resolved_products[key]
+    for product in list_all_products(family):
+        if product.get("thickness_mm") == thickness_mm and product.get("sub_family") == sub_family:
+            session.resolved_products[key] = product["product_id"]
+            return product["product_id"]
+    return None
+
+
+def follow_up_params(message: str, session: SessionState) -> Optional[Dict[str, Any]]:
+    """
+    Quote parameters for a follow-up that edits the session's last quote.
+
+    A follow-up is a short message that names no product family and changes
+    at least one of thickness, dimensions, discount or quantity, e.g.
+    "y en 150mm?" or "y si es 8x5 con 10%". Returns None otherwise (or if
+    the new thickness does not exist for the quoted product line), and the
+    message goes through the full agent.
+    """
+    last = session.last_quote_params
+    product = session.last_product
+    if not last or not product:
+        return None
+    text = message.lower()
+    if len(text.split()) > FOLLOW_UP_MAX_WORDS or _match_product_family(text):
+        return None
+
+    params = dict(last)
+    changed = False
+
+    thickness = _THICKNESS_RE.search(text)
+    if thickness:
+        product_id = resolve_product(
+            session,
+            product["family"],
+            product.get("sub_family"),
+            int(thickness.group(1)),
+        )
+        if product_id is None:
+            return None
+        params["product_id"] = product_id
+        changed = True
+
+    dimensions = _DIMENSIONS_RE.search(text)
+    if dimensions:
+        params["length_m"] = _number(dimensions.group(1))
+        params["width_m"] = _number(dimensions.group(2))
+        changed = True
+
+    discount = _DISCOUNT_RE.search(text)
+    if discount:
+        params["discount_percent"] = _number(discount.group(1))
+        changed = True
+
+    quantity = _QUANTITY_RE.search(text)
+    if quantity:
+        params["quantity"] = int(quantity.group(1))
+        changed = True
+
+    return params if changed else None
+
+
+class SessionStore:
+    """
+    Thread-safe LRU of SessionState with TTL and optional SQLite spill.
+
+    Example:
+        >>> store = SessionStore(maxsize=100)
+        >>> session = store.get_or_create("s-1")
+        >>> session.add_turn("cotizar isodec 100mm 6x4", "Total: USD 1234.56")
+        >>> store.save(session)
+        >>> store.get("s-1").turn_count
+        1
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_MAXSIZE,
+        ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+        max_history: int = DEFAULT_MAX_HISTORY,
+        spill_path: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            maxsize: Sessions kept in memory before the least recent is evicted
+            ttl_seconds: Idle time after which a session expires (None = never)
+            max_history: Messages kept verbatim per session (older are summarized)
+            spill_path: SQLite file for evicted sessions (None = drop them)
+            clock: Wall clock (injectable for testing; spilled sessions outlive the process)
+        """
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.max_history = max_history
+        self.spill_path = spill_path
+        self._clock = clock
+        self._sessions: "OrderedDict[str, SessionState]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._next_sweep = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.spills = 0
+        self.restores = 0
+        if spill_path:
+            self._conn = sqlite3.connect(spill_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "session_id TEXT PRIMARY KEY, payload TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at)"
+            )
+            self._conn.commit()
+            self._sweep()
+
+    def _expired(self, session: SessionState) -> bool:
+        return self.ttl_seconds is not None and self._clock() - session.updated_at >= self.ttl_seconds
+
+    def _sweep(self) -> None:
+        """Delete spilled sessions past their TTL (the table would grow forever)."""
+        if self._conn is None or self.ttl_seconds is None:
+            return
+        now = self._clock()
+        cursor = self._conn.execute(
+            "DELETE FROM sessions WHERE updated_at <= ?", (now - self.ttl_seconds,)
+        )
+        self._conn.commit()
+        self.expirations += cursor.rowcount
+        self._next_sweep = now + self.ttl_seconds
+
+    def _restore(self, session_id: str) -> Optional[SessionState]:
+        if self._conn is None:
+            return None
+        row = self._conn.execute(
+            "SELECT payload FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+        self._conn.commit()
+        return SessionState.from_json(row[0])
+
+    def _spill(self, session: SessionState) -> None:
+        if self._conn is None:
+            return
+        self._conn.execute(
+            "INSERT OR REPLACE INTO sessions (session_id, payload, updated_at) VALUES (?, ?, ?)",
+            (session.session_id, session.to_json(), session.updated_at),
+        )
+        self._conn.commit()
+        self.spills += 1
+        if self._clock() >= self._next_sweep:
+            self._sweep()
+
+    def get(self, session_id: str) -> Optional[SessionState]:
+        """Return the live session (from memory or spill) or None."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            restored = False
+            if session is None:
+                session = self._restore(session_id)
+                restored = session is not None
+            if session is not None and self._expired(session):
+                self._sessions.pop(session_id, None)
+                self.expirations += 1
+                session = None
+            if session is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            if restored:
+                self.restores += 1
+                self._insert(session)
+            else:
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def get_or_create(self, session_id: str) -> SessionState:
+        session = self.get(session_id)
+        if session is None:
+            session = SessionState(session_id=session_id, updated_at=self._clock())
+        return session
+
+    def save(self, session: SessionState) -> None:
+        """Store the session as most recently used, evicting (spilling) the oldest."""
+        session.updated_at = self._clock()
+        with self._lock:
+            self._insert(session)
+
+    def _insert(self, session: SessionState) -> None:
+        self._sessions[session.session_id] = session
+        self._sessions.move_to_end(session.session_id)
+        while len(self._sessions) > self.maxsize:
+            _, evicted = self._sessions.popitem(last=False)
+            self.evictions += 1
+            if not self._expired(evicted):
+                self._spill(evicted)
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+                self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM sessions")
+                self._conn.commit()
+
+    def close(self) -> None:
+        """Spill every in-memory session (if configured) and close SQLite."""
+        with self._lock:
+            if self._conn is None:
+                return
+            for session in self._sessions.values():
+                if not self._expired(session):
+                    self._spill(session)
+            self._conn.close()
+            self._conn = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            spilled = 0
+            if self._conn is not None:
+                spilled = self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+            return {
+                "size": len(self._sessions),
+                "maxsize": self.maxsize,
+                "spilled": spilled,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "spills": self.spills,
+                "restores": self.restores,
+            }
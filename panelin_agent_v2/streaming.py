@@ -0,0 +1,134 @@
+"""
+Server-Sent Events helpers for the Wolf API.
+
+The agent and the quote pipeline are synchronous. To stream their progress
+without blocking the event loop, the event iterator runs in a worker thread
+and hands events to the response through a bounded asyncio.Queue:
+
+- Back-pressure: when the client reads slower than events are produced, the
+  queue fills up and the worker blocks, so memory stays bounded by
+  max_buffered events.
+- Cancellation: when the client disconnects (or the response is torn down),
+  the worker is told to stop and closes the iterator between events, which
+  stops the underlying agent run.
+"""
+
+import asyncio
+import concurrent.futures
+import json
+import logging
+import threading
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+
+logger = logging.getLogger(__name__)
+
+SSE_MEDIA_TYPE = "text/event-stream"
+DEFAULT_MAX_BUFFERED_EVENTS = 32
+
+# How often a blocked worker re-checks for cancellation (seconds)
+_CANCEL_POLL_S = 0.05
+
+_END = object()
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Serialize one event in SSE wire format."""
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+async def iterate_in_thread(
+    events: Callable[[], Iterator[Dict[str, Any]]],
+    max_buffered: int = DEFAULT_MAX_BUFFERED_EVENTS,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run a blocking event iterator in a worker thread and yield its events.
+
+    Args:
+        events: Zero-argument callable returning the iterator (called in the worker)
+        max_buffered: Events buffered before the worker blocks
+
+    Exceptions raised by the iterator are re-raised here. Closing this
+    generator cancels the worker.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_buffered)
+    cancelled = threading.Event()
+
+    def put(item: Any) -> bool:
+        future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+        while True:
+            try:
+                future.result(timeout=_CANCEL_POLL_S)
+                return True
+            except concurrent.futures.TimeoutError:
+                if cancelled.is_set():
+                    future.cancel()
+                    return False
+
+    def produce() -> None:
+        result: Any = _END
+        try:
+            iterator = events()
+            try:
+                for event in iterator:
+                    if cancelled.is_set() or not put(event):
+                        return
+            finally:
+                close = getattr(iterator, "close", None)
+                if close is not None:
+                    close()
+        except BaseException as exc:  # re-raised in the consumer
+            result = exc
+        if not cancelled.is_set():
+            put(result)
+
+    worker = threading.Thread(target=produce, name="sse-producer", daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = await queue.get()
+            if item is _END:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        cancelled.set()
+
+
+def sse_response(
+    request: Request,
+    events: Callable[[], Iterator[Dict[str, Any]]],
+    max_buffered: int = DEFAULT_MAX_BUFFERED_EVENTS,
+    on_error: Optional[Callable[[Exception], Dict[str, Any]]] = None,
+) -> StreamingResponse:
+    """
+    Stream events ({"event": ..., "data": ...}) as a text/event-stream response.
+
+    The stream stops as soon as the client disconnects. An exception from the
+    iterator becomes a final "error" event (on_error maps it to the payload).
+    """
+    async def body() -> AsyncIterator[str]:
+        stream = iterate_in_thread(events, max_buffered)
+        try:
+            async for event in stream:
+                if await request.is_disconnected():
+                    logger.info("SSE client disconnected; cancelling stream")
+                    return
+                yield format_sse(event["event"], event["data"])
+        except Exception as exc:
+            payload = on_error(exc) if on_error else {"detail": "Internal error"}
+            yield format_sse("error", payload)
+        finally:
+            await stream.aclose()
+
+    return StreamingResponse(
+        body(),
+        media_type=SSE_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,187 @@
+"""
+Tests for the session store and session reuse in the agent
+==========================================================
+
+The agent runs with a scripted chat model that counts its calls: a follow-up
+answered from the session must not reach the model at all.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from panelin_agent_v2.session_store import SessionState, SessionStore, follow_up_params
+from panelin_agent_v2.tools.quotation_calculator import calculate_panel_quote, lookup_product_specs
+
+
+QUOTE_ARGS = {"product_id": "ISODEC_EPS_100mm", "length_m": 6.0, "width_m": 4.0}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _quoted_session(session_id="s-1") -> SessionState:
+    session = SessionState(session_id=session_id)
+    session.remember_quote(
+        QUOTE_ARGS,
+        dict(calculate_panel_quote(**QUOTE_ARGS)),
+        lookup_product_specs(product_id=QUOTE_ARGS["product_id"]),
+    )
+    return session
+
+
+class TestSessionStore:
+    def test_lru_eviction(self):
+        store = SessionStore(maxsize=2)
+        for session_id in ("a", "b"):
+            store.save(store.get_or_create(session_id))
+        store.get("a")
+        store.save(store.get_or_create("c"))
+        assert store.get("b") is None
+        assert store.get("a") is not None
+        assert store.stats()["evictions"] == 1
+
+    def test_ttl_expiration(self):
+        clock = FakeClock()
+        store = SessionStore(ttl_seconds=60, clock=clock)
+        store.save(store.get_or_create("a"))
+        clock.now += 59
+        assert store.get("a") is not None
+        clock.now += 61
+        assert store.get("a") is None
+        assert store.stats()["expirations"] == 1
+
+    def test_history_is_compacted(self):
+        session = SessionState(session_id="s")
+        for i in range(5):
+            session.add_turn(f"pregunta {i}", f"respuesta {i}", max_history=4)
+        assert [m["content"] for m in session.history] == [
+            "pregunta 3", "respuesta 3", "pregunta 4", "respuesta 4"
+        ]
+        assert session.summary == ["pregunta 0", "pregunta 1", "pregunta 2"]
+        assert session.turn_count == 5
+
+    def test_evicted_sessions_spill_to_sqlite(self, tmp_path):
+        spill = str(tmp_path / "sessions.db")
+        store = SessionStore(maxsize=1, spill_path=spill)
+        store.save(_quoted_session("a"))
+        store.save(store.get_or_create("b"))
+        assert store.stats()["spilled"] == 1
+
+        restored = store.get("a")
+        assert restored.last_quote_params == QUOTE_ARGS
+        assert restored.last_product["family"] == "ISODEC"
+        assert store.stats()["restores"] == 1
+
+        store.close()
+        reopened = SessionStore(spill_path=spill)
+        assert reopened.get("b") is not None
+        reopened.close()
+
+    def test_expired_spilled_sessions_are_deleted(self, tmp_path):
+        spill = str(tmp_path / "sessions.db")
+        clock = FakeClock()
+        store = SessionStore(maxsize=1, ttl_seconds=60, spill_path=spill, clock=clock)
+        for session_id in ("a", "b", "c"):
+            store.save(store.get_or_create(session_id))
+        assert store.stats()["spilled"] == 2
+
+        # Pasado el TTL, el próximo spill ("d") barre "a" y "b" sin que nadie las pida
+        clock.now += 61
+        for session_id in ("d", "e"):
+            store.save(store.get_or_create(session_id))
+        stats = store.stats()
+        assert stats["spilled"] == 1
+        assert stats["expirations"] == 2
+        store.close()
+
+        # Al reabrir también se borran las que vencieron mientras estaba cerrado
+        clock.now += 61
+        reopened = SessionStore(ttl_seconds=60, spill_path=spill, clock=clock)
+        assert reopened.stats()["spilled"] == 0
+        reopened.close()
+
+
+class TestFollowUpParams:
+    def test_thickness_change_resolves_sibling_product(self):
+        params = follow_up_params("y en 150mm?", _quoted_session())
+        assert params == dict(QUOTE_ARGS, product_id="ISODEC_EPS_150mm")
+
+    def test_dimensions_and_discount(self):
+        params = follow_up_params("y si es 8x5 con 10%", _quoted_session())
+        assert params["length_m"] == 8.0 and params["width_m"] == 5.0
+        assert params["discount_percent"] == 10.0
+        assert params["product_id"] == QUOTE_ARGS["product_id"]
+
+    @pytest.mark.parametrize("message", [
+        "y en isopanel 150mm?",   # names a new product line
+        "y en 999mm?",            # thickness that does not exist
+        "gracias!",               # changes nothing
+        "y si en lugar de eso me explicas qué diferencia hay con 150mm de espesor",
+    ])
+    def test_not_a_follow_up(self, message):
+        assert follow_up_params(message, _quoted_session()) is None
+
+    def test_needs_a_previous_quote(self):
+        assert follow_up_params("y en 150mm?", SessionState(session_id="s")) is None
+
+
+class TestAgentSessions:
+    @pytest.fixture
+    def agent_and_model(self):
+        pytest.importorskip("langgraph")
+        from langchain_core.messages import AIMessage
+        from panelin_agent_v2.agent.panelin_agent import PanelinQuotationAgent
+
+        class ScriptedLLM:
+            def __init__(self):
+                self.calls = []
+
+            def bind_tools(self, tools):
+                return self
+
+            def invoke(self, messages):
+                self.calls.append(list(messages))
+                if len(self.calls) % 2:
+                    return AIMessage(content="", tool_calls=[
+                        {"name": "tool_calculate_quote", "args": QUOTE_ARGS, "id": f"call-{len(self.calls)}"},
+                    ])
+                return AIMessage(content="Cotización lista")
+
+        model = ScriptedLLM()
+        return PanelinQuotationAgent(llm=model), model
+
+    def test_follow_up_skips_the_llm(self, agent_and_model):
+        agent, model = agent_and_model
+        first = agent.invoke("cotizar isodec 100mm 6x4", session_id="s-1")
+        assert first["session_reused"] is False
+        assert len(model.calls) == 2
+
+        second = agent.invoke("y en 150mm?", session_id="s-1")
+        assert len(model.calls) == 2
+        assert second["session_reused"] is True
+        expected = calculate_panel_quote(**dict(QUOTE_ARGS, product_id="ISODEC_EPS_150mm"))
+        assert second["quotation"]["total_usd"] == expected["total_usd"]
+        assert second["validation_passed"] is True
+
+    def test_history_is_sent_on_later_turns(self, agent_and_model):
+        agent, model = agent_and_model
+        agent.invoke("cotizar isodec 100mm 6x4", session_id="s-2")
+        agent.invoke("¿cuánto tarda la entrega a Maldonado?", session_id="s-2")
+        contents = [getattr(m, "content", "") for m in model.calls[2]]
+        assert "cotizar isodec 100mm 6x4" in contents
+        assert "Cotización lista" in contents
+
+    def test_default_session_is_not_reused(self, agent_and_model):
+        agent, model = agent_and_model
+        agent.invoke("cotizar isodec 100mm 6x4")
+        agent.invoke("y en 150mm?")
+        assert len(model.calls) == 4
@@ -0,0 +1,199 @@
+"""
+Tests for the SSE streaming endpoints
+=====================================
+
+Uses FastAPI's TestClient and a fake chat model that emits its reply token by
+token, so the stream can be checked event by event without an API key.
+"""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+pytest.importorskip("langgraph")
+from fastapi.testclient import TestClient
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from panelin_agent_v2 import api
+from panelin_agent_v2.agent.panelin_agent import PanelinQuotationAgent
+from panelin_agent_v2.streaming import iterate_in_thread, sse_response
+from panelin_agent_v2.tools.quotation_calculator import calculate_panel_quote
+
+
+API_KEY = "test-wolf-key"
+HEADERS = {"X-API-Key": API_KEY}
+QUOTE_ARGS = {"product_id": "ISOPANEL_EPS_50mm", "length_m": 6.0, "width_m": 4.0}
+
+
+class FakeStreamingModel(BaseChatModel):
+    """Replays scripted AI turns, streaming their content word by word."""
+
+    turns: List[AIMessage]
+    position: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-streaming"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _next_turn(self) -> AIMessage:
+        turn = self.turns[min(self.position, len(self.turns) - 1)]
+        self.position += 1
+        return turn
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        return ChatResult(generations=[ChatGeneration(message=self._next_turn())])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        turn = self._next_turn()
+        for word in turn.content.split(" "):
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=word + " "))
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+        if turn.tool_calls:
+            yield ChatGenerationChunk(message=AIMessageChunk(content="", tool_call_chunks=[
+                {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": i}
+                for i, call in enumerate(turn.tool_calls)
+            ]))
+
+
+def _fake_agent() -> PanelinQuotationAgent:
+    model = FakeStreamingModel(turns=[
+        AIMessage(content="Calculo la cotización", tool_calls=[
+            {"name": "tool_calculate_quote", "args": QUOTE_ARGS, "id": "call-1"},
+        ]),
+        AIMessage(content="Aquí está tu cotización verificada"),
+    ])
+    return PanelinQuotationAgent(llm=model)
+
+
+def _parse_sse(text: str):
+    events = []
+    for block in text.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(api.settings, "WOLF_API_KEY", API_KEY)
+    api.app.dependency_overrides[api.get_agent] = _fake_agent
+    yield TestClient(api.app)
+    api.app.dependency_overrides.clear()
+
+
+class TestQuoteStream:
+    def test_progress_quote_and_done_events(self, client):
+        response = client.post("/calculate_quote/stream", json=QUOTE_ARGS, headers=HEADERS)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+
+        events = _parse_sse(response.text)
+        assert [name for name, _ in events] == ["progress", "progress", "quote", "done"]
+        quote = events[2][1]
+        expected = calculate_panel_quote(**QUOTE_ARGS)
+        assert quote["total_usd"] == expected["total_usd"]
+        assert quote["calculation_verified"] is True
+        assert events[3][1]["validation_passed"] is True
+
+    def test_calculation_error_is_an_event(self, client):
+        response = client.post("/calculate_quote/stream", headers=HEADERS,
+                               json=dict(QUOTE_ARGS, product_id="NO_EXISTE"))
+        events = _parse_sse(response.text)
+        assert events[-1][0] == "error"
+        assert events[-1][1]["status_code"] == 400
+
+    def test_requires_api_key(self, client):
+        response = client.post("/calculate_quote/stream", json=QUOTE_ARGS)
+        assert response.status_code == 403
+
+
+class TestChatStream:
+    def test_tokens_tools_quote_and_done(self, client):
+        response = client.post("/chat/stream", headers=HEADERS,
+                               json={"message": "cotizar isopanel 50mm 6x4", "session_id": "s-1"})
+        events = _parse_sse(response.text)
+        names = [name for name, _ in events]
+
+        assert names.index("tool_call") < names.index("tool_result") < names.index("quote")
+        assert names[-1] == "done"
+        tokens = "".join(data["text"] for name, data in events if name == "token")
+        assert "Calculo la cotización" in tokens
+        assert "Aquí está tu cotización verificada" in tokens
+
+        tool_call = events[names.index("tool_call")][1]
+        assert tool_call["name"] == "tool_calculate_quote"
+        assert tool_call["args"] == QUOTE_ARGS
+        assert events[names.index("tool_result")][1]["ok"] is True
+
+        done = events[-1][1]
+        assert done["session_id"] == "s-1"
+        assert done["quotation"]["total_usd"] == events[names.index("quote")][1]["total_usd"]
+        assert done["response"].strip() == "Aquí está tu cotización verificada"
+
+
+class TestBackPressureAndCancellation:
+    def test_producer_waits_for_slow_consumer(self):
+        produced = []
+
+        def events():
+            for i in range(20):
+                produced.append(i)
+                yield {"event": "token", "data": {"i": i}}
+
+        async def consume():
+            lags = []
+            async for event in iterate_in_thread(events, max_buffered=2):
+                await asyncio.sleep(0.005)
+                lags.append(len(produced) - event["data"]["i"])
+            return lags
+
+        lags = asyncio.run(consume())
+        assert len(lags) == 20
+        # Cola de 2 + el evento en vuelo + el que el productor está generando
+        assert max(lags) <= 4
+
+    def test_disconnect_stops_the_producer(self):
+        closed = threading.Event()
+        produced = []
+
+        def endless():
+            try:
+                while True:
+                    produced.append(1)
+                    yield {"event": "token", "data": {"text": "x"}}
+            finally:
+                closed.set()
+
+        class DisconnectingRequest:
+            def __init__(self):
+                self.checks = 0
+
+            async def is_disconnected(self):
+                self.checks += 1
+                return self.checks > 3
+
+        async def consume():
+            response = sse_response(DisconnectingRequest(), endless, max_buffered=4)
+            return [chunk async for chunk in response.body_iterator]
+
+        chunks = asyncio.run(consume())
+        assert len(chunks) == 3
+        assert closed.wait(timeout=2)
+        count = len(produced)
+        time.sleep(0.1)
+        assert len(produced) == count
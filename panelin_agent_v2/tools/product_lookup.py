@@ -13,13 +13,15 @@ import json
 import re
 
 
+KB_PATH = Path(__file__).parent.parent / "config" / "panelin_truth_bmcuruguay.json"
+
+
 def _load_knowledge_base() -> dict:
     """Load the single source of truth knowledge base"""
-    kb_path = Path(__file__).parent.parent / "config" / "panelin_truth_bmcuruguay.json"
-    if not kb_path.exists():
-        raise FileNotFoundError(f"Knowledge base not found at {kb_path}")
-    
-    with open(kb_path, 'r', encoding='utf-8') as f:
+    if not KB_PATH.exists():
+        raise FileNotFoundError(f"Knowledge base not found at {KB_PATH}")
+
+    with open(KB_PATH, 'r', encoding='utf-8') as f:
         return json.load(f)
 
 
@@ -17,6 +17,8 @@ from pathlib import Path
 import json
 import math
 
+from panelin_core.pricing_kernel import load_compiled_kb
+
 # Type definitions for structured outputs
 class ProductSpecs(TypedDict):
     product_id: str
@@ -94,16 +96,25 @@ class QuotationResult(TypedDict):
     notes: List[str]  # Notes including cutting instructions
 
 
+KB_PATH = Path(__file__).parent.parent / "config" / "panelin_truth_bmcuruguay.json"
+
+
 def _load_knowledge_base() -> dict:
     """Load the single source of truth knowledge base"""
-    kb_path = Path(__file__).parent.parent / "config" / "panelin_truth_bmcuruguay.json"
-    if not kb_path.exists():
-        raise FileNotFoundError(f"Knowledge base not found at {kb_path}")
+    if not KB_PATH.exists():
+        raise FileNotFoundError(f"Knowledge base not found at {KB_PATH}")
     
-    with open(kb_path, 'r', encoding='utf-8') as f:
+    with open(KB_PATH, 'r', encoding='utf-8') as f:
         return json.load(f)
 
 
+def _load_compiled_kb():
+    """Load the knowledge base with prices precompiled to Decimal (cached per file version)"""
+    if not KB_PATH.exists():
+        raise FileNotFoundError(f"Knowledge base not found at {KB_PATH}")
+    return load_compiled_kb(KB_PATH)
+
+
 def _decimal_round(value: Decimal, places: int = 2) -> Decimal:
     """Round decimal to specified places using banker's rounding"""
     quantizer = Decimal(10) ** -places
@@ -336,7 +347,8 @@ def calculate_panel_quote(
         ValueError: If product not found or parameters invalid
     """
     # Load KB and validate product
-    kb = _load_knowledge_base()
+    compiled = _load_compiled_kb()
+    kb = compiled.catalog
     products = kb.get("products", {})
     
     if product_id not in products:
@@ -390,7 +402,9 @@ def calculate_panel_quote(
     # Convert to Decimal for precision (use adjusted length for pricing)
     length_d = Decimal(str(adjusted_length))
     width_d = Decimal(str(width_m))
-    price_per_m2_d = Decimal(str(product["price_per_m2"]))
+    price_per_m2_d = compiled.price(product_id)
+    if price_per_m2_d is None:
+        price_per_m2_d = Decimal(str(product["price_per_m2"]))
     discount_d = Decimal(str(discount_percent))
     tax_rate_d = Decimal(str(pricing_rules.get("tax_rate_uy_iva", 0.22)))
     ancho_util_d = Decimal(str(product["ancho_util_m"]))
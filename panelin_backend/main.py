@@ -8,8 +8,10 @@ from datetime import datetime
 import os
 
 from panelin_backend.database import db
+from panelin_core.metrics import instrument_app
 
 app = FastAPI(title="Panelin Conversation Logging API", version="1.0.0")
+instrument_app(app, service="panelin_backend")
 
 # CORS
 app.add_middleware(
@@ -220,3 +220,17 @@ def test_add_message_conversation_not_found(mock_db):
         
         assert response.status_code == 404
         assert "not found" in response.json()["detail"].lower()
+
+
+@patch("panelin_backend.main.db")
+def test_metrics_endpoint(mock_db):
+    """Test Prometheus metrics scrape after a request"""
+    with TestClient(app) as client:
+        client.get("/health")
+        response = client.get("/metrics")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'service="panelin_backend"' in response.text
+        assert 'route="/health"' in response.text
+        assert "panelin_http_requests_in_flight" in response.text
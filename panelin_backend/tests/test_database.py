@@ -173,3 +173,20 @@ def test_get_conversation_by_thread_id_not_found(mock_psycopg2):
     result = db.get_conversation_by_thread_id("nonexistent")
     
     assert result is None
+
+
+@patch("panelin_backend.database.db.psycopg2")
+def test_operation_metrics(mock_psycopg2):
+    """Test DB time and connection usage are recorded per operation"""
+    from panelin_core.metrics import DB_CONNECTIONS_IN_USE, DB_QUERY_SECONDS
+    
+    mock_conn = MagicMock()
+    mock_psycopg2.connect.return_value = mock_conn
+    mock_conn.cursor.return_value.__enter__.return_value.fetchone.return_value = None
+    histogram = DB_QUERY_SECONDS.labels(operation="get_conversation_by_id", status="ok")
+    before = histogram.snapshot()[0]
+    
+    db.get_conversation_by_id("nonexistent")
+    
+    assert sum(histogram.snapshot()[0]) == sum(before) + 1
+    assert DB_CONNECTIONS_IN_USE.labels().value == 0
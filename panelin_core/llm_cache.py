@@ -0,0 +1,308 @@
+"""
+Panelin LLM Cache - cache de respuestas del chat model direccionado por contenido.
+
+Los reintentos del agente, las corridas de entrenamiento y las simulaciones
+repiten llamadas con exactamente los mismos mensajes. Con temperatura 0 la
+respuesta es (a efectos prácticos) una función de la entrada, así que se puede
+servir desde SQLite sin volver a llamar al modelo.
+
+Clave (sha256 de):
+- identificador del modelo (nombre + temperatura)
+- hash del system prompt
+- mensajes no-system normalizados (tipo, contenido, tool calls; sin ids,
+  que el proveedor genera al azar)
+- esquema de las herramientas enlazadas con bind_tools (formato OpenAI)
+
+Garantías:
+- Acotado por cantidad de entradas y por bytes; se desaloja lo usado hace más tiempo.
+- invoke(..., bypass_cache=True) llama siempre al modelo y no escribe el cache.
+- Las respuestas cacheadas se devuelven sin id, para que dos hits iguales en
+  una misma conversación no se pisen en el reducer de mensajes.
+
+StubChatModel es un modelo local determinista con latencia simulada, para
+medir hit rate y ahorro de latencia sin red (tests y benchmarks).
+
+Usado por:
+- panelin/agent/hybrid_agent.py
+- panelin_agent_v2/agent/panelin_agent.py
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+try:
+    from langchain_core.language_models.chat_models import BaseChatModel
+    from langchain_core.messages import AIMessage, BaseMessage, message_to_dict, messages_from_dict
+    from langchain_core.outputs import ChatGeneration, ChatResult
+    from langchain_core.utils.function_calling import convert_to_openai_tool
+    LANGCHAIN_AVAILABLE = True
+except ImportError:
+    LANGCHAIN_AVAILABLE = False
+    BaseChatModel = object
+
+
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def _sha256(payload: Any) -> str:
+    data = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def _normalize_message(message: Any) -> Dict[str, Any]:
+    """Campos de un mensaje que determinan la respuesta (sin ids)."""
+    if isinstance(message, tuple):
+        role, content = message
+        return {"type": role, "content": content}
+    normalized = {"type": message.type, "content": message.content}
+    tool_calls = getattr(message, "tool_calls", None)
+    if tool_calls:
+        normalized["tool_calls"] = [{"name": c["name"], "args": c["args"]} for c in tool_calls]
+    name = getattr(message, "name", None)
+    if name:
+        normalized["name"] = name
+    return normalized
+
+
+def model_identifier(model: Any) -> str:
+    """Nombre del modelo y temperatura, tal como los exponen los chat models de LangChain."""
+    name = (
+        getattr(model, "model_name", None)
+        or getattr(model, "model", None)
+        or getattr(model, "_llm_type", None)
+        or type(model).__name__
+    )
+    return f"{name}|temperature={getattr(model, 'temperature', None)}"
+
+
+def cache_key(model_id: str, messages: Sequence[Any], tools_schema: Sequence[Dict[str, Any]] = ()) -> str:
+    """Clave direccionada por contenido de una llamada al chat model."""
+    normalized = [_normalize_message(m) for m in messages]
+    system = [m["content"] for m in normalized if m["type"] == "system"]
+    return _sha256({
+        "model": model_id,
+        "system": _sha256(system),
+        "messages": [m for m in normalized if m["type"] != "system"],
+        "tools": list(tools_schema),
+    })
+
+
+class LLMResponseCache:
+    """
+    Cache SQLite de respuestas (AIMessage serializado) con desalojo LRU.
+
+    Thread-safe. Con path=None vive en memoria (útil para tests y benchmarks).
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        """
+        Args:
+            path: Archivo SQLite (None = ":memory:")
+            max_entries: Máximo de respuestas retenidas
+            max_bytes: Máximo de bytes de payload retenidos
+        """
+        self.path = path or ":memory:"
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_responses ("
+            "key TEXT PRIMARY KEY, model TEXT NOT NULL, payload TEXT NOT NULL, "
+            "size INTEGER NOT NULL, latency_ms REAL NOT NULL, "
+            "created_at REAL NOT NULL, last_access REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_llm_responses_access ON llm_responses (last_access)"
+        )
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.evictions = 0
+        self.saved_latency_ms = 0.0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Retorna el mensaje serializado (message_to_dict) o None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, latency_ms FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE llm_responses SET last_access = ?, hits = hits + 1 WHERE key = ?",
+                (time.time(), key),
+            )
+            self._conn.commit()
+            self.hits += 1
+            self.saved_latency_ms += row[1]
+            return json.loads(row[0])
+
+    def put(self, key: str, model_id: str, payload: Dict[str, Any], latency_ms: float) -> None:
+        data = json.dumps(payload, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses "
+                "(key, model, payload, size, latency_ms, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, model_id, data, len(data.encode("utf-8")), latency_ms, now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        count, size = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_responses"
+        ).fetchone()
+        if count <= self.max_entries and size <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT key, size FROM llm_responses ORDER BY last_access ASC, created_at ASC"
+        ).fetchall()
+        doomed = []
+        for key, entry_size in rows:
+            if count <= self.max_entries and size <= self.max_bytes:
+                break
+            doomed.append((key,))
+            count -= 1
+            size -= entry_size
+        self._conn.executemany("DELETE FROM llm_responses WHERE key = ?", doomed)
+        self.evictions += len(doomed)
+
+    def record_bypass(self) -> None:
+        with self._lock:
+            self.bypasses += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_responses")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_responses"
+            ).fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "entries": count,
+                "bytes": size,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "bypasses": self.bypasses,
+                "evictions": self.evictions,
+                "saved_latency_ms": round(self.saved_latency_ms, 2),
+            }
+
+
+class CachedChatModel:
+    """
+    Envuelve un chat model de LangChain y sirve respuestas repetidas desde el cache.
+
+    Expone la parte de la interfaz que usan los agentes (bind_tools / invoke).
+
+    Example:
+        >>> cache = LLMResponseCache()
+        >>> llm = CachedChatModel(StubChatModel(), cache).bind_tools(tools)
+        >>> llm.invoke(messages)                      # miss: llama al modelo
+        >>> llm.invoke(messages)                      # hit
+        >>> llm.invoke(messages, bypass_cache=True)   # siempre llama al modelo
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        cache: LLMResponseCache,
+        tools_schema: Sequence[Dict[str, Any]] = (),
+        model_id: Optional[str] = None,
+    ):
+        self.model = model
+        self.cache = cache
+        self.tools_schema = list(tools_schema)
+        self.model_id = model_id or model_identifier(model)
+
+    def bind_tools(self, tools: Iterable[Any], **kwargs) -> "CachedChatModel":
+        tools = list(tools)
+        schema = [convert_to_openai_tool(t) for t in tools]
+        return CachedChatModel(
+            self.model.bind_tools(tools, **kwargs),
+            self.cache,
+            tools_schema=schema + [{"bind_kwargs": kwargs}] if kwargs else schema,
+            model_id=self.model_id,
+        )
+
+    def invoke(self, messages: Sequence[Any], config: Optional[Any] = None,
+               *, bypass_cache: bool = False, **kwargs) -> Any:
+        if bypass_cache:
+            self.cache.record_bypass()
+            return self.model.invoke(messages, config, **kwargs)
+
+        key = cache_key(self.model_id, messages, self.tools_schema + ([kwargs] if kwargs else []))
+        payload = self.cache.get(key)
+        if payload is not None:
+            return messages_from_dict([payload])[0]
+
+        start = time.perf_counter()
+        response = self.model.invoke(messages, config, **kwargs)
+        latency_ms = (time.perf_counter() - start) * 1000
+        stored = message_to_dict(response)
+        stored["data"]["id"] = None
+        self.cache.put(key, self.model_id, stored, latency_ms)
+        return response
+
+
+if LANGCHAIN_AVAILABLE:
+    class StubChatModel(BaseChatModel):
+        """
+        Chat model local y determinista con latencia simulada.
+
+        responses mapea un fragmento del último mensaje del usuario a la
+        respuesta (texto o AIMessage, p. ej. con tool_calls); sin coincidencia,
+        responde con un eco del mensaje.
+        """
+
+        model_name: str = "stub-chat"
+        temperature: float = 0.0
+        latency_s: float = 0.0
+        responses: Dict[str, Any] = {}
+        calls: int = 0
+
+        @property
+        def _llm_type(self) -> str:
+            return "stub-chat"
+
+        def bind_tools(self, tools, **kwargs):
+            return self
+
+        def _reply(self, messages: List[BaseMessage]) -> AIMessage:
+            last_user = next((m.content for m in reversed(messages) if m.type == "human"), "")
+            for fragment, reply in self.responses.items():
+                if fragment in last_user:
+                    return reply if isinstance(reply, AIMessage) else AIMessage(content=reply)
+            return AIMessage(content=f"stub: {last_user}")
+
+        def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+            self.calls += 1
+            if self.latency_s:
+                time.sleep(self.latency_s)
+            return ChatResult(generations=[ChatGeneration(message=self._reply(messages))])
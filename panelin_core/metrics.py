@@ -0,0 +1,430 @@
+"""
+Panelin Metrics - instrumentación en formato de texto de Prometheus, sin dependencias.
+
+Registro compartido por los servicios FastAPI (panelin_backend, panelin_agent_v2)
+y por los módulos que miden su propio trabajo (carga de KB, herramientas, DB, PDF).
+Cada servicio expone el registro en /metrics con instrument_app().
+
+Tipos:
+- Counter: solo crece (requests, hits, conexiones abiertas)
+- Gauge: sube y baja (requests en curso, conexiones en uso)
+- Histogram: buckets acumulativos + _sum + _count (duraciones en segundos)
+- Colectores: callables evaluados en cada scrape (p. ej. stats() de un cache)
+
+Los nombres de ruta se toman de la plantilla (/api/conversations/{conversation_id}),
+no del path concreto, para que la cardinalidad de labels quede acotada.
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Una familia de muestras: (nombre, tipo, ayuda, [(sufijo, labels, valor)])
+Sample = Tuple[str, Dict[str, str], float]
+Family = Tuple[str, str, str, List[Sample]]
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if value != value:
+        return "NaN"
+    if float(value).is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def labels(self, **labels: Any) -> Any:
+        """Serie hija para estos valores de labels (se crea al primer uso)."""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} espera labels {self.labelnames}, recibió {tuple(labels)}")
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._children[key] = self._new_child()
+        return child
+
+    def _default(self) -> Any:
+        if self.labelnames:
+            raise ValueError(f"{self.name} tiene labels {self.labelnames}: usar .labels(...)")
+        return self.labels()
+
+    def _series(self) -> Iterator[Tuple[Dict[str, str], Any]]:
+        with self._lock:
+            items = list(self._children.items())
+        for key, child in items:
+            yield dict(zip(self.labelnames, key)), child
+
+    def collect(self) -> Family:
+        raise NotImplementedError
+
+
+class _ValueChild:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self.value = value
+
+    @contextmanager
+    def track_inprogress(self) -> Iterator[None]:
+        self.inc()
+        try:
+            yield
+        finally:
+            self.dec()
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def _new_child(self) -> _ValueChild:
+        return _ValueChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError("Un counter no puede decrementarse")
+        self._default().inc(amount)
+
+    def collect(self) -> Family:
+        samples = [("_total", labels, child.value) for labels, child in self._series()]
+        return self.name, self.type_name, self.documentation, samples
+
+
+class Gauge(_Metric):
+    type_name = "gauge"
+
+    def _new_child(self) -> _ValueChild:
+        return _ValueChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default().dec(amount)
+
+    def set(self, value: float) -> None:
+        self._default().set(value)
+
+    def track_inprogress(self):
+        return self._default().track_inprogress()
+
+    def collect(self) -> Family:
+        samples = [("", labels, child.value) for labels, child in self._series()]
+        return self.name, self.type_name, self.documentation, samples
+
+
+class _HistogramChild:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # el último es +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observa la duración (segundos) del bloque, aun si lanza una excepción."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        with self._lock:
+            return list(self.counts), self.sum
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets if b != math.inf))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default().observe(value)
+
+    def time(self):
+        return self._default().time()
+
+    def collect(self) -> Family:
+        samples: List[Sample] = []
+        for labels, child in self._series():
+            counts, total = child.snapshot()
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                samples.append(("_bucket", dict(labels, le=_format_value(bound)), cumulative))
+            samples.append(("_sum", labels, total))
+            samples.append(("_count", labels, cumulative))
+        return self.name, self.type_name, self.documentation, samples
+
+
+class MetricsRegistry:
+    """Conjunto de métricas y colectores que se renderiza en un scrape."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: Dict[str, Callable[[], Iterable[Family]]] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Métrica {metric.name} ya registrada con otra definición")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, key: str, collector: Callable[[], Iterable[Family]]) -> None:
+        """Registra (o reemplaza, por key) un colector evaluado en cada scrape."""
+        with self._lock:
+            self._collectors[key] = collector
+
+    def register_cache(self, cache: str, stats: Callable[[], Optional[Dict[str, Any]]]) -> None:
+        """
+        Expone un cache con stats() estilo QuoteCache (hits, misses, tamaño).
+
+        stats puede retornar None (p. ej. cache aún no creado) y se omite.
+        """
+        def collect() -> Iterable[Family]:
+            values = stats()
+            if not values:
+                return []
+            labels = {"cache": cache}
+            hits = values.get("hits", 0)
+            misses = values.get("misses", 0)
+            lookups = hits + misses
+            size = values.get("size", values.get("entries"))
+            families = [
+                ("panelin_cache_hits", "counter", "Hits de cache", [("_total", labels, hits)]),
+                ("panelin_cache_misses", "counter", "Misses de cache", [("_total", labels, misses)]),
+                ("panelin_cache_hit_ratio", "gauge", "Proporción de hits sobre consultas",
+                 [("", labels, hits / lookups if lookups else 0.0)]),
+            ]
+            if size is not None:
+                families.append(("panelin_cache_entries", "gauge", "Entradas en cache", [("", labels, size)]))
+            if "evictions" in values:
+                families.append(("panelin_cache_evictions", "counter", "Entradas desalojadas",
+                                 [("_total", labels, values["evictions"])]))
+            return families
+
+        self.register_collector(f"cache:{cache}", collect)
+
+    def render(self) -> str:
+        """Todas las métricas en formato de texto de Prometheus (0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors.values())
+
+        families: Dict[str, Family] = {}
+        for metric in metrics:
+            name, kind, doc, samples = metric.collect()
+            families[name] = (name, kind, doc, samples)
+        for collector in collectors:
+            for name, kind, doc, samples in collector():
+                if name in families:
+                    families[name][3].extend(samples)
+                else:
+                    families[name] = (name, kind, doc, list(samples))
+
+        lines: List[str] = []
+        for name, kind, doc, samples in families.values():
+            lines.append(f"# HELP {name} {_escape(doc)}")
+            lines.append(f"# TYPE {name} {kind}")
+            for suffix, labels, value in samples:
+                lines.append(f"{name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# ─── Métricas compartidas ───
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "panelin_http_request_duration_seconds",
+    "Duración de requests HTTP por ruta (hasta el último byte de la respuesta)",
+    ("service", "method", "route", "status"),
+)
+HTTP_IN_FLIGHT = REGISTRY.gauge(
+    "panelin_http_requests_in_flight",
+    "Requests HTTP en curso",
+    ("service", "route"),
+)
+TOOL_CALL_SECONDS = REGISTRY.histogram(
+    "panelin_tool_call_duration_seconds",
+    "Duración de tool calls del agente",
+    ("tool", "status"),
+)
+KB_LOAD_SECONDS = REGISTRY.histogram(
+    "panelin_kb_load_seconds",
+    "Tiempo de carga y compilación de la KB",
+    ("kb",),
+)
+DB_QUERY_SECONDS = REGISTRY.histogram(
+    "panelin_db_operation_duration_seconds",
+    "Duración de operaciones de base de datos (conexión incluida)",
+    ("operation", "status"),
+)
+DB_CONNECTIONS_IN_USE = REGISTRY.gauge(
+    "panelin_db_connections_in_use",
+    "Conexiones a la base de datos abiertas en este momento",
+)
+DB_CONNECTIONS_OPENED = REGISTRY.counter(
+    "panelin_db_connections_opened",
+    "Conexiones a la base de datos abiertas desde el arranque",
+)
+PDF_RENDER_SECONDS = REGISTRY.histogram(
+    "panelin_pdf_render_seconds",
+    "Tiempo de generación de PDFs de cotización",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+
+# ─── Integración ASGI / FastAPI ───
+
+class PrometheusMiddleware:
+    """
+    Middleware ASGI que mide duración e in-flight por ruta.
+
+    ASGI puro (no BaseHTTPMiddleware) para no interferir con respuestas
+    streaming: la duración cubre hasta que termina de enviarse el body.
+    """
+
+    def __init__(self, app: Any, service: str, registry: MetricsRegistry = REGISTRY):
+        self.app = app
+        self.service = service
+        self.registry = registry
+
+    def _route_template(self, scope: Dict[str, Any]) -> str:
+        from starlette.routing import Match
+
+        router = getattr(scope.get("app"), "router", None)
+        for route in getattr(router, "routes", ()):
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return getattr(route, "path", scope["path"])
+        return "unmatched"
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route = self._route_template(scope)
+        status = {"code": 500}
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        in_flight = HTTP_IN_FLIGHT.labels(service=self.service, route=route)
+        start = time.perf_counter()
+        in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
+            HTTP_REQUEST_SECONDS.labels(
+                service=self.service,
+                method=scope["method"],
+                route=route,
+                status=str(status["code"]),
+            ).observe(time.perf_counter() - start)
+
+
+def instrument_app(app: Any, service: str, path: str = "/metrics", registry: MetricsRegistry = REGISTRY) -> None:
+    """
+    Agrega el middleware de métricas y la ruta GET {path} a una app FastAPI.
+
+    Llamar al construir la app (antes del primer request).
+    """
+    from fastapi.responses import Response
+
+    async def metrics_endpoint() -> Response:
+        return Response(registry.render(), media_type=CONTENT_TYPE)
+
+    app.add_middleware(PrometheusMiddleware, service=service, registry=registry)
+    app.add_api_route(path, metrics_endpoint, methods=["GET"], include_in_schema=False)
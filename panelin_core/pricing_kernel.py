@@ -0,0 +1,117 @@
+"""
+Panelin Pricing Kernel - KB de precios compilada por versión de archivo.
+
+Núcleo compartido por todos los calculadores de cotización:
+- panelin/tools/quotation_calculator.py
+- panelin_agent_v2/tools/quotation_calculator.py
+- panelin_core/quotation_calculator.py
+- panelin_hybrid_agent/tools/pricing_rules.py
+
+La KB se carga y sus precios se convierten a Decimal una sola vez por versión
+del archivo (mtime_ns, size), en lugar de un json.load por cotización. La
+aritmética sigue en cada calculador con decimal.Decimal (Decimal(str(x)) para
+las entradas, quantize ROUND_HALF_UP a centavos).
+"""
+
+import json
+import os
+import threading
+import time
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from panelin_core.metrics import KB_LOAD_SECONDS, REGISTRY
+
+
+# ─── KB compilada por versión de archivo ───
+
+class CompiledKB:
+    """
+    KB cargada con sus precios precompilados a Decimal.
+
+    `catalog` es el JSON tal cual se cargó y se comparte entre llamadas:
+    tratarlo como solo lectura.
+    """
+
+    def __init__(self, catalog: Dict[str, Any], price_fields: Tuple[str, ...] = ("price_per_m2",)):
+        self.catalog = catalog
+        self.price_fields = price_fields
+        self._prices: Dict[Tuple[str, str], Decimal] = {}
+        self._derived: Dict[str, Any] = {}
+        self._derived_lock = threading.Lock()
+        products = catalog.get("products", {})
+        if not isinstance(products, dict):
+            return
+        for key, product in products.items():
+            if not isinstance(product, dict):
+                continue
+            for field in price_fields:
+                value = product.get(field)
+                if value is None or isinstance(value, bool):
+                    continue
+                try:
+                    self._prices[(key, field)] = Decimal(str(value))
+                except (ValueError, ArithmeticError):
+                    continue
+
+    def price(self, key: str, field: str = "price_per_m2") -> Optional[Decimal]:
+        """Precio compilado de un producto, o None si no tiene ese campo."""
+        return self._prices.get((key, field))
+
+    def derived(self, name: str, builder: Callable[[Dict[str, Any]], Any]) -> Any:
+        """
+        Estructura derivada del catálogo, construida una vez por versión de KB.
+
+        builder recibe el catálogo; el resultado se reutiliza hasta que
+        load_compiled_kb recompile la KB.
+        """
+        value = self._derived.get(name)
+        if value is None:
+            with self._derived_lock:
+                value = self._derived.get(name)
+                if value is None:
+                    value = self._derived[name] = builder(self.catalog)
+        return value
+
+
+_compiled: Dict[Tuple[str, Tuple[str, ...]], Tuple[Tuple[int, int], CompiledKB]] = {}
+_compiled_lock = threading.Lock()
+_compiled_stats = {"hits": 0, "misses": 0}
+
+
+def load_compiled_kb(kb_path: Any, price_fields: Tuple[str, ...] = ("price_per_m2",)) -> CompiledKB:
+    """
+    Carga y compila la KB, reutilizándola mientras el archivo no cambie.
+
+    La versión se determina por (mtime_ns, size) del archivo; cualquier
+    escritura (webhooks, correcciones) fuerza una recompilación.
+
+    Raises:
+        FileNotFoundError: Si el archivo no existe
+    """
+    path = os.fspath(kb_path)
+    stat = os.stat(path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    cache_key = (path, tuple(price_fields))
+    with _compiled_lock:
+        cached = _compiled.get(cache_key)
+        hit = cached is not None and cached[0] == version
+        _compiled_stats["hits" if hit else "misses"] += 1
+    if hit:
+        return cached[1]
+    start = time.perf_counter()
+    with open(path, "r", encoding="utf-8") as f:
+        compiled = CompiledKB(json.load(f), tuple(price_fields))
+    KB_LOAD_SECONDS.labels(kb=os.path.basename(path)).observe(time.perf_counter() - start)
+    with _compiled_lock:
+        _compiled[cache_key] = (version, compiled)
+    return compiled
+
+
+def compiled_kb_stats() -> Dict[str, int]:
+    """Hits/misses del cache de KB compiladas y cantidad de KBs retenidas."""
+    with _compiled_lock:
+        return dict(_compiled_stats, size=len(_compiled))
+
+
+REGISTRY.register_cache("compiled_kb", compiled_kb_stats)
@@ -4,6 +4,8 @@ import json
 import os
 import math
 
+from panelin_core.pricing_kernel import load_compiled_kb
+
 class QuotationResult(TypedDict):
     product_id: str
     product_name: str
@@ -38,8 +40,10 @@ def calculate_panel_quote(
     Cálculo DETERMINISTA de cotización.
     El LLM NUNCA ejecuta esta matemática—solo extrae parámetros.
     """
-    catalog = _load_catalog()
-    products = catalog['products']
+    if not os.path.exists(KB_PATH):
+        raise FileNotFoundError(f"Knowledge Base not found at {KB_PATH}")
+    compiled = load_compiled_kb(KB_PATH)
+    products = compiled.catalog['products']
     
     # Construct product key (handling variations in naming convention if necessary)
     # The KB uses keys like "Isodec_EPS_100mm", "Isopanel_EPS_50mm", "Isoroof_3G_30mm"
@@ -117,28 +121,14 @@ def calculate_panel_quote(
     d_length = Decimal(str(length_m))
     d_width = Decimal(str(width_m))
     d_qty = Decimal(str(quantity))
-    d_price = Decimal(str(product_data['price_per_m2']))
+    d_price = compiled.price(selected_key)
+    if d_price is None:
+        d_price = Decimal(str(product_data['price_per_m2']))
     d_discount_pct = Decimal(str(discount_percent))
     
     # Area calculation
-    # Some panels use fixed width (ancho_util) for pricing per m2, but user might provide width to indicate coverage?
-    # Usually panels are sold by module width.
-    # If width_m is provided, we check if it matches the standard width or if we calculate coverage.
-    # For pricing, usually it's Length * Standard Width * Quantity * Price/m2
-    # OR if the user provides total m2. 
-    # The prompt implies calculating from dimensions: area = length * width.
-    # However, panels have fixed width. If user says "width 1.0", but panel is 1.12, we quote the panel width.
-    # But strictly following prompt's code: area = length * width. 
-    # I will stick to the prompt's logic: area = length * width. 
-    # BUT I should probably use the product's 'ancho_util_m' if the user input width is just a placeholder or if we want to be precise about what is sold.
-    # Re-reading prompt code: `area = Decimal(str(length_m)) * Decimal(str(width_m))`
-    # This implies the user specifies the width of the piece they want, or maybe it's custom cutting?
-    # Standard panels come in fixed widths.
-    # I'll modify slightly to use the product's standardized width if the user input seems to be "count" based, 
-    # but the prompt signature explicitly asks for `width_m`. 
-    # If I blindly multiply, I might get weird areas. 
-    # Let's assume the prompt's logic is correct for this specific requirement (maybe custom cuts or just generic area calc).
-    
+    # Panels are sold by module width, but pricing follows the requested
+    # dimensions: area = length * width.
     area_per_unit = d_length * d_width
     total_area = area_per_unit * d_qty
     
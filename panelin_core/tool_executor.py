@@ -0,0 +1,247 @@
+"""
+Panelin Tool Executor - ejecución concurrente de tool calls independientes.
+
+Cuando el modelo pide varias herramientas en un mismo turno (precio de paneles,
+de accesorios, disponibilidad), ninguna puede depender del resultado de otra:
+el modelo las emitió sin ver ningún resultado. Las lecturas (lookups, cálculos)
+se ejecutan entonces en paralelo sobre un pool de hilos acotado; solo las
+herramientas declaradas como serie (escrituras a la KB, sincronizaciones)
+actúan como barrera y corren solas, en el orden en que llegaron.
+
+Garantías:
+- Los resultados se devuelven en el mismo orden que las llamadas.
+- Cada herramienta tiene su timeout, contado desde que empieza a ejecutarse
+  (no desde que entra en la cola del pool). La espera por un hilo libre
+  también está acotada por ese timeout: si se excede, la llamada se reporta
+  como timeout. Un timeout o una excepción se reportan como error de esa
+  llamada; el resto del lote sigue.
+- Un hilo que excede su timeout no se puede interrumpir: su resultado se
+  descarta cuando termine. El pool donde quedó colgado se retira (sin
+  esperarlo) y las llamadas que seguían en cola pasan a un pool nuevo, así
+  los hilos colgados nunca bloquean lotes posteriores.
+
+Usado por los nodos de herramientas de:
+- panelin/agent/hybrid_agent.py
+- panelin_agent_v2/agent/panelin_agent.py
+"""
+
+import contextvars
+import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Set
+
+from panelin_core.metrics import TOOL_CALL_SECONDS
+from panelin_core.tracing import span
+
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_TIMEOUT_S = 30.0
+
+# Cada cuánto se revisan llamadas que todavía esperan un hilo libre
+_POLL_S = 0.01
+
+
+@dataclass
+class ToolOutcome:
+    """Resultado de una tool call."""
+    call_id: Optional[str]
+    name: str
+    output: Any = None
+    error: Optional[str] = None
+    elapsed_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def content(self) -> str:
+        """Contenido para un ToolMessage: el output (JSON si no es str) o el error."""
+        if self.error is not None:
+            return json.dumps({"error": self.error}, ensure_ascii=False)
+        if isinstance(self.output, str):
+            return self.output
+        return json.dumps(self.output, ensure_ascii=False, default=str)
+
+
+class ToolExecutor:
+    """
+    Ejecuta lotes de tool calls ({"name", "args", "id"}) sobre un pool acotado.
+
+    Example:
+        >>> executor = ToolExecutor({"get_price": lambda args: {"usd": 46.07}})
+        >>> [o.output for o in executor.run([{"name": "get_price", "args": {}, "id": "1"}])]
+        [{'usd': 46.07}]
+    """
+
+    def __init__(
+        self,
+        tools: Mapping[str, Callable[[Dict[str, Any]], Any]],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        timeout_s: float = DEFAULT_TIMEOUT_S,
+        timeouts: Optional[Mapping[str, float]] = None,
+        serial_tools: Iterable[str] = (),
+    ):
+        """
+        Args:
+            tools: Nombre -> callable que recibe el dict de argumentos
+            max_workers: Máximo de herramientas ejecutándose a la vez
+            timeout_s: Timeout por defecto de cada llamada
+            timeouts: Timeouts por herramienta (sobrescriben timeout_s)
+            serial_tools: Herramientas con efectos que no deben solaparse con otras
+        """
+        self.tools = dict(tools)
+        self.max_workers = max_workers
+        self.timeout_s = timeout_s
+        self.timeouts = dict(timeouts or {})
+        self.serial_tools: Set[str] = set(serial_tools)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    @classmethod
+    def from_langchain_tools(cls, tools: Iterable[Any], **kwargs) -> "ToolExecutor":
+        """Construye el executor desde herramientas LangChain (.name / .invoke)."""
+        return cls({t.name: t.invoke for t in tools}, **kwargs)
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="panelin-tool"
+                )
+            return self._pool
+
+    def _retire_pool(self, pool: ThreadPoolExecutor) -> None:
+        """Deja de usar un pool con hilos colgados; el próximo _get_pool crea otro."""
+        with self._pool_lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False)
+
+    def shutdown(self) -> None:
+        """Libera el pool (sin esperar llamadas que excedieron su timeout)."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def timeout_for(self, name: str) -> float:
+        return self.timeouts.get(name, self.timeout_s)
+
+    def waves(self, calls: List[Dict[str, Any]]) -> List[List[int]]:
+        """
+        Agrupa las llamadas en tandas que pueden ejecutarse en paralelo.
+
+        Las lecturas consecutivas forman una tanda; cada herramienta serie
+        forma una tanda propia.
+        """
+        waves: List[List[int]] = []
+        current: List[int] = []
+        for index, call in enumerate(calls):
+            if call["name"] in self.serial_tools:
+                if current:
+                    waves.append(current)
+                    current = []
+                waves.append([index])
+            else:
+                current.append(index)
+        if current:
+            waves.append(current)
+        return waves
+
+    def run(self, calls: List[Dict[str, Any]]) -> List[ToolOutcome]:
+        """Ejecuta el lote y retorna un ToolOutcome por llamada, en el mismo orden."""
+        outcomes: List[Optional[ToolOutcome]] = [None] * len(calls)
+        for wave in self.waves(calls):
+            for index, outcome in self._run_wave(wave, calls).items():
+                outcomes[index] = outcome
+        for outcome in outcomes:
+            TOOL_CALL_SECONDS.labels(
+                tool=outcome.name, status="ok" if outcome.ok else "error"
+            ).observe(outcome.elapsed_ms / 1000)
+        return outcomes  # type: ignore[return-value]
+
+    def _invoke(self, call: Dict[str, Any], started: Dict[int, float], index: int) -> Any:
+        started[index] = time.monotonic()
+        tool = self.tools.get(call["name"])
+        if tool is None:
+            raise KeyError(f"Herramienta desconocida: {call['name']}")
+        with span("tool_call", tool=call["name"]):
+            return tool(call.get("args") or {})
+
+    def _submit(self, pool: ThreadPoolExecutor, call: Dict[str, Any], started: Dict[int, float], index: int) -> Future:
+        # Cada llamada corre en una copia del contexto: los spans de tracing
+        # de la herramienta quedan bajo el span del turno
+        return pool.submit(contextvars.copy_context().run, self._invoke, call, started, index)
+
+    def _run_wave(self, wave: List[int], calls: List[Dict[str, Any]]) -> Dict[int, ToolOutcome]:
+        pool = self._get_pool()
+        started: Dict[int, float] = {}
+        submitted = time.monotonic()
+        futures: Dict[Future, int] = {
+            self._submit(pool, calls[index], started, index): index for index in wave
+        }
+        results: Dict[int, ToolOutcome] = {}
+        pending = set(futures)
+
+        def deadline(future: Future) -> float:
+            index = futures[future]
+            return started.get(index, submitted) + self.timeout_for(calls[index]["name"])
+
+        while pending:
+            now = time.monotonic()
+            waiting = any(futures[f] not in started for f in pending)
+            timeout = max(0.0, min(deadline(f) for f in pending) - now)
+            if waiting:
+                timeout = min(timeout, _POLL_S)
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                index = futures[future]
+                call = calls[index]
+                elapsed = (time.monotonic() - started.get(index, now)) * 1000
+                error = future.exception()
+                results[index] = ToolOutcome(
+                    call_id=call.get("id"),
+                    name=call["name"],
+                    output=None if error else future.result(),
+                    error=f"{type(error).__name__}: {error}" if error else None,
+                    elapsed_ms=elapsed,
+                )
+
+            now = time.monotonic()
+            hung = False
+            for future in list(pending):
+                if now < deadline(future):
+                    continue
+                index = futures[future]
+                call = calls[index]
+                limit = self.timeout_for(call["name"])
+                pending.discard(future)
+                if index in started:
+                    hung = True
+                    reason = f"Timeout: {call['name']} excedió {limit}s"
+                    elapsed_ms = (now - started[index]) * 1000
+                else:
+                    future.cancel()
+                    reason = f"Timeout: {call['name']} esperó {limit}s un hilo libre"
+                    elapsed_ms = (now - submitted) * 1000
+                results[index] = ToolOutcome(
+                    call_id=call.get("id"), name=call["name"], error=reason, elapsed_ms=elapsed_ms
+                )
+
+            if hung:
+                # El hilo colgado sigue ocupando su lugar: las llamadas en cola
+                # pasan a un pool nuevo en vez de esperar detrás de él
+                self._retire_pool(pool)
+                pool = self._get_pool()
+                for future in list(pending):
+                    index = futures[future]
+                    if index not in started and future.cancel():
+                        pending.discard(future)
+                        moved = self._submit(pool, calls[index], started, index)
+                        futures[moved] = index
+                        pending.add(moved)
+        return results
@@ -0,0 +1,363 @@
+"""
+Panelin Tracing - spans de tiempo anidados y perfilado muestreado (opt-in).
+
+Responde "¿en qué se fueron los segundos de esta cotización?": carga de KB,
+extracción con regex, llamada al LLM, herramientas o PDF. Las funciones
+instrumentadas (`@traced`) y los bloques `with span(...)` forman un árbol por
+cada llamada raíz (p.ej. PanelinHybridAgent.run); los árboles terminados
+quedan en un buffer acotado (recent_traces).
+
+Desactivado por defecto. Con el tracing apagado, un `@traced` cuesta una
+lectura de global y una llamada extra (ver benchmarks/bench_tracing.py).
+
+Activación:
+- Código: configure(enabled=True, profile_sample_rate=0.1, profile_dir="...")
+  o el context manager tracing(...) (tests, benchmarks).
+- Entorno: PANELIN_TRACE=1, PANELIN_PROFILE_SAMPLE_RATE=0.1,
+  PANELIN_PROFILE_DIR=/tmp/panelin_profiles
+
+Perfilado: una fracción de las trazas raíz corre bajo cProfile; el perfil se
+escribe como collapsed stacks (`frame;frame;frame <µs>`), el formato de
+entrada de flamegraph.pl y speedscope. cProfile observa solo el hilo de la
+raíz: las herramientas que ToolExecutor corre en su pool aparecen como spans
+pero no en el perfil.
+
+El contexto de span viaja en un ContextVar, así que el anidamiento es correcto
+en asyncio y en los hilos que copian el contexto (ToolExecutor lo hace).
+"""
+
+import contextlib
+import contextvars
+import cProfile
+import functools
+import inspect
+import logging
+import os
+import pstats
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Cotas de memoria: un barrido del optimizador puede abrir miles de spans
+MAX_SPAN_CHILDREN = 256
+MAX_TRACES = 100
+MAX_PROFILE_DEPTH = 64
+
+_enabled = False
+_profile_sample_rate = 0.0
+_profile_dir: Optional[Path] = None
+_random: Callable[[], float] = random.random
+
+_current: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("panelin_span", default=None)
+_traces: Deque["Span"] = deque(maxlen=MAX_TRACES)
+_traces_lock = threading.Lock()
+
+
+class Span:
+    """Un intervalo con nombre, atributos e hijos."""
+
+    __slots__ = ("name", "attrs", "start", "duration", "children", "dropped_children",
+                 "profile", "profile_path")
+
+    def __init__(self, name: str, attrs: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.attrs = attrs or {}
+        self.start = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.children: List["Span"] = []
+        self.dropped_children = 0
+        self.profile: Optional[List[str]] = None  # collapsed stacks si se perfiló
+        self.profile_path: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.duration or 0.0) * 1000
+
+    @property
+    def self_ms(self) -> float:
+        """Tiempo propio: duración menos la de los hijos registrados."""
+        return max(0.0, self.duration_ms - sum(child.duration_ms for child in self.children))
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            "name": self.name,
+            "duration_ms": round(self.duration_ms, 3),
+            "self_ms": round(self.self_ms, 3),
+        }
+        if self.attrs:
+            data["attrs"] = dict(self.attrs)
+        if self.children:
+            data["children"] = [child.to_dict() for child in self.children]
+        if self.dropped_children:
+            data["dropped_children"] = self.dropped_children
+        if self.profile_path:
+            data["profile_path"] = self.profile_path
+        return data
+
+
+class _NullSpan:
+    """Context manager sin efecto que se retorna con el tracing apagado."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _SpanContext:
+    __slots__ = ("span", "token", "is_root", "profiler")
+
+    def __init__(self, name: str, attrs: Dict[str, Any]):
+        self.span = Span(name, attrs)
+        self.token = None
+        self.is_root = False
+        self.profiler: Optional[cProfile.Profile] = None
+
+    def __enter__(self) -> Span:
+        parent = _current.get()
+        self.is_root = parent is None
+        if parent is not None:
+            if len(parent.children) < MAX_SPAN_CHILDREN:
+                parent.children.append(self.span)
+            else:
+                parent.dropped_children += 1
+        elif _profile_sample_rate and _random() < _profile_sample_rate:
+            self.profiler = _start_profiler()
+        self.token = _current.set(self.span)
+        self.span.start = time.perf_counter()
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        span = self.span
+        span.duration = time.perf_counter() - span.start
+        if exc_type is not None:
+            span.attrs["error"] = exc_type.__name__
+        _current.reset(self.token)
+        if self.is_root:
+            _finish_root(span, self.profiler)
+        return False
+
+
+def span(name: str, **attrs: Any):
+    """
+    Abre un span hijo del span actual (o una traza raíz si no hay ninguno).
+
+    Example:
+        >>> with span("kb.load", path="bom_rules.json"):
+        ...     data = json.load(f)
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _SpanContext(name, attrs)
+
+
+def traced(name: Optional[str] = None, **attrs: Any) -> Callable:
+    """
+    Decorador: cada llamada a la función es un span (sync o async).
+
+    Args:
+        name: Nombre del span (por defecto módulo.función)
+        attrs: Atributos fijos del span
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not _enabled:
+                    return await func(*args, **kwargs)
+                with _SpanContext(span_name, dict(attrs)):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _SpanContext(span_name, dict(attrs)):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def current_span() -> Optional[Span]:
+    """Span abierto en el contexto actual, o None."""
+    return _current.get() if _enabled else None
+
+
+# ── Configuración ────────────────────────────────────────────────────────────
+
+def configure(
+    enabled: bool = True,
+    profile_sample_rate: float = 0.0,
+    profile_dir: Optional[os.PathLike] = None,
+    rng: Optional[Callable[[], float]] = None,
+) -> None:
+    """
+    Activa/desactiva el tracing.
+
+    Args:
+        enabled: Registrar spans
+        profile_sample_rate: Fracción (0-1) de trazas raíz que corren bajo cProfile
+        profile_dir: Directorio donde escribir los .collapsed (sin él, el
+                     perfil queda solo en Span.profile de la traza raíz)
+        rng: Fuente de aleatoriedad del muestreo (tests)
+    """
+    global _enabled, _profile_sample_rate, _profile_dir, _random
+    if not 0.0 <= profile_sample_rate <= 1.0:
+        raise ValueError(f"profile_sample_rate fuera de rango (0-1): {profile_sample_rate}")
+    _enabled = enabled
+    _profile_sample_rate = profile_sample_rate if enabled else 0.0
+    _profile_dir = Path(profile_dir) if profile_dir else None
+    _random = rng or random.random
+
+
+def disable() -> None:
+    """Apaga tracing y perfilado."""
+    configure(enabled=False)
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+@contextlib.contextmanager
+def tracing(profile_sample_rate: float = 0.0, profile_dir: Optional[os.PathLike] = None,
+            rng: Optional[Callable[[], float]] = None) -> Iterator[None]:
+    """Activa el tracing dentro del bloque y restaura la configuración previa."""
+    previous = (_enabled, _profile_sample_rate, _profile_dir, _random)
+    configure(True, profile_sample_rate, profile_dir, rng)
+    try:
+        yield
+    finally:
+        configure(previous[0], previous[1], previous[2], previous[3])
+
+
+def configure_from_env() -> None:
+    """Configura según PANELIN_TRACE / PANELIN_PROFILE_SAMPLE_RATE / PANELIN_PROFILE_DIR."""
+    if os.getenv("PANELIN_TRACE", "").lower() not in ("1", "true", "yes"):
+        return
+    try:
+        rate = float(os.getenv("PANELIN_PROFILE_SAMPLE_RATE", "0"))
+    except ValueError:
+        logger.warning("PANELIN_PROFILE_SAMPLE_RATE inválido, perfilado desactivado")
+        rate = 0.0
+    configure(True, min(max(rate, 0.0), 1.0), os.getenv("PANELIN_PROFILE_DIR") or None)
+
+
+# ── Trazas terminadas ────────────────────────────────────────────────────────
+
+def recent_traces() -> List[Span]:
+    """Últimas MAX_TRACES trazas raíz terminadas (la más reciente al final)."""
+    with _traces_lock:
+        return list(_traces)
+
+
+def clear_traces() -> None:
+    with _traces_lock:
+        _traces.clear()
+
+
+def collapsed_spans(root: Span) -> List[str]:
+    """Árbol de spans como collapsed stacks de tiempo propio (µs)."""
+    lines: List[str] = []
+
+    def walk(node: Span, prefix: str) -> None:
+        path = f"{prefix};{node.name}" if prefix else node.name
+        self_us = int(node.self_ms * 1000)
+        if self_us > 0:
+            lines.append(f"{path} {self_us}")
+        for child in node.children:
+            walk(child, path)
+
+    walk(root, "")
+    return lines
+
+
+def _finish_root(root: Span, profiler: Optional[cProfile.Profile]) -> None:
+    if profiler is not None:
+        profiler.disable()
+        lines = root.profile = profile_to_collapsed(profiler, prefix=root.name)
+        if _profile_dir is not None:
+            try:
+                _profile_dir.mkdir(parents=True, exist_ok=True)
+                path = _profile_dir / f"{root.name}-{int(time.time() * 1000)}-{id(root):x}.collapsed"
+                path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+                root.profile_path = str(path)
+            except OSError as e:
+                logger.warning(f"No se pudo escribir el perfil de {root.name}: {e}")
+    with _traces_lock:
+        _traces.append(root)
+    logger.debug("trace %s %.1fms", root.name, root.duration_ms)
+
+
+# ── Perfilado ────────────────────────────────────────────────────────────────
+
+def _start_profiler() -> Optional[cProfile.Profile]:
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Otro profiler ya activo (p.ej. una traza raíz en otro hilo en 3.12+)
+        return None
+    return profiler
+
+
+def _frame_label(func) -> str:
+    filename, line, name = func
+    if filename == "~":
+        return name.replace(";", ",")
+    return f"{name} ({os.path.basename(filename)}:{line})".replace(";", ",")
+
+
+def profile_to_collapsed(profiler: cProfile.Profile, prefix: Optional[str] = None) -> List[str]:
+    """
+    Convierte un perfil de cProfile en collapsed stacks (µs de tiempo propio).
+
+    cProfile solo guarda aristas caller->callee, no pilas completas: el tiempo
+    de cada función se reparte entre sus caminos en proporción al tiempo
+    acumulado de cada arista (la misma aproximación de flameprof/gprof2dot).
+    """
+    stats = pstats.Stats(profiler).stats  # func -> (cc, nc, tt, ct, callers)
+    children: Dict[Any, Dict[Any, float]] = defaultdict(dict)
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            children[caller][func] = edge[3]
+    roots = [func for func, entry in stats.items() if not entry[4]]
+
+    totals: Dict[str, float] = defaultdict(float)
+
+    def walk(func, stack: List[str], on_path: set, inclusive: float) -> None:
+        _, _, tt, ct, _ = stats[func]
+        fraction = inclusive / ct if ct else 0.0
+        stack.append(_frame_label(func))
+        on_path.add(func)
+        if tt * fraction > 0:
+            totals[";".join(stack)] += tt * fraction
+        if len(stack) < MAX_PROFILE_DEPTH:
+            for child, edge_ct in children.get(func, {}).items():
+                if child not in on_path:
+                    walk(child, stack, on_path, edge_ct * fraction)
+        on_path.discard(func)
+        stack.pop()
+
+    for root in roots:
+        walk(root, [prefix] if prefix else [], set(), stats[root][3])
+
+    return [f"{stack} {int(seconds * 1e6)}" for stack, seconds in totals.items() if seconds >= 1e-6]
+
+
+configure_from_env()
@@ -30,6 +30,7 @@ from ..tools.pricing_rules import (
     calculate_delivery_cost,
     get_minimum_order_value,
     calculate_tax,
+    price_cart,
 )
 
 from .tool_definitions import SYSTEM_PROMPT, get_tool_definitions
@@ -46,6 +47,7 @@ TOOL_REGISTRY = {
     "get_catalog_summary": get_catalog_summary,
     "apply_bulk_pricing": apply_bulk_pricing,
     "calculate_delivery_cost": calculate_delivery_cost,
+    "price_cart": price_cart,
 }
 
 
@@ -279,6 +279,49 @@ Usar cuando el cliente pregunta por flete o entrega.""",
             "required": ["total_area_m2"]
         }
     },
+    {
+        "name": "price_cart",
+        "description": """Aplica precios por volumen a todas las líneas de un pedido en una sola llamada.
+Usar cuando el cliente pide varios productos juntos; opcionalmente suma el envío sobre el área total.""",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "lines": {
+                    "type": "array",
+                    "description": "Líneas del pedido",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "total_area_m2": {
+                                "type": "number",
+                                "description": "Área de la línea en m²"
+                            },
+                            "base_price_per_m2": {
+                                "type": "number",
+                                "description": "Precio base por m²"
+                            },
+                            "product_type": {
+                                "type": "string",
+                                "description": "Tipo de producto (opcional)"
+                            }
+                        },
+                        "required": ["total_area_m2", "base_price_per_m2"]
+                    }
+                },
+                "destination_zone": {
+                    "type": "string",
+                    "enum": ["montevideo", "canelones", "interior", "exterior"],
+                    "description": "Zona de envío (omitir si no hay envío)"
+                },
+                "product_weight_kg_per_m2": {
+                    "type": "number",
+                    "default": 12.0,
+                    "description": "Peso por m² (típico 10-15 kg/m²)"
+                }
+            },
+            "required": ["lines"]
+        }
+    },
     {
         "name": "get_catalog_summary",
         "description": """Obtiene un resumen del catálogo disponible.
@@ -325,6 +368,7 @@ Tienes herramientas deterministas para TODOS los cálculos. NUNCA hagas matemát
 - Para cantidades: usa calculate_fixation_points
 - Para descuentos: usa apply_bulk_pricing
 - Para fletes: usa calculate_delivery_cost
+- Para pedidos con varias líneas: usa price_cart
 
 ## Tu Rol
 1. Entender qué necesita el cliente (techo, pared, cámara fría, etc.)
@@ -0,0 +1,164 @@
+"""
+Test Cases for Monitoring
+=========================
+
+Tests for latency histograms, sliding-window rates and the fixed-memory
+guarantees of QuotationMonitor.
+"""
+
+import logging
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from panelin_hybrid_agent.validation import monitoring
+from panelin_hybrid_agent.validation.monitoring import (
+    LatencyHistogram,
+    QuotationMonitor,
+    SlidingWindowCounter,
+)
+
+
+VERIFIED = {"calculation_verified": True}
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def quiet_logger():
+    """Per-event INFO logs would dominate the stress test"""
+    previous = monitoring.logger.level
+    monitoring.logger.setLevel(logging.WARNING)
+    yield
+    monitoring.logger.setLevel(previous)
+
+
+class TestLatencyHistogram:
+    """Test log-linear bucket percentiles"""
+
+    def test_percentiles_within_bucket_error(self):
+        rng = random.Random(7)
+        values = sorted(rng.lognormvariate(3, 1) for _ in range(50_000))
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+
+        for q in (50, 90, 99):
+            exact = values[int(q / 100 * len(values)) - 1]
+            assert histogram.percentile(q) == pytest.approx(exact, rel=0.07)
+
+    def test_small_values_are_exact_to_the_microsecond(self):
+        histogram = LatencyHistogram()
+        for value in (0.001, 0.002, 0.003, 0.004):
+            histogram.record(value)
+        assert histogram.percentile(50) == pytest.approx(0.002)
+        assert histogram.percentile(100) == pytest.approx(0.004)
+
+    def test_empty_and_overflow(self):
+        histogram = LatencyHistogram()
+        assert histogram.percentile(99) is None
+        histogram.record(10 ** 9)
+        assert histogram.percentile(99) == 10 ** 9
+
+
+class TestSlidingWindow:
+    """Test sliding-window rates"""
+
+    def test_old_slots_fall_out_of_the_window(self):
+        counter = SlidingWindowCounter(window_seconds=60)
+        counter.add(100.0, 30)
+        counter.add(130.0, 30)
+        assert counter.total(130.0) == 60
+        assert counter.rate(130.0) == 1.0
+        assert counter.total(170.0) == 30
+        assert counter.total(200.0) == 0
+        assert counter.total(130.5, window_seconds=10) == 30
+
+
+class TestQuotationMonitor:
+    """Test the monitor summary"""
+
+    def test_average_latency_is_per_response(self):
+        monitor = QuotationMonitor()
+        for _ in range(4):
+            monitor.log_request("cotizar")
+        monitor.log_response("ok", 100.0)
+        monitor.log_response("ok", 300.0)
+        assert monitor.get_summary()["average_latency_ms"] == 200.0
+
+    def test_per_tool_percentiles_and_rates(self):
+        clock = FakeClock()
+        monitor = QuotationMonitor(clock=clock)
+        for latency in range(1, 101):
+            monitor.log_tool_call("calculate_panel_quote", {}, VERIFIED, float(latency))
+            monitor.log_tool_call("lookup_product", {}, VERIFIED, 2.0)
+
+        assert monitor.percentile(50, "calculate_panel_quote") == pytest.approx(50, rel=0.07)
+        assert monitor.percentile(99, "calculate_panel_quote") == pytest.approx(99, rel=0.07)
+        assert monitor.percentile(99, "lookup_product") == 2.0
+        assert monitor.percentile(50, "unknown") is None
+
+        summary = monitor.get_summary()
+        assert summary["tool_latency"]["lookup_product"]["count"] == 100
+        assert summary["rates_per_s"]["tool_call"] == pytest.approx(200 / 60, rel=1e-3)
+        clock.now += 61
+        assert monitor.rate("tool_call") == 0.0
+
+    def test_tool_names_are_capped(self):
+        monitor = QuotationMonitor()
+        for i in range(monitoring.MAX_TRACKED_TOOLS + 10):
+            monitor.log_tool_call(f"tool_{i}", {}, VERIFIED, 1.0)
+        assert len(monitor.tool_latency) == monitoring.MAX_TRACKED_TOOLS + 1
+        assert monitor.tool_latency["_other"].count == 10
+
+
+class TestFixedMemory:
+    """Million-event stress test: memory and per-event cost stay flat"""
+
+    def test_million_events(self):
+        monitor = QuotationMonitor(max_events=1000)
+        tool_result = {"calculation_verified": True, "total_usd": 1234.56}
+        batch = 100_000
+        timings = []
+
+        def log_batch():
+            start = time.perf_counter()
+            for i in range(batch // 4):
+                monitor.log_request("cotizar isodec 100mm 6x4")
+                monitor.log_tool_call("calculate_panel_quote", {"i": i}, tool_result, 1.0 + i % 50)
+                monitor.log_tool_call("lookup_product", {"i": i}, tool_result, 0.2)
+                monitor.log_response("Total USD 1234.56", 20.0 + i % 200)
+            timings.append(time.perf_counter() - start)
+
+        for _ in range(6):
+            log_batch()
+        tracemalloc.start()  # traced batches are slower: not part of timings
+        try:
+            log_batch()
+            after_warmup, _ = tracemalloc.get_traced_memory()
+            log_batch()
+            log_batch()
+            after_stress, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        timings[6:] = []
+        log_batch()
+
+        summary = monitor.get_summary()
+        assert summary["total_tool_calls"] + summary["total_requests"] + summary["total_responses"] == 10 * batch
+        assert len(monitor.events) == 1000
+        # Events 700k..900k retained no memory beyond noise
+        assert after_stress - after_warmup < 64 * 1024
+        assert timings[-1] < 2 * timings[0]
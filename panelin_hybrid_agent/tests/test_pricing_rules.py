@@ -0,0 +1,117 @@
+"""
+Test Cases for Compiled Pricing Rules
+=====================================
+
+Tier selection by bisection must match the original first-match linear scan,
+and the cart API must price every line exactly like apply_bulk_pricing.
+"""
+
+import json
+import random
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from panelin_hybrid_agent.tools import pricing_rules
+from panelin_hybrid_agent.tools.pricing_rules import (
+    _CompiledRules,
+    apply_bulk_pricing,
+    calculate_delivery_cost,
+    price_cart,
+)
+
+
+def _linear_tier(tiers, area):
+    """Original lookup: first tier with min <= area < max"""
+    for rule in tiers:
+        if rule["min_m2"] <= area < rule.get("max_m2", float("inf")):
+            return rule
+    return None
+
+
+class TestTierSelection:
+    """Bisect over compiled thresholds == linear first match"""
+
+    def test_kb_tiers_boundaries(self):
+        rules = _CompiledRules(pricing_rules.load_compiled_kb(pricing_rules.KB_PATH).catalog)
+        assert rules.tier_for(9.99)[1] == -5
+        assert rules.tier_for(10)[1] == 0
+        assert rules.tier_for(100)[1] == 5
+        assert rules.tier_for(999999) is None
+        assert rules.tier_for(-1) is None
+
+    def test_overlapping_unsorted_tiers(self):
+        rnd = random.Random(11)
+        for _ in range(200):
+            tiers = []
+            for _ in range(rnd.randint(1, 8)):
+                low = rnd.choice([0, 5, 10, 50, rnd.uniform(0, 100)])
+                tier = {"min_m2": low, "discount": rnd.randint(-5, 10)}
+                if rnd.random() < 0.8:
+                    tier["max_m2"] = low + rnd.choice([0, 10, rnd.uniform(0, 100)])
+                tiers.append(tier)
+            rules = _CompiledRules({"pricing_rules": {"bulk_discounts": {"tiers": tiers}}})
+            for _ in range(100):
+                area = rnd.choice([rnd.uniform(-10, 250), float(rnd.choice([0, 5, 10, 50]))])
+                found = rules.tier_for(area)
+                assert (found[0] if found else None) is _linear_tier(tiers, area)
+
+    def test_defaults_without_pricing_rules(self):
+        rules = _CompiledRules({})
+        assert rules.tier_for(5)[1] == -5
+        assert rules.tier_for(1e9)[1] == 10
+        assert rules.zones["interior"][0] == Decimal("3.0")
+
+
+class TestPriceCart:
+    """Batch pricing == one call per line"""
+
+    LINES = [
+        {"total_area_m2": 8.5, "base_price_per_m2": 46.07},
+        {"total_area_m2": 66.0, "base_price_per_m2": 41.88},
+        {"total_area_m2": 120.75, "base_price_per_m2": 55.0, "product_type": "panel"},
+        {"total_area_m2": 1500.0, "base_price_per_m2": 39.9},
+    ]
+
+    def test_lines_match_single_calls(self):
+        cart = price_cart(self.LINES)
+        for line, result in zip(self.LINES, cart["lines"]):
+            assert result == apply_bulk_pricing(line["total_area_m2"], line["base_price_per_m2"])
+        expected = sum(round(r["final_total_usd"] * 100) for r in cart["lines"]) / 100
+        assert cart["subtotal_usd"] == expected
+        assert cart["total_usd"] == cart["subtotal_usd"]
+        assert cart["delivery"] is None
+
+    def test_delivery_on_total_area(self):
+        cart = price_cart(self.LINES, destination_zone="canelones")
+        assert cart["total_area_m2"] == 1695.25
+        assert cart["delivery"] == calculate_delivery_cost(1695.25, "canelones")
+        assert cart["total_usd"] == round(cart["subtotal_usd"] + cart["delivery"]["delivery_cost_usd"], 2)
+
+    def test_empty_cart(self):
+        cart = price_cart([])
+        assert cart["line_count"] == 0
+        assert cart["total_usd"] == 0
+
+
+class TestRecompilation:
+    def test_rules_follow_kb_version(self, tmp_path, monkeypatch):
+        kb_copy = tmp_path / "kb.json"
+        catalog = json.loads(pricing_rules.KB_PATH.read_text(encoding="utf-8"))
+        kb_copy.write_text(json.dumps(catalog), encoding="utf-8")
+        monkeypatch.setattr(pricing_rules, "KB_PATH", kb_copy)
+        assert calculate_delivery_cost(100, "montevideo")["rate_per_m2_usd"] == 1.5
+
+        catalog["pricing_rules"]["delivery"]["zones"]["montevideo"]["per_m2"] = 1.75
+        kb_copy.write_text(json.dumps(catalog), encoding="utf-8")
+        assert calculate_delivery_cost(100, "montevideo")["rate_per_m2_usd"] == 1.75
+
+    def test_missing_kb(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(pricing_rules, "KB_PATH", tmp_path / "missing.json")
+        with pytest.raises(FileNotFoundError):
+            apply_bulk_pricing(10, 40)
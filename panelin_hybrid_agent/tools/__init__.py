@@ -28,6 +28,7 @@ from .pricing_rules import (
     apply_bulk_pricing,
     calculate_delivery_cost,
     get_minimum_order_value,
+    price_cart,
 )
 
 __all__ = [
@@ -50,4 +51,5 @@ __all__ = [
     "apply_bulk_pricing",
     "calculate_delivery_cost",
     "get_minimum_order_value",
+    "price_cart",
 ]
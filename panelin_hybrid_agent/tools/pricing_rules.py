@@ -5,12 +5,19 @@ Pricing Rules - Reglas de Precios Deterministas
 Este módulo implementa las reglas de negocio para precios, descuentos,
 y costos de envío. Todas las reglas son deterministas y configurables
 desde la Knowledge Base.
+
+Las reglas (tramos por volumen, zonas de envío, mínimos, IVA) se compilan una
+vez por versión de la KB: los tramos en un arreglo ordenado de umbrales con
+selección por bisección y las zonas en un dict con tarifas ya convertidas.
 """
 
+import bisect
 import json
 from decimal import Decimal, ROUND_HALF_UP
 from pathlib import Path
-from typing import Optional, Literal, Dict, Any
+from typing import Optional, Literal, Dict, Any, List, Tuple
+
+from panelin_core.pricing_kernel import load_compiled_kb
 
 KB_PATH = Path(__file__).parent.parent / "kb" / "panelin_truth_bmcuruguay.json"
 
@@ -33,6 +40,90 @@ def _round_currency(value: Decimal) -> Decimal:
     return value.quantize(Decimal("0.01"), ROUND_HALF_UP)
 
 
+# Reglas por defecto si no están en KB
+DEFAULT_BULK_TIERS = [
+    {"min_m2": 0, "max_m2": 10, "discount": -5, "note": "Recargo pedido mínimo"},
+    {"min_m2": 10, "max_m2": 50, "discount": 0, "note": "Precio estándar"},
+    {"min_m2": 50, "max_m2": 100, "discount": 3, "note": "Descuento volumen"},
+    {"min_m2": 100, "max_m2": 500, "discount": 5, "note": "Descuento volumen mayor"},
+    {"min_m2": 500, "max_m2": 1000, "discount": 7, "note": "Descuento mayorista"},
+    {"min_m2": 1000, "max_m2": float("inf"), "discount": 10, "note": "Requiere aprobación"},
+]
+
+DEFAULT_DELIVERY_RATES = {
+    "montevideo": {"per_m2": 1.50, "minimum": 50},
+    "canelones": {"per_m2": 2.00, "minimum": 75},
+    "interior": {"per_m2": 3.00, "minimum": 150},
+    "exterior": {"per_m2": 0, "minimum": 0, "note": "Consultar"},
+}
+
+DEFAULT_MINIMUMS = {
+    "panel": {"min_area_m2": 10, "min_value_usd": 500},
+    "perfil": {"min_units": 3, "min_value_usd": 50},
+    "accesorio": {"min_value_usd": 25},
+    "default": {"min_value_usd": 100},
+}
+
+NO_TIER = {"discount": 0, "note": "Sin regla aplicable"}
+
+
+class _CompiledRules:
+    """
+    Reglas de precios de una versión de la KB, listas para consultar.
+
+    Los tramos pueden solaparse: como en la búsqueda lineal original gana el
+    primero de la lista. Para eso los extremos de todos los tramos parten la
+    recta en intervalos elementales y a cada uno se le asigna su tramo ganador;
+    una consulta es un bisect sobre los umbrales.
+    """
+
+    def __init__(self, catalog: Dict[str, Any]):
+        pricing_rules = catalog.get("pricing_rules", {})
+
+        tiers = pricing_rules.get("bulk_discounts", {}).get("tiers", DEFAULT_BULK_TIERS)
+        spans = [(rule["min_m2"], rule.get("max_m2", float("inf"))) for rule in tiers]
+        self.tier_bounds: List[float] = sorted({b for span in spans for b in span})
+        self.tier_rules: List[Optional[Tuple[Dict[str, Any], Any, Decimal]]] = []
+        for left in self.tier_bounds:
+            winner = next(
+                (rule for rule, (lo, hi) in zip(tiers, spans) if lo <= left < hi), None
+            )
+            if winner is None:
+                self.tier_rules.append(None)
+                continue
+            discount = winner.get("discount", 0)
+            self.tier_rules.append((winner, discount, abs(_to_decimal(discount))))
+
+        rates = pricing_rules.get("delivery", {}).get("zones", DEFAULT_DELIVERY_RATES)
+        self.zones = {zone: self._compile_zone(rate) for zone, rate in rates.items()}
+        self.fallback_zone = self._compile_zone(DEFAULT_DELIVERY_RATES["interior"])
+
+        minimums = pricing_rules.get("minimum_orders", {})
+        self.minimums = minimums if minimums else DEFAULT_MINIMUMS
+
+        self.tax_rate = _to_decimal(pricing_rules.get("tax_rate_uy", 22))
+
+    @staticmethod
+    def _compile_zone(rate: Dict[str, Any]) -> Tuple[Decimal, Decimal, str]:
+        return (
+            _to_decimal(rate.get("per_m2", 2.0)),
+            _to_decimal(rate.get("minimum", 50)),
+            rate.get("note", ""),
+        )
+
+    def tier_for(self, total_area_m2: float):
+        """(regla, descuento, |descuento| en Decimal) del tramo aplicable, o None."""
+        i = bisect.bisect_right(self.tier_bounds, total_area_m2) - 1
+        return self.tier_rules[i] if i >= 0 else None
+
+
+def _compiled_rules() -> _CompiledRules:
+    """Reglas compiladas de la versión actual de la KB"""
+    if not KB_PATH.exists():
+        raise FileNotFoundError(f"Knowledge Base no encontrada: {KB_PATH}")
+    return load_compiled_kb(KB_PATH).derived("pricing_rules", _CompiledRules)
+
+
 def apply_discount(
     subtotal_usd: float,
     discount_percent: float,
@@ -91,38 +182,27 @@ def apply_bulk_pricing(
     Returns:
         Dict con precio ajustado y detalles del descuento
     """
-    kb = _load_kb()
-    pricing_rules = kb.get("pricing_rules", {})
-    bulk_rules = pricing_rules.get("bulk_discounts", {})
-    
-    # Reglas por defecto si no están en KB
-    default_rules = [
-        {"min_m2": 0, "max_m2": 10, "discount": -5, "note": "Recargo pedido mínimo"},
-        {"min_m2": 10, "max_m2": 50, "discount": 0, "note": "Precio estándar"},
-        {"min_m2": 50, "max_m2": 100, "discount": 3, "note": "Descuento volumen"},
-        {"min_m2": 100, "max_m2": 500, "discount": 5, "note": "Descuento volumen mayor"},
-        {"min_m2": 500, "max_m2": 1000, "discount": 7, "note": "Descuento mayorista"},
-        {"min_m2": 1000, "max_m2": float("inf"), "discount": 10, "note": "Requiere aprobación"},
-    ]
-    
-    rules = bulk_rules.get("tiers", default_rules)
-    
-    # Encontrar regla aplicable
-    applicable_rule = None
-    for rule in rules:
-        if rule["min_m2"] <= total_area_m2 < rule.get("max_m2", float("inf")):
-            applicable_rule = rule
-            break
-    
-    if not applicable_rule:
-        applicable_rule = {"discount": 0, "note": "Sin regla aplicable"}
-    
-    discount_percent = applicable_rule.get("discount", 0)
-    base_total = _to_decimal(total_area_m2) * _to_decimal(base_price_per_m2)
+    return _bulk_pricing(_compiled_rules(), total_area_m2, base_price_per_m2)
+
+
+def _bulk_pricing(
+    rules: _CompiledRules,
+    total_area_m2: float,
+    base_price_per_m2: float,
+) -> Dict[str, Any]:
+    """apply_bulk_pricing sobre reglas ya compiladas"""
+    tier = rules.tier_for(total_area_m2)
+    if tier is None:
+        applicable_rule, discount_percent, magnitude = NO_TIER, 0, Decimal(0)
+    else:
+        applicable_rule, discount_percent, magnitude = tier
+
+    area = _to_decimal(total_area_m2)
+    base_total = area * _to_decimal(base_price_per_m2)
     
     if discount_percent < 0:
         # Es un recargo, no descuento
-        surcharge = _round_currency(base_total * abs(_to_decimal(discount_percent)) / 100)
+        surcharge = _round_currency(base_total * magnitude / 100)
         final_total = base_total + surcharge
         return {
             "total_area_m2": total_area_m2,
@@ -132,12 +212,12 @@ def apply_bulk_pricing(
             "adjustment_percent": abs(discount_percent),
             "adjustment_amount_usd": float(surcharge),
             "final_total_usd": float(_round_currency(final_total)),
-            "final_price_per_m2": float(_round_currency(final_total / _to_decimal(total_area_m2))),
+            "final_price_per_m2": float(_round_currency(final_total / area)),
             "note": applicable_rule.get("note", ""),
             "calculation_verified": True,
         }
     else:
-        discount = _round_currency(base_total * _to_decimal(discount_percent) / 100)
+        discount = _round_currency(base_total * magnitude / 100)
         final_total = base_total - discount
         return {
             "total_area_m2": total_area_m2,
@@ -147,7 +227,7 @@ def apply_bulk_pricing(
             "adjustment_percent": discount_percent,
             "adjustment_amount_usd": float(discount),
             "final_total_usd": float(_round_currency(final_total)),
-            "final_price_per_m2": float(_round_currency(final_total / _to_decimal(total_area_m2))),
+            "final_price_per_m2": float(_round_currency(final_total / area)),
             "note": applicable_rule.get("note", ""),
             "calculation_verified": True,
         }
@@ -169,21 +249,16 @@ def calculate_delivery_cost(
     Returns:
         Dict con costo de envío y detalles
     """
-    kb = _load_kb()
-    pricing_rules = kb.get("pricing_rules", {})
-    delivery_rules = pricing_rules.get("delivery", {})
-    
-    # Tarifas por defecto
-    default_rates = {
-        "montevideo": {"per_m2": 1.50, "minimum": 50},
-        "canelones": {"per_m2": 2.00, "minimum": 75},
-        "interior": {"per_m2": 3.00, "minimum": 150},
-        "exterior": {"per_m2": 0, "minimum": 0, "note": "Consultar"},
-    }
-    
-    rates = delivery_rules.get("zones", default_rates)
-    zone_rate = rates.get(destination_zone, default_rates["interior"])
-    
+    return _delivery_cost(_compiled_rules(), total_area_m2, destination_zone, product_weight_kg_per_m2)
+
+
+def _delivery_cost(
+    rules: _CompiledRules,
+    total_area_m2: float,
+    destination_zone: str,
+    product_weight_kg_per_m2: float,
+) -> Dict[str, Any]:
+    """calculate_delivery_cost sobre reglas ya compiladas"""
     if destination_zone == "exterior":
         return {
             "total_area_m2": total_area_m2,
@@ -194,8 +269,7 @@ def calculate_delivery_cost(
             "calculation_verified": True,
         }
     
-    per_m2_rate = _to_decimal(zone_rate.get("per_m2", 2.0))
-    minimum = _to_decimal(zone_rate.get("minimum", 50))
+    per_m2_rate, minimum, note = rules.zones.get(destination_zone, rules.fallback_zone)
     
     calculated_cost = _round_currency(_to_decimal(total_area_m2) * per_m2_rate)
     final_cost = max(calculated_cost, minimum)
@@ -210,7 +284,57 @@ def calculate_delivery_cost(
         "minimum_charge_usd": float(minimum),
         "delivery_cost_usd": float(final_cost),
         "estimated_weight_kg": round(total_weight, 1),
-        "note": zone_rate.get("note", ""),
+        "note": note,
+        "calculation_verified": True,
+    }
+
+
+def price_cart(
+    lines: List[Dict[str, Any]],
+    destination_zone: Optional[Literal["montevideo", "canelones", "interior", "exterior"]] = None,
+    product_weight_kg_per_m2: float = 12.0,
+) -> Dict[str, Any]:
+    """
+    Precios por volumen de un carrito completo en una sola llamada.
+    
+    Cada línea se valoriza exactamente como apply_bulk_pricing; el envío
+    (opcional) se calcula sobre el área total del carrito. Las reglas se
+    resuelven una sola vez para todas las líneas.
+    
+    Args:
+        lines: Lista de dicts con total_area_m2 y base_price_per_m2
+               (product_type opcional)
+        destination_zone: Zona de envío (None = sin envío)
+        product_weight_kg_per_m2: Peso por m² para el envío
+        
+    Returns:
+        Dict con el resultado de cada línea, subtotal, envío y total
+    """
+    rules = _compiled_rules()
+    
+    priced = []
+    total_area = Decimal(0)
+    subtotal = Decimal(0)
+    for line in lines:
+        result = _bulk_pricing(rules, line["total_area_m2"], line["base_price_per_m2"])
+        priced.append(result)
+        total_area += _to_decimal(line["total_area_m2"])
+        subtotal += _round_currency(_to_decimal(result["final_total_usd"]))
+    
+    total_area_m2 = float(total_area)
+    delivery = None
+    total = subtotal
+    if destination_zone is not None:
+        delivery = _delivery_cost(rules, total_area_m2, destination_zone, product_weight_kg_per_m2)
+        total += _round_currency(_to_decimal(delivery["delivery_cost_usd"]))
+    
+    return {
+        "lines": priced,
+        "line_count": len(priced),
+        "total_area_m2": total_area_m2,
+        "subtotal_usd": float(subtotal),
+        "delivery": delivery,
+        "total_usd": float(total),
         "calculation_verified": True,
     }
 
@@ -227,19 +351,7 @@ def get_minimum_order_value(
     Returns:
         Dict con valores mínimos
     """
-    kb = _load_kb()
-    pricing_rules = kb.get("pricing_rules", {})
-    minimums = pricing_rules.get("minimum_orders", {})
-    
-    # Valores por defecto
-    default_minimums = {
-        "panel": {"min_area_m2": 10, "min_value_usd": 500},
-        "perfil": {"min_units": 3, "min_value_usd": 50},
-        "accesorio": {"min_value_usd": 25},
-        "default": {"min_value_usd": 100},
-    }
-    
-    mins = minimums if minimums else default_minimums
+    mins = _compiled_rules().minimums
     
     if product_type and product_type in mins:
         return {
@@ -271,9 +383,7 @@ def calculate_tax(
     Returns:
         Dict con desglose de impuestos
     """
-    kb = _load_kb()
-    pricing_rules = kb.get("pricing_rules", {})
-    tax_rate = _to_decimal(pricing_rules.get("tax_rate_uy", 22))
+    tax_rate = _compiled_rules().tax_rate
     
     subtotal = _to_decimal(subtotal_usd)
     
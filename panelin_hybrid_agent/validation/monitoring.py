@@ -4,15 +4,23 @@ Monitoring and Observability
 
 Tracks quotation events, errors, and performance metrics.
 Designed for integration with LangSmith, Langfuse, or custom logging.
+
+Memory is fixed no matter how long the process runs:
+- recent events live in a ring buffer (the oldest are dropped)
+- latencies go into log-linear histograms (p50/p90/p99 from bucket counts)
+- rates come from a per-second ring of counters over a sliding window
 """
 
 import json
 import logging
+import math
+import threading
+import time
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Deque, Dict, List, Optional
 from dataclasses import dataclass, field
 from pathlib import Path
-from collections import defaultdict
+from collections import defaultdict, deque
 
 # Configure logging
 logging.basicConfig(
@@ -24,6 +32,109 @@ logger = logging.getLogger("panelin.monitoring")
 # Metrics storage (in production, use proper metrics system)
 METRICS_PATH = Path(__file__).parent.parent / "logs" / "metrics.json"
 
+DEFAULT_MAX_EVENTS = 1000
+RATE_WINDOW_SECONDS = 60
+MAX_TRACKED_TOOLS = 64
+DEFAULT_PERCENTILES = (50, 90, 99)
+
+
+class LatencyHistogram:
+    """
+    Log-linear latency histogram with a fixed number of buckets.
+    
+    Values are recorded in microseconds. Below 2**SUB_BITS us buckets are
+    1us wide; above, each power of two is split into 2**SUB_BITS linear
+    sub-buckets, so a reported percentile is within 1/2**SUB_BITS (~6%)
+    of the true value. Values above MAX_US land in the last bucket.
+    """
+    
+    SUB_BITS = 4
+    MAX_US = 2 ** 36  # ~19 hours
+    
+    def __init__(self):
+        self._sub = 1 << self.SUB_BITS
+        self.counts = [0] * self._index(self.MAX_US) + [0]
+        self.count = 0
+        self.sum_ms = 0.0
+        self.min_ms = math.inf
+        self.max_ms = 0.0
+    
+    def _index(self, value_us: int) -> int:
+        if value_us < self._sub:
+            return value_us
+        shift = value_us.bit_length() - self.SUB_BITS - 1
+        return self._sub * (shift + 1) + (value_us >> shift) - self._sub
+    
+    def _bucket_bounds(self, index: int) -> tuple:
+        if index < self._sub:
+            return index, index
+        shift, offset = divmod(index - self._sub, self._sub)
+        low = (self._sub + offset) << shift
+        return low, low + (1 << shift) - 1
+    
+    def record(self, latency_ms: float) -> None:
+        value_us = min(max(int(latency_ms * 1000), 0), self.MAX_US)
+        self.counts[self._index(value_us)] += 1
+        self.count += 1
+        self.sum_ms += latency_ms
+        if latency_ms < self.min_ms:
+            self.min_ms = latency_ms
+        if latency_ms > self.max_ms:
+            self.max_ms = latency_ms
+    
+    def percentile(self, q: float) -> Optional[float]:
+        """Latency (ms) at percentile q (0-100), or None if empty"""
+        if self.count == 0:
+            return None
+        rank = max(1, math.ceil(q / 100 * self.count))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                low, high = self._bucket_bounds(index)
+                value_ms = (low + high) / 2 / 1000
+                return min(max(value_ms, self.min_ms), self.max_ms)
+        return self.max_ms
+    
+    def summary(self, percentiles=DEFAULT_PERCENTILES) -> Dict[str, Any]:
+        result = {
+            "count": self.count,
+            "avg_ms": round(self.sum_ms / self.count, 3) if self.count else 0.0,
+            "min_ms": round(self.min_ms, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+        }
+        for q in percentiles:
+            value = self.percentile(q)
+            result[f"p{q:g}_ms"] = round(value, 3) if value is not None else 0.0
+        return result
+
+
+class SlidingWindowCounter:
+    """Event counts over the last window_seconds, in one-second slots"""
+    
+    def __init__(self, window_seconds: int = RATE_WINDOW_SECONDS):
+        self.window_seconds = window_seconds
+        self._counts = [0] * window_seconds
+        self._seconds = [-1] * window_seconds
+    
+    def add(self, now: float, amount: int = 1) -> None:
+        second = int(now)
+        slot = second % self.window_seconds
+        if self._seconds[slot] != second:
+            self._seconds[slot] = second
+            self._counts[slot] = 0
+        self._counts[slot] += amount
+    
+    def total(self, now: float, window_seconds: Optional[int] = None) -> int:
+        window = min(window_seconds or self.window_seconds, self.window_seconds)
+        oldest = int(now) - window
+        return sum(c for c, s in zip(self._counts, self._seconds) if s > oldest)
+    
+    def rate(self, now: float, window_seconds: Optional[int] = None) -> float:
+        """Events per second over the window"""
+        window = min(window_seconds or self.window_seconds, self.window_seconds)
+        return self.total(now, window) / window
+
 
 @dataclass
 class QuotationEvent:
@@ -60,15 +171,40 @@ class QuotationMonitor:
     Monitors quotation operations for observability.
     
     Tracks:
-    - Request/response events
+    - Request/response events (the last max_events, in a ring buffer)
     - Tool call usage
     - Errors and their types
-    - Latency metrics
+    - Latency histograms, end-to-end and per tool (p50/p90/p99)
+    - Sliding-window rates per event type
     - calculation_verified status (critical)
+    
+    Thread-safe: tools may log concurrently.
     """
     
-    events: List[QuotationEvent] = field(default_factory=list)
+    max_events: int = DEFAULT_MAX_EVENTS
+    events: Deque[QuotationEvent] = field(default=None)
     metrics: Dict[str, Any] = field(default_factory=lambda: defaultdict(int))
+    clock: Callable[[], float] = time.monotonic
+    
+    def __post_init__(self):
+        self.events = deque(self.events or (), maxlen=self.max_events)
+        self.latency = LatencyHistogram()
+        self.tool_latency: Dict[str, LatencyHistogram] = {}
+        self.rates: Dict[str, SlidingWindowCounter] = {
+            event_type: SlidingWindowCounter()
+            for event_type in ("request", "tool_call", "response", "error")
+        }
+        self._lock = threading.Lock()
+    
+    def _record(self, event: QuotationEvent) -> None:
+        self.events.append(event)
+        self.rates[event.event_type].add(self.clock())
+    
+    def _tool_key(self, tool_name: str) -> str:
+        """Tool name, or "_other" once MAX_TRACKED_TOOLS names are tracked"""
+        if tool_name in self.tool_latency or len(self.tool_latency) < MAX_TRACKED_TOOLS:
+            return tool_name
+        return "_other"
     
     def log_request(self, user_message: str) -> None:
         """Log an incoming request"""
@@ -76,8 +212,9 @@ class QuotationMonitor:
             event_type="request",
             user_message=user_message,
         )
-        self.events.append(event)
-        self.metrics["total_requests"] += 1
+        with self._lock:
+            self._record(event)
+            self.metrics["total_requests"] += 1
         logger.info(f"Request received: {user_message[:100]}...")
     
     def log_tool_call(
@@ -98,14 +235,22 @@ class QuotationMonitor:
             latency_ms=latency_ms,
             calculation_verified=calculation_verified,
         )
-        self.events.append(event)
-        
-        self.metrics["total_tool_calls"] += 1
-        self.metrics[f"tool_calls_{tool_name}"] += 1
+        with self._lock:
+            self._record(event)
+            key = self._tool_key(tool_name)
+            histogram = self.tool_latency.get(key)
+            if histogram is None:
+                histogram = self.tool_latency[key] = LatencyHistogram()
+            histogram.record(latency_ms)
+            
+            self.metrics["total_tool_calls"] += 1
+            self.metrics[f"tool_calls_{key}"] += 1
+            
+            if not calculation_verified:
+                # CRITICAL: This should never happen
+                self.metrics["calculation_not_verified"] += 1
         
         if not calculation_verified:
-            # CRITICAL: This should never happen
-            self.metrics["calculation_not_verified"] += 1
             logger.critical(
                 f"CALCULATION_NOT_VERIFIED: {tool_name} returned without verification!"
             )
@@ -119,10 +264,12 @@ class QuotationMonitor:
             response=response[:500],  # Truncate for storage
             latency_ms=total_latency_ms,
         )
-        self.events.append(event)
-        
-        self.metrics["total_responses"] += 1
-        self.metrics["total_latency_ms"] += total_latency_ms
+        with self._lock:
+            self._record(event)
+            self.latency.record(total_latency_ms)
+            
+            self.metrics["total_responses"] += 1
+            self.metrics["total_latency_ms"] += total_latency_ms
         
         logger.info(f"Response sent ({total_latency_ms:.2f}ms)")
     
@@ -133,27 +280,48 @@ class QuotationMonitor:
             error=error,
             tool_args=context,
         )
-        self.events.append(event)
-        
-        self.metrics["total_errors"] += 1
+        with self._lock:
+            self._record(event)
+            self.metrics["total_errors"] += 1
         logger.error(f"Error: {error}")
     
+    def percentile(self, q: float, tool_name: Optional[str] = None) -> Optional[float]:
+        """End-to-end (or per-tool) latency in ms at percentile q (0-100)"""
+        with self._lock:
+            histogram = self.latency if tool_name is None else self.tool_latency.get(tool_name)
+            return histogram.percentile(q) if histogram else None
+    
+    def rate(self, event_type: str, window_seconds: int = RATE_WINDOW_SECONDS) -> float:
+        """Events per second of event_type over the last window_seconds"""
+        with self._lock:
+            return self.rates[event_type].rate(self.clock(), window_seconds)
+    
     def get_summary(self) -> Dict[str, Any]:
         """Get metrics summary"""
-        total_requests = self.metrics.get("total_requests", 0)
-        total_latency = self.metrics.get("total_latency_ms", 0)
-        
-        return {
-            "total_requests": total_requests,
-            "total_responses": self.metrics.get("total_responses", 0),
-            "total_tool_calls": self.metrics.get("total_tool_calls", 0),
-            "total_errors": self.metrics.get("total_errors", 0),
-            "calculation_not_verified": self.metrics.get("calculation_not_verified", 0),
-            "average_latency_ms": total_latency / total_requests if total_requests > 0 else 0,
-            "tool_usage": {
-                k: v for k, v in self.metrics.items() if k.startswith("tool_calls_")
-            },
-        }
+        with self._lock:
+            total_responses = self.metrics.get("total_responses", 0)
+            total_latency = self.metrics.get("total_latency_ms", 0)
+            now = self.clock()
+            
+            return {
+                "total_requests": self.metrics.get("total_requests", 0),
+                "total_responses": total_responses,
+                "total_tool_calls": self.metrics.get("total_tool_calls", 0),
+                "total_errors": self.metrics.get("total_errors", 0),
+                "calculation_not_verified": self.metrics.get("calculation_not_verified", 0),
+                "average_latency_ms": total_latency / total_responses if total_responses > 0 else 0,
+                "latency": self.latency.summary(),
+                "tool_latency": {
+                    name: histogram.summary() for name, histogram in self.tool_latency.items()
+                },
+                "rates_per_s": {
+                    event_type: round(counter.rate(now), 4)
+                    for event_type, counter in self.rates.items()
+                },
+                "tool_usage": {
+                    k: v for k, v in self.metrics.items() if k.startswith("tool_calls_")
+                },
+            }
     
     def check_health(self) -> Dict[str, Any]:
         """Check monitoring health and critical metrics"""
@@ -104,6 +104,43 @@ def _build_headers() -> List[str]:
     ] + [f"ml_{l}" for l in LENGTHS_ML]
 
 
+def _product_row(p: Dict[str, Any]) -> List[Any]:
+    """Sheet row for one product, in _build_headers() order."""
+    meta = p.get("metadata", {}) or {}
+    costos = (p.get("costos", {}) or {}).get("fabrica_directo", {}) or {}
+    margen = p.get("margen", {}) or {}
+    precios = p.get("precios", {}) or {}
+    empresa = precios.get("empresa", {}) or {}
+    particular = precios.get("particular", {}) or {}
+    web_stock = precios.get("web_stock", {}) or {}
+    ml = p.get("precio_metro_lineal", {}) or {}
+    ml_by_len = ml.get("precios_por_largo", {}) or {}
+
+    row = [
+        _safe_str(meta.get("proveedor")),
+        _safe_str(p.get("codigo")),
+        _safe_str(p.get("nombre")),
+        _safe_str(p.get("categoria")),
+        _safe_str(p.get("espesor_mm")),
+        _safe_str(p.get("estado")),
+        _safe_str(meta.get("shopify_status")),
+        _safe_str(meta.get("notas")),
+        costos.get("costo_base_usd_iva"),
+        costos.get("costo_con_aumento_usd_iva"),
+        costos.get("costo_proximo_aumento_usd_iva"),
+        _safe_str(margen.get("porcentaje")),
+        margen.get("ganancia_usd"),
+        empresa.get("venta_iva_usd"),
+        particular.get("consumidor_iva_inc_usd"),
+        web_stock.get("web_venta_iva_usd"),
+        web_stock.get("web_venta_iva_inc_usd"),
+        ml.get("precio_base_usd"),
+    ]
+    for l in LENGTHS_ML:
+        row.append(ml_by_len.get(l))
+    return row
+
+
 def sync_up(json_path: str, credentials_path: str, spreadsheet_name: str):
     """Push local JSON Cost Matrix to Google Sheets."""
     client = get_client(credentials_path)
@@ -132,42 +169,7 @@ def sync_up(json_path: str, credentials_path: str, spreadsheet_name: str):
 
     # Build rows
     headers = _build_headers()
-    rows = [headers]
-
-    for p in products:
-        meta = p.get("metadata", {}) or {}
-        costos = (p.get("costos", {}) or {}).get("fabrica_directo", {}) or {}
-        margen = p.get("margen", {}) or {}
-        precios = p.get("precios", {}) or {}
-        empresa = precios.get("empresa", {}) or {}
-        particular = precios.get("particular", {}) or {}
-        web_stock = precios.get("web_stock", {}) or {}
-        ml = p.get("precio_metro_lineal", {}) or {}
-        ml_by_len = ml.get("precios_por_largo", {}) or {}
-
-        row = [
-            _safe_str(meta.get("proveedor")),
-            _safe_str(p.get("codigo")),
-            _safe_str(p.get("nombre")),
-            _safe_str(p.get("categoria")),
-            _safe_str(p.get("espesor_mm")),
-            _safe_str(p.get("estado")),
-            _safe_str(meta.get("shopify_status")),
-            _safe_str(meta.get("notas")),
-            costos.get("costo_base_usd_iva"),
-            costos.get("costo_con_aumento_usd_iva"),
-            costos.get("costo_proximo_aumento_usd_iva"),
-            _safe_str(margen.get("porcentaje")),
-            margen.get("ganancia_usd"),
-            empresa.get("venta_iva_usd"),
-            particular.get("consumidor_iva_inc_usd"),
-            web_stock.get("web_venta_iva_usd"),
-            web_stock.get("web_venta_iva_inc_usd"),
-            ml.get("precio_base_usd"),
-        ]
-        for l in LENGTHS_ML:
-            row.append(ml_by_len.get(l))
-        rows.append(row)
+    rows = [headers] + [_product_row(p) for p in products]
 
     # Clear and update
     ws.clear()
@@ -175,6 +177,49 @@ def sync_up(json_path: str, credentials_path: str, spreadsheet_name: str):
     print(f"Successfully pushed {len(products)} products to Google Sheets.")
 
 
+def push_rows(
+    credentials_path: str,
+    spreadsheet_name: str,
+    products: List[Dict[str, Any]],
+) -> Dict[str, int]:
+    """Update (or append) only the given products' rows in the PRODUCTS sheet.
+
+    Rows are located by the "codigo" column; all existing rows are written in
+    one batch_update call and new codes are appended in one append_rows call.
+
+    Returns:
+        Counts of updated and appended rows.
+    """
+    client = get_client(credentials_path)
+    sh = client.open(spreadsheet_name)
+    ws = sh.worksheet("PRODUCTS")
+
+    headers = _build_headers()
+    codes = ws.col_values(headers.index("codigo") + 1)
+    row_by_code: Dict[str, int] = {}
+    for i, code in enumerate(codes[1:], start=2):
+        if code:
+            row_by_code.setdefault(code, i)
+
+    updates = []
+    appends = []
+    for p in products:
+        row = _product_row(p)
+        row_number = row_by_code.get(_safe_str(p.get("codigo")))
+        if row_number:
+            updates.append({"range": f"A{row_number}", "values": [row]})
+        else:
+            appends.append(row)
+
+    if not codes:
+        appends.insert(0, headers)
+    if updates:
+        ws.batch_update(updates)
+    if appends:
+        ws.append_rows(appends)
+    return {"updated": len(updates), "appended": len(appends) - (0 if codes else 1)}
+
+
 def sync_down(
     credentials_path: str,
     spreadsheet_name: str,
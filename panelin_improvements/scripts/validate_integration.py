@@ -9,6 +9,7 @@ from agente_kb_indexing import (  # noqa: E402
     get_cost_matrix_product,
     sync_cost_matrix,
     update_product_price,
+    flush_cost_matrix_sync,
 )
 
 
@@ -42,6 +43,10 @@ def main():
             f"update_product_price failed: {update_result}"
         )
     print(f"Update status: {update_result.get('sync_status')}")
+    flush_result = flush_cost_matrix_sync()
+    if flush_result.get("status") == "failed":
+        raise RuntimeError(f"flush_cost_matrix_sync failed: {flush_result}")
+    print(f"Pushed rows: {flush_result.get('pushed')}")
 
     print("Integration validation completed.")
 
@@ -86,8 +86,11 @@ class SourceOfTruthValidator:
             product_id=product_id
         )
         
+        # Serialize once for the three content checks
+        data_str = json.dumps(response_data).lower()
+        
         # Check if response contains price information
-        if self._contains_price(response_data):
+        if self._contains_price(response_data, data_str):
             result.field_validated = "price"
             validation = self._validate_price_source(sources_consulted, response_data)
             result.valid = validation["valid"]
@@ -97,7 +100,7 @@ class SourceOfTruthValidator:
             result.errors.extend(validation.get("errors", []))
         
         # Check if response contains formula calculations
-        if self._contains_formula(response_data):
+        if self._contains_formula(response_data, data_str):
             result.field_validated = "formula"
             validation = self._validate_formula_source(sources_consulted, response_data)
             if not validation["valid"]:
@@ -106,7 +109,7 @@ class SourceOfTruthValidator:
             result.errors.extend(validation.get("errors", []))
         
         # Check if response contains technical specifications
-        if self._contains_specifications(response_data):
+        if self._contains_specifications(response_data, data_str):
             result.field_validated = "specifications"
             validation = self._validate_spec_source(sources_consulted, response_data)
             if not validation["valid"]:
@@ -116,21 +119,21 @@ class SourceOfTruthValidator:
         
         return result
     
-    def _contains_price(self, data: Dict[str, Any]) -> bool:
+    def _contains_price(self, data: Dict[str, Any], data_str: Optional[str] = None) -> bool:
         """Check if response contains price information"""
-        data_str = json.dumps(data).lower()
+        data_str = data_str if data_str is not None else json.dumps(data).lower()
         price_indicators = ["$", "precio", "price", "costo", "cost", "usd"]
         return any(indicator in data_str for indicator in price_indicators)
     
-    def _contains_formula(self, data: Dict[str, Any]) -> bool:
+    def _contains_formula(self, data: Dict[str, Any], data_str: Optional[str] = None) -> bool:
         """Check if response contains formula calculations"""
-        data_str = json.dumps(data).lower()
+        data_str = data_str if data_str is not None else json.dumps(data).lower()
         formula_indicators = ["formula", "calculo", "calculation", "roundup", "round"]
         return any(indicator in data_str for indicator in formula_indicators)
     
-    def _contains_specifications(self, data: Dict[str, Any]) -> bool:
+    def _contains_specifications(self, data: Dict[str, Any], data_str: Optional[str] = None) -> bool:
         """Check if response contains technical specifications"""
-        data_str = json.dumps(data).lower()
+        data_str = data_str if data_str is not None else json.dumps(data).lower()
         spec_indicators = ["espesor", "autoportancia", "ancho", "thickness", "span"]
         return any(indicator in data_str for indicator in spec_indicators)
     
@@ -33,6 +33,9 @@ from reportlab.platypus import (
 )
 from reportlab.lib.styles import ParagraphStyle
 
+from panelin_core.metrics import PDF_RENDER_SECONDS
+from panelin_core.tracing import traced
+
 from .pdf_styles import BMCStyles, QuotationConstants
 
 
@@ -273,6 +276,7 @@ class BMCQuotationPDF:
 
     # ── public entry point ──────────────────────────────────────
 
+    @traced("pdf.generate")
     def generate(self, quotation_data: Dict) -> str:
         """
         Generate complete quotation PDF.
@@ -295,12 +299,13 @@ class BMCQuotationPDF:
             (6.8, 7.8),
         ]
 
-        for font_size, leading in attempts:
-            self._comment_font_size = font_size
-            self._comment_leading = leading
-            page_count = self._build_pdf(quotation_data)
-            if page_count <= 1:
-                break
+        with PDF_RENDER_SECONDS.time():
+            for font_size, leading in attempts:
+                self._comment_font_size = font_size
+                self._comment_leading = leading
+                page_count = self._build_pdf(quotation_data)
+                if page_count <= 1:
+                    break
 
         return self.output_path
 
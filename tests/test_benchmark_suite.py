@@ -0,0 +1,78 @@
+"""
+Tests de la suite de benchmarks (benchmarks/suite.py).
+
+No miden tiempos: verifican que los catálogos sintéticos sean reproducibles,
+que compare marque regresiones según el umbral y que la suite corra completa
+en una pasada mínima.
+"""
+
+import json
+
+import pytest
+
+from benchmarks import catalogs, suite
+
+
+def _report(median_by_key):
+    return {
+        "metadata": {"machine": "x86_64", "cpu_count": 1},
+        "results": [
+            {"benchmark": name, "scale": scale, "scenario": scenario, "median_ms": median}
+            for (name, scale, scenario), median in median_by_key.items()
+        ],
+    }
+
+
+class TestCatalogs:
+    def test_scaled_catalog_is_seeded_and_keeps_real_products(self, tmp_path):
+        first = catalogs.build_catalogs(tmp_path / "a", 10, seed=7)
+        second = catalogs.build_catalogs(tmp_path / "b", 10, seed=7)
+        for name, path in first.items():
+            assert path.read_bytes() == second[name].read_bytes()
+
+        real = json.loads(catalogs.AGENT_V2_KB.read_text(encoding="utf-8"))["products"]
+        scaled = json.loads(first["agent_v2_kb"].read_text(encoding="utf-8"))["products"]
+        assert len(scaled) == 10 * len(real)
+        assert scaled["ISOPANEL_EPS_50mm"] == real["ISOPANEL_EPS_50mm"]
+        assert scaled["ISOPANEL_EPS_50mm_SYN001"]["price_per_m2"] != real["ISOPANEL_EPS_50mm"]["price_per_m2"]
+
+    def test_accessories_match_the_shipped_catalog_size(self, tmp_path):
+        paths = catalogs.build_catalogs(tmp_path, 1, seed=7)
+        accessories = json.loads(paths["accessories"].read_text(encoding="utf-8"))
+        assert sum(len(items) for items in accessories.values()) == catalogs.shipped_accessory_count()
+
+
+class TestCompare:
+    def test_flags_regressions_beyond_threshold(self):
+        baseline = _report({("a", 1, "warm"): 1.0, ("b", 1, "warm"): 1.0, ("c", 1, "cold"): 1.0})
+        current = _report({("a", 1, "warm"): 1.05, ("b", 1, "warm"): 1.5, ("c", 1, "cold"): 0.5,
+                           ("d", 1, "warm"): 1.0})
+        status = {r["benchmark"]: r["status"] for r in suite.compare(baseline, current, threshold=0.10)}
+        assert status == {"a": "ok", "b": "regression", "c": "improvement", "d": "new"}
+
+    def test_sub_noise_deltas_are_not_regressions(self):
+        rows = suite.compare(_report({("a", 1, "warm"): 0.01}), _report({("a", 1, "warm"): 0.03}))
+        assert rows[0]["status"] == "ok"
+
+    def test_compare_command_exit_code(self, tmp_path):
+        base, new = tmp_path / "base.json", tmp_path / "new.json"
+        base.write_text(json.dumps(_report({("a", 1, "warm"): 1.0})))
+        new.write_text(json.dumps(_report({("a", 1, "warm"): 2.0})))
+        assert suite.main(["compare", str(base), str(base)]) == 0
+        assert suite.main(["compare", str(base), str(new)]) == 1
+
+
+def test_run_suite_smoke():
+    report = suite.run_suite(scales=(1,), repeat=1, cold_repeat=1)
+    assert report["metadata"]["python"]
+    assert {r["benchmark"] for r in report["results"]} == {name for name, _ in suite.CASES}
+    assert {r["scenario"] for r in report["results"]} == set(suite.SCENARIOS)
+    assert all(r["median_ms"] > 0 for r in report["results"])
+    # Los módulos quedan apuntando a la KB real
+    assert suite.quotation_calculator.KB_PATH == catalogs.AGENT_V2_KB
+    assert suite.product_lookup.KB_PATH == catalogs.AGENT_V2_KB
+
+
+@pytest.mark.parametrize("metric", suite.METRICS)
+def test_summary_has_every_metric(metric):
+    assert metric in suite.summarize([0.001, 0.002, 0.003])
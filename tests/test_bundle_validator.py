@@ -0,0 +1,162 @@
+import json
+from pathlib import Path
+
+import pytest
+
+import bundle_validator
+from bundle_validator import BundleValidator, get_compiled_validators
+
+BASE_BUNDLE = json.loads(
+    (Path(__file__).parent.parent / "bundle_ejemplo_minimo.json").read_text(encoding="utf-8")
+)
+
+
+def _bundle_with(conversations):
+    bundle = dict(BASE_BUNDLE)
+    bundle["conversations"] = conversations
+    return bundle
+
+
+def _conversations(n, bad_every=0):
+    template = BASE_BUNDLE["conversations"][0]
+    conversations = []
+    for i in range(n):
+        conv = json.loads(json.dumps(template))
+        conv["id"] = f"CONV_{i:05d}"
+        if bad_every and i % bad_every == 0:
+            conv["messages"][0]["role"] = "bot"
+        conversations.append(conv)
+    return conversations
+
+
+def _write_jsonl(path, bundle):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"meta": bundle["meta"], "instructions": bundle["instructions"]}) + "\n")
+        for conv in bundle["conversations"]:
+            f.write(json.dumps(conv, ensure_ascii=False) + "\n")
+
+
+def _strip_kpis(report):
+    report["kpis"].pop("calculated_at")
+    return report["kpis"]
+
+
+def test_compiled_validators_are_cached():
+    assert get_compiled_validators() is get_compiled_validators()
+
+
+def test_stream_matches_validate_all_on_valid_bundle(tmp_path):
+    bundle = _bundle_with(_conversations(50))
+    path = tmp_path / "bundle.jsonl"
+    _write_jsonl(path, bundle)
+
+    expected = BundleValidator().validate_all(bundle)
+    report = BundleValidator().validate_stream(str(path), workers=2, chunk_size=7)
+
+    assert report["valid"] and expected["valid"]
+    assert report["streaming"]["total_conversations"] == 50
+    assert _strip_kpis(report) == _strip_kpis(expected)
+
+
+def test_stream_reports_errors_as_found_with_cap(tmp_path):
+    bundle = _bundle_with(_conversations(100, bad_every=2))
+    path = tmp_path / "bundle.jsonl"
+    _write_jsonl(path, bundle)
+
+    seen = []
+    report = BundleValidator().validate_stream(str(path), chunk_size=10, max_errors=15, on_error=seen.append)
+
+    assert not report["valid"]
+    assert report["streaming"]["truncated"]
+    assert len(report["errors"]) == 15
+    assert seen == report["errors"]
+
+
+def test_stream_flags_invalid_lines_and_head(tmp_path):
+    path = tmp_path / "bundle.jsonl"
+    conv = _conversations(1)[0]
+    path.write_text(json.dumps(conv) + "\n{not json\n", encoding="utf-8")
+
+    report = BundleValidator().validate_stream(str(path))
+
+    types = {error["type"] for error in report["errors"]}
+    assert {"invalid_json", "missing_field"} <= types
+    assert not report["structure_valid"]
+
+
+@pytest.mark.parametrize("use_ijson", [True, False])
+def test_stream_json_bundle(tmp_path, monkeypatch, use_ijson):
+    if use_ijson and bundle_validator.ijson is None:
+        pytest.skip("ijson no instalado")
+    if not use_ijson:
+        monkeypatch.setattr(bundle_validator, "ijson", None)
+
+    bundle = _bundle_with(_conversations(20, bad_every=5))
+    path = tmp_path / "bundle.json"
+    path.write_text(json.dumps(bundle), encoding="utf-8")
+
+    expected = BundleValidator().validate_all(bundle)
+    report = BundleValidator().validate_stream(str(path), chunk_size=3)
+
+    assert report["roles_valid"] is expected["roles_valid"] is False
+    assert [e for e in report["errors"] if e["type"] == "invalid_role"] == \
+        [e for e in expected["errors"] if e["type"] == "invalid_role"]
+    assert _strip_kpis(report) == _strip_kpis(expected)
+
+
+@pytest.mark.parametrize("conversations", [None, [{"id": "C1", "messages": []}]])
+def test_stream_kpi_error_is_a_warning(tmp_path, conversations):
+    if bundle_validator.KPICalculator is None:
+        pytest.skip("kpi_calculator no disponible")
+    # Solo la línea meta, o conversaciones sin mensajes: el reporte de KPIs
+    # no puede dividir por cero y se informa como advertencia
+    path = tmp_path / "bundle.jsonl"
+    lines = [json.dumps({"meta": {"version": "1.0"}})]
+    lines += [json.dumps(conv) for conv in conversations or []]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    report = BundleValidator().validate_stream(str(path))
+
+    assert report["kpis"] is None
+    assert any(w["type"] == "kpi_calculation_error" for w in report["warnings"])
+
+
+def test_stream_caps_kept_warnings(tmp_path):
+    conversations = _conversations(40)
+    for conv in conversations:
+        conv["messages"] = [{"role": "user", "content": "hola"}] * 3
+    path = tmp_path / "bundle.jsonl"
+    _write_jsonl(path, _bundle_with(conversations))
+
+    report = BundleValidator().validate_stream(str(path), chunk_size=7, max_warnings=5)
+
+    alternation = [w for w in report["warnings"] if w["type"] == "role_alternation"]
+    assert len(report["warnings"]) == 5 and len(alternation) <= 5
+    assert report["streaming"]["warnings_found"] >= 80
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_stream_reports_malformed_messages(tmp_path, workers):
+    conversations = _conversations(6)
+    conversations[1]["messages"] = ["x"]
+    conversations[4]["messages"][1] = {"role": None, "content": "hola"}
+    path = tmp_path / "bundle.jsonl"
+    _write_jsonl(path, _bundle_with(conversations))
+
+    report = BundleValidator().validate_stream(str(path), workers=workers, chunk_size=2)
+
+    invalid = [e for e in report["errors"] if e["type"] == "invalid_message"]
+    assert [(e["conversation_id"], e["message_index"]) for e in invalid] == [
+        ("CONV_00001", 0), ("CONV_00004", 1)
+    ]
+    assert not report["valid"] and not report["roles_valid"]
+    assert report["streaming"]["total_conversations"] == 6
+
+
+def test_validate_all_reports_malformed_messages():
+    bundle = _bundle_with([{"id": "C1", "messages": ["x", 3]}])
+
+    report = BundleValidator().validate_all(bundle)
+
+    assert [e["message_index"] for e in report["errors"] if e["type"] == "invalid_message"] == [0, 1]
+    assert not report["roles_valid"]
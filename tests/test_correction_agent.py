@@ -0,0 +1,141 @@
+import json
+
+import pytest
+
+from gpt_kb_config_agent.correction_agent import GPTCorrectionAgent
+
+KB_FILE = "BMC_Base_Conocimiento_GPT-2.json"
+
+
+def _make_project(root):
+    products = {
+        f"PROD_{i}": {"espesores": {str(e): {"precio": 10.0 + e, "autoportancia": e / 20} for e in (50, 100)}}
+        for i in range(20)
+    }
+    kb = {"meta": {"version": "5.0-Unified"}, "identidad": {}, "products": products}
+    (root / KB_FILE).write_text(json.dumps(kb, ensure_ascii=False, indent=2), encoding="utf-8")
+    (root / "notes.txt").write_text("precio viejo\nfin\n", encoding="utf-8")
+
+
+def _corrections():
+    corrections = [
+        {
+            "correction_id": f"KB-{i:03d}",
+            "correction_type": "precio",
+            "description": "Ajuste de precio",
+            "changes": {"product_id": f"PROD_{i % 20}", "espesor": 100, "nuevo_precio": 200 + i},
+        }
+        for i in range(60)
+    ]
+    corrections.append({
+        "correction_id": "KB-BAD",
+        "correction_type": "precio",
+        "description": "Producto inexistente",
+        "changes": {"product_id": "NOPE", "espesor": 100, "nuevo_precio": 1},
+    })
+    corrections.append({
+        "correction_id": "KB-TXT",
+        "correction_type": "instrucciones",
+        "description": "Texto",
+        "changes": {"replace": {"precio viejo": "precio nuevo"}},
+        "affected_files": ["notes.txt"],
+    })
+    return corrections
+
+
+def test_batch_matches_sequential_application(tmp_path):
+    sequential_root = tmp_path / "sequential"
+    batch_root = tmp_path / "batch"
+    for root in (sequential_root, batch_root):
+        root.mkdir()
+        _make_project(root)
+
+    sequential = GPTCorrectionAgent(project_root=str(sequential_root), backup_enabled=False)
+    for correction in _corrections():
+        sequential.apply_correction(**correction)
+
+    agent = GPTCorrectionAgent(project_root=str(batch_root), backup_enabled=True)
+    summary = agent.batch_apply_corrections(_corrections())
+
+    assert summary["successful"] == 61
+    assert summary["failed"] == 1
+    assert summary["files_written"] == 2
+    failed = [r for r in summary["results"] if not r["success"]]
+    assert failed[0]["correction_id"] == "KB-BAD"
+
+    for name in (KB_FILE, "notes.txt"):
+        assert (batch_root / name).read_text(encoding="utf-8") == (sequential_root / name).read_text(encoding="utf-8")
+
+    # Un único backup para todo el lote
+    backups = list((batch_root / ".corrections_backup").iterdir())
+    assert len(backups) == 1
+
+
+def test_batch_rejects_file_when_validation_regresses(tmp_path):
+    _make_project(tmp_path)
+    original = (tmp_path / KB_FILE).read_text(encoding="utf-8")
+    agent = GPTCorrectionAgent(project_root=str(tmp_path), backup_enabled=False)
+
+    summary = agent.batch_apply_corrections([
+        {
+            "correction_id": "KB-001",
+            "correction_type": "precio",
+            "description": "Ajuste",
+            "changes": {"product_id": "PROD_1", "espesor": 50, "nuevo_precio": 99},
+        },
+        {
+            "correction_id": "KB-002",
+            "correction_type": "generic",
+            "description": "Rompe estructura",
+            "changes": {"products": None},
+            "affected_files": [KB_FILE],
+        },
+    ])
+
+    assert summary["failed"] == 2
+    assert (tmp_path / KB_FILE).read_text(encoding="utf-8") == original
+    assert not (tmp_path / (KB_FILE + ".tmp")).exists()
+
+
+@pytest.mark.parametrize("changes", [
+    {"nombre": "sin product_id"},
+    {"product_id": "PROD_NEW", "nombre": "Nuevo", "nuevo_espesor": {"valor": 80}},
+])
+def test_dropped_correction_leaves_no_partial_changes(tmp_path, changes):
+    # Un archivo sin 'products': la corrección inválida no debe crearlo ni
+    # dejar el producto a medias cuando otra corrección del lote escribe el archivo
+    (tmp_path / "extra.json").write_text(json.dumps({"meta": {"version": "1.0"}}), encoding="utf-8")
+    agent = GPTCorrectionAgent(project_root=str(tmp_path), backup_enabled=False)
+
+    summary = agent.batch_apply_corrections([
+        {
+            "correction_id": "KB-BAD",
+            "correction_type": "producto",
+            "description": "Inválida",
+            "changes": changes,
+            "affected_files": ["extra.json"],
+        },
+        {
+            "correction_id": "KB-OK",
+            "correction_type": "reglas_negocio",
+            "description": "Válida",
+            "changes": {"iva": "22%"},
+            "affected_files": ["extra.json"],
+        },
+    ])
+
+    assert [r["success"] for r in summary["results"]] == [False, True]
+    data = json.loads((tmp_path / "extra.json").read_text(encoding="utf-8"))
+    assert "products" not in data
+    assert data["reglas_negocio"] == {"iva": "22%"}
+    assert [c["id"] for c in data["meta"]["correcciones"]] == ["KB-OK"]
+
+
+def test_batch_saves_a_report_per_correction(tmp_path):
+    _make_project(tmp_path)
+    agent = GPTCorrectionAgent(project_root=str(tmp_path), backup_enabled=False)
+
+    agent.batch_apply_corrections(_corrections()[:3])
+
+    reports = sorted(p.name for p in (tmp_path / "docs" / "corrections").glob("KB-*.json"))
+    assert [name.split("_")[0] for name in reports] == ["KB-000", "KB-001", "KB-002"]
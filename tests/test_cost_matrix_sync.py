@@ -0,0 +1,178 @@
+"""
+Tests de las actualizaciones por lotes de la matriz de costos y del envío
+incremental (solo filas modificadas) con el backend local de prueba.
+"""
+
+import json
+import subprocess
+import sys
+import textwrap
+import threading
+from pathlib import Path
+
+import pytest
+
+from agente_kb_indexing import COST_MATRIX_REL_PATH, KBIndexingAgent
+from cost_matrix_sync import CostMatrixSyncQueue, LocalSyncBackend
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _product(code, cost):
+    return {
+        "codigo": code,
+        "nombre": f"Panel {code}",
+        "costos": {"fabrica_directo": {"costo_base_usd_iva": cost}},
+        "precios": {"empresa": {"venta_iva_usd": cost * 1.3}},
+    }
+
+
+@pytest.fixture
+def cost_matrix(tmp_path):
+    path = tmp_path / "kb" / COST_MATRIX_REL_PATH
+    path.parent.mkdir(parents=True)
+    products = [_product(f"P{i:03d}", 10.0 + i) for i in range(50)]
+    path.write_text(json.dumps({"meta": {"version": 1}, "productos": {"todos": products}}), encoding="utf-8")
+    return path
+
+
+def _agent(cost_matrix, backend, debounce_s=None):
+    return KBIndexingAgent(kb_path=cost_matrix.parents[3], sync_backend=backend, sync_debounce_s=debounce_s)
+
+
+def _on_disk(cost_matrix):
+    data = json.loads(cost_matrix.read_text(encoding="utf-8"))
+    return {p["codigo"]: p for p in data["productos"]["todos"]}
+
+
+def test_batch_update_writes_once_and_pushes_only_dirty_rows(cost_matrix):
+    backend = LocalSyncBackend()
+    agent = _agent(cost_matrix, backend)
+    result = agent.update_product_prices([
+        {"code": "P003", "new_value": 99.0},
+        {"code": "p007", "new_value": 55.5, "field": "precio_venta"},
+        {"code": "P003", "new_value": 101.0},
+    ])
+    assert result["status"] == "success"
+    assert result["sync_status"] == "queued"
+    assert result["codes"] == ["P003", "P007"]
+    assert backend.pushes == []
+
+    products = _on_disk(cost_matrix)
+    assert products["P003"]["costos"]["fabrica_directo"]["costo_base_usd_iva"] == 101.0
+    assert products["P007"]["precios"]["empresa"]["venta_iva_usd"] == 55.5
+    assert products["P007"]["metadata"]["last_editor"] == "AI Agent"
+    assert products["P010"] == _product("P010", 20.0)
+
+    flushed = agent.flush_cost_matrix_sync()
+    assert flushed["pushed"] == 2
+    assert backend.pushes == [["P003", "P007"]]
+    assert backend.rows["P003"] == products["P003"]
+    assert agent.get_sync_status()["pending_sync"] == 0
+    assert agent.flush_cost_matrix_sync()["status"] == "noop"
+
+
+def test_batch_is_all_or_nothing(cost_matrix):
+    backend = LocalSyncBackend()
+    agent = _agent(cost_matrix, backend)
+    before = cost_matrix.read_text(encoding="utf-8")
+    assert "error" in agent.update_product_prices([{"code": "P001", "new_value": 1.0}, {"code": "NOPE", "new_value": 2.0}])
+    assert "error" in agent.update_product_prices([{"code": "P001", "new_value": 1.0, "field": "stock"}])
+    assert cost_matrix.read_text(encoding="utf-8") == before
+    assert agent.get_cost_matrix_product("P001")["product"] == _product("P001", 11.0)
+    assert backend.pushes == []
+
+
+def test_single_update_keeps_legacy_result_and_pushes_inline(cost_matrix):
+    backend = LocalSyncBackend()
+    agent = _agent(cost_matrix, backend, debounce_s=0)
+    result = agent.update_product_price("P002", 77.0)
+    assert result["status"] == "success"
+    assert result["sync_status"] == "synced_to_local"
+    assert result["product"]["costos"]["fabrica_directo"]["costo_base_usd_iva"] == 77.0
+    assert result["last_sync_at"] is not None
+    assert backend.pushes == [["P002"]]
+
+
+def test_external_file_change_is_reloaded_before_update(cost_matrix):
+    agent = _agent(cost_matrix, LocalSyncBackend())
+    assert agent.get_cost_matrix_product("P001")["product"]["nombre"] == "Panel P001"
+    data = json.loads(cost_matrix.read_text(encoding="utf-8"))
+    data["productos"]["todos"][1]["nombre"] = "Renombrado en la planilla"
+    cost_matrix.write_text(json.dumps(data, indent=4), encoding="utf-8")
+    agent.update_product_prices([{"code": "P002", "new_value": 5.0}])
+    assert _on_disk(cost_matrix)["P001"]["nombre"] == "Renombrado en la planilla"
+
+
+def test_failed_push_keeps_rows_dirty(cost_matrix):
+    backend = LocalSyncBackend(fail=True)
+    agent = _agent(cost_matrix, backend)
+    agent.update_product_prices([{"code": "P001", "new_value": 1.0}])
+    failed = agent.flush_cost_matrix_sync()
+    assert failed["status"] == "failed"
+    assert agent.get_sync_status()["pending_sync"] == 1
+
+    agent.update_product_prices([{"code": "P001", "new_value": 2.0}, {"code": "P004", "new_value": 4.0}])
+    backend.fail = False
+    assert agent.flush_cost_matrix_sync()["pushed"] == 2
+    assert backend.rows["P001"]["costos"]["fabrica_directo"]["costo_base_usd_iva"] == 2.0
+
+
+def test_queue_debounces_consecutive_edits():
+    backend = LocalSyncBackend()
+    done = threading.Event()
+    queue = CostMatrixSyncQueue(backend, debounce_s=0.05, on_synced=lambda result: done.set())
+    for i in range(5):
+        queue.mark_dirty([_product("P001", float(i)), _product(f"N{i}", 1.0)])
+    assert done.wait(5)
+    assert backend.pushes == [["P001", "N0", "N1", "N2", "N3", "N4"]]
+    assert backend.rows["P001"]["costos"]["fabrica_directo"]["costo_base_usd_iva"] == 4.0
+
+
+def test_no_backend_without_credentials(cost_matrix, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    agent = KBIndexingAgent(kb_path=cost_matrix.parents[3])
+    result = agent.update_product_price("P001", 3.0)
+    assert result["sync_status"] == "skipped_no_creds"
+
+
+def test_single_update_pushes_inline_even_when_debounced(cost_matrix):
+    backend = LocalSyncBackend()
+    agent = _agent(cost_matrix, backend, debounce_s=60)
+    result = agent.update_product_price("P002", 77.0)
+    assert result["sync_status"] == "synced_to_local"
+    assert backend.pushes == [["P002"]]
+
+
+def test_close_pushes_pending_rows(cost_matrix):
+    backend = LocalSyncBackend()
+    agent = _agent(cost_matrix, backend, debounce_s=60)
+    agent.update_product_prices([{"code": "P001", "new_value": 1.0}])
+    assert backend.pushes == []
+    assert agent.close()["pushed"] == 1
+    assert backend.pushes == [["P001"]]
+
+
+def test_queued_edit_is_pushed_at_process_exit(cost_matrix, tmp_path):
+    # Un proceso corto (CLI, una acción del GPT) termina antes del debounce:
+    # el hook de salida envía las filas pendientes
+    pushed = tmp_path / "pushed.json"
+    script = textwrap.dedent(f"""
+        import json, sys
+        from pathlib import Path
+        sys.path.insert(0, {str(ROOT)!r})
+        from agente_kb_indexing import KBIndexingAgent
+        from cost_matrix_sync import LocalSyncBackend
+
+        class FileBackend(LocalSyncBackend):
+            def push_rows(self, products):
+                with open({str(pushed)!r}, "w") as f:
+                    json.dump([p["codigo"] for p in products], f)
+                return super().push_rows(products)
+
+        agent = KBIndexingAgent(kb_path=Path({str(cost_matrix.parents[3])!r}), sync_backend=FileBackend(), sync_debounce_s=60)
+        result = agent.update_product_prices([{{"code": "P005", "new_value": 9.0}}])
+        assert result["sync_status"] == "queued", result
+    """)
+    subprocess.run([sys.executable, "-c", script], check=True, timeout=60)
+    assert json.loads(pushed.read_text()) == ["P005"]
@@ -24,3 +24,41 @@ def test_get_client(mock_authorize, mock_creds, tmp_path):
     client = gsheets_manager.get_client(str(creds_file))
     assert mock_creds.from_service_account_file.called
     assert mock_authorize.called
+
+
+def _worksheet(codes):
+    ws = MagicMock()
+    ws.col_values.return_value = codes
+    return ws
+
+
+@patch('panelin_improvements.cost_matrix_tools.gsheets_manager.get_client')
+def test_push_rows_updates_only_given_products(mock_client):
+    ws = _worksheet(["codigo", "A1", "B2", "C3"])
+    mock_client.return_value.open.return_value.worksheet.return_value = ws
+    products = [
+        {"codigo": "C3", "nombre": "Panel C", "costos": {"fabrica_directo": {"costo_base_usd_iva": 12.5}}},
+        {"codigo": "NEW", "nombre": "Nuevo"},
+    ]
+
+    result = gsheets_manager.push_rows("creds.json", "Sheet", products)
+
+    assert result == {"updated": 1, "appended": 1}
+    ws.col_values.assert_called_once_with(gsheets_manager._build_headers().index("codigo") + 1)
+    (updates,), _ = ws.batch_update.call_args
+    assert [u["range"] for u in updates] == ["A4"]
+    assert updates[0]["values"] == [gsheets_manager._product_row(products[0])]
+    (appended,), _ = ws.append_rows.call_args
+    assert appended == [gsheets_manager._product_row(products[1])]
+    assert not ws.clear.called
+
+
+@patch('panelin_improvements.cost_matrix_tools.gsheets_manager.get_client')
+def test_push_rows_on_empty_sheet_writes_headers(mock_client):
+    ws = _worksheet([])
+    mock_client.return_value.open.return_value.worksheet.return_value = ws
+    result = gsheets_manager.push_rows("creds.json", "Sheet", [{"codigo": "A1"}])
+    assert result == {"updated": 0, "appended": 1}
+    (appended,), _ = ws.append_rows.call_args
+    assert appended[0] == gsheets_manager._build_headers()
+    assert not ws.batch_update.called
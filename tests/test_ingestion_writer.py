@@ -0,0 +1,124 @@
+"""
+Tests del escritor SQLite de la tabla de ingestion (IngestionWriter) y de la
+re-ingesta del CSV de cotizaciones sin duplicados.
+"""
+
+import csv
+import json
+import sqlite3
+
+import pytest
+
+from agente_ingestion_analisis import AgenteIngestionAnalisis, IngestionRecord
+from ingestion_writer import IngestionWriter
+
+
+def _record(i, query=None, metadata=None):
+    return IngestionRecord(
+        id=f"ig_{i}",
+        source="instagram",
+        platform="instagram",
+        timestamp=f"2025-01-{i % 28 + 1:02d}",
+        user_query=query if query is not None else f"consulta {i}",
+        metadata=metadata if metadata is not None else {"n": i},
+    )
+
+
+def _rows(db_path):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("SELECT id, user_query, metadata FROM ingestion_table ORDER BY id").fetchall()
+    conn.close()
+    return rows
+
+
+@pytest.fixture
+def agent(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    agent = AgenteIngestionAnalisis(db_path=str(tmp_path / "ingestion.db"))
+    agent.csv_inputs = str(tmp_path / "cotizaciones.csv")
+    # Sin APIs ni MongoDB: solo el CSV
+    agent.social_engine = agent.ml_client = agent.mongodb_client = None
+    yield agent
+    agent.close()
+
+
+def _write_csv(path, rows):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Administrador de Cotizaciones"])
+        writer.writerow(["Fecha", "Cliente", "Consulta", "Producto"])
+        writer.writerows(rows)
+
+
+def test_write_many_batches_and_upserts(agent):
+    writer = IngestionWriter(agent.db_path, batch_size=7, commit_rows=20)
+    assert writer.write_many(_record(i) for i in range(50)) == 50
+    assert writer.write_many([_record(3, query="editada", metadata={"v": 2})]) == 1
+    writer.close()
+
+    rows = _rows(agent.db_path)
+    assert len(rows) == 50
+    assert ("ig_3", "editada", json.dumps({"v": 2})) in rows
+    conn = sqlite3.connect(agent.db_path)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    conn.close()
+
+
+def test_bad_rows_do_not_drop_the_batch(agent, capsys):
+    writer = IngestionWriter(agent.db_path, batch_size=10)
+    records = [_record(i) for i in range(10)]
+    records[4].user_query = None  # NOT NULL
+    assert writer.write_many(records) == 9
+    writer.close()
+    assert len(_rows(agent.db_path)) == 9
+    assert "ig_4" in capsys.readouterr().out
+
+
+def test_bounded_queue_persists_everything(agent):
+    writer = IngestionWriter(agent.db_path, batch_size=5, queue_batches=2).start()
+    writer.submit(_record(i) for i in range(40))
+    writer.submit([_record(i) for i in range(40, 43)])
+    assert writer.join() == 43
+    writer.close()
+    assert len(_rows(agent.db_path)) == 43
+
+
+def test_save_to_database_keeps_existing_rows_format(agent):
+    assert agent._save_to_database([_record(1), _record(2, metadata={})]) == 2
+    assert _rows(agent.db_path) == [
+        ("ig_1", "consulta 1", json.dumps({"n": 1})),
+        ("ig_2", "consulta 2", None),
+    ]
+
+
+def test_reingesting_the_csv_does_not_duplicate(agent, tmp_path):
+    _write_csv(agent.csv_inputs, [
+        ["2025-01-02", "Ana", "Isodec 100mm para 40 m2", "ISODEC"],
+        ["2025-01-03", "Luis", "", "ISOPANEL"],
+        ["2025-01-04", "Eva", "Isoroof 50mm"],
+    ])
+    first = agent.generar_tabla_ingestion()
+    assert first["by_source"] == {"quote": 2}
+    agent.generar_tabla_ingestion()
+    assert len(_rows(agent.db_path)) == 2
+
+    # Fila nueva al final: solo se agrega esa
+    with open(agent.csv_inputs, "a", encoding="utf-8", newline="") as f:
+        csv.writer(f).writerow(["2025-01-05", "Juan", "Isowall 80mm", "ISOWALL"])
+    agent.generar_tabla_ingestion()
+    rows = _rows(agent.db_path)
+    assert len(rows) == 3
+    metadata = [json.loads(m) for _, _, m in rows]
+    assert sorted(m["fila"] for m in metadata) == [3, 5, 6]
+    assert {m["producto"] for m in metadata} == {"ISODEC", "", "ISOWALL"}
+
+
+def test_quote_records_match_csv_columns(agent):
+    _write_csv(agent.csv_inputs, [["2025-01-02", " Ana ", " Isodec 100mm ", "ISODEC"]])
+    (record,) = agent._ingest_quotes()
+    assert record.timestamp == "2025-01-02"
+    assert record.user_query == "Isodec 100mm"
+    assert record.metadata == {
+        "cliente": "Ana", "producto": "ISODEC", "dimensiones": "", "luz": "",
+        "fijacion": "", "notas": "", "fila": 3,
+    }
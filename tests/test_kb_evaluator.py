@@ -0,0 +1,74 @@
+"""
+Tests de la evaluación por lotes de KnowledgeBaseEvaluator.
+
+Los puntajes con tokens compartidos, en paralelo y con agregados en una
+pasada deben ser idénticos al camino original (benchmarks/bench_kb_evaluator).
+"""
+
+import pytest
+
+from benchmarks.bench_kb_evaluator import legacy_benchmark, synthetic_dataset
+from kb_training_system.kb_evaluator import (
+    BenchmarkAccumulator,
+    KnowledgeBaseEvaluator,
+    tokenize_sample,
+)
+
+
+AGGREGATES = [
+    "average_relevance", "average_groundedness", "average_coherence", "average_accuracy",
+    "source_compliance_rate", "leak_rate", "kb_coverage_score", "instruction_effectiveness",
+    "detailed_metrics",
+]
+
+
+def _scores(result):
+    return (result.metrics, result.leaks_detected, result.recommendations, result.source_validation)
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    return synthetic_dataset(600, seed=5)
+
+
+def test_shared_tokens_give_the_same_metric_scores(dataset):
+    evaluator = KnowledgeBaseEvaluator()
+    for sample in dataset[:200]:
+        query, response = sample["query"], sample["response"]
+        truth = sample.get("ground_truth")
+        tokens = tokenize_sample(query, response, truth)
+        assert evaluator._calculate_relevance(query, response, tokens) == evaluator._calculate_relevance(query, response)
+        assert evaluator._calculate_coherence(response, tokens) == evaluator._calculate_coherence(response)
+        if truth:
+            assert (evaluator._calculate_accuracy(response, truth, tokens)
+                    == evaluator._calculate_accuracy(response, truth))
+
+
+def test_benchmark_matches_the_original_aggregation(dataset):
+    expected = legacy_benchmark(KnowledgeBaseEvaluator(), dataset)
+    benchmark = KnowledgeBaseEvaluator().benchmark_architecture(dataset, chunk_size=64)
+    assert benchmark.total_evaluations == len(dataset)
+    for key in AGGREGATES:
+        assert getattr(benchmark, key) == expected[key], key
+
+
+def test_process_pool_gives_identical_results_in_order(dataset):
+    serial = KnowledgeBaseEvaluator().evaluate_batch(dataset)
+    evaluator = KnowledgeBaseEvaluator()
+    pooled = evaluator.evaluate_batch(dataset, workers=2, chunk_size=50)
+    assert [r.query for r in pooled] == [s["query"] for s in dataset]
+    assert [_scores(r) for r in pooled] == [_scores(r) for r in serial]
+    assert len(evaluator.evaluation_history) == len(dataset)
+
+
+def test_evaluate_interaction_still_records_history():
+    evaluator = KnowledgeBaseEvaluator()
+    result = evaluator.evaluate_interaction("¿Precio de isodec?", "El precio es $45", ["BMC_Base_Conocimiento_GPT.json"])
+    assert evaluator.evaluation_history == [result]
+
+
+def test_empty_dataset():
+    benchmark = BenchmarkAccumulator().build()
+    assert benchmark.total_evaluations == 0
+    assert benchmark.average_relevance == 0.0
+    assert benchmark.detailed_metrics["relevance_distribution"] == {}
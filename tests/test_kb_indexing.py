@@ -21,3 +21,74 @@ def test_index_json_structure():
     assert any(item["key"] == "key1" for item in index)
     # Check if subkey is indexed
     assert any(item["key"] == "subkey" for item in index)
+
+
+# --- Índice invertido persistido (kb_search_index) ---------------------------
+
+KB_FILE = "BMC_Base_Conocimiento_GPT-2.json"
+WEB_FILE = "panelin_truth_bmcuruguay_web_only_v2.json"
+
+
+def _write_kb(kb_dir, products):
+    master = {
+        "products": {
+            name: {"espesores": {"100": {"precio": price, "autoportancia": 5.5}}, "nombre": f"Panel {name}"}
+            for name, price in products.items()
+        },
+        "formulas_cotizacion": {"paneles": "ROUNDUP(ancho / ancho_util)"},
+        "reglas_negocio": {"iva": "22%", "sistema_de_fijacion": "varilla roscada"},
+    }
+    (kb_dir / KB_FILE).write_text(json.dumps(master), encoding="utf-8")
+    (kb_dir / WEB_FILE).write_text(json.dumps({"meta": {"fuente": "web isodec"}}), encoding="utf-8")
+
+
+@pytest.fixture
+def kb_agent(tmp_path):
+    kb_dir = tmp_path / "kb"
+    kb_dir.mkdir()
+    _write_kb(kb_dir, {"ISODEC_EPS": 45.2, "ISOPANEL_EPS": 41.0, "ISOROOF_3G": 38.5})
+    return KBIndexingAgent(kb_path=kb_dir, index_path=tmp_path / "index" / "kb.sqlite")
+
+
+@pytest.mark.parametrize("query", ["isodec", "ISODEC eps", "precio", "o_e", "", "?", "varilla roscada",
+                                   "sistema de fijacion", "panel isoroof_3g", "zzz"])
+@pytest.mark.parametrize("search_type", ["hybrid", "keyword", "structured", "semantic"])
+@pytest.mark.parametrize("level", [None, 1, 3])
+def test_index_search_matches_linear_scan(kb_agent, query, search_type, level):
+    for max_results in (1, 3, 50):
+        expected = kb_agent._scan_search(query, level, search_type, max_results)
+        assert kb_agent.search_kb(query, level, search_type, max_results)["results"] == expected
+
+
+def test_index_is_persisted_and_refreshed_incrementally(kb_agent, tmp_path):
+    first = kb_agent.refresh_search_index()
+    assert sorted(first["reindexed"]) == sorted([KB_FILE, WEB_FILE])
+    kb_agent._search_index.close()
+
+    # Un agente nuevo abre el índice sin reindexar
+    agent = KBIndexingAgent(kb_path=kb_agent.kb_path, index_path=kb_agent.index_path)
+    assert agent.refresh_search_index() == {"reindexed": [], "unchanged": 2, "removed": []}
+
+    # Solo se reindexa el archivo cuyo hash cambió
+    _write_kb(kb_agent.kb_path, {"ISODEC_EPS": 45.2, "ISOWALL_PIR": 60.0})
+    assert agent.refresh_search_index()["reindexed"] == [KB_FILE]
+    assert agent.search_kb("isowall")["results"][0]["entry"]["path"].startswith("products.ISOWALL_PIR")
+    assert not any("ISOROOF" in r["entry"]["path"] for r in agent.search_kb("isoroof")["results"])
+
+    (kb_agent.kb_path / WEB_FILE).unlink()
+    assert agent.refresh_search_index()["removed"] == [WEB_FILE]
+
+
+def test_search_kb_path_prefix(kb_agent):
+    result = kb_agent.search_kb_path("products.ISODEC_EPS.espesores")
+    paths = [r["entry"]["path"] for r in result["results"]]
+    assert paths and all(p.startswith("products.ISODEC_EPS.espesores") for p in paths)
+    assert paths == sorted(paths)
+    assert kb_agent.search_kb_path("products.", level_priority=3)["total_matches"] == 0
+
+
+def test_search_falls_back_to_scan_when_index_unusable(tmp_path, kb_agent):
+    blocker = tmp_path / "not_a_dir"
+    blocker.write_text("x")
+    agent = KBIndexingAgent(kb_path=kb_agent.kb_path, index_path=blocker / "kb.sqlite")
+    assert agent.search_kb("isodec")["results"] == kb_agent.search_kb("isodec")["results"]
@@ -0,0 +1,174 @@
+"""
+Tests del detector de fugas de conocimiento (kb_training_system.kb_leak_detector).
+
+Verifican que el escaneo en una sola pasada produzca exactamente las mismas
+fugas que el algoritmo original (una regex/keyword por vez) y el historial
+append-only en JSONL.
+"""
+
+import json
+import random
+import re
+
+import pytest
+
+from kb_training_system.kb_leak_detector import KnowledgeBaseLeakDetector
+
+
+# --- Algoritmo original, copiado como referencia de paridad -----------------
+
+LEGACY_MISSING = [
+    r"no tengo (esa|la) información",
+    r"no (está|estan) disponible",
+    r"no encuentro",
+    r"no sé",
+    r"no disponible en base",
+    r"no (tengo|tiene) (esa|ese|esa) (información|dato|precio)",
+]
+LEGACY_SPECIFIC = {
+    "precio": ["precio", "costo", "valor", "$"],
+    "espesor": ["espesor", "thickness", "grosor"],
+    "autoportancia": ["autoportancia", "luz", "span", "distancia"],
+    "fórmula": ["fórmula", "cálculo", "formula", "calcular"],
+}
+LEGACY_GENERIC = ["en general", "típicamente", "usualmente", "puede variar", "depende"]
+
+
+def legacy_category(query):
+    q = query.lower()
+    if any(kw in q for kw in ["precio", "costo", "valor", "$"]):
+        return "pricing"
+    if any(kw in q for kw in ["espesor", "thickness", "grosor"]):
+        return "specifications"
+    if any(kw in q for kw in ["autoportancia", "luz", "span"]):
+        return "specifications"
+    if any(kw in q for kw in ["fórmula", "calcular", "cálculo"]):
+        return "formulas"
+    return "general"
+
+
+def legacy_missing_info(query):
+    q = query.lower()
+    found = [kw for kw in ["isodec", "isoroof", "isopanel", "isowall"] if kw in q]
+    if found:
+        return f"Information about {', '.join(found)}"
+    measurements = re.findall(r'\d+\s*(mm|m|cm)', q)
+    if measurements:
+        return f"Information for {measurements[0]} specification"
+    return "General information requested in query"
+
+
+def legacy_leaks(query, response, sources):
+    out = []
+    r, q = response.lower(), query.lower()
+    for pattern in LEGACY_MISSING:
+        if re.search(pattern, r):
+            out.append(("missing_info", legacy_category(query), legacy_missing_info(query)))
+    for kind, kws in LEGACY_SPECIFIC.items():
+        if any(kw in q for kw in kws) and not any(kw in r for kw in kws):
+            if not any(p in r for p in LEGACY_MISSING):
+                out.append(("missing_info", kind, f"Specific {kind} data not provided"))
+    if not sources and any(p in r for p in LEGACY_GENERIC):
+        out.append(("coverage_gap", legacy_category(query), None))
+    return out
+
+
+QUERY_PARTS = ["precio", "Costo", "valor $", "espesor", "grosor", "luz", "span", "distancia",
+               "fórmula", "calcular", "Isodec", "isopanel", "isowall", "100 mm", "6m", "de", "para"]
+RESPONSE_PARTS = ["No tengo esa información", "no tengo la información", "no está disponible",
+                  "no estan disponible", "no encuentro", "no sé", "no disponible en base",
+                  "no tiene ese dato", "no tengo esa precio", "en general", "depende", "usualmente",
+                  "el precio es", "espesor 100", "luz 5.5", "ok", "cálculo", "no (está|estan) disponible"]
+
+
+def _corpus(n, seed=11):
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(n):
+        corpus.append({
+            "query": " ".join(rng.sample(QUERY_PARTS, rng.randint(0, 4))),
+            "response": ", ".join(rng.sample(RESPONSE_PARTS, rng.randint(0, 4))),
+            "sources": rng.choice([[], ["BMC_Base_Conocimiento_GPT.json"]]),
+        })
+    return corpus
+
+
+@pytest.fixture
+def detector(tmp_path):
+    return KnowledgeBaseLeakDetector(leak_history_path=str(tmp_path))
+
+
+def _summary(leaks):
+    return [(l.leak_type, l.category, l.missing_information) for l in leaks]
+
+
+class TestParity:
+    def test_matches_legacy_algorithm_on_fuzzed_corpus(self, detector):
+        for item in _corpus(400):
+            leaks = detector.detect_leaks_in_interaction(item["query"], item["response"], item["sources"])
+            assert _summary(leaks) == legacy_leaks(item["query"], item["response"], item["sources"]), item
+
+    def test_overlapping_patterns_each_produce_a_leak(self, detector):
+        # "no tengo esa información" cumple los patrones 0 y 5
+        leaks = detector.detect_leaks_in_interaction("precio isodec", "No tengo esa información", ["x"])
+        pattern_leaks = [l for l in leaks if l.category == "pricing"]
+        assert len(pattern_leaks) == 2
+        assert all(l.severity == "critical" for l in pattern_leaks)
+        assert pattern_leaks[0].missing_information == "Information about isodec"
+
+    def test_batch_equals_per_interaction(self, tmp_path):
+        corpus = _corpus(200, seed=3)
+        single = KnowledgeBaseLeakDetector(leak_history_path=str(tmp_path / "a"))
+        batch = KnowledgeBaseLeakDetector(leak_history_path=str(tmp_path / "b"))
+        expected = [l for item in corpus
+                    for l in single.detect_leaks_in_interaction(item["query"], item["response"], item["sources"])]
+        assert _summary(batch.detect_leaks_batch(corpus)) == _summary(expected)
+
+
+class TestHistory:
+    def test_leaks_are_appended_and_reloaded(self, tmp_path, detector):
+        detector.detect_leaks_in_interaction("precio", "no sé", [])
+        detector.detect_leaks_in_interaction("espesor", "ok", [])
+        lines = (tmp_path / "leak_history.jsonl").read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 2
+        reloaded = KnowledgeBaseLeakDetector(leak_history_path=str(tmp_path))
+        assert _summary(reloaded.detected_leaks) == _summary(detector.detected_leaks)
+
+    def test_corrupt_lines_are_skipped_and_compacted_away(self, tmp_path, detector):
+        detector.detect_leaks_in_interaction("precio", "no sé", [])
+        with open(tmp_path / "leak_history.jsonl", "a", encoding="utf-8") as f:
+            f.write('{"leak_id": "torn\n')
+        reloaded = KnowledgeBaseLeakDetector(leak_history_path=str(tmp_path))
+        assert len(reloaded.detected_leaks) == 1
+        reloaded.compact_history()
+        assert len((tmp_path / "leak_history.jsonl").read_text(encoding="utf-8").splitlines()) == 1
+
+    def test_max_history_trims_memory_and_compacts_log(self, tmp_path):
+        detector = KnowledgeBaseLeakDetector(leak_history_path=str(tmp_path), max_history=5, compact_every=4)
+        for _ in range(6):
+            detector.detect_leaks_in_interaction("espesor", "ok", [])
+        assert len(detector.detected_leaks) == 5
+        lines = (tmp_path / "leak_history.jsonl").read_text(encoding="utf-8").splitlines()
+        # Compacta al llegar a 4 agregados (quedan 4) y después suma 2 más
+        assert len(lines) == 6
+        assert len(KnowledgeBaseLeakDetector(leak_history_path=str(tmp_path), max_history=5).detected_leaks) == 5
+
+    def test_legacy_json_is_migrated(self, tmp_path, detector):
+        detector.detect_leaks_in_interaction("precio", "no sé", [])
+        legacy = {"timestamp": "x", "leaks": [json.loads(line) for line in
+                  (tmp_path / "leak_history.jsonl").read_text(encoding="utf-8").splitlines()]}
+        other = tmp_path / "legacy"
+        other.mkdir()
+        (other / "leak_history.json").write_text(json.dumps(legacy), encoding="utf-8")
+        migrated = KnowledgeBaseLeakDetector(leak_history_path=str(other))
+        assert _summary(migrated.detected_leaks) == _summary(detector.detected_leaks)
+        assert (other / "leak_history.jsonl").exists()
+        assert (other / "leak_history.json").exists()
+
+
+def test_analyze_reports_throughput(tmp_path, detector):
+    report = detector.analyze_leak_patterns(_corpus(50))
+    assert report.throughput["interactions"] == 50
+    assert report.throughput["leaks"] == report.total_leaks
+    text = detector.export_leak_report(report, str(tmp_path / "report.md"))
+    assert "Throughput:" in text
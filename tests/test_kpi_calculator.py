@@ -0,0 +1,60 @@
+import json
+
+from kpi_calculator import KPIAccumulator, KPICalculator
+
+
+def _make_bundle(n):
+    conversations = []
+    for i in range(n):
+        conversations.append({
+            "id": f"CONV_{i % 7:03d}",
+            "messages": [
+                {"role": "user", "content": "cotizar ISODEC 100mm 6x4",
+                 "timestamp": "2026-01-16T10:00:00Z",
+                 "annotations": {"intent": "cotizacion", "entities": [{"type": "product"}]}},
+                {"role": "assistant", "content": "Perfecto, ¿cuál es la luz entre apoyos?"},
+                {"role": "assistant", "content": "" if i % 3 else "ok"},
+            ],
+            "quality_scores": {"completeness": 0.5 + (i % 5) / 10, "accuracy": 0.9},
+            "metadata": {"outcome": "won" if i % 2 else "lost", "quotation_generated": i % 4 == 0},
+        })
+    return {"meta": {"version": "1.0.0", "training_type": ["both"]}, "conversations": conversations}
+
+
+def _strip(report):
+    report.pop("calculated_at")
+    return report
+
+
+def test_single_pass_counts():
+    report = KPICalculator().calculate_all(_make_bundle(10))
+    kpis = report["kpis"]
+    assert kpis["basic"]["total_messages"] == 30
+    assert kpis["annotations"]["intent_distribution"] == {"cotizacion": 10}
+    assert kpis["quality"]["role_alternation_errors"] == 10
+    assert kpis["consistency"]["duplicate_conversation_ids"] == 3
+    assert kpis["training"]["classification_ready_conversations"] == 10
+    assert report["metadata"]["schema_version"] == "1.0.0"
+
+
+def test_merge_matches_single_accumulator():
+    bundle = _make_bundle(40)
+    whole = KPIAccumulator()
+    left, right = KPIAccumulator(), KPIAccumulator()
+    for i, conv in enumerate(bundle["conversations"]):
+        whole.add_conversation(conv)
+        (left if i < 15 else right).add_conversation(conv)
+    assert left.merge(right).build_kpis() == whole.build_kpis()
+
+
+def test_jsonl_sharded_matches_in_memory(tmp_path):
+    bundle = _make_bundle(200)
+    path = tmp_path / "bundle.jsonl"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"meta": bundle["meta"]}) + "\n")
+        for conv in bundle["conversations"]:
+            f.write(json.dumps(conv, ensure_ascii=False) + "\n")
+
+    expected = _strip(KPICalculator().calculate_all(bundle))
+    assert _strip(KPICalculator().calculate_jsonl(str(path))) == expected
+    assert _strip(KPICalculator().calculate_jsonl(str(path), workers=3)) == expected
@@ -0,0 +1,125 @@
+"""
+Tests del cache de respuestas del LLM (panelin_core.llm_cache).
+
+Todo corre offline con StubChatModel: se cuentan las llamadas reales al modelo
+para verificar hits, bypass y desalojo.
+"""
+
+import pytest
+
+pytest.importorskip("langchain_core")
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.tools import tool
+
+from panelin_core.llm_cache import CachedChatModel, LLMResponseCache, StubChatModel, cache_key
+
+
+@tool
+def get_price(product_id: str) -> str:
+    """Precio de un producto."""
+    return "46.07"
+
+
+@tool
+def get_stock(product_id: str) -> str:
+    """Stock de un producto."""
+    return "available"
+
+
+def _messages(question="precio isodec 100mm", system="Eres Panelin"):
+    return [SystemMessage(content=system), HumanMessage(content=question)]
+
+
+@pytest.fixture
+def stub():
+    return StubChatModel(responses={
+        "precio": AIMessage(content="", tool_calls=[
+            {"name": "get_price", "args": {"product_id": "ISODEC_EPS_100mm"}, "id": "call-1"},
+        ]),
+    })
+
+
+class TestCacheKey:
+    def test_ids_do_not_change_the_key(self):
+        a = [HumanMessage(content="hola", id="a"), ToolMessage(content="x", tool_call_id="call-1")]
+        b = [HumanMessage(content="hola", id="b"), ToolMessage(content="x", tool_call_id="call-9")]
+        assert cache_key("m", a) == cache_key("m", b)
+
+    @pytest.mark.parametrize("other", [
+        ("otro-modelo", _messages(), ()),
+        ("m", _messages(system="Otro prompt"), ()),
+        ("m", _messages(question="precio isodec 150mm"), ()),
+        ("m", _messages(), ({"type": "function", "function": {"name": "get_price"}},)),
+    ])
+    def test_every_component_is_part_of_the_key(self, other):
+        assert cache_key("m", _messages()) != cache_key(*other)
+
+
+class TestCachedChatModel:
+    def test_repeated_prompt_is_served_from_cache(self, stub):
+        cache = LLMResponseCache()
+        llm = CachedChatModel(stub, cache).bind_tools([get_price])
+
+        first = llm.invoke(_messages())
+        second = llm.invoke(_messages())
+
+        assert stub.calls == 1
+        assert second.tool_calls == first.tool_calls
+        assert second.id is None
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+    def test_bypass_always_calls_the_model(self, stub):
+        cache = LLMResponseCache()
+        llm = CachedChatModel(stub, cache).bind_tools([get_price])
+        llm.invoke(_messages())
+        llm.invoke(_messages(), bypass_cache=True)
+        assert stub.calls == 2
+        assert cache.stats()["bypasses"] == 1
+
+    def test_tool_schema_separates_entries(self, stub):
+        cache = LLMResponseCache()
+        CachedChatModel(stub, cache).bind_tools([get_price]).invoke(_messages())
+        CachedChatModel(stub, cache).bind_tools([get_price, get_stock]).invoke(_messages())
+        assert stub.calls == 2
+
+    def test_saved_latency_is_measured(self):
+        cache = LLMResponseCache()
+        llm = CachedChatModel(StubChatModel(latency_s=0.02), cache)
+        for _ in range(3):
+            llm.invoke(_messages())
+        assert cache.stats()["saved_latency_ms"] >= 2 * 20
+
+    def test_persists_across_instances(self, tmp_path, stub):
+        path = str(tmp_path / "llm_cache.db")
+        CachedChatModel(stub, LLMResponseCache(path)).invoke(_messages())
+        reopened = LLMResponseCache(path)
+        response = CachedChatModel(stub, reopened).invoke(_messages())
+        assert stub.calls == 1
+        assert response.tool_calls[0]["name"] == "get_price"
+
+
+class TestEviction:
+    def test_max_entries_evicts_least_recently_used(self):
+        stub = StubChatModel()
+        cache = LLMResponseCache(max_entries=2)
+        llm = CachedChatModel(stub, cache)
+        llm.invoke(_messages("a"))
+        llm.invoke(_messages("b"))
+        llm.invoke(_messages("a"))  # hit: "b" pasa a ser el menos reciente
+        llm.invoke(_messages("c"))
+
+        assert cache.stats()["evictions"] == 1
+        calls = stub.calls
+        llm.invoke(_messages("a"))
+        assert stub.calls == calls
+        llm.invoke(_messages("b"))
+        assert stub.calls == calls + 1
+
+    def test_max_bytes(self):
+        cache = LLMResponseCache(max_bytes=1500)
+        llm = CachedChatModel(StubChatModel(), cache)
+        for i in range(10):
+            llm.invoke(_messages(f"consulta {i} " + "x" * 200))
+        assert cache.stats()["bytes"] <= 1500
+        assert cache.stats()["evictions"] > 0
@@ -0,0 +1,138 @@
+"""
+Tests de la instrumentación Prometheus (panelin_core.metrics).
+
+Se verifican el formato de texto y el endpoint /metrics de la Wolf API
+scrapeándolo con TestClient, sin red ni prometheus_client.
+"""
+
+import re
+
+import pytest
+
+from panelin_core.metrics import MetricsRegistry, REGISTRY, instrument_app
+from panelin_core.tool_executor import ToolExecutor
+
+
+def _sample(text, name, **labels):
+    """Valor de la muestra name{labels} (labels parciales) o None."""
+    for line in text.splitlines():
+        if line.startswith("#") or not line.startswith(name):
+            continue
+        match = re.match(r"^(\w+)(?:\{(.*)\})? (\S+)$", line)
+        if match.group(1) != name:
+            continue
+        found = dict(re.findall(r'(\w+)="((?:[^"\\]|\\.)*)"', match.group(2) or ""))
+        if all(found.get(k) == str(v) for k, v in labels.items()):
+            return float(match.group(3))
+    return None
+
+
+class TestTextFormat:
+    def test_counter_gauge_histogram(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("jobs", "Trabajos", ("kind",))
+        gauge = registry.gauge("queue_depth", "Cola")
+        histogram = registry.histogram("job_seconds", "Duración", buckets=(0.1, 1.0))
+
+        counter.labels(kind="pdf").inc(3)
+        gauge.set(7)
+        for value in (0.05, 0.5, 5.0):
+            histogram.observe(value)
+
+        text = registry.render()
+        assert "# TYPE jobs counter" in text
+        assert 'jobs_total{kind="pdf"} 3' in text
+        assert "queue_depth 7" in text
+        assert 'job_seconds_bucket{le="0.1"} 1' in text
+        assert 'job_seconds_bucket{le="1"} 2' in text
+        assert 'job_seconds_bucket{le="+Inf"} 3' in text
+        assert "job_seconds_count 3" in text
+        assert _sample(text, "job_seconds_sum") == pytest.approx(5.55)
+
+    def test_label_escaping_and_validation(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("errors", "Errores", ("detail",))
+        counter.labels(detail='dijo "hola"\n').inc()
+        assert r'errors_total{detail="dijo \"hola\"\n"} 1' in registry.render()
+        with pytest.raises(ValueError):
+            counter.labels(other="x")
+        with pytest.raises(ValueError):
+            counter.inc()
+
+    def test_cache_collector(self):
+        registry = MetricsRegistry()
+        registry.register_cache("quotes", lambda: {"hits": 3, "misses": 1, "size": 4, "evictions": 0})
+        registry.register_cache("not_created", lambda: None)
+        text = registry.render()
+        assert _sample(text, "panelin_cache_hit_ratio", cache="quotes") == 0.75
+        assert _sample(text, "panelin_cache_entries", cache="quotes") == 4
+        assert 'cache="not_created"' not in text
+
+
+class TestMetricsEndpoint:
+    @pytest.fixture
+    def client(self, monkeypatch):
+        pytest.importorskip("fastapi")
+        from fastapi.testclient import TestClient
+        from panelin_agent_v2 import api
+
+        monkeypatch.setattr(api.settings, "WOLF_API_KEY", "test-key")
+        return TestClient(api.app)
+
+    def test_scrape_after_requests(self, client):
+        quote = {"product_id": "ISOPANEL_EPS_50mm", "length_m": 6.0, "width_m": 4.0}
+        before = _sample(client.get("/metrics").text, "panelin_http_request_duration_seconds_count",
+                         route="/calculate_quote", status="200") or 0
+        client.post("/calculate_quote", json=quote, headers={"X-API-Key": "test-key"})
+        client.post("/calculate_quote", json=quote, headers={"X-API-Key": "wrong"})
+
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        text = response.text
+
+        assert _sample(text, "panelin_http_request_duration_seconds_count",
+                       service="panelin_wolf_api", route="/calculate_quote", status="200") == before + 1
+        assert _sample(text, "panelin_http_request_duration_seconds_count",
+                       route="/calculate_quote", status="403") >= 1
+        assert _sample(text, "panelin_http_requests_in_flight", route="/calculate_quote") == 0
+        assert _sample(text, "panelin_cache_hit_ratio", cache="compiled_kb") is not None
+        assert _sample(text, "panelin_kb_load_seconds_count",
+                       kb="panelin_truth_bmcuruguay.json") >= 1
+
+    def test_route_template_keeps_cardinality_bounded(self, client):
+        client.get("/no/existe/123")
+        text = client.get("/metrics").text
+        assert _sample(text, "panelin_http_request_duration_seconds_count",
+                       route="unmatched", status="404") >= 1
+        assert "/no/existe/123" not in text
+
+    def test_in_flight_during_request(self):
+        pytest.importorskip("fastapi")
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        app = FastAPI()
+        instrument_app(app, service="test_service")
+
+        @app.get("/items/{item_id}")
+        def read_item(item_id: int):
+            return {"metrics": REGISTRY.render()}
+
+        inside = TestClient(app).get("/items/7").json()["metrics"]
+        assert _sample(inside, "panelin_http_requests_in_flight",
+                       service="test_service", route="/items/{item_id}") == 1
+
+
+def test_tool_call_latency_is_recorded():
+    executor = ToolExecutor({"metrics_probe": lambda args: 1, "metrics_broken": lambda args: 1 / 0})
+    try:
+        executor.run([
+            {"name": "metrics_probe", "args": {}, "id": "1"},
+            {"name": "metrics_broken", "args": {}, "id": "2"},
+        ])
+    finally:
+        executor.shutdown()
+    text = REGISTRY.render()
+    assert _sample(text, "panelin_tool_call_duration_seconds_count", tool="metrics_probe", status="ok") >= 1
+    assert _sample(text, "panelin_tool_call_duration_seconds_count", tool="metrics_broken", status="error") >= 1
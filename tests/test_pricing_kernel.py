@@ -0,0 +1,51 @@
+"""
+Tests de la KB compilada por versión de archivo (panelin_core.pricing_kernel).
+
+La aritmética de los calculadores es decimal.Decimal; acá se verifica que los
+precios se compilan una vez por versión del archivo y que se recompilan al
+cambiar la KB.
+"""
+
+from decimal import Decimal
+
+from panelin_core import pricing_kernel as pk
+
+
+class TestCompiledKB:
+    def test_prices_compiled_once_per_file_version(self, tmp_path):
+        kb_file = tmp_path / "kb.json"
+        kb_file.write_text('{"products": {"a": {"price_per_m2": 41.88}}}', encoding="utf-8")
+
+        first = pk.load_compiled_kb(kb_file)
+        assert first.price("a") == Decimal("41.88")
+        assert pk.load_compiled_kb(kb_file) is first
+
+        kb_file.write_text('{"products": {"a": {"price_per_m2": 45.125}}}', encoding="utf-8")
+        second = pk.load_compiled_kb(kb_file)
+        assert second is not first
+        assert second.price("a") == Decimal("45.125")
+        assert second.price("missing") is None
+
+    def test_prices_match_decimal_of_str(self, tmp_path):
+        # Mismo valor que Decimal(str(x)) del código previo, no el binario del float
+        kb_file = tmp_path / "kb.json"
+        kb_file.write_text(
+            '{"products": {"a": {"price_per_m2": 0.1}, "b": {"price_per_m2": "x"}, "c": {"price_per_m2": true}}}',
+            encoding="utf-8",
+        )
+        compiled = pk.load_compiled_kb(kb_file)
+        assert str(compiled.price("a")) == "0.1"
+        assert compiled.price("b") is None and compiled.price("c") is None
+
+    def test_derived_is_built_once_per_version(self, tmp_path):
+        kb_file = tmp_path / "kb.json"
+        kb_file.write_text('{"products": {}}', encoding="utf-8")
+        builds = []
+
+        def builder(catalog):
+            builds.append(catalog)
+            return object()
+
+        compiled = pk.load_compiled_kb(kb_file)
+        assert compiled.derived("x", builder) is compiled.derived("x", builder)
+        assert len(builds) == 1
@@ -0,0 +1,157 @@
+"""
+Tests del pipeline asyncio de SocialIngestionEngine contra una Graph API falsa.
+
+El servidor local (benchmarks/bench_social_ingestion.MockGraphAPI) agrega
+latencia por request, 429 con Retry-After y fallas 500 inyectables. El
+pipeline async debe guardar exactamente lo mismo que el camino serial,
+respetar la concurrencia por plataforma, reusar conexiones y retomar una
+corrida interrumpida desde los cursores persistidos.
+"""
+
+import json
+
+import pytest
+
+from benchmarks.bench_social_ingestion import (
+    FB_TOKEN,
+    IG_TOKEN,
+    MockGraphAPI,
+    make_engine,
+    saved_interactions,
+)
+from gpt_simulation_agent.agent_system.utils.facebook_api import FacebookAPIClient
+from gpt_simulation_agent.agent_system.utils.graph_async import TokenBucket, graph_usage
+
+pytest.importorskip("httpx")
+
+POSTS = 150  # dos páginas de posts/media (límite de página 100)
+FAST = {"rate_per_s": 1000.0, "backoff_s": 0.01}
+
+
+@pytest.fixture
+def api():
+    with MockGraphAPI(posts=POSTS, comments=5, conversations=4, latency_s=0.005) as server:
+        yield server
+
+
+def _total(results):
+    return results["facebook"]["count"] + results["instagram"]["count"]
+
+
+def test_async_matches_serial(api, tmp_path):
+    serial = make_engine(tmp_path / "serial", api.base_url, use_async=False)
+    serial_results = serial.ingest(limit_per_platform=POSTS)
+
+    concurrent = make_engine(tmp_path / "async", api.base_url, max_concurrency=4, **FAST)
+    async_results = concurrent.ingest(limit_per_platform=POSTS)
+
+    expected = saved_interactions(tmp_path / "serial")
+    assert set(expected) == {
+        "facebook/posts", "facebook/comments", "facebook/messages",
+        "instagram/posts", "instagram/comments",
+    }
+    assert saved_interactions(tmp_path / "async") == expected
+    assert _total(async_results) == _total(serial_results) == 2 * POSTS + 2 * 50 * 5 + 4 * 3
+
+
+def test_bounded_concurrency_and_pooled_connections(api, tmp_path):
+    engine = make_engine(tmp_path, api.base_url, max_concurrency=3, **FAST)
+    engine.ingest(limit_per_platform=POSTS)
+
+    for token in (FB_TOKEN, IG_TOKEN):
+        assert 1 < api.max_in_flight[token] <= 3
+    # Un pool compartido: las ~120 requests viajan por unas pocas conexiones
+    assert api.connections <= 2 * 3 < api.requests
+
+
+def test_429_is_retried_after_retry_after(api, tmp_path):
+    api.throttle_every = 7
+    engine = make_engine(tmp_path, api.base_url, max_concurrency=4, **FAST)
+    results = engine.ingest(limit_per_platform=POSTS)
+
+    assert api.throttled > 0
+    assert "errors" not in results["facebook"] and "errors" not in results["instagram"]
+    assert _total(results) == 2 * POSTS + 2 * 50 * 5 + 4 * 3
+
+
+def test_interrupted_run_resumes_from_cursor(api, tmp_path):
+    api.fail_paths = {"page1/posts?after=100"}
+    engine = make_engine(tmp_path, api.base_url, max_retries=1, **FAST)
+    first = engine.ingest(limit_per_platform=POSTS)
+
+    # Como el camino serial, se guarda lo que sí se pudo leer
+    assert first["facebook"]["resumable"] and list(first["facebook"]["errors"]) == ["facebook:posts"]
+    assert first["facebook"]["count"] == 100 + 50 * 5 + 4 * 3
+    assert first["instagram"]["count"] == POSTS + 50 * 5
+    assert "errors" not in first["instagram"]
+    state = json.loads((tmp_path / ".cursors" / "cursors.json").read_text(encoding="utf-8"))
+    assert state["facebook:posts"]["done"] is False
+    assert "after=100" in state["facebook:posts"]["next"]
+    assert "access_token" not in state["facebook:posts"]["next"]
+
+    api.fail_paths = set()
+    second = engine.ingest(limit_per_platform=POSTS)
+
+    assert second["facebook"]["count"] == POSTS + 50 * 5 + 4 * 3
+    # La primera página no se vuelve a pedir: se retoma desde el cursor
+    assert api.hits["/v18.0/page1/posts?after=0"] == 1
+    posts = max(
+        (json.loads(f.read_text(encoding="utf-8")) for f in (tmp_path / "facebook" / "posts").glob("*.json")),
+        key=len,
+    )
+    assert [p["id"] for p in posts] == [f"page1_post{i}" for i in range(POSTS)]
+    # Corrida completa: los cursores de la plataforma se olvidan
+    assert json.loads((tmp_path / ".cursors" / "cursors.json").read_text(encoding="utf-8")) == {}
+    assert not list((tmp_path / ".cursors").glob("*.jsonl"))
+
+
+def test_failing_edge_does_not_drop_the_platform(api, tmp_path):
+    # Sin permiso de Messenger (o un post borrado) falla en cada corrida: el
+    # resto de la plataforma se guarda igual y solo ese edge queda pendiente
+    api.fail_paths = {"me/conversations", "page1_post3/comments"}
+    engine = make_engine(tmp_path, api.base_url, max_retries=1, **FAST)
+
+    for _ in range(2):
+        results = engine.ingest(limit_per_platform=POSTS)
+        assert set(results["facebook"]["errors"]) == {"facebook:conversations", "facebook:comments:page1_post3"}
+        assert results["facebook"]["count"] == POSTS + 49 * 5
+        assert sorted(results["facebook"]["files"]) == ["facebook/comments", "facebook/posts"]
+        assert results["instagram"]["count"] == POSTS + 50 * 5
+
+    state = json.loads((tmp_path / ".cursors" / "cursors.json").read_text(encoding="utf-8"))
+    assert not any(key.startswith("instagram:") for key in state)
+    assert "facebook:posts" not in state
+
+
+def test_custom_clients_use_serial_path(api, tmp_path):
+    class StubFacebookClient(FacebookAPIClient):
+        def get_posts(self, limit=100, since=None, until=None):
+            return [{"id": "stub_post", "message": "¿precio?"}]
+
+        def get_comments(self, post_id, limit=100):
+            return []
+
+        def get_messages(self, limit=100):
+            return []
+
+    engine = make_engine(tmp_path, api.base_url, **FAST)
+    engine.facebook_client = StubFacebookClient(page_access_token=FB_TOKEN, page_id="page1")
+    results = engine.ingest(platforms=["facebook"])
+
+    assert results["facebook"]["count"] == 1
+    assert api.requests == 0
+    assert not (tmp_path / ".cursors").exists()
+
+
+def test_token_bucket_follows_usage_headers():
+    now = [0.0]
+    bucket = TokenBucket(rate=10.0, slowdown_at=75.0, clock=lambda: now[0])
+
+    bucket.observe({"x-app-usage": json.dumps({"call_count": 90, "total_time": 10})})
+    assert bucket.rate == pytest.approx(4.0)
+
+    buc = {"123": [{"type": "pages", "call_count": 20, "estimated_time_to_regain_access": 2}]}
+    usage = graph_usage({"x-business-use-case-usage": json.dumps(buc)})
+    assert usage == {"percent": 20.0, "regain_s": 120.0}
+    bucket.observe({"x-business-use-case-usage": json.dumps(buc)})
+    assert bucket.rate == 10.0 and bucket._paused_until == 120.0
@@ -0,0 +1,184 @@
+"""
+Tests del executor concurrente de tool calls (panelin_core.tool_executor).
+
+Con herramientas que duermen artificialmente, el tiempo de pared de un lote
+independiente debe acercarse al de la herramienta más lenta y no a la suma.
+"""
+
+import threading
+import time
+
+import pytest
+
+from panelin_core.tool_executor import ToolExecutor
+
+
+def _sleeper(seconds, value=None, log=None):
+    def tool(args):
+        if log is not None:
+            log.append(("start", args.get("tag")))
+        time.sleep(seconds)
+        if log is not None:
+            log.append(("end", args.get("tag")))
+        return {"value": value if value is not None else args.get("tag")}
+    return tool
+
+
+def _calls(*names):
+    return [{"name": name, "args": {"tag": i}, "id": f"call-{i}"} for i, name in enumerate(names)]
+
+
+@pytest.fixture
+def executor_factory():
+    created = []
+
+    def make(tools, **kwargs):
+        executor = ToolExecutor(tools, **kwargs)
+        created.append(executor)
+        return executor
+
+    yield make
+    for executor in created:
+        executor.shutdown()
+
+
+class TestConcurrency:
+    def test_wall_time_close_to_slowest_tool(self, executor_factory):
+        executor = executor_factory({
+            "panel_price": _sleeper(0.2),
+            "accessory_price": _sleeper(0.3),
+            "availability": _sleeper(0.1),
+        })
+        calls = _calls("panel_price", "accessory_price", "availability")
+
+        start = time.perf_counter()
+        outcomes = executor.run(calls)
+        wall = time.perf_counter() - start
+
+        assert all(o.ok for o in outcomes)
+        assert 0.3 <= wall < 0.45  # suma secuencial: 0.6s
+
+    def test_results_keep_call_order(self, executor_factory):
+        executor = executor_factory({"slow": _sleeper(0.15), "fast": _sleeper(0.0)})
+        outcomes = executor.run(_calls("slow", "fast", "slow", "fast"))
+        assert [o.call_id for o in outcomes] == ["call-0", "call-1", "call-2", "call-3"]
+        assert [o.output["value"] for o in outcomes] == [0, 1, 2, 3]
+
+    def test_pool_is_bounded(self, executor_factory):
+        active, peak, lock = [0], [0], threading.Lock()
+
+        def tracked(args):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            return args["tag"]
+
+        executor = executor_factory({"tool": tracked}, max_workers=2)
+        outcomes = executor.run(_calls(*["tool"] * 6))
+        assert [o.output for o in outcomes] == list(range(6))
+        assert peak[0] == 2
+
+
+class TestTimeoutsAndErrors:
+    def test_per_tool_timeout(self, executor_factory):
+        executor = executor_factory(
+            {"hangs": _sleeper(1.0), "quick": _sleeper(0.05)},
+            timeouts={"hangs": 0.1},
+        )
+        start = time.perf_counter()
+        hangs, quick = executor.run(_calls("hangs", "quick"))
+        assert time.perf_counter() - start < 0.5
+        assert not hangs.ok and "Timeout" in hangs.error
+        assert quick.ok
+
+    def test_timeout_counts_from_start_not_from_queue(self, executor_factory):
+        # Con un solo hilo, la segunda llamada termina 0.3s después del envío,
+        # pero solo corre 0.15s: no excede su timeout de 0.2s.
+        executor = executor_factory({"tool": _sleeper(0.15)}, max_workers=1, timeout_s=0.2)
+        outcomes = executor.run(_calls("tool", "tool"))
+        assert all(o.ok for o in outcomes)
+
+    def test_hung_tools_do_not_block_later_runs(self, executor_factory):
+        # Dos herramientas colgadas ocupan los dos hilos: el pool se retira y
+        # las llamadas siguientes corren en uno nuevo
+        release = threading.Event()
+        executor = executor_factory(
+            {"hangs": lambda args: release.wait(5), "fast": _sleeper(0.0)},
+            max_workers=2,
+            timeouts={"hangs": 0.2},
+        )
+        try:
+            outcomes = executor.run(_calls("hangs", "hangs"))
+            assert all("Timeout" in o.error for o in outcomes)
+
+            start = time.perf_counter()
+            (fast,) = executor.run(_calls("fast"))
+            assert fast.ok
+            assert time.perf_counter() - start < 0.5
+        finally:
+            release.set()
+
+    def test_queued_calls_behind_hung_tools_still_run(self, executor_factory):
+        release = threading.Event()
+        executor = executor_factory(
+            {"hangs": lambda args: release.wait(5), "fast": _sleeper(0.0)},
+            max_workers=2,
+            timeouts={"hangs": 0.2},
+        )
+        try:
+            start = time.perf_counter()
+            outcomes = executor.run(_calls("hangs", "hangs", "fast"))
+            assert time.perf_counter() - start < 0.5
+            assert [o.ok for o in outcomes] == [False, False, True]
+        finally:
+            release.set()
+
+    def test_wait_for_a_free_worker_is_capped(self, executor_factory):
+        # Si no aparece un hilo libre dentro del timeout, la llamada se
+        # reporta como timeout en vez de esperar indefinidamente
+        release = threading.Event()
+        executor = executor_factory(
+            {"hangs": lambda args: release.wait(5), "fast": _sleeper(0.0)},
+            max_workers=1,
+            timeouts={"hangs": 1.0, "fast": 0.1},
+        )
+        try:
+            hangs, fast = executor.run(_calls("hangs", "fast"))
+            assert "excedió" in hangs.error
+            assert "hilo libre" in fast.error
+        finally:
+            release.set()
+
+    def test_exception_is_reported_per_call(self, executor_factory):
+        def broken(args):
+            raise ValueError("producto inexistente")
+
+        executor = executor_factory({"broken": broken, "ok": _sleeper(0.0)})
+        broken_outcome, ok_outcome = executor.run(_calls("broken", "ok"))
+        assert broken_outcome.error == "ValueError: producto inexistente"
+        assert '"error"' in broken_outcome.content()
+        assert ok_outcome.ok
+
+    def test_unknown_tool(self, executor_factory):
+        (outcome,) = executor_factory({}).run(_calls("missing"))
+        assert "missing" in outcome.error
+
+
+class TestSerialTools:
+    def test_serial_tool_is_a_barrier(self, executor_factory):
+        log = []
+        executor = executor_factory(
+            {"read": _sleeper(0.05, log=log), "write": _sleeper(0.05, log=log)},
+            serial_tools={"write"},
+        )
+        calls = _calls("read", "read", "write", "read")
+        assert executor.waves(calls) == [[0, 1], [2], [3]]
+
+        executor.run(calls)
+        write_start = log.index(("start", 2))
+        write_end = log.index(("end", 2))
+        assert {("end", 0), ("end", 1)} <= set(log[:write_start])
+        assert ("start", 3) in log[write_end:]
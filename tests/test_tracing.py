@@ -0,0 +1,148 @@
+"""
+Tests del tracing opt-in (panelin_core.tracing).
+"""
+
+import asyncio
+import re
+
+import pytest
+
+from panelin_core import tracing
+from panelin_core.tool_executor import ToolExecutor
+
+
+@tracing.traced("test.leaf")
+def leaf(x):
+    return x * 2
+
+
+@tracing.traced("test.parent")
+def parent(x):
+    with tracing.span("test.block", step=1):
+        return leaf(x) + leaf(x)
+
+
+@tracing.traced("test.async_root")
+async def async_root():
+    await asyncio.sleep(0)
+    return parent(1)
+
+
+@pytest.fixture(autouse=True)
+def clean_traces():
+    tracing.clear_traces()
+    yield
+    tracing.clear_traces()
+
+
+def _names(span):
+    return [span.name] + [name for child in span.children for name in _names(child)]
+
+
+class TestDisabled:
+    def test_no_spans_when_disabled(self):
+        assert not tracing.is_enabled()
+        assert parent(2) == 8
+        assert tracing.span("x").__enter__() is None
+        assert tracing.recent_traces() == []
+
+    def test_wrapper_keeps_function_metadata(self):
+        assert leaf.__name__ == "leaf"
+        assert leaf.__wrapped__(3) == 6
+
+
+class TestSpans:
+    def test_nested_sync_spans(self):
+        with tracing.tracing():
+            parent(1)
+        [root] = tracing.recent_traces()
+        assert _names(root) == ["test.parent", "test.block", "test.leaf", "test.leaf"]
+        block = root.children[0]
+        assert block.attrs == {"step": 1}
+        assert root.duration_ms >= block.duration_ms >= sum(c.duration_ms for c in block.children)
+        assert root.to_dict()["children"][0]["name"] == "test.block"
+
+    def test_async_root(self):
+        with tracing.tracing():
+            assert asyncio.run(async_root()) == 4
+        [root] = tracing.recent_traces()
+        assert _names(root)[:2] == ["test.async_root", "test.parent"]
+
+    def test_exception_is_recorded(self):
+        with tracing.tracing(), pytest.raises(ZeroDivisionError):
+            with tracing.span("test.fails"):
+                1 / 0
+        assert tracing.recent_traces()[-1].attrs["error"] == "ZeroDivisionError"
+
+    def test_children_are_capped(self):
+        with tracing.tracing(), tracing.span("test.sweep"):
+            for i in range(tracing.MAX_SPAN_CHILDREN + 5):
+                leaf(i)
+        root = tracing.recent_traces()[-1]
+        assert len(root.children) == tracing.MAX_SPAN_CHILDREN
+        assert root.dropped_children == 5
+
+    def test_tool_executor_threads_nest_under_the_turn(self):
+        executor = ToolExecutor({"double": lambda args: leaf(args["x"]), "other": lambda args: leaf(1)})
+        try:
+            with tracing.tracing(), tracing.span("test.turn"):
+                executor.run([
+                    {"name": "double", "args": {"x": 2}, "id": "1"},
+                    {"name": "other", "args": {}, "id": "2"},
+                ])
+        finally:
+            executor.shutdown()
+        [root] = tracing.recent_traces()
+        assert sorted(c.attrs["tool"] for c in root.children) == ["double", "other"]
+        assert all(c.children[0].name == "test.leaf" for c in root.children)
+
+
+class TestProfiling:
+    def test_sampled_profile_is_written_as_collapsed_stacks(self, tmp_path):
+        def busy():
+            return sum(i * i for i in range(20000))
+
+        with tracing.tracing(profile_sample_rate=1.0, profile_dir=tmp_path):
+            with tracing.span("test.profiled"):
+                busy()
+        root = tracing.recent_traces()[-1]
+        assert root.profile
+        assert all(re.match(r"^test\.profiled(;[^;]+)* \d+$", line) for line in root.profile)
+        assert any("busy (test_tracing.py:" in line for line in root.profile)
+        assert open(root.profile_path, encoding="utf-8").read().splitlines() == root.profile
+
+    def test_not_sampled(self):
+        with tracing.tracing(profile_sample_rate=0.5, rng=lambda: 0.9):
+            parent(1)
+        assert tracing.recent_traces()[-1].profile is None
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            tracing.configure(profile_sample_rate=2.0)
+        assert not tracing.is_enabled()
+
+
+def test_configure_from_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("PANELIN_TRACE", "1")
+    monkeypatch.setenv("PANELIN_PROFILE_SAMPLE_RATE", "0.25")
+    monkeypatch.setenv("PANELIN_PROFILE_DIR", str(tmp_path))
+    try:
+        tracing.configure_from_env()
+        assert tracing.is_enabled()
+        assert tracing._profile_sample_rate == 0.25
+    finally:
+        tracing.disable()
+
+
+def test_hybrid_agent_run_is_traced():
+    pytest.importorskip("langchain_core")
+    from panelin.agent.hybrid_agent import PanelinHybridAgent
+    from panelin_core.llm_cache import StubChatModel
+
+    agent = PanelinHybridAgent(llm=StubChatModel())
+    with tracing.tracing():
+        asyncio.run(agent.run("Necesito 20 paneles Isopanel de 3m x 1.14m, espesor 100mm"))
+    root = tracing.recent_traces()[-1]
+    assert root.name == "agent.run"
+    assert "agent.route" in _names(root)
+    assert "tool.validate_quotation" in _names(root)